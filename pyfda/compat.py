@@ -23,6 +23,7 @@ try:
                                  QPushButton, QCheckBox, QToolButton, QSpinBox, QDial,
                                  QFileDialog, QInputDialog, QPlainTextEdit,
                                  QTableWidget, QTableWidgetItem, QTextBrowser,
+                                 QListWidget, QListWidgetItem,
                                  QSizePolicy, QAbstractItemView,
                                  QHBoxLayout, QVBoxLayout, QGridLayout,
                                  QStyledItemDelegate, QStyle)
@@ -44,6 +45,7 @@ except ImportError:
                              QPushButton, QCheckBox, QToolButton, QSpinBox, QDial,
                              QFileDialog, QInputDialog, QPlainTextEdit,
                              QTableWidget, QTableWidgetItem, QTextBrowser, QTextCursor,
+                             QListWidget, QListWidgetItem,
                              QSizePolicy, QAbstractItemView,
                              QHBoxLayout, QVBoxLayout, QGridLayout,
                              QStyledItemDelegate)
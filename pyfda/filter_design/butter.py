@@ -33,8 +33,7 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import scipy.signal as sig
 from scipy.signal import buttord
 
-from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit
-from pyfda.pyfda_qt_lib import qfilter_warning
+from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit, fil_order_warning
 
 __version__ = "2.0"
 
@@ -185,7 +184,7 @@ are calculated using the ``buttord()``  helper routine to meet pass and stop ban
         design.
         """
         if self.N > 25:
-            return qfilter_warning(None, self.N, "Butterworth")
+            return fil_order_warning(self.N, "Butterworth")
         else:
             return True
 
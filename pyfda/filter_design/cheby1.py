@@ -32,8 +32,7 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import scipy.signal as sig
 from scipy.signal import cheb1ord
     
-from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit
-from pyfda.pyfda_qt_lib import qfilter_warning
+from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit, fil_order_warning
 from .common import Common
 
 __version__ = "2.0"
@@ -158,7 +157,7 @@ critical passband frequency :math:`F_C` from passband / stopband specifications.
         design.
         """
         if self.N > 30:
-            return qfilter_warning(None, self.N, "Chebychev 1")
+            return fil_order_warning(self.N, "Chebychev 1")
         else:
             return True
 
@@ -33,8 +33,7 @@ import scipy.signal as sig
 from scipy.signal import cheb2ord
 from .common import Common 
 
-from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit
-from pyfda.pyfda_qt_lib import qfilter_warning
+from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit, fil_order_warning
 
 __version__ = "2.0"
 
@@ -155,7 +154,7 @@ critical stop band frequency :math:`F_C` from pass and stop band specifications.
         design.
         """
         if self.N > 25:
-            return qfilter_warning(None, self.N, "Chebychev 2")
+            return fil_order_warning(self.N, "Chebychev 2")
         else:
             return True
 
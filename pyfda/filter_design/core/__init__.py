@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Qt-free design cores of the filter design classes with additional widgets
+(Equiripple, Firwin, MA, EllipZeroPhz). The widgets in `pyfda.filter_design`
+are derived from these classes and add the UI, the numerical design is done
+here. This allows designing filters without importing PyQt and matplotlib,
+e.g. in batch jobs:
+
+>>> from pyfda.filter_design.core.equiripple import EquirippleCore
+>>> fil_dict = {'N': 20, 'F_PB': 0.1, 'F_SB': 0.2, 'W_PB': 1, 'W_SB': 1, ...}
+>>> EquirippleCore().LPman(fil_dict)
+>>> b, a = fil_dict['ba']
+
+Parameters that are entered in the widgets (e.g. the window for Firwin) are
+read from `fil_dict['wdg_fil']` when available.
+"""
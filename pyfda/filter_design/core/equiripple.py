@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Qt-free design core for equiripple filters (LP, HP, BP, BS, HIL, DIFF) with
+fixed or minimum order, return the filter design in coefficients format ('ba').
+
+The widget `pyfda.filter_design.equiripple.Equiripple` is derived from this class.
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import logging
+logger = logging.getLogger(__name__)
+
+import scipy.signal as sig
+import numpy as np
+
+from pyfda.pyfda_lib import (fil_save, remezord, round_odd, ceil_even,
+                             fil_order_warning, fir_verify_order)
+
+N_MAX = 2000 # filter lengths above this value trigger a warning
+
+class EquirippleCore(object):
+
+    FRMT = 'ba' # output format of filter design routines 'zpk' / 'ba' / 'sos'
+            # currently, only 'ba' is supported for equiripple routines
+
+    info ="""
+**Equiripple filters**
+
+have the steepest rate of transition between the frequency response’s passband
+and stopband of all FIR filters. This comes at the expense of a constant ripple
+(equiripple) :math:`A_PB` and :math:`A_SB` in both pass and stop band.
+
+The filter-coefficients are calculated in such a way that the transfer function
+minimizes the maximum error (**Minimax** design) between the desired gain and the
+realized gain in the specified frequency bands using the **Remez** exchange algorithm.
+The filter design algorithm is known as **Parks-McClellan** algorithm, in
+Matlab (R) it is called ``firpm``.
+
+Manual filter order design requires specifying the frequency bands (:math:`F_PB`,
+:math:`f_SB` etc.), the filter order :math:`N` and weight factors :math:`W_PB`,
+:math:`W_SB` etc.) for individual bands.
+
+The minimum order and the weight factors needed to fulfill the target specifications
+is estimated from frequency and amplitude specifications using Ichige's algorithm.
+With "Verify N", filters with lengths around the estimate are designed and
+checked against the specs, the shortest compliant filter is selected.
+
+**Design routines:**
+
+``scipy.signal.remez()``, ``pyfda_lib.remezord()``
+    """
+
+    def __init__(self):
+
+        self.grid_density = 16
+        self.verify_N = False # verify estimated minimum order with the actual response
+
+        self.ft = 'FIR'
+
+        self.rt_dicts = ('com',)
+
+        self.rt_dict = {
+            'COM': {'man': {'fo':('a', 'N'),
+                            'msg':('a',
+                                "<span>Enter desired filter order <b><i>N</i></b>, corner "
+                                "frequencies of pass and stop band(s), <b><i>F<sub>PB</sub></i></b>"
+                                "&nbsp; and <b><i>F<sub>SB</sub></i></b>&nbsp;, and relative weight "
+                                "values <b><i>W&nbsp; </i></b> (1 ... 10<sup>6</sup>) to specify how well "
+                                "the bands are approximated.</span>")
+                            },
+                    'min': {'fo':('d', 'N'),
+                            'msg': ('a',
+                                "<span>Enter the maximum pass band ripple <b><i>A<sub>PB</sub></i></b>, "
+                                "minimum stop band attenuation <b><i>A<sub>SB</sub></i></b> "
+                                "and the corresponding corner frequencies of pass and "
+                                "stop band(s), <b><i>F<sub>PB</sub></i></b>&nbsp; and "
+                                "<b><i>F<sub>SB</sub></i></b> .</span>")
+                            }
+                },
+            'LP': {'man':{'wspecs': ('a','W_PB','W_SB'),
+                          'tspecs': ('u', {'frq':('a','F_PB','F_SB'),
+                                           'amp':('u','A_PB','A_SB')})
+                          },
+                   'min':{'wspecs': ('d','W_PB','W_SB'),
+                          'tspecs': ('a', {'frq':('a','F_PB','F_SB'),
+                                           'amp':('a','A_PB','A_SB')})
+                        }
+                },
+            'HP': {'man':{'wspecs': ('a','W_SB','W_PB'),
+                          'tspecs': ('u', {'frq':('a','F_SB','F_PB'),
+                                           'amp':('u','A_SB','A_PB')})
+                         },
+                   'min':{'wspecs': ('d','W_SB','W_PB'),
+                          'tspecs': ('a', {'frq':('a','F_SB','F_PB'),
+                                           'amp':('a','A_SB','A_PB')})
+                         }
+                    },
+            'BP': {'man':{'wspecs': ('a','W_SB','W_PB','W_SB2'),
+                          'tspecs': ('u', {'frq':('a','F_SB','F_PB','F_PB2','F_SB2'),
+                                           'amp':('u','A_SB','A_PB','A_SB2')})
+                         },
+                   'min':{'wspecs': ('d','W_SB','W_PB','W_SB2'),
+                          'tspecs': ('a', {'frq':('a','F_SB','F_PB','F_PB2','F_SB2'),
+                                           'amp':('a','A_SB','A_PB','A_SB2')})
+                         },
+                    },
+            'BS': {'man':{'wspecs': ('a','W_PB','W_SB','W_PB2'),
+                          'tspecs': ('u', {'frq':('a','F_PB','F_SB','F_SB2','F_PB2'),
+                                           'amp':('u','A_PB','A_SB','A_PB2')})
+                          },
+                   'min':{'wspecs': ('d','W_PB','W_SB','W_PB2'),
+                          'tspecs': ('a', {'frq':('a','F_PB','F_SB','F_SB2','F_PB2'),
+                                           'amp':('a','A_PB','A_SB','A_PB2')})
+                        }
+                },
+            'HIL': {'man':{'wspecs': ('a','W_SB','W_PB','W_SB2'),
+                           'tspecs': ('u', {'frq':('a','F_SB','F_PB','F_PB2','F_SB2'),
+                                           'amp':('u','A_SB','A_PB','A_SB2')})
+                         }
+                    },
+            'DIFF': {'man':{'wspecs': ('a','W_PB'),
+                            'tspecs': ('u', {'frq':('a','F_PB'),
+                                           'amp':('i',)}),
+                            'msg':('a',"Enter the max. frequency up to where the differentiator "
+                                        "works.")
+                          }
+                    }
+            }
+
+        self.info_doc = []
+        self.info_doc.append('remez()\n=======')
+        self.info_doc.append(sig.remez.__doc__)
+        self.info_doc.append('remezord()\n==========')
+        self.info_doc.append(remezord.__doc__)
+
+        self.wdg = True  # has additional dynamic widget 'wdg_fil'
+
+        self.hdl = ('df') # filter topologies
+
+    def _get_params(self, fil_dict):
+        """
+        Translate parameters from the passed dictionary to instance
+        parameters, scaling / transforming them if needed.
+        """
+        self.N     = fil_dict['N'] + 1  # remez algorithms expects number of taps
+                                        # which is larger by one than the order!!
+        self.F_PB  = fil_dict['F_PB']
+        self.F_SB  = fil_dict['F_SB']
+        self.F_PB2 = fil_dict['F_PB2']
+        self.F_SB2 = fil_dict['F_SB2']
+        # remez amplitude specs are linear (not in dBs)
+        self.A_PB  = fil_dict['A_PB']
+        self.A_PB2 = fil_dict['A_PB2']
+        self.A_SB  = fil_dict['A_SB']
+        self.A_SB2 = fil_dict['A_SB2']
+
+        self.alg = 'ichige'
+
+        # grid density entered in the widget
+        if 'wdg_fil' in fil_dict and 'equiripple' in fil_dict['wdg_fil']:
+            self.grid_density = fil_dict['wdg_fil']['equiripple'].get('grid_density',
+                                                                   self.grid_density)
+            self.verify_N = fil_dict['wdg_fil']['equiripple'].get('verify_N',
+                                                               self.verify_N)
+
+    def _test_N(self):
+        """
+        Warn the user if the calculated order is too high for a reasonable filter
+        design.
+        """
+        if self.N > N_MAX:
+            return fil_order_warning(self.N, "Equiripple")
+        else:
+            return True
+
+    def _save(self, fil_dict, arg):
+        """
+        Convert between poles / zeros / gain, filter coefficients (polynomes)
+        and second-order sections and store all available formats in the passed
+        dictionary 'fil_dict'.
+        """
+
+        fil_save(fil_dict, arg, self.FRMT, __name__)
+
+        if str(fil_dict['fo']) == 'min':
+            fil_dict['N'] = self.N - 1  # yes, update filterbroker
+
+
+    def LPman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self._save(fil_dict,
+                  sig.remez(self.N,[0, self.F_PB, self.F_SB, 0.5], [1, 0],
+                        weight = [fil_dict['W_PB'],fil_dict['W_SB']], Hz = 1,
+                        grid_density = self.grid_density))
+
+    def LPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        (self.N, F, A, W) = remezord([self.F_PB, self.F_SB], [1, 0],
+            [self.A_PB, self.A_SB], Hz = 1, alg = self.alg)
+        if not self._test_N():
+            return -1
+        fil_dict['W_PB'] = W[0]
+        fil_dict['W_SB'] = W[1]
+        design = lambda N: sig.remez(N, F, [1, 0], weight = W, Hz = 1,
+                        grid_density = self.grid_density)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     N_max = N_MAX)
+        self._save(fil_dict, b)
+
+
+    def HPman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        if (self.N % 2 == 0): # even order, use odd symmetry (type III)
+            self._save(fil_dict,
+                  sig.remez(self.N,[0, self.F_SB, self.F_PB, 0.5], [0, 1],
+                        weight = [fil_dict['W_SB'],fil_dict['W_PB']], Hz = 1,
+                        type = 'hilbert', grid_density = self.grid_density))
+        else: # odd order,
+            self._save(fil_dict,
+                  sig.remez(self.N,[0, self.F_SB, self.F_PB, 0.5], [0, 1],
+                        weight = [fil_dict['W_SB'],fil_dict['W_PB']], Hz = 1,
+                        type = 'bandpass', grid_density = self.grid_density))
+
+    def HPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        (self.N, F, A, W) = remezord([self.F_SB, self.F_PB], [0, 1],
+            [self.A_SB, self.A_PB], Hz = 1, alg = self.alg)
+        if not self._test_N():
+            return -1
+#        self.N = ceil_odd(N)  # enforce odd order
+        fil_dict['W_SB'] = W[0]
+        fil_dict['W_PB'] = W[1]
+        # even order: odd symmetry (type IV)
+        design = lambda N: sig.remez(N, F,[0, 1], weight = W, Hz = 1,
+                        type = 'hilbert' if N % 2 == 0 else 'bandpass',
+                        grid_density = self.grid_density)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    # For BP and BS, F_PB and F_SB have two elements each
+    def BPman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self._save(fil_dict,
+                 sig.remez(self.N,[0, self.F_SB, self.F_PB,
+                self.F_PB2, self.F_SB2, 0.5],[0, 1, 0],
+                weight = [fil_dict['W_SB'],fil_dict['W_PB'], fil_dict['W_SB2']],
+                Hz = 1, grid_density = self.grid_density))
+
+    def BPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        (self.N, F, A, W) = remezord([self.F_SB, self.F_PB,
+                                self.F_PB2, self.F_SB2], [0, 1, 0],
+            [self.A_SB, self.A_PB, self.A_SB2], Hz = 1, alg = self.alg)
+        if not self._test_N():
+            return -1
+        fil_dict['W_SB']  = W[0]
+        fil_dict['W_PB']  = W[1]
+        fil_dict['W_SB2'] = W[2]
+        design = lambda N: sig.remez(N, F, [0, 1, 0], weight = W, Hz = 1,
+                                      grid_density = self.grid_density)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def BSman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self.N = round_odd(self.N) # enforce odd order
+        self._save(fil_dict, sig.remez(self.N,[0, self.F_PB, self.F_SB,
+            self.F_SB2, self.F_PB2, 0.5],[1, 0, 1],
+            weight = [fil_dict['W_PB'],fil_dict['W_SB'], fil_dict['W_PB2']],
+            Hz = 1, grid_density = self.grid_density))
+
+    def BSmin(self, fil_dict):
+        self._get_params(fil_dict)
+        (N, F, A, W) = remezord([self.F_PB, self.F_SB,
+                                self.F_SB2, self.F_PB2], [1, 0, 1],
+            [self.A_PB, self.A_SB, self.A_PB2], Hz = 1, alg = self.alg)
+        self.N = round_odd(N)  # enforce odd order
+        if not self._test_N():
+            return -1
+        fil_dict['W_PB']  = W[0]
+        fil_dict['W_SB']  = W[1]
+        fil_dict['W_PB2'] = W[2]
+        design = lambda N: sig.remez(N, F, [1, 0, 1], weight = W, Hz = 1,
+                                      grid_density = self.grid_density)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     step = 2, N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def HILman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self._save(fil_dict, sig.remez(self.N,[0, self.F_SB, self.F_PB,
+                self.F_PB2, self.F_SB2, 0.5],[0, 1, 0],
+                weight = [fil_dict['W_SB'],fil_dict['W_PB'], fil_dict['W_SB2']],
+                Hz = 1, type = 'hilbert', grid_density = self.grid_density))
+
+    def DIFFman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self.N = ceil_even(self.N) # enforce even order
+        self._save(fil_dict, sig.remez(self.N,[0, self.F_PB],[np.pi*fil_dict['W_PB']],
+                Hz = 1, type = 'differentiator', grid_density = self.grid_density))
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
+    filt = EquirippleCore()
+    filt.LPman(fb.fil[0])  # design a low-pass with parameters from global dict
+    print(fb.fil[0][filt.FRMT]) # return results in default format
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Qt-free design core for windowed FIR filters (LP, HP, BP, BS) with fixed or
+minimum order, return the filter design in coefficient ('ba') format.
+
+The widget `pyfda.filter_design.firwin.Firwin` is derived from this class.
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.pyfda_lib import (fil_save, remezord, round_odd, fil_order_warning,
+                             fir_verify_order)
+from ..common import Common
+
+N_MAX = 1000 # filter lengths above this value trigger a warning
+
+class FirwinCore(object):
+
+    FRMT = 'ba' # output format(s) of filter design routines 'zpk' / 'ba' / 'sos'
+                # currently, only 'ba' is supported for firwin routines
+
+    def __init__(self):
+
+        self.ft = 'FIR'
+
+        c = Common()
+        self.rt_dict = c.rt_base_iir
+
+        self.rt_dict_add = {
+            'COM':{'min':{'msg':('a',
+                                  r"<br /><b>Note:</b> This is only a rough approximation!")},
+                   'man':{'msg':('a',
+                                 r"Enter desired filter order <b><i>N</i></b> and "
+                                  "<b>-6 dB</b> pass band corner "
+                                  "frequency(ies) <b><i>F<sub>C</sub></i></b> .")},
+                                  },
+            'LP': {'man':{}, 'min':{}},
+            'HP': {'man':{'msg':('a', r"<br /><b>Note:</b> Order needs to be odd!")},
+                   'min':{}},
+            'BS': {'man':{'msg':('a', r"<br /><b>Note:</b> Order needs to be odd!")},
+                   'min':{}},
+            'BP': {'man':{}, 'min':{}},
+            }
+
+
+        self.info = """**Windowed FIR filters**
+
+        are designed by truncating the
+        infinite impulse response of an ideal filter with a window function.
+        The kind of used window has strong influence on ripple etc. of the
+        resulting filter.
+
+        **Design routines:**
+
+        ``scipy.signal.firwin()``
+
+        The minimum order is only a rough estimate. With "Verify N", filters
+        with lengths around the estimate are designed and checked against the
+        specs, the shortest compliant filter is selected.
+        """
+        self.info_doc = []
+
+        #------------------- end of static info for filter tree ---------------
+
+        self.wdg = True  # has additional dynamic widget 'wdg_fil'
+
+        self.hdl = ('df') # filter topologies
+
+        # Window used for the design, either a string with the window name or
+        # a tuple with the window name and its parameter(s) and algorithm for
+        # estimating the minimum order. Both are selected in the widget.
+        self.firWindow = 'hann'
+        self.fir_window_name = 'hann'
+        self.alg = 'ichige'
+        self.verify_N = False # verify estimated minimum order with the actual response
+
+    def _get_params(self, fil_dict):
+        """
+        Translate parameters from the passed dictionary to instance
+        parameters, scaling / transforming them if needed.
+        """
+        self.N     = fil_dict['N']
+        self.F_PB  = fil_dict['F_PB']
+        self.F_SB  = fil_dict['F_SB']
+        self.F_PB2 = fil_dict['F_PB2']
+        self.F_SB2 = fil_dict['F_SB2']
+        self.F_C   = fil_dict['F_C']
+        self.F_C2  = fil_dict['F_C2']
+
+        # firwin amplitude specs are linear (not in dBs)
+        self.A_PB  = fil_dict['A_PB']
+        self.A_PB2 = fil_dict['A_PB2']
+        self.A_SB  = fil_dict['A_SB']
+        self.A_SB2 = fil_dict['A_SB2']
+
+        # window and algorithm selected in the widget
+        if 'wdg_fil' in fil_dict and 'firwin' in fil_dict['wdg_fil']:
+            wdg_fil_par = fil_dict['wdg_fil']['firwin']
+            if 'win' in wdg_fil_par:
+                self.firWindow = wdg_fil_par['win']
+                if not np.isscalar(self.firWindow): # name and parameters
+                    self.firWindow = tuple(self.firWindow)
+            if 'alg' in wdg_fil_par:
+                self.alg = wdg_fil_par['alg']
+            self.verify_N = wdg_fil_par.get('verify_N', self.verify_N)
+
+        if np.isscalar(self.firWindow):
+            self.fir_window_name = str(self.firWindow).lower()
+        else:
+            self.fir_window_name = str(self.firWindow[0]).lower()
+
+    def _test_N(self):
+        """
+        Warn the user if the calculated order is too high for a reasonable filter
+        design.
+        """
+        if self.N > N_MAX:
+            return fil_order_warning(self.N, "FirWin")
+        else:
+            return True
+
+
+    def _save(self, fil_dict, arg):
+        """
+        Convert between poles / zeros / gain, filter coefficients (polynomes)
+        and second-order sections and store all available formats in the passed
+        dictionary 'fil_dict'. Window and algorithm are stored as well as they
+        can be changed by the design routine.
+        """
+        fil_save(fil_dict, arg, self.FRMT, __name__)
+
+        try: # has the order been calculated by a "min" filter design?
+            fil_dict['N'] = self.N # yes, update filterbroker
+        except AttributeError:
+            pass
+
+        if not 'wdg_fil' in fil_dict:
+            fil_dict.update({'wdg_fil':{}})
+        fil_dict['wdg_fil'].update({'firwin':
+                                        {'win':self.firWindow,
+                                         'alg':self.alg,
+                                         'verify_N':self.verify_N}
+                                    })
+
+
+    def _firwin_ord(self, F, W, A, alg):
+        #http://www.mikroe.com/chapters/view/72/chapter-2-fir-filters/
+        delta_f = abs(F[1] - F[0])
+        delta_A = np.sqrt(A[0] * A[1])
+        if self.fir_window_name == 'kaiser':
+            # kaiserord expects the attenuation in dB and the transition width
+            # normalized to f_Nyq = f_S/2
+            N, beta = sig.kaiserord(-20 * np.log10(min(A)), delta_f * 2)
+            self.firWindow = (self.fir_window_name, beta)
+            return N
+
+        if self.firWindow == 'hann':
+            gamma = 3.11
+            sidelobe = 44
+        elif self.firWindow == 'hamming':
+            gamma = 3.32
+            sidelobe = 53
+        elif self.firWindow == 'blackman':
+            gamma = 5.56
+            sidelobe = 75
+        else:
+            gamma = 1
+        N = remezord(F, W, A, Hz = 1, alg = alg)[0]
+        return N
+
+    def LPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        self.N = self._firwin_ord([self.F_PB, self.F_SB], [1, 0],
+                                 [self.A_PB, self.A_SB], alg = self.alg)
+        if not self._test_N():
+            return -1
+        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
+        design = lambda N: sig.firwin(N, fil_dict['F_C'],
+                                       window = self.firWindow, nyq = 0.5)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def LPman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'],
+                                       window = self.firWindow, nyq = 0.5))
+
+    def HPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        N = self._firwin_ord([self.F_SB, self.F_PB], [0, 1],
+                            [self.A_SB, self.A_PB], alg = self.alg)
+        self.N = round_odd(N)  # enforce odd order
+        if not self._test_N():
+            return -1
+        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
+        design = lambda N: sig.firwin(N, fil_dict['F_C'],
+                    window = self.firWindow, pass_zero=False, nyq = 0.5)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     step = 2, N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def HPman(self, fil_dict):
+        self._get_params(fil_dict)
+        self.N = round_odd(self.N)  # enforce odd order
+        if not self._test_N():
+            return -1
+        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'],
+            window = self.firWindow, pass_zero=False, nyq = 0.5))
+
+
+    # For BP and BS, F_PB and F_SB have two elements each
+    def BPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        self.N = remezord([self.F_SB, self.F_PB, self.F_PB2, self.F_SB2], [0, 1, 0],
+            [self.A_SB, self.A_PB, self.A_SB2], Hz = 1, alg = self.alg)[0]
+        if not self._test_N():
+            return -1
+        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
+        fil_dict['F_C2'] = (self.F_SB2 + self.F_PB2)/2 # use average of calculated F_PB and F_SB
+        design = lambda N: sig.firwin(N, [fil_dict['F_C'], fil_dict['F_C2']],
+                            window = self.firWindow, pass_zero=False, nyq = 0.5)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def BPman(self, fil_dict):
+        self._get_params(fil_dict)
+        if not self._test_N():
+            return -1
+        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
+                            window = self.firWindow, pass_zero=False, nyq = 0.5))
+
+    def BSmin(self, fil_dict):
+        self._get_params(fil_dict)
+        N = remezord([self.F_PB, self.F_SB, self.F_SB2, self.F_PB2], [1, 0, 1],
+            [self.A_PB, self.A_SB, self.A_PB2], Hz = 1, alg = self.alg)[0]
+        self.N = round_odd(N)  # enforce odd order
+        if not self._test_N():
+            return -1
+        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
+        fil_dict['F_C2'] = (self.F_SB2 + self.F_PB2)/2 # use average of calculated F_PB and F_SB
+        design = lambda N: sig.firwin(N, [fil_dict['F_C'], fil_dict['F_C2']],
+                            window = self.firWindow, pass_zero=True, nyq = 0.5)
+        self.N, b = fir_verify_order(design, fil_dict, self.N, self.verify_N,
+                                     step = 2, N_max = N_MAX)
+        self._save(fil_dict, b)
+
+    def BSman(self, fil_dict):
+        self._get_params(fil_dict)
+        self.N = round_odd(self.N)  # enforce odd order
+        if not self._test_N():
+            return -1
+        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
+                            window = self.firWindow, pass_zero=True, nyq = 0.5))
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
+    filt = FirwinCore()
+    filt.LPman(fb.fil[0])  # design a low-pass with parameters from global dict
+    print(fb.fil[0][filt.FRMT]) # return results in default format
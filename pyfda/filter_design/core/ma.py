@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Qt-free design core for moving average filters (LP, HP, BP, BS) with fixed or
+minimum order, return the filter design in coefficients format ('ba') and as
+poles/zeros ('zpk').
+
+The widget `pyfda.filter_design.ma.MA` is derived from this class.
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from pyfda.pyfda_lib import fil_save, fil_convert, ceil_odd, fil_order_warning
+
+class MACore(object):
+
+    FRMT = ('zpk', 'ba') # output format(s) of filter design routines 'zpk' / 'ba' / 'sos'
+
+    info ="""
+**Moving average filters**
+
+can only be specified via their length and the number of cascaded sections.
+
+The minimum order to obtain a certain attenuation at a given frequency is
+calculated via the si function.
+
+Moving average filters can be implemented very efficiently in hard- and software
+as they require no multiplications but only addition and subtractions. Probably
+only the lowpass is really useful, as the other response types only filter out resp.
+leave components at ``f_S/4`` (bandstop resp. bandpass) resp. leave components
+near ``f_S/2`` (highpass).
+
+**Design routines:**
+
+``ma.calc_ma()``
+    """
+
+    def __init__(self):
+
+        self.delays = 12 # number of delays per stage
+        self.stages = 1 # number of stages
+        self.normalize = True # normalize to |H_max| = 1
+
+        self.ft = 'FIR'
+
+        self.rt_dicts = ()
+        # Common data for all filter response types:
+        # This data is merged with the entries for individual response types
+        # (common data comes first):
+
+        self.rt_dict = {
+            'COM':{'man':{'fo': ('d', 'N'),
+                          'msg':('a',
+                   "Enter desired order (= delays) <b><i>M</i></b> per stage and"
+                    " the number of <b>stages</b>. Target frequencies and amplitudes"
+                    " are only used for comparison, not for the design itself.")
+                        },
+                    'min':{'fo': ('d', 'N'),
+                          'msg':('a',
+                   "Enter desired attenuation <b><i>A<sub>SB</sub></i></b> at "
+                   "the corner of the stop band <b><i>F<sub>SB</sub></i></b>. "
+                   "Choose the number of <b>stages</b>, the minimum order <b><i>M</i></b> "
+                   "per stage will be determined. Passband specs are not regarded.")
+                        }
+                    },
+            'LP': {'man':{'tspecs': ('u', {'frq':('u','F_PB','F_SB'),
+                                           'amp':('u','A_PB','A_SB')})
+                          },
+                   'min':{'tspecs': ('a', {'frq':('a','F_PB','F_SB'),
+                                           'amp':('a','A_PB','A_SB')})
+                   }
+                },
+            'HP': {'man':{'tspecs': ('u', {'frq':('u','F_SB','F_PB'),
+                                           'amp':('u','A_SB','A_PB')})
+                         },
+                   'min':{'tspecs': ('a', {'frq':('a','F_SB','F_PB'),
+                                           'amp':('a','A_SB','A_PB')})
+                         },
+                },
+            'BS': {'man':{'tspecs': ('u', {'frq':('u','F_PB','F_SB','F_SB2', 'F_PB2'),
+                                           'amp':('u','A_PB','A_SB','A_PB2')}),
+                    'msg': ('a', "\nThis is not a proper band stop, it only lets pass"
+                            " frequency components around DC and <i>f<sub>S</sub></i>/2."
+                            " The order needs to be odd."),
+                        }},
+            'BP': {'man':{'tspecs': ('u', {'frq':('u','F_SB','F_PB','F_PB2','F_SB2',),
+                                           'amp':('u','A_SB','A_PB','A_SB2')}),
+                    'msg': ('a', "\nThis is not a proper band pass, it only lets pass"
+                            " frequency components around <i>f<sub>S</sub></i>/4."
+                            " The order needs to be odd."),
+
+                        }},
+                }
+
+
+        self.info_doc = []
+#        self.info_doc.append('remez()\n=======')
+#        self.info_doc.append(sig.remez.__doc__)
+#        self.info_doc.append('remezord()\n==========')
+#        self.info_doc.append(remezord.__doc__)
+
+        self.wdg = True # has additional dynamic widget 'wdg_fil'
+
+        self.hdl = ('ma', 'cic', 'df')  # filter topologies
+
+
+    def _get_params(self, fil_dict):
+        """
+        Translate parameters from the passed dictionary to instance
+        parameters, scaling / transforming them if needed.
+        """
+        # N is total order, L is number of taps per stage
+        self.F_SB  = fil_dict['F_SB']
+        self.A_SB  = fil_dict['A_SB']
+
+        # number of delays and stages, normalization entered in the widget
+        if 'wdg_fil' in fil_dict and 'ma' in fil_dict['wdg_fil']:
+            wdg_fil_par = fil_dict['wdg_fil']['ma']
+            self.delays = wdg_fil_par.get('delays', self.delays)
+            self.stages = wdg_fil_par.get('stages', self.stages)
+            self.normalize = wdg_fil_par.get('normalize', self.normalize)
+
+
+    def _save(self, fil_dict):
+        """
+        Save MA-filters both in 'zpk' and 'ba' format; no conversion has to be
+        performed except maybe deleting an 'sos' entry from an earlier
+        filter design.
+        """
+        if 'zpk' in self.FRMT:
+            fil_save(fil_dict, self.zpk, 'zpk', __name__, convert = False)
+
+        if 'ba' in self.FRMT:
+            fil_save(fil_dict, self.b, 'ba', __name__, convert = False)
+
+        fil_convert(fil_dict, self.FRMT)
+
+        # always update filter dict, in case the design algorithm
+        # has changed the number of delays:
+        fil_dict['N'] = self.delays * self.stages # updated filter order
+
+        if not 'wdg_fil' in fil_dict:
+            fil_dict.update({'wdg_fil':{}})
+        fil_dict['wdg_fil'].update({'ma':
+                                        {'delays':self.delays,
+                                         'stages':self.stages,
+                                         'normalize':self.normalize}
+                                    })
+
+
+    def calc_ma(self, fil_dict, rt='LP'):
+        """
+        Calculate coefficients and P/Z for moving average filter based on
+        filter length L = N + 1 and number of cascaded stages and save the
+        result in the filter dictionary.
+        """
+        b = 1.
+        k = 1.
+        L = self.delays + 1
+
+        if rt == 'LP':
+            b0 = np.ones(L) #  h[n] = {1; 1; 1; ...}
+            i = np.arange(1, L)
+
+            norm = L
+
+        elif rt == 'HP':
+            b0 = np.ones(L)
+            b0[::2] = -1. # h[n] = {1; -1; 1; -1; ...}
+
+            i = np.arange(L)
+            if (L % 2 == 0): # even order, remove middle element
+                i = np.delete(i ,round(L/2.))
+            else: # odd order, shift by 0.5 and remove middle element
+                i = np.delete(i, int(L/2.)) + 0.5
+
+            norm = L
+
+        elif rt == 'BP':
+            # N is even, L is odd
+            b0 = np.ones(L)
+            b0[1::2] = 0
+            b0[::4] = -1 # h[n] = {1; 0; -1; 0; 1; ... }
+
+            L = L + 1
+            i = np.arange(L) # create N + 2 zeros around the unit circle, ...
+            # ... remove first and middle element and rotate by L / 4
+            i = np.delete(i, [0, L // 2]) + L / 4
+
+            norm = np.sum(abs(b0))
+
+        elif rt == 'BS':
+            # N is even, L is odd
+            b0 = np.ones(L)
+            b0[1::2] = 0
+
+            L = L + 1
+            i = np.arange(L) # create N + 2 zeros around the unit circle and ...
+            i = np.delete(i, [0, L // 2]) # ... remove first and middle element
+
+            norm = np.sum(b0)
+
+        if self.delays > 1000:
+            if not fil_order_warning(self.delays*self.stages, "Moving Average"):
+                return -1
+
+
+        z0 = np.exp(-2j*np.pi*i/L)
+        # calculate filter for multiple cascaded stages
+        for i in range(self.stages):
+            b = np.convolve(b0, b)
+        z = np.repeat(z0, self.stages)
+
+        # normalize filter to |H_max| = 1 if checked:
+        if self.normalize:
+            b = b / (norm ** self.stages)
+            k = 1./norm ** self.stages
+        p = np.zeros(len(z))
+
+        # store in class attributes for the _save method
+        self.zpk = [z,p,k]
+        self.b = b
+        self._save(fil_dict)
+
+
+    def LPman(self, fil_dict):
+        self._get_params(fil_dict)
+        return self.calc_ma(fil_dict, rt = 'LP')
+
+    def LPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        self.delays = int(np.ceil(1 / (self.A_SB **(1/self.stages) *
+                                                     np.sin(self.F_SB * np.pi))))
+        return self.calc_ma(fil_dict, rt = 'LP')
+
+    def HPman(self, fil_dict):
+        self._get_params(fil_dict)
+        return self.calc_ma(fil_dict, rt = 'HP')
+
+    def HPmin(self, fil_dict):
+        self._get_params(fil_dict)
+        self.delays = int(np.ceil(1 / (self.A_SB **(1/self.stages) *
+                                              np.sin((0.5 - self.F_SB) * np.pi))))
+        return self.calc_ma(fil_dict, rt = 'HP')
+
+    def BSman(self, fil_dict):
+        self._get_params(fil_dict)
+        self.delays = ceil_odd(self.delays)  # enforce odd order
+        return self.calc_ma(fil_dict, rt = 'BS')
+
+    def BPman(self, fil_dict):
+        self._get_params(fil_dict)
+        self.delays = ceil_odd(self.delays)  # enforce odd order
+        return self.calc_ma(fil_dict, rt = 'BP')
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
+    filt = MACore()
+    filt.LPman(fb.fil[0])  # design a low-pass with parameters from global dict
+    print(fb.fil[0]['zpk']) # return results in default format
@@ -32,8 +32,7 @@ API version info:
 from __future__ import print_function, division, unicode_literals
 import scipy.signal as sig
 from scipy.signal import ellipord
-from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit
-from pyfda.pyfda_qt_lib import qfilter_warning
+from pyfda.pyfda_lib import fil_save, SOS_AVAIL, lin2unit, fil_order_warning
 
 from .common import Common
 
@@ -153,7 +152,7 @@ critical passband frequency :math:`F_C` from pass and stop band specifications.
         design.
         """
         if self.N > 25:
-            return qfilter_warning(None, self.N, "Elliptic")
+            return fil_order_warning(self.N, "Elliptic")
         else:
             return True
 
@@ -26,11 +26,14 @@ API version info:
          first element controls whether the widget is visible and / or enabled.
          This dict is now called self.rt_dict. When present, the dict self.rt_dict_add
          is read and merged with the first one.
+    2.1: numerical design has been moved to the Qt-free class
+         `core.firwin.FirwinCore`, this class only adds the UI. Window and
+         algorithm are always stored in the filter dict.
 """
 from __future__ import print_function, division, unicode_literals
 
 from ..compat import (Qt, QWidget, QLabel, QLineEdit, pyqtSignal, QComboBox,
-                      QVBoxLayout, QGridLayout)
+                      QCheckBox, QVBoxLayout, QGridLayout)
 
 import numpy as np
 import scipy.signal as sig
@@ -38,9 +41,8 @@ from importlib import import_module
 import inspect
 
 import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
-from pyfda.pyfda_lib import fil_save, remezord, round_odd, safe_eval
-from pyfda.pyfda_qt_lib import qfilter_warning
-from .common import Common
+from pyfda.pyfda_lib import safe_eval
+from .core.firwin import FirwinCore
 
 
 # TODO: Hilbert, differentiator, multiband are missing
@@ -49,64 +51,24 @@ from .common import Common
 # TODO: Improve calculation of F_C and F_C2 using the weights
 # TODO: Automatic setting of density factor for remez calculation? 
 #       Automatic switching to Kaiser / Hermann?
-# TODO: Parameters for windows are not stored in fil_dict?
 
-__version__ = "2.0"
+__version__ = "2.1"
 
 filter_classes = {'Firwin':'Windowed FIR'}
 
-class Firwin(QWidget):
+class Firwin(FirwinCore, QWidget):
+    """
+    Widget for the windowed FIR filter design, the design routines are inherited
+    from `FirwinCore`.
+    """
 
-    FRMT = 'ba' # output format(s) of filter design routines 'zpk' / 'ba' / 'sos'
-                # currently, only 'ba' is supported for firwin routines
-    
     sigFiltChanged = pyqtSignal()
 
     def __init__(self):
         QWidget.__init__(self)
-
-        self.ft = 'FIR'
-                           
-        c = Common()
-        self.rt_dict = c.rt_base_iir
-        
-        self.rt_dict_add = {
-            'COM':{'min':{'msg':('a',
-                                  r"<br /><b>Note:</b> This is only a rough approximation!")},
-                   'man':{'msg':('a',
-                                 r"Enter desired filter order <b><i>N</i></b> and " 
-                                  "<b>-6 dB</b> pass band corner "
-                                  "frequency(ies) <b><i>F<sub>C</sub></i></b> .")},                                  
-                                  },
-            'LP': {'man':{}, 'min':{}},
-            'HP': {'man':{'msg':('a', r"<br /><b>Note:</b> Order needs to be odd!")},
-                   'min':{}},
-            'BS': {'man':{'msg':('a', r"<br /><b>Note:</b> Order needs to be odd!")},
-                   'min':{}},
-            'BP': {'man':{}, 'min':{}},
-            }
-            
-        
-        self.info = """**Windowed FIR filters**
-        
-        are designed by truncating the
-        infinite impulse response of an ideal filter with a window function.
-        The kind of used window has strong influence on ripple etc. of the
-        resulting filter.
-        
-        **Design routines:**
-
-        ``scipy.signal.firwin()``
-
-        """
+        FirwinCore.__init__(self)
         #self.info_doc = [] is set in self._update_UI()
-        
-        #------------------- end of static info for filter tree ---------------
 
-        self.wdg = True  # has additional dynamic widget 'wdg_fil'
-        
-        self.hdl = ('df') # filter topologies
-        
         #----------------------------------------------------------------------        
     def construct_UI(self):
         """
@@ -159,6 +121,12 @@ class Firwin(QWidget):
         self.led_firwin_2.setVisible(False)
         self.lbl_firwin_2.setVisible(False)
 
+        self.chk_firwin_verify = QCheckBox("Verify N", self)
+        self.chk_firwin_verify.setObjectName('wdg_chk_firwin_verify')
+        self.chk_firwin_verify.setToolTip("<span>Minimum order: Design filters with lengths "
+                "around the estimated order, check them against the specs and "
+                "select the shortest compliant one.</span>")
+
         self.layGWin = QGridLayout()
         self.layGWin.setObjectName('wdg_layGWin')
         self.layGWin.addWidget(self.cmb_firwin_win,0,0,1,2)
@@ -167,6 +135,7 @@ class Firwin(QWidget):
         self.layGWin.addWidget(self.led_firwin_1,1,1)
         self.layGWin.addWidget(self.lbl_firwin_2,1,2)
         self.layGWin.addWidget(self.led_firwin_2,1,3)
+        self.layGWin.addWidget(self.chk_firwin_verify,2,0,1,2)
         self.layGWin.setContentsMargins(0,0,0,0)
         # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
         self.wdg_fil = QWidget(self)
@@ -180,9 +149,10 @@ class Firwin(QWidget):
         self.led_firwin_1.editingFinished.connect(self._update_UI)
         self.led_firwin_2.editingFinished.connect(self._update_UI)
         self.cmb_firwin_alg.activated.connect(self._update_UI)
+        self.chk_firwin_verify.clicked.connect(self._update_UI)
         #----------------------------------------------------------------------
 
-        self._load_dict() # get initial / last setting from dictionary
+        self.load_dict() # get initial / last setting from dictionary
         self._update_UI()
 
 
@@ -193,6 +163,7 @@ class Firwin(QWidget):
         """
         self.fir_window_name = str(self.cmb_firwin_win.currentText()).lower()
         self.alg = str(self.cmb_firwin_alg.currentText())
+        self.verify_N = self.chk_firwin_verify.isChecked()
 
         mod_ = import_module('scipy.signal')
 #        mod = __import__('scipy.signal') # works, but not with the next line
@@ -235,6 +206,7 @@ class Firwin(QWidget):
         else:
             self.firWindow = self.fir_window_name
 
+        self._store_entries()
         self.sigFiltChanged.emit() # -> select_filter -> filter_specs
             
     def destruct_UI(self):
@@ -245,13 +217,15 @@ class Firwin(QWidget):
         self.led_firwin_1.editingFinished.disconnect()
         self.led_firwin_2.editingFinished.disconnect()
         self.cmb_firwin_alg.activated.disconnect()
+        self.chk_firwin_verify.clicked.disconnect()
 
 
-    def _load_dict(self):
+    def load_dict(self):
         """
         Reload window selection and parameters from filter dictionary
         and set UI elements accordingly. load_dict() is called upon 
-        initialization and when the filter is loaded from disk.
+        initialization, after a filter design and when the filter is loaded
+        from disk.
         """
         win_idx = 0
         alg_idx = 0
@@ -278,6 +252,7 @@ class Firwin(QWidget):
                                 Qt.MatchFixedString)
                 if alg_idx == -1: # Key does not exist, use first entry instead
                     alg_idx = 0
+            self.chk_firwin_verify.setChecked(wdg_fil_par.get('verify_N', False))
         
         self.cmb_firwin_win.setCurrentIndex(win_idx) # set index for window and
         self.cmb_firwin_alg.setCurrentIndex(alg_idx) # and algorithm cmbBox
@@ -291,160 +266,9 @@ class Firwin(QWidget):
             fb.fil[0].update({'wdg_fil':{}})
         fb.fil[0]['wdg_fil'].update({'firwin':
                                         {'win':self.firWindow,
-                                         'alg':self.alg}
+                                         'alg':self.alg,
+                                         'verify_N':self.verify_N}
                                  })
-            
-
-    def _get_params(self, fil_dict):
-        """
-        Translate parameters from the passed dictionary to instance
-        parameters, scaling / transforming them if needed.
-        """
-        self.N     = fil_dict['N']
-        self.F_PB  = fil_dict['F_PB']
-        self.F_SB  = fil_dict['F_SB']
-        self.F_PB2 = fil_dict['F_PB2']
-        self.F_SB2 = fil_dict['F_SB2']
-        self.F_C   = fil_dict['F_C']
-        self.F_C2  = fil_dict['F_C2']
-        
-        # firwin amplitude specs are linear (not in dBs)
-        self.A_PB  = fil_dict['A_PB']
-        self.A_PB2 = fil_dict['A_PB2']
-        self.A_SB  = fil_dict['A_SB']
-        self.A_SB2 = fil_dict['A_SB2']
-
-#        self.alg = 'ichige' # algorithm for determining the minimum order
-#        self.alg = self.cmb_firwin_alg.currentText()
-
-    def _test_N(self):
-        """
-        Warn the user if the calculated order is too high for a reasonable filter
-        design.
-        """
-        if self.N > 1000:
-            return qfilter_warning(self, self.N, "FirWin")
-        else:
-            return True
-
-
-    def _save(self, fil_dict, arg):
-        """
-        Convert between poles / zeros / gain, filter coefficients (polynomes)
-        and second-order sections and store all available formats in the passed
-        dictionary 'fil_dict'.
-        """
-        fil_save(fil_dict, arg, self.FRMT, __name__)
-
-        try: # has the order been calculated by a "min" filter design?
-            fil_dict['N'] = self.N # yes, update filterbroker
-        except AttributeError:
-            pass
-#        self._store_entries()
-        
-        
-    def _firwin_ord(self, F, W, A, alg):
-        #http://www.mikroe.com/chapters/view/72/chapter-2-fir-filters/
-        delta_f = abs(F[1] - F[0])
-        delta_A = np.sqrt(A[0] * A[1])
-        if self.fir_window_name == 'kaiser':
-            N, beta = sig.kaiserord(fb.fil[0]['A_SB'], delta_f)
-            self.led_firwin_1.setText(str(beta))
-            fb.fil[0]['wdg_fil'][1] = beta
-            self.firWindow[1] = beta
-            self._load_dict()
-            return N
-        
-        if self.firWindow == 'hann':
-            gamma = 3.11
-            sidelobe = 44
-        elif self.firWindow == 'hamming':
-            gamma = 3.32
-            sidelobe = 53
-        elif self.firWindow == 'blackman':
-            gamma = 5.56
-            sidelobe = 75
-        else:
-            gamma = 1
-        N = remezord(F, W, A, Hz = 1, alg = alg)[0]
-        return N
-
-    def LPmin(self, fil_dict):
-        self._get_params(fil_dict)
-        self.N = self._firwin_ord([self.F_PB, self.F_SB], [1, 0],
-                                 [self.A_PB, self.A_SB], alg = self.alg)
-        if not self._test_N():
-            return -1
-        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
-        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'], 
-                                       window = self.firWindow, nyq = 0.5))
-
-    def LPman(self, fil_dict):
-        self._get_params(fil_dict)
-        if not self._test_N():
-            return -1
-        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'],
-                                       window = self.firWindow, nyq = 0.5))
-
-    def HPmin(self, fil_dict):
-        self._get_params(fil_dict)
-        N = self._firwin_ord([self.F_SB, self.F_PB], [0, 1],
-                            [self.A_SB, self.A_PB], alg = self.alg)
-        self.N = round_odd(N)  # enforce odd order
-        if not self._test_N():
-            return -1
-        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
-        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'], 
-                    window = self.firWindow, pass_zero=False, nyq = 0.5))
-
-    def HPman(self, fil_dict):
-        self._get_params(fil_dict)
-        self.N = round_odd(self.N)  # enforce odd order
-        if not self._test_N():
-            return -1
-        self._save(fil_dict, sig.firwin(self.N, fil_dict['F_C'], 
-            window = self.firWindow, pass_zero=False, nyq = 0.5))
-
-
-    # For BP and BS, F_PB and F_SB have two elements each
-    def BPmin(self, fil_dict):
-        self._get_params(fil_dict)
-        self.N = remezord([self.F_SB, self.F_PB, self.F_PB2, self.F_SB2], [0, 1, 0],
-            [self.A_SB, self.A_PB, self.A_SB2], Hz = 1, alg = self.alg)[0]
-        if not self._test_N():
-            return -1
-        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
-        fil_dict['F_C2'] = (self.F_SB2 + self.F_PB2)/2 # use average of calculated F_PB and F_SB
-        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
-                            window = self.firWindow, pass_zero=False, nyq = 0.5))
-
-    def BPman(self, fil_dict):
-        self._get_params(fil_dict)
-        if not self._test_N():
-            return -1
-        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
-                            window = self.firWindow, pass_zero=False, nyq = 0.5))
-
-    def BSmin(self, fil_dict):
-        self._get_params(fil_dict)
-        N = remezord([self.F_PB, self.F_SB, self.F_SB2, self.F_PB2], [1, 0, 1],
-            [self.A_PB, self.A_SB, self.A_PB2], Hz = 1, alg = self.alg)[0]
-        self.N = round_odd(N)  # enforce odd order
-        if not self._test_N():
-            return -1
-        fil_dict['F_C'] = (self.F_SB + self.F_PB)/2 # use average of calculated F_PB and F_SB
-        fil_dict['F_C2'] = (self.F_SB2 + self.F_PB2)/2 # use average of calculated F_PB and F_SB
-        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
-                            window = self.firWindow, pass_zero=True, nyq = 0.5))
-
-    def BSman(self, fil_dict):
-        self._get_params(fil_dict)
-        self.N = round_odd(self.N)  # enforce odd order
-        if not self._test_N():
-            return -1
-        self._save(fil_dict, sig.firwin(self.N, [fil_dict['F_C'], fil_dict['F_C2']],
-                            window = self.firWindow, pass_zero=True, nyq = 0.5))
-
 
 #------------------------------------------------------------------------------
 
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Filter dictionary with lazily calculated filter representations.
+
+A filter design routine produces the filter in one format ('ba', 'zpk' or
+'sos'), the other formats are only calculated from it when they are accessed
+for the first time. Especially finding the zeros of long FIR filters
+(`np.roots()`) is expensive and often not needed at all.
+"""
+from __future__ import division, unicode_literals, print_function, absolute_import
+
+import logging
+logger = logging.getLogger(__name__)
+
+FORMATS = ('ba', 'zpk', 'sos') # filter representations that can be converted
+
+class _Lazy(object):
+    """
+    Placeholder for a filter representation that hasn't been calculated yet,
+    a singleton that survives pickling.
+    """
+    def __repr__(self):
+        return 'LAZY'
+
+    def __reduce__(self):
+        return 'LAZY'
+
+LAZY = _Lazy()
+
+#------------------------------------------------------------------------------
+class FilterDesign(dict):
+    """
+    Dictionary for a filter design and its specifications that behaves like
+    `defaultdict(lambda: default)`. The representations 'ba', 'zpk' and 'sos'
+    that have not been produced by the design routine are stored as `LAZY`
+    placeholders by `set_lazy()` and are calculated and memoized when they are
+    accessed for the first time by `fil[key]`, `get()`, iterating over items
+    or converting to a dict. Hence, the keys and the values of the dictionary
+    look the same as for a completely converted filter, e.g. for widgets or
+    when saving the filter.
+
+    The lazy representations are calculated for the filter type 'ft' of the
+    design, changing 'ft' afterwards (e.g. by the filter type selector)
+    doesn't affect them. Assigning one of the representations produced by the
+    design directly marks the ones derived from it as not calculated again;
+    the keys 'creator' and 'timestamp' are only set by `pyfda_lib.fil_save()`.
+
+    Parameters
+    ----------
+    default : object
+        value returned (and stored) for missing keys
+    """
+    def __init__(self, default=None, *args, **kwargs):
+        super(FilterDesign, self).__init__(*args, **kwargs)
+        self.default = default
+        self.format_in = None # format the lazy representations are derived from
+        self.ft_in = None # filter type of the design the conversion is based on
+        self._rpk = None # memoized residues / poles / direct terms
+
+    def __missing__(self, key):
+        self[key] = self.default
+        return self.default
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is LAZY:
+            value = self._convert(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in FORMATS:
+            self._rpk = None
+            if self.format_in is not None and key in self.format_in:
+                # the derived representations are invalidated together
+                dict.__setitem__(self, key, value)
+                self.set_lazy(self.format_in)
+                return
+        dict.__setitem__(self, key, value)
+
+    def __iter__(self):
+        # overriding __iter__ makes dict(), update() and ** use __getitem__()
+        return iter(list(dict.keys(self)))
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, dict.__repr__(self))
+
+    def __reduce__(self):
+        # pickle without calculating the lazy representations
+        return (type(self), (self.default,), self.__dict__, None,
+                iter(dict.items(self)))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            dict.pop(self, key)
+            return value
+        return dict.pop(self, key, *args)
+
+    def copy(self):
+        """ Return a shallow copy, the lazy representations are not calculated """
+        fil = type(self)(self.default)
+        fil.update(self)
+        return fil
+
+    def update(self, *args, **kwargs):
+        """
+        Update the dictionary like `dict.update()`. When another `FilterDesign`
+        is passed, the state of its lazy representations is copied as well.
+        """
+        if len(args) == 1 and isinstance(args[0], FilterDesign)\
+                and args[0].format_in is not None:
+            # all representations are replaced, calculated or lazy ones
+            dict.update(self, dict.items(args[0]))
+            self.format_in = args[0].format_in
+            self.ft_in = args[0].ft_in
+            self._rpk = None
+            args = ()
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
+
+    def clear(self):
+        dict.clear(self)
+        self.format_in = self.ft_in = None
+        self._rpk = None
+
+    #--------------------------------------------------------------------------
+    def set_lazy(self, format_in):
+        """
+        Mark all filter representations except `format_in` (string or set of
+        strings, generated by the design routine) as not calculated yet. The
+        filter type 'ft' is recorded for calculating them.
+        """
+        self.format_in = format_in
+        self.ft_in = self.get('ft')
+        self._rpk = None
+        for fmt in FORMATS:
+            if fmt not in format_in:
+                dict.__setitem__(self, fmt, LAZY)
+
+    def new_design(self):
+        """
+        Remove the representations that haven't been calculated from the
+        previous design, called before a new design is stored.
+        """
+        for fmt in FORMATS:
+            if self.is_lazy(fmt):
+                dict.__delitem__(self, fmt)
+        self.format_in = self.ft_in = None
+        self._rpk = None
+
+    def is_lazy(self, key):
+        """ Return True when the representation `key` hasn't been calculated yet """
+        return dict.get(self, key, None) is LAZY
+
+    def materialize(self):
+        """ Calculate all representations that haven't been calculated yet """
+        for fmt in FORMATS:
+            if self.is_lazy(fmt):
+                self._convert(fmt)
+
+    def _convert(self, fmt):
+        from pyfda.pyfda_lib import convert_format
+        logger.debug("Converting filter from '%s' to '%s'", self.format_in, fmt)
+        value = convert_format(self, self.format_in, fmt, self.ft_in)
+        dict.__setitem__(self, fmt, value)
+        return value
+
+    #--------------------------------------------------------------------------
+    @property
+    def ba(self):
+        """ numerator and denominator coefficients [b, a] """
+        return self['ba']
+
+    @property
+    def zpk(self):
+        """ zeros, poles and gain [z, p, k] """
+        return self['zpk']
+
+    @property
+    def sos(self):
+        """ second-order sections (an empty list for FIR filters) """
+        return self['sos']
+
+    @property
+    def rpk(self):
+        """
+        Residues, poles and direct terms [r, p, k] of the partial fraction
+        expansion: Zero-phase designs store theirs under the key 'rpk' (its
+        presence marks the filter as non-causal), for all other filters it is
+        calculated from 'ba' on first access with `scipy.signal.residuez()`.
+        """
+        if 'rpk' in self:
+            return self['rpk']
+        if self._rpk is None:
+            import scipy.signal as sig
+            self._rpk = list(sig.residuez(self['ba'][0], self['ba'][1]))
+        return self._rpk
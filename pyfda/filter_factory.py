@@ -15,14 +15,119 @@ which have a global scope like class variables.
 from __future__ import division, unicode_literals, print_function, absolute_import
 import importlib
 import logging
+import pickle
+import time
 import six
+import numpy as np
+from .compat import QObject
 from . import filterbroker as fb
+from .pyfda_rc import params
 
 logger = logging.getLogger(__name__)
 
 # Instance of current filter design class (e.g. "cheby1")
 fil_inst = None
 
+# Design methods are run in a separate worker process. Processes are started
+# with "spawn" (instead of "fork") to avoid copying the state of the Qt
+# application. This requires Python >= 3.4, otherwise designs are run in the
+# main process.
+try:
+    import multiprocessing
+    MP_CTX = multiprocessing.get_context('spawn')
+except (ImportError, AttributeError, ValueError):
+    MP_CTX = None
+
+# Keys of the filter dict with the results of a design in the worker process,
+# only these are copied back as the specs may have been edited in the meantime
+DESIGN_KEYS = ('ba', 'zpk', 'sos', 'rpk', 'baA', 'zpkA', 'wdg_fil', 'creator',
+               'timestamp')
+# Specs that are modified by some design routines (e.g. the order calculated by
+# minimum order designs), they are only copied back when the design changed them
+DESIGN_SPECS = ('N', 'ft', 'F_C', 'F_C2', 'F_PB', 'F_PB2', 'W_PB', 'W_PB2',
+                'W_SB', 'W_SB2', 'A_PB2', 'A_SB2')
+# Keys selecting the design method, the result is discarded when they change
+# while the design is running
+DESIGN_SELECTION = ('fc', 'rt', 'fo')
+
+#------------------------------------------------------------------------------
+def _changed(old, new):
+    """ Return True when the values `old` and `new` of a spec differ """
+    try:
+        return not np.array_equal(old, new)
+    except Exception:
+        return True
+
+def _design_results(fil_dict_w, fil_dict_s):
+    """
+    Return a copy of the filter dict `fil_dict_w` returned by the worker process
+    that only contains the results of the design, i.e. `DESIGN_KEYS` and the
+    `DESIGN_SPECS` that differ from the filter dict `fil_dict_s` passed to the
+    worker. Lazy representations are not calculated.
+    """
+    results = fil_dict_w.copy()
+    for k in list(dict.keys(results)):
+        if k in DESIGN_KEYS or (k in DESIGN_SPECS and
+                (k not in fil_dict_s or _changed(fil_dict_s[k], dict.__getitem__(results, k)))):
+            continue
+        dict.__delitem__(results, k)
+    return results
+
+#------------------------------------------------------------------------------
+def _headless_class(inst):
+    """
+    Return the class of the filter design instance `inst` that can be
+    instantiated without Qt. Widgets need to be derived from a Qt-free design
+    class (e.g. `EquirippleCore`), otherwise None is returned.
+    """
+    for cls in type(inst).__mro__:
+        if cls is object:
+            break
+        if not issubclass(cls, QObject):
+            return cls
+    return None
+
+def _picklable_state(inst):
+    """
+    Return a dict with all attributes of the filter design instance `inst`
+    that can be passed to / from the worker process.
+    """
+    state = {}
+    for k, v in inst.__dict__.items():
+        try:
+            pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        state[k] = v
+    return state
+
+def _design_worker(conn):
+    """
+    Main loop of the design worker process: Receive design jobs
+    `(module, class, method, fil_dict, state)` via the pipe `conn`, run them and
+    send back `('ok', err_code, fil_dict, state)` or `('exc', err_string, None, None)`.
+    The loop is left when `None` is received or the pipe is closed.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        mod, fc, method, fil_dict, state = job
+        try:
+            inst = getattr(importlib.import_module(mod), fc)()
+            inst.__dict__.update(state)
+            # use the filter dict of the worker process as some design methods
+            # access fb.fil[0] directly
+            fb.fil[0].clear()
+            fb.fil[0].update(fil_dict)
+            err_code = getattr(inst, method)(fb.fil[0])
+            conn.send(('ok', err_code, fb.fil[0].copy(), _picklable_state(inst)))
+        except Exception as e:
+            conn.send(('exc', str(e), None, None))
+
 #------------------------------------------------------------------------------
 class FilterFactory(object):
     """
@@ -34,6 +139,13 @@ class FilterFactory(object):
         # return error codes for class instantiation and method 
         self.err_code = 0
 
+        # worker process for filter designs and connection to it
+        self._proc = None
+        self._conn = None
+        # currently running design job: (method, fil_dict, specs passed to the
+        # worker, filter design instance, start time)
+        self._job = None
+
 
     def create_fil_inst(self, fc, mod = None):
         # TODO: need to pass both module and class name for more flexibility
@@ -176,6 +288,9 @@ class FilterFactory(object):
 
              :19: filter design error containing "failure to converge"
 
+             :20: filter design has been aborted after timeout (only in
+                  `poll_fil_method()`)
+
              :99: unknown error
 
         Example
@@ -187,9 +302,29 @@ class FilterFactory(object):
         then performs the actual filter design by calling the method 'LPmin',
         passing the global filter dictionary fil[0] as the parameter.
         """                
+        err_string = self._check_fil_method(method, fc)
+
+        if not err_string: # everything ok so far, try calling method with the filter dict as argument
+              # err_code = -1 means "operation cancelled"
+            try:
+                #------------------------------------------------------------------
+                self.err_code = getattr(fil_inst, method)(fil_dict)
+                #------------------------------------------------------------------
+            except Exception as e:
+                err_string = self._design_error(method, e)
+
+        return self._log_err_code(err_string)
+
+#------------------------------------------------------------------------------
+    def _check_fil_method(self, method, fc):
+        """
+        (Re-)create the filter design instance when `fc` is given and check
+        whether `method` can be called, setting `self.err_code`. Return an
+        error string (empty when everything is ok).
+        """
+        err_string = ""
         if self.err_code >= 16 or self.err_code < 0:
             self.err_code = 0 #  # clear previous method call error
-            err_string = ""
 
         if fc: # filter design class was part of the argument, (re-)create class instance
             self.err_code = self.create_fil_inst(fc)
@@ -207,27 +342,30 @@ class FilterFactory(object):
         elif not hasattr(fil_inst, method):
             err_string = "Method '{0}' doesn't exist in class '{1}'.".format(method, fil_inst)
             self.err_code = 17
- 
-        else: # everything ok so far, try calling method with the filter dict as argument
-              # err_code = -1 means "operation cancelled"
-            try:
-                #------------------------------------------------------------------
-                self.err_code = getattr(fil_inst, method)(fil_dict)
-                #------------------------------------------------------------------
-            except Exception as e:
-                err_string = "Method '{0}' of class '{1}':\n{2}"\
-                                    .format(method, type(fil_inst).__name__, e)
-                if e:
-                    err_string += "\n" # add line break to error message
-                if "order n is too high" in str(e).lower():
-                    self.err_code = 18
-                    err_string += "Try relaxing the specifications."
-                elif "failure to converge" in str(e).lower():
-                    self.err_code = 19
-                    err_string += "Try relaxing the specifications."
-                else: 
-                    self.err_code = 99
 
+        return err_string
+
+    def _design_error(self, method, e):
+        """
+        Set `self.err_code` according to the exception (or error message) `e`
+        raised by the design method and return an error string.
+        """
+        err_string = "Method '{0}' of class '{1}':\n{2}"\
+                            .format(method, type(fil_inst).__name__, e)
+        if e:
+            err_string += "\n" # add line break to error message
+        if "order n is too high" in str(e).lower():
+            self.err_code = 18
+            err_string += "Try relaxing the specifications."
+        elif "failure to converge" in str(e).lower():
+            self.err_code = 19
+            err_string += "Try relaxing the specifications."
+        else: 
+            self.err_code = 99
+        return err_string
+
+    def _log_err_code(self, err_string):
+        """ Log errors and return the final error code """
         if self.err_code is None:
             self.err_code = 0
         elif self.err_code > 0:
@@ -235,6 +373,149 @@ class FilterFactory(object):
 
         return self.err_code
 
+#------------------------------------------------------------------------------
+    def start_fil_method(self, method, fil_dict, fc = None):
+        """
+        Start the filter design like `call_fil_method()`, but run the design
+        method in a worker process so that the GUI stays responsive. Filter
+        design widgets are designed in the worker with their Qt-free base class
+        (e.g. `EquirippleCore`), widgets without one are designed in the current
+        process.
+
+        Parameters are the same as for `call_fil_method()`.
+
+        Returns
+        -------
+
+        err_code : integer or None
+            None when the design has been started in the worker process, poll
+            the result with `poll_fil_method()`. Otherwise, the design has been
+            finished (or could not be started) and the error code is returned
+            as described in `call_fil_method()`.
+        """
+        if self.busy():
+            logger.warning("A filter design is still running, cancel it first.")
+            return 99
+
+        err_string = self._check_fil_method(method, fc)
+        if err_string:
+            return self._log_err_code(err_string)
+
+        cls = _headless_class(fil_inst)
+        if MP_CTX is None or cls is None:
+            return self.call_fil_method(method, fil_dict)
+
+        fil_dict_s = fil_dict.copy() # specs as passed to the worker
+        try:
+            self.start_worker()
+            self._conn.send((cls.__module__, cls.__name__,
+                             method, fil_dict_s, _picklable_state(fil_inst)))
+        except Exception as e:
+            logger.warning("Couldn't start design in worker process, designing locally:\n{0}"\
+                           .format(e))
+            self.stop_worker()
+            return self.call_fil_method(method, fil_dict)
+
+        self._job = (method, fil_dict, fil_dict_s, fil_inst, time.time())
+        return None
+
+    def poll_fil_method(self):
+        """
+        Check whether the design started by `start_fil_method()` has finished.
+        The results are written to the filter dict passed to `start_fil_method()`
+        only when they have arrived, specs that have been edited in the meantime
+        are kept. A design that takes longer than `params['design_timeout']`
+        seconds is aborted. When the filter design instance or the design method
+        (filter class, response type or filter order mode) has been changed
+        while the design was running, it is cancelled.
+
+        Returns
+        -------
+
+        err_code : integer or None
+            None while the design is still running, afterwards the error code
+            as described in `call_fil_method()`.
+        """
+        if not self._job:
+            return self.err_code
+        method, fil_dict, fil_dict_s, inst, t_start = self._job
+        err_string = ""
+
+        if inst is not fil_inst or any(_changed(fil_dict_s.get(k), fil_dict.get(k))
+                                       for k in DESIGN_SELECTION):
+            logger.info("Filter selection has changed, discarding design.")
+            return self.cancel_fil_method()
+
+        if self._conn.poll():
+            self._job = None
+            try:
+                status, result, fil_dict_w, state = self._conn.recv()
+            except (EOFError, OSError) as e:
+                status, result = 'exc', e
+            if status == 'ok':
+                fil_dict.update(_design_results(fil_dict_w, fil_dict_s))
+                inst.__dict__.update(state)
+                self.err_code = result
+            else:
+                err_string = self._design_error(method, result)
+
+        elif not self._proc.is_alive():
+            self._job = None
+            self.stop_worker()
+            self.err_code = 99
+            err_string = "Worker process for filter design terminated unexpectedly."
+
+        elif time.time() - t_start > params['design_timeout']:
+            self._job = None
+            self.stop_worker()
+            self.err_code = 20
+            err_string = "Method '{0}' of class '{1}' has been aborted after {2} s.\n"\
+                         "Try relaxing the specifications or increase the timeout."\
+                         .format(method, type(fil_inst).__name__, params['design_timeout'])
+        else:
+            return None # still busy
+
+        return self._log_err_code(err_string)
+
+    def cancel_fil_method(self):
+        """
+        Cancel a running design by killing the worker process, the filter dict
+        remains unchanged. Returns the error code -1 (design cancelled).
+        """
+        if self._job:
+            self._job = None
+            self.stop_worker()
+            logger.info("Filter design cancelled.")
+        self.err_code = -1
+        return self.err_code
+
+    def busy(self):
+        """ Return True while a design is running in the worker process """
+        return self._job is not None
+
+    def start_worker(self):
+        """
+        Start the worker process for filter designs if it isn't running yet.
+        This can be called in advance to hide the startup time of the process.
+        """
+        if MP_CTX is None or (self._proc is not None and self._proc.is_alive()):
+            return
+        self._conn, child_conn = MP_CTX.Pipe()
+        self._proc = MP_CTX.Process(target=_design_worker, args=(child_conn,),
+                                    name="pyfda_design_worker")
+        self._proc.daemon = True # terminate worker together with pyfda
+        self._proc.start()
+        child_conn.close()
+
+    def stop_worker(self):
+        """ Terminate the worker process """
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.join(1)
+        if self._conn is not None:
+            self._conn.close()
+        self._proc = self._conn = None
+
 #------------------------------------------------------------------------------
 fil_factory = FilterFactory()       
 # This *class instance* of FilterFactory can be accessed in other modules using
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Parameter sweeps for exploring trade-offs between filter order, band edges,
+ripple and weights.
+
+One or two spec keys of a filter dict (e.g. 'N', 'F_SB', 'A_SB', 'W_PB') are
+varied over a grid, the filter is designed for each point of the grid with
+`FilterFactory.call_fil_method()` and the achieved performance is measured.
+Designs are run in a pool of worker processes, the results are collected in
+an array-backed `SweepResult`.
+
+Example
+-------
+
+    >>> sw = ParameterSweep(fb.fil[0], 'LPman', [('N', range(4, 12)),
+    ...                      ('F_SB', np.linspace(0.15, 0.25, 11))])
+    >>> res = sw.run()
+    >>> res['A_SB'] # stopband attenuation in dB, shape (8, 11)
+"""
+from __future__ import division, unicode_literals, print_function, absolute_import
+
+import time
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+import pyfda.filterbroker as fb
+import pyfda.filter_factory as ff
+from pyfda.pyfda_lib import calc_Hcomplex, grpdelay, fil_sos, spec_bands
+
+SWEEP_N_FFT = 2048 # number of frequency points for measuring a design
+
+#------------------------------------------------------------------------------
+class SweepResult(object):
+    """
+    Results of a parameter sweep over the grid of one or two spec keys, stored
+    in a numpy structured array `data` with the shape of the grid and the
+    fields
+
+    - 'N_design'   : filter order of the design (differs from the swept or
+                     specified order 'N' for minimum order designs)
+    - 'A_SB'       : minimum stopband attenuation in dB (relative to the
+                     maximum passband gain)
+    - 'A_PB'       : passband ripple (peak-to-peak) in dB
+    - 'tau_spread' : peak-to-peak variation of the group delay in the
+                     passband in samples
+    - 'err'        : error code of the design method (see
+                     `FilterFactory.call_fil_method()`), metrics of failed
+                     designs are nan
+
+    Parameters
+    ----------
+    keys : list of str
+        swept spec keys
+    grids : list of array_like
+        values of the swept keys
+    """
+    METRICS = ('N_design', 'A_SB', 'A_PB', 'tau_spread')
+
+    def __init__(self, keys, grids):
+        self.keys = list(keys)
+        self.grids = [np.asarray(g, dtype=float) for g in grids]
+        shape = tuple(len(g) for g in self.grids)
+        self.data = np.zeros(shape, dtype=[(m, float) for m in self.METRICS]
+                             + [('err', int)])
+        for m in self.METRICS:
+            self.data[m] = np.nan
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __getitem__(self, field):
+        return self.data[field]
+
+    def table(self):
+        """
+        Return the results as a 2D array with one row per grid point and the
+        columns listed in `columns()` (swept keys, metrics and error code).
+        """
+        mesh = np.meshgrid(*self.grids, indexing='ij')
+        cols = [m.ravel() for m in mesh] + [self.data[f].ravel().astype(float)
+                                            for f in self.data.dtype.names]
+        return np.column_stack(cols)
+
+    def columns(self):
+        """ Return the column names of `table()` """
+        return self.keys + list(self.data.dtype.names)
+
+#------------------------------------------------------------------------------
+def _bands(fil_dict):
+    """
+    Return lists of passbands and stopbands [(F_start, F_stop), ...] of the
+    response type of `fil_dict`, normalized to f_S
+    """
+    bands = spec_bands(fil_dict)
+    return ([(F0, F1) for F0, F1, gain, _ in bands if gain == 1],
+            [(F0, F1) for F0, F1, gain, _ in bands if gain == 0])
+
+def _in_bands(F, bands):
+    """ Return a boolean mask for the frequencies `F` within `bands` """
+    mask = np.zeros(len(F), dtype=bool)
+    for F_start, F_stop in bands:
+        mask |= (F >= F_start) & (F <= F_stop)
+    return mask
+
+def sweep_metrics(fil_dict, N_FFT=SWEEP_N_FFT):
+    """
+    Measure the filter design in `fil_dict` against its specs, return a dict
+    with the order 'N_design', the stopband attenuation 'A_SB' and the passband ripple
+    'A_PB' (both in dB) and the group delay variation in the passband
+    'tau_spread' (in samples). Metrics that are undefined for the response
+    type (e.g. no passband) are nan.
+    """
+    W, H = calc_Hcomplex(fil_dict, N_FFT, False)
+    F = W / (2 * np.pi)
+    A = 20 * np.log10(np.maximum(np.abs(H), 1e-20))
+    PB, SB = _bands(fil_dict)
+    pb, sb = _in_bands(F, PB), _in_bands(F, SB)
+
+    res = {'N_design': fil_dict['N'], 'A_SB': np.nan, 'A_PB': np.nan, 'tau_spread': np.nan}
+    if np.any(pb):
+        res['A_PB'] = np.ptp(A[pb])
+        W_tau, tau = grpdelay(fil_dict['ba'][0], fil_dict['ba'][1], N_FFT,
+                              verbose=False, sos=fil_sos(fil_dict))
+        res['tau_spread'] = np.ptp(tau[_in_bands(W_tau / (2 * np.pi), PB)])
+    if np.any(sb):
+        A_ref = np.max(A[pb]) if np.any(pb) else 0.
+        res['A_SB'] = A_ref - np.max(A[sb])
+    return res
+
+#------------------------------------------------------------------------------
+def _design_points(method, fil_dict, points, use_fb):
+    """
+    Design the filter with `method` of the current filter instance for all
+    `points` [(index, {key: value, ...}), ...], replacing the values of the
+    swept keys in a copy of `fil_dict`. Return a list of tuples
+    (index, err_code, metrics).
+
+    When `use_fb` is True (in a worker process), the designs are performed in
+    `fb.fil[0]` as some design methods access it directly.
+    """
+    results = []
+    for idx, values in points:
+        if use_fb:
+            fb.fil[0].clear()
+            fb.fil[0].update(fil_dict)
+            fil = fb.fil[0]
+        else:
+            fil = fil_dict.copy()
+        fil.update(values)
+        try:
+            err = ff.fil_factory.call_fil_method(method, fil)
+            metrics = sweep_metrics(fil) if err == 0 else {}
+        except Exception as e:
+            logger.warning("Sweep point %s: %s", values, e)
+            err, metrics = 99, {}
+        results.append((idx, err, metrics))
+    return results
+
+def _sweep_worker(job):
+    """
+    Design a chunk of sweep points in a worker process of the pool, `job` is
+    the tuple (module, class, method, fil_dict, state, points).
+    """
+    mod, fc, method, fil_dict, state, points = job
+    import importlib
+    ff.fil_inst = getattr(importlib.import_module(mod), fc)()
+    ff.fil_inst.__dict__.update(state)
+    return _design_points(method, fil_dict, points, use_fb=True)
+
+#------------------------------------------------------------------------------
+class ParameterSweep(object):
+    """
+    Sweep one or two spec keys of the filter dict `fil_dict` over a grid and
+    design the filter with `method` (e.g. 'LPman') of the current filter
+    design instance `ff.fil_inst` (or of the class `fc`) for each point.
+
+    The designs are run in a pool of worker processes (when the design class
+    can be instantiated without Qt, see `filter_factory`), `start()` returns
+    immediately and the results are collected with `poll()`. `run()` blocks
+    until the sweep has finished.
+
+    Parameters
+    ----------
+    fil_dict : dict
+        filter dict with the specs that are not swept, it isn't modified
+    method : str
+        name of the design method
+    params : list of tuples
+        one or two tuples (key, values) with the swept spec key and its values
+    fc : str (optional)
+        name of the filter design class, default: the current instance
+    """
+    def __init__(self, fil_dict, method, params, fc=None):
+        if not 1 <= len(params) <= 2:
+            raise ValueError("One or two parameters can be swept, got {0}."\
+                             .format(len(params)))
+        for key, _ in params:
+            if key not in fil_dict:
+                raise ValueError("Unknown spec key '{0}'.".format(key))
+        if fc:
+            ff.fil_factory.create_fil_inst(fc)
+        if not hasattr(ff.fil_inst, method):
+            raise ValueError("Method '{0}' doesn't exist in class '{1}'."\
+                             .format(method, type(ff.fil_inst).__name__))
+        self.fil_dict = fil_dict.copy()
+        self.method = method
+        self.result = SweepResult([k for k, _ in params], [v for _, v in params])
+        self.n_done = 0
+        self.error = None # message of an exception that aborted the sweep
+        self._pool = self._it = None
+
+    @property
+    def n_points(self):
+        return self.result.data.size
+
+    def _points(self):
+        """ Return a list of all grid points [(index, {key: value})] """
+        r = self.result
+        return [(idx, dict((k, int(g[i]) if k == 'N' else g[i].item())
+                           for k, g, i in zip(r.keys, r.grids, idx)))
+                for idx in np.ndindex(r.shape)]
+
+    def _store(self, results):
+        for idx, err, metrics in results:
+            self.result.data[idx]['err'] = err
+            for m, v in metrics.items():
+                self.result.data[idx][m] = v
+            self.n_done += 1
+
+    def start(self, processes=None):
+        """
+        Start the sweep with `processes` worker processes (default: one per
+        CPU). When the design class requires Qt or processes are not available,
+        the designs are run in the current process before returning.
+        """
+        self.t_start = time.time()
+        points = self._points()
+        cls = ff._headless_class(ff.fil_inst)
+        if ff.MP_CTX is None or cls is None or len(points) < 2:
+            self._store(_design_points(self.method, self.fil_dict, points, use_fb=False))
+            return
+
+        n_proc = min(processes or ff.multiprocessing.cpu_count(), len(points))
+        n_chunks = min(len(points), 4 * n_proc) # balance load of the processes
+        state = ff._picklable_state(ff.fil_inst)
+        jobs = [(cls.__module__, cls.__name__, self.method, self.fil_dict, state,
+                 points[i::n_chunks]) for i in range(n_chunks)]
+        self._pool = ff.MP_CTX.Pool(n_proc)
+        self._it = self._pool.imap_unordered(_sweep_worker, jobs)
+
+    def poll(self, timeout=0):
+        """
+        Collect the results that have arrived (waiting up to `timeout` s for
+        the next one), return True when the sweep has finished. When a worker
+        process fails, the sweep is cancelled and the message is stored in
+        `error`.
+        """
+        if self._it is None:
+            return True
+        try:
+            while True:
+                self._store(self._it.next(timeout=timeout))
+        except ff.multiprocessing.TimeoutError:
+            return False
+        except StopIteration:
+            self._close()
+            logger.info("Swept %d designs in %.3g s.", self.n_points,
+                        time.time() - self.t_start)
+            return True
+        except Exception as e:
+            self.cancel()
+            self.error = "{0}: {1}".format(type(e).__name__, e)
+            logger.error("Sweep failed after %d of %d designs:\n%s", self.n_done,
+                         self.n_points, self.error)
+            return True
+
+    def cancel(self):
+        """ Stop the sweep, the results of unfinished designs remain nan """
+        if self._pool is not None:
+            self._pool.terminate()
+        self._close()
+
+    def _close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+        self._pool = self._it = None
+
+    def run(self, processes=None):
+        """ Run the sweep and return the `SweepResult` """
+        self.start(processes)
+        try:
+            while not self.poll(timeout=None):
+                pass
+        finally:
+            self._close()
+        return self.result
@@ -15,15 +15,36 @@ import os, sys, six
 from pprint import pformat
 import codecs
 import importlib
+import hashlib
+import pickle
 
 import logging
 logger = logging.getLogger(__name__)
 
 import pyfda.filterbroker as fb
 import pyfda.filter_factory as ff
+import pyfda.pyfda_dirs as dirs
 
 from .frozendict import freeze_hierarchical
 
+# Default file for caching the filter tree and the version of its format
+FIL_TREE_CACHE_FILE = os.path.join(dirs.CONF_DIR, 'pyfda_filter_tree.pickle')
+FIL_TREE_CACHE_VERSION = 1
+
+#--------------------------------------------------------------------------
+def file_stamp(path, stamp=None):
+    """
+    Return the tuple (mtime, size, sha1) of the file `path`. When the previous
+    stamp `stamp` has the same modification time and size, it is returned
+    without reading and hashing the file again.
+    """
+    st = os.stat(path)
+    if stamp is not None and tuple(stamp[:2]) == (st.st_mtime, st.st_size):
+        return tuple(stamp)
+    with open(path, 'rb') as f:
+        sha1 = hashlib.sha1(f.read()).hexdigest()
+    return (st.st_mtime, st.st_size, sha1)
+
 #--------------------------------------------------------------------------
 def merge_dicts(d1, d2, path=None, mode='keep1'):
     """
@@ -106,15 +127,24 @@ class FilterTreeBuilder(object):
     comment_char: char
         comment character at the beginning of a comment line
 
+    cache_file: string or None
+        Name of the file for caching the filter tree, default is
+        ``FIL_TREE_CACHE_FILE`` in the config directory. Caching is disabled
+        when an empty string is passed.
+
     """
 
-    def __init__(self, filt_dir, filt_list_file, comment_char='#'):
+    def __init__(self, filt_dir, filt_list_file, comment_char='#', cache_file=None):
         cwd = os.path.dirname(os.path.abspath(__file__))
+        self.filt_dir_path = os.path.join(cwd, filt_dir)
         self.filt_dir_file = os.path.join(cwd, filt_dir, filt_list_file)
 
         logger.debug("Filter file list: %s\n", self.filt_dir_file)
         self.comment_char = comment_char
         self.filt_dir = filt_dir
+        if cache_file is None:
+            cache_file = FIL_TREE_CACHE_FILE
+        self.cache_file = cache_file
 
         self.init_filters()
 
@@ -130,7 +160,14 @@ class FilterTreeBuilder(object):
 
         This method can also be called when the main app runs to re-read the
         filter directory
+
+        When the filter directory hasn't been changed since the last call, the
+        filter tree and the filter classes are read from the cache file instead.
+        The filter modules are then only imported when a filter class is selected.
         """
+        if self.load_cache():
+            return
+
         # Scan filter_list.txt for python file names and extract them
         filt_list_names = self.read_filt_file()
 
@@ -147,12 +184,13 @@ class FilterTreeBuilder(object):
 
         fil_tree = {}
 
-        for fc in fb.fil_classes:  # iterate over all previously found filter classes fc
+        for fc in list(fb.fil_classes):  # iterate over all previously found filter classes fc
 
             # instantiate a global instance ff.fil_inst() of filter class fc
             err_code = ff.fil_factory.create_fil_inst(fc)
             if err_code > 0:
                 logger.warning('Skipping filter class "%s" due to import error %d', fc, err_code)
+                self.import_errors += 1
                 continue # continue with next entry in fb.fil_classes
 
             # add attributes from dict to fil_tree for filter class fc
@@ -164,6 +202,12 @@ class FilterTreeBuilder(object):
                 merge_dicts(fil_tree, fil_tree_add, mode='add1')
 
 
+        # Cache the tree before freezing it (which works in place). Don't cache
+        # the results of failed imports, a missing module might have been
+        # installed until the next start.
+        if self.import_errors == 0:
+            self.save_cache(fil_tree)
+
         # Make the dictionary and all sub-dictionaries read-only ("FrozenDict"):
         fb.fil_tree = freeze_hierarchical(fil_tree)
 
@@ -175,6 +219,93 @@ class FilterTreeBuilder(object):
 
         logger.debug("\nfb.fil_tree =\n%s", pformat(fb.fil_tree))
 
+#==============================================================================
+    def _cache_files(self):
+        """
+        Return a sorted list with the filter list file and all Python files in
+        the filter directory (including subpackages like ``core``).
+        """
+        files = [self.filt_dir_file]
+        for root, _, names in os.walk(self.filt_dir_path):
+            files += [os.path.join(root, n) for n in names if n.endswith('.py')]
+        return sorted(files)
+
+    def load_cache(self):
+        """
+        Read filter tree and filter classes from the cache file and store them
+        in ``fb.fil_tree`` and ``fb.fil_classes``. The cache is only used when
+        format, Python version and the stamps (modification time, size and
+        SHA1 hash) of all files returned by ``_cache_files()`` match. Stamps
+        of files that have been touched without changing their content are
+        updated in the cache file, hence they are not hashed again at the next
+        start.
+
+        Returns True when the cache has been loaded successfully.
+        """
+        if not self.cache_file or not os.path.isfile(self.cache_file):
+            return False
+        try:
+            with open(self.cache_file, 'rb') as f:
+                cache = pickle.load(f)
+            if cache['version'] != FIL_TREE_CACHE_VERSION\
+                    or tuple(cache['python']) != tuple(sys.version_info[:2]):
+                return False
+            files = self._cache_files()
+            if sorted(cache['files']) != files:
+                return False
+            touched = False
+            for path in files:
+                stamp = tuple(cache['files'][path])
+                new_stamp = file_stamp(path, stamp)
+                if new_stamp[2] != stamp[2]:
+                    logger.info("Filter file '%s' has been changed, rebuilding filter tree.", path)
+                    return False
+                if new_stamp != stamp:
+                    cache['files'][path] = new_stamp
+                    touched = True
+        except Exception as e:
+            logger.warning("Couldn't read filter tree cache '%s':\n%s", self.cache_file, e)
+            return False
+
+        if touched: # store the new stamps, the tree is still unfrozen
+            self._write_cache(cache)
+        fb.fil_classes = cache['fil_classes']
+        fb.fil_tree = freeze_hierarchical(cache['fil_tree'])
+        logger.info("Read %d filter classes from cache.", len(fb.fil_classes))
+        return True
+
+    def save_cache(self, fil_tree):
+        """
+        Write the (unfrozen) filter tree `fil_tree` and ``fb.fil_classes``
+        together with the stamps of the filter files to the cache file.
+        """
+        if not self.cache_file:
+            return
+        try:
+            cache = {'version': FIL_TREE_CACHE_VERSION,
+                     'python': tuple(sys.version_info[:2]),
+                     'files': dict((path, file_stamp(path)) for path in self._cache_files()),
+                     'fil_classes': fb.fil_classes,
+                     'fil_tree': fil_tree}
+        except Exception as e:
+            logger.warning("Couldn't write filter tree cache '%s':\n%s", self.cache_file, e)
+            return
+        self._write_cache(cache)
+
+    def _write_cache(self, cache):
+        """
+        Pickle the dict `cache` to the cache file, replacing it in one step.
+        """
+        try:
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(cache, f, protocol=2) # readable with Python 2.x
+            if os.path.isfile(self.cache_file):
+                os.remove(self.cache_file)
+            os.rename(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.warning("Couldn't write filter tree cache '%s':\n%s", self.cache_file, e)
+
 
 #==============================================================================
     def read_filt_file(self):
@@ -206,7 +337,7 @@ class FilterTreeBuilder(object):
 
         try:
             # Try to open filt_dir_file in read mode:
-            fp = codecs.open(self.filt_dir_file, 'rU', encoding='utf-8')
+            fp = codecs.open(self.filt_dir_file, 'r', encoding='utf-8')
             cur_line = fp.readline()
 
             while cur_line: # read until currentLine is empty (EOF reached)
@@ -282,6 +413,7 @@ class FilterTreeBuilder(object):
 
         """
         fb.fil_classes = {}   # initialize global dict for filter classes
+        self.import_errors = 0    # number of failed imports
         num_imports = 0           # number of successful filter module imports
         imported_fil_classes = "" # names of successful filter module imports
 
@@ -308,9 +440,11 @@ class FilterTreeBuilder(object):
 
             except ImportError as e:
                 logger.warning('Filter module "{0}" could not be imported.\n{1}'.format(filt_mod, e))
+                self.import_errors += 1
                 continue
             except Exception as e:
                 logger.warning("Unexpected error during module import:\n%s", e)
+                self.import_errors += 1
                 continue
             # Now, try to instantiate an instance ff.fil_inst() of filter class fc
             for fc in fdict:
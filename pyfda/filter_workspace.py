@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Workspace for several filter designs side by side.
+
+`fb.fil[0]` is the active design that is edited by the input widgets, the
+slots `fb.fil[1:]` hold stored designs. Storing and activating a design
+copies the `FilterDesign` dict without calculating lazy formats, all
+specifications and widget settings are copied along, hence activating a
+stored design restores the input widgets without redesigning the filter.
+Nested values like the widget settings 'wdg_fil' are copied deeply as some
+widgets modify them in place, only the filter representations are shared.
+Responses of the designs are cached by their content (see `resp_cache` in
+pyfda_lib), switching between designs doesn't recalculate them either.
+
+Stored designs can be selected for overlaying them in the plot widgets.
+"""
+from __future__ import division, unicode_literals, print_function, absolute_import
+
+import copy
+import logging
+logger = logging.getLogger(__name__)
+
+import pyfda.filterbroker as fb
+from pyfda.filter_dict import FORMATS
+
+NAME_KEY = 'design_name' # key of the design name in the filter dict
+
+active = None # slot the active design has been loaded from or stored to
+overlay = set() # slots of the designs that are overlaid in the plots
+
+#------------------------------------------------------------------------------
+def slots():
+    """ Return the list of slots with a stored design """
+    return [i for i in range(1, len(fb.fil)) if fb.fil[i] is not None]
+
+def design_name(fil_dict):
+    """
+    Return the name of the design in `fil_dict` or a default name derived from
+    the filter class, response type and order.
+    """
+    if NAME_KEY in fil_dict:
+        return fil_dict[NAME_KEY]
+    return "{0} {1}, N = {2}".format(fil_dict['fc'], fil_dict['rt'], fil_dict['N'])
+
+def active_name():
+    """
+    Return the name of the active design: The name of the stored design it
+    has been activated from or stored to as long as it hasn't been redesigned
+    (same timestamp), otherwise a default name.
+    """
+    if active is not None and fb.fil[active] is not None and\
+            fb.fil[active]['timestamp'] == fb.fil[0]['timestamp']:
+        return design_name(fb.fil[active])
+    return design_name(fb.fil[0])
+
+def _unshare(fil_dict):
+    """
+    Replace all values of `fil_dict` except the filter representations (which
+    may be lazy) by deep copies, in place.
+    """
+    for key in list(dict.keys(fil_dict)):
+        if key not in FORMATS:
+            dict.__setitem__(fil_dict, key, copy.deepcopy(dict.__getitem__(fil_dict, key)))
+
+#------------------------------------------------------------------------------
+def store(name=None, idx=None):
+    """
+    Store a copy of the active design in slot `idx` (default: the first free
+    slot) under `name` (default: the name of the active design, see
+    `active_name()`) and return the slot. Raise `ValueError` when all slots
+    are occupied.
+    """
+    global active
+    if idx is None:
+        free = [i for i in range(1, len(fb.fil)) if fb.fil[i] is None]
+        if not free:
+            raise ValueError("All {0} slots for designs are occupied."\
+                             .format(len(fb.fil) - 1))
+        idx = free[0]
+    elif not 0 < idx < len(fb.fil):
+        raise ValueError("Invalid slot {0} for a design.".format(idx))
+
+    name = name or active_name()
+    fb.fil[idx] = fb.fil[0].copy()
+    _unshare(fb.fil[idx])
+    fb.fil[idx][NAME_KEY] = name
+    active = idx
+    logger.info('Stored design "%s" in slot %d.', fb.fil[idx][NAME_KEY], idx)
+    return idx
+
+def activate(idx):
+    """
+    Make a copy of the design in slot `idx` the active design `fb.fil[0]`.
+    """
+    global active
+    if fb.fil[idx] is None:
+        raise ValueError("Slot {0} contains no design.".format(idx))
+    fb.fil[0].clear()
+    fb.fil[0].update(fb.fil[idx])
+    _unshare(fb.fil[0])
+    fb.fil[0].pop(NAME_KEY, None) # the name belongs to the stored design
+    active = idx
+
+def remove(idx):
+    """ Remove the design in slot `idx` from the workspace """
+    global active
+    fb.fil[idx] = None
+    overlay.discard(idx)
+    if active == idx:
+        active = None
+
+def rename(idx, name):
+    """ Rename the design in slot `idx` """
+    fb.fil[idx][NAME_KEY] = name
+
+def set_overlay(idx, on=True):
+    """ Select / deselect the design in slot `idx` for overlaying in the plots """
+    if on:
+        overlay.add(idx)
+    else:
+        overlay.discard(idx)
+
+def overlay_designs():
+    """
+    Return a list of tuples (slot, name, fil_dict) with the stored designs
+    selected for overlaying, sorted by slot.
+    """
+    return [(i, design_name(fb.fil[i]), fb.fil[i]) for i in sorted(overlay)
+            if i < len(fb.fil) and fb.fil[i] is not None]
@@ -13,8 +13,8 @@ having a global scope like class variables.
 """
 
 from __future__ import division, unicode_literals, print_function, absolute_import
-from collections import defaultdict
 from .frozendict import freeze_hierarchical
+from .filter_dict import FilterDesign
 
 # Handle to central clipboard instance
 clipboard = None
@@ -204,14 +204,16 @@ fil_init = {'rt':'LP', 'ft':'FIR', 'fc':'equiripple', 'fo':'man',
 
 
 fil = [None] * 10 # create empty list with length 10 for multiple filter designs
-# This functionality is not implemented yet, currently only fil[0] is used
+# fil[0] is the active design, fil[1:] hold designs stored in the workspace
+# (see filter_workspace.py)
 
-# define fil[0] as a dict with "built-in" default. The argument defines the default
-# factory that is called when a key is missing. Here, lambda simply returns a float.
-# When e.g. list is given as the default_factory, an empty list is returned.
-fil[0] = defaultdict(lambda: 0.123)
+# define fil[0] as a dict with "built-in" default: The argument defines the value
+# that is returned (and stored) when a key is missing, like a defaultdict.
+# Formats that haven't been produced by the filter design routine ('ba', 'zpk'
+# or 'sos') are only calculated when they are accessed, see filter_dict.py.
+fil[0] = FilterDesign(0.123)
 
-# Now, copy each key-value pair into the defaultdict
+# Now, copy each key-value pair into the filter dict
 for k in fil_init:
     fil[0].update({k:fil_init[k]})
 
@@ -45,8 +45,17 @@ from numpy.random import uniform
 from scipy import signal
 
 from .filter_intf import FilterInterface
+from .iir_sections import IIRTypeOneSection, IIRTypeTwoSection
 from .filter_iir_hdl import filter_iir_hdl, filter_iir_sos_hdl
 
+# Frames of the RTL simulation are run in worker processes, started with "spawn"
+# like the filter design worker (Python >= 3.4), otherwise in the main process.
+try:
+    import multiprocessing
+    MP_CTX = multiprocessing.get_context('spawn')
+except (ImportError, AttributeError, ValueError):
+    MP_CTX = None
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class FilterIIR(object):
@@ -243,7 +252,7 @@ class FilterIIR(object):
             return iir
 
         clock = Signal(False)
-        reset = ResetSignal(0, active=1, async=False)
+        reset = ResetSignal(0, 1, False) # active high, synchronous
         x = Signal(intbv(0, min=-imax, max=imax))
         y = Signal(intbv(0, min=-imax, max=imax))
         xdv, ydv = Signal(bool(0)), Signal(bool(0))
@@ -259,19 +268,72 @@ class FilterIIR(object):
         tofunc.directory = self.hdl_directory
         tofunc(filter_iir_top, clock, reset, x, xdv, y, ydv)
 
-    def simulate_freqz(self, num_loops=3, Nfft=1024):
+    def simulate_freqz(self, num_loops=3, Nfft=1024, trace=False, processes=None):
         """ simulate the discrete frequency response
         This function will invoke an HDL simulation and capture the
         inputs and outputs of the filter.  The response can be compared
         to the frequency response (signal.freqz) of the coefficients.
+
+        The random stimulus for all `num_loops` frames of `Nfft` samples is
+        generated in advance. Each frame is simulated separately, starting
+        from reset, in up to `processes` worker processes (default: one per
+        frame and CPU, 1: no worker processes). The response of the
+        floating-point model is calculated for each frame after the RTL
+        simulation.
+
+        When `trace` is True, the signals of the first frame are written to
+        the VCD file 'filter_iir_sim.vcd'.
         """
         self.Nfft = Nfft
-        w = self.word_format[0]
+        xf = uniform(-1, 1, (num_loops, Nfft))
+        args = [(self, xf[ii], trace and ii == 0) for ii in range(num_loops)]
+
+        if processes is None:
+            processes = min(num_loops, os.cpu_count() or 1) if MP_CTX else 1
+        if processes > 1 and num_loops > 1:
+            pool = MP_CTX.Pool(processes)
+            try:
+                frames = pool.map(_simulate_frame, args)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            frames = [_simulate_frame(arg) for arg in args]
+        xsave, ysave, xfsave = [np.array(s) for s in zip(*frames)]
+
+        # grab the response from the floating-point model, starting from
+        # zero state for each frame like the RTL simulation
+        if self.is_sos:
+            psave = signal.sosfilt(np.hstack((self.b, self.a)), xfsave, axis=1)
+        else:
+            psave = signal.lfilter(self.b, self.a, xfsave, axis=1)
+
+        # remove any zeros
+        for s in (xsave, ysave, psave):
+            s[s == 0] = 1e-19
+
+        # average the FFT frames (converges the noise variance)
+        self.yfavg = np.sum(np.abs(fft(ysave, Nfft, axis=1)), axis=0) / Nfft
+        self.xfavg = np.sum(np.abs(fft(xsave, Nfft, axis=1)), axis=0) / Nfft
+        self.pfavg = np.sum(np.abs(fft(psave, Nfft, axis=1)), axis=0) / Nfft
+
+        return None
+
+    def simulate_frame(self, xf, trace=False):
+        """ simulate the RTL description for one frame of stimulus
+        The float stimulus `xf` (range -1 ... 1) is converted to fixed-point
+        and fed to the HDL description, starting from reset.
+
+        Returns the quantized input and output of the filter (scaled to
+        floats) and the float stimulus, captured for each sample.
+        """
+        Nfft = len(xf)
+        xi = (self.max * np.asarray(xf)).astype(int)
         clock = Signal(bool(0))
-        reset = ResetSignal(0, active=1, async=False)
+        reset = ResetSignal(0, 1, False) # active high, synchronous
         sigin = FilterInterface(word_format=self.word_format)
         sigout = FilterInterface(word_format=self.word_format)
-        xf = Signal(0.0)    # floating point version
+        xfs = Signal(0.0)    # floating point version
 
         # determine the sample rate to clock frequency
         fs = self._sample_rate
@@ -279,6 +341,11 @@ class FilterIIR(object):
         fscnt_max = fc//fs
         cnt = Signal(fscnt_max)
 
+        xsave = np.zeros(Nfft)
+        ysave = np.zeros(Nfft)
+        xfsave = np.zeros(Nfft)
+        idx = [0] # index of the next stimulus sample
+
         def _test_stim():
             # get the hardware description to simulation
             tbdut = self.get_hdl(clock, reset, sigin, sigout)
@@ -297,52 +364,36 @@ class FilterIIR(object):
                     sigin.data_valid.next = False
 
             @always(clock.posedge)
-            def tbrandom():
+            def tbinput():
                 if sigin.data_valid:
-                    xi = uniform(-1, 1)
-                    sigin.data.next = int(self.max*xi)
-                    xf.next = xi
+                    ii = idx[0] % Nfft
+                    sigin.data.next = int(xi[ii])
+                    xfs.next = float(xf[ii])
+                    idx[0] += 1
 
             @instance
             def tbstim():
-                ysave = np.zeros(Nfft)
-                xsave = np.zeros(Nfft)
-                psave = np.zeros(Nfft)
-
-                self.yfavg = np.zeros(Nfft)
-                self.xfavg = np.zeros(Nfft)
-                self.pfavg = np.zeros(Nfft)
-
-                for ii in range(num_loops):
-                    for jj in range(Nfft):
-                        yield sigin.data_valid.posedge
-                        xsave[jj] = float(sigin.data)/self.max
-                        yield sigout.data_valid.posedge
-                        ysave[jj] = float(sigout.data)/self.max
-                        # grab the response from the floating-point model
-                        psave[jj] = self.filter_model(float(xf))
-
-                    # remove any zeros
-                    xsave[xsave == 0] = 1e-19
-                    ysave[ysave == 0] = 1e-19
-                    psave[psave == 0] = 1e-19
-
-                    # average the FFT frames (converges the noise variance)
-                    self.yfavg += (np.abs(fft(ysave, Nfft)) / Nfft)
-                    self.xfavg += (np.abs(fft(xsave, Nfft)) / Nfft)
-                    self.pfavg += (np.abs(fft(psave, Nfft)) / Nfft)
+                for jj in range(Nfft):
+                    yield sigin.data_valid.posedge
+                    xsave[jj] = float(sigin.data)/self.max
+                    yield sigout.data_valid.posedge
+                    ysave[jj] = float(sigout.data)/self.max
+                    xfsave[jj] = float(xfs)
 
                 raise StopSimulation
 
-            return (tbdut, tbclk, tbdv, tbrandom, tbstim,)
+            return (tbdut, tbclk, tbdv, tbinput, tbstim,)
 
-        traceSignals.name = 'filter_iir_sim'
-        if os.path.isfile(traceSignals.name+'.vcd'):
-            os.remove(traceSignals.name+'.vcd')
-        gens = traceSignals(_test_stim)
+        if trace:
+            traceSignals.name = 'filter_iir_sim'
+            if os.path.isfile(traceSignals.name+'.vcd'):
+                os.remove(traceSignals.name+'.vcd')
+            gens = traceSignals(_test_stim)
+        else:
+            gens = _test_stim()
         Simulation(gens).run()
 
-        return None
+        return xsave, ysave, xfsave
 
     def plot_response(self, ax):
         # Plot the designed filter response
@@ -375,36 +426,10 @@ class FilterIIR(object):
                       'Fixed-P. Sim', 'Floating-P. Sim'))
 
 
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-class IIRTypeOneSection(object):
-    def __init__(self, b, a):
-        self.b, self.a = b, a
-        self._fbd = [0. for _ in range(2)]
-        self._ffd = [0. for _ in range(2)]
-
-    def process(self, x):
-        y = x*self.b[0] + \
-            self._ffd[0]*self.b[1] + \
-            self._ffd[1]*self.b[2] - \
-            self._fbd[0]*self.a[1] - \
-            self._fbd[1]*self.a[2]
-
-        self._ffd[1] = self._ffd[0]
-        self._ffd[0] = x
 
-        self._fbd[1] = self._fbd[0]
-        self._fbd[0] = y
-
-        return y
-
-
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-class IIRTypeTwoSection(object):
-    def __init__(self, b, a):
-        self.b = b
-        self.a = a
-
-    def process(self, x):
-        # @todo: finish type two ...
-        y = 0
-        return y
+def _simulate_frame(args):
+    """ Run `FilterIIR.simulate_frame` with the tuple `args` = (flt, xf, trace),
+    the module level function can be called in a worker process.
+    """
+    flt, xf, trace = args
+    return flt.simulate_frame(xf, trace)
@@ -18,6 +18,8 @@ logger = logging.getLogger(__name__)
 from ..compat import (QWidget, QLabel, QLineEdit, QComboBox, QFont, QPushButton, QFD,
                       QVBoxLayout, QHBoxLayout, pyqtSignal, QFrame)
 import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 #from myhdl import (toVerilog, toVHDL, Signal, always, always_comb, delay,
 #               instance, instances, intbv, traceSignals, 
@@ -486,22 +488,19 @@ class HDLSpecs(QWidget):
 
             self.setupHDL(file_name = plt_file_name, dir_name = plt_dir_name)
 
-            logger.info("Fixpoint simulation setup")
-            tb = self.flt.simulate_freqz(num_loops=3, Nfft=1024)
-            clk = myhdl.Signal(False)
-            ts  = myhdl.Signal(False)
-            x   = myhdl.Signal(myhdl.intbv(0,min=-2**(self.W[0]-1), max=2**(self.W[0]-1)))
-            y   = myhdl.Signal(myhdl.intbv(0,min=-2**(self.W[0]-1), max=2**(self.W[0]-1)))
-            
+            logger.info("Fixpoint simulation started")
             try:
-                sim = myhdl.Simulation(tb)
-                logger.info("Fixpoint simulation started")
-                sim.run()
-                logger.info("Fixpoint plotting started")
-                self.flt.plot_response()
-                logger.info("Fixpoint plotting finished")
+                self.flt.simulate_freqz(num_loops=3, Nfft=1024)
             except myhdl.SimulationError as e:
                 logger.warning("Simulation failed:\n{0}".format(e))
+                return
+
+            logger.info("Fixpoint plotting started")
+            fig = Figure()
+            FigureCanvasAgg(fig)
+            self.flt.plot_response(fig.add_subplot(111))
+            fig.savefig(plt_file)
+            logger.info("Fixpoint plotting finished")
 
 #------------------------------------------------------------------------------
 
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011, 2015 Christopher L. Felton
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+"""
+Floating-point models of second-order IIR sections
+==================================================
+
+Golden models for the RTL simulation of `filter_iir.FilterIIR`. They are
+processed sample by sample and don't require MyHDL.
+"""
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class IIRTypeOneSection(object):
+    """ direct form I biquad with the coefficients `b` and `a` (a[0] = 1) """
+    def __init__(self, b, a):
+        self.b, self.a = b, a
+        self._fbd = [0. for _ in range(2)]
+        self._ffd = [0. for _ in range(2)]
+
+    def process(self, x):
+        y = x*self.b[0] + \
+            self._ffd[0]*self.b[1] + \
+            self._ffd[1]*self.b[2] - \
+            self._fbd[0]*self.a[1] - \
+            self._fbd[1]*self.a[2]
+
+        self._ffd[1] = self._ffd[0]
+        self._ffd[0] = x
+
+        self._fbd[1] = self._fbd[0]
+        self._fbd[0] = y
+
+        return y
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class IIRTypeTwoSection(object):
+    """ direct form II biquad with the coefficients `b` and `a` (a[0] = 1) """
+    def __init__(self, b, a):
+        self.b, self.a = b, a
+        self._d = [0. for _ in range(2)]
+
+    def process(self, x):
+        # direct form II: the delay line holds the output of the recursive part
+        w = x - \
+            self._d[0]*self.a[1] - \
+            self._d[1]*self.a[2]
+        y = w*self.b[0] + \
+            self._d[0]*self.b[1] + \
+            self._d[1]*self.b[2]
+
+        self._d[1] = self._d[0]
+        self._d[0] = w
+
+        return y
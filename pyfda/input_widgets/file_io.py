@@ -140,6 +140,9 @@ class File_IO(QWidget):
                     if file_type == '.npz':
                         # http://stackoverflow.com/questions/22661764/storing-a-dict-with-np-savez-gives-unexpected-result
                         a = np.load(f) # array containing dict, dtype 'object'
+                        # the file contains all formats, don't calculate the
+                        # missing formats of the current design before overwriting
+                        fb.fil[0].new_design()
 
                         for key in a:
                             if np.ndim(a[key]) == 0:
@@ -595,7 +595,7 @@ class FilterCoeffs(QWidget):
         logger.debug("importing data: dim - shape = {0} - {1} - {2}\n{3}"\
                        .format(type(data_str), np.ndim(data_str), np.shape(data_str), data_str))
 
-        conv = self.myQ.frmt2float # frmt2float_vec?
+        conv = self.myQ.frmt2float # converts whole columns of strings at once
         frmt = self.myQ.frmt
 
         if np.ndim(data_str) > 1:
@@ -611,18 +611,17 @@ class FilterCoeffs(QWidget):
         logger.info("_copy_to_table: c x r = {0} x {1}".format(num_cols, num_rows))
         if orientation_horiz:
             self.ba = [[],[]]
-            for c in range(num_cols):
-                self.ba[0].append(conv(data_str[c][0], frmt))
-                if num_rows > 1:
-                    self.ba[1].append(conv(data_str[c][1], frmt))
+            self.ba[0] = list(conv([d[0] for d in data_str], frmt))
+            if num_rows > 1:
+                self.ba[1] = list(conv([d[1] for d in data_str], frmt))
             if num_rows > 1:
                 self._filter_type(ftype='IIR')
             else:
                 self._filter_type(ftype='FIR')
         else:
-            self.ba[0] = [conv(s, frmt) for s in data_str[0]]
+            self.ba[0] = list(np.atleast_1d(conv(data_str[0], frmt)))
             if num_cols > 1:
-                self.ba[1] = [conv(s, frmt) for s in data_str[1]]
+                self.ba[1] = list(conv(data_str[1], frmt))
                 self._filter_type(ftype='IIR')
             else:
                 self.ba[1] = [1]
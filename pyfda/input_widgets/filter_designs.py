@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Widget for storing, activating and overlaying several filter designs
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+import sys
+import logging
+logger = logging.getLogger(__name__)
+
+from ..compat import (QtCore, Qt, QWidget, QPushButton, QFrame, QListWidget,
+                      QListWidgetItem, QHBoxLayout, QVBoxLayout, QLabel)
+
+import pyfda.filterbroker as fb
+import pyfda.filter_workspace as ws
+from pyfda.pyfda_rc import params
+
+
+class FilterDesigns(QWidget):
+    """
+    Create the widget for the workspace with several filter designs: The
+    active design can be stored, stored designs can be activated again,
+    renamed (double click) and overlaid in the plots (checkbox).
+    """
+    sigFilterLoaded = QtCore.pyqtSignal() # emitted when a design has been activated
+    sigViewChanged = QtCore.pyqtSignal() # emitted when the overlay selection has changed
+
+    def __init__(self, parent):
+        super(FilterDesigns, self).__init__(parent)
+
+        self._construct_UI()
+        self.load_dict()
+
+    def _construct_UI(self):
+        """
+        Intitialize the user interface
+        """
+        lblTitle = QLabel("Designs (check to overlay in plots):", self)
+
+        self.lstDesigns = QListWidget(self)
+        self.lstDesigns.setToolTip("<span>Stored filter designs, double click to rename. "
+                                   "Checked designs are overlaid in the plots.</span>")
+
+        self.butStore = QPushButton("Store", self)
+        self.butStore.setToolTip("Store the active design in the workspace.")
+        self.butActivate = QPushButton("Activate", self)
+        self.butActivate.setToolTip("<span>Make the selected design the active one, "
+                                    "the input widgets are restored without redesigning.</span>")
+        self.butRemove = QPushButton("Remove", self)
+        self.butRemove.setToolTip("Remove the selected design from the workspace.")
+
+        layHButtons = QHBoxLayout()
+        layHButtons.addWidget(self.butStore)
+        layHButtons.addWidget(self.butActivate)
+        layHButtons.addWidget(self.butRemove)
+
+        layVDesigns = QVBoxLayout()
+        layVDesigns.addWidget(lblTitle)
+        layVDesigns.addWidget(self.lstDesigns)
+        layVDesigns.addLayout(layHButtons)
+
+        # This is the top level widget, encompassing the other widgets
+        frmMain = QFrame(self)
+        frmMain.setLayout(layVDesigns)
+
+        layVMain = QVBoxLayout()
+        layVMain.setAlignment(Qt.AlignTop)
+        layVMain.addWidget(frmMain)
+        layVMain.setContentsMargins(*params['wdg_margins'])
+
+        self.setLayout(layVMain)
+
+        #----------------------------------------------------------------------
+        # SIGNALS & SLOTs
+        #----------------------------------------------------------------------
+        self.butStore.clicked.connect(self.store_design)
+        self.butActivate.clicked.connect(self.activate_design)
+        self.butRemove.clicked.connect(self.remove_design)
+        self.lstDesigns.itemChanged.connect(self._item_changed)
+
+#------------------------------------------------------------------------------
+    def load_dict(self):
+        """
+        (Re-)build the list of stored designs from the workspace, e.g. after
+        loading a filter file, and mark the active design in bold
+        """
+        self.lstDesigns.blockSignals(True)
+        self.lstDesigns.clear()
+        for idx in ws.slots():
+            item = QListWidgetItem(ws.design_name(fb.fil[idx]))
+            item.setData(Qt.UserRole, idx)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
+            item.setCheckState(Qt.Checked if idx in ws.overlay else Qt.Unchecked)
+            font = item.font()
+            font.setBold(idx == ws.active)
+            item.setFont(font)
+            self.lstDesigns.addItem(item)
+            if idx == ws.active:
+                self.lstDesigns.setCurrentItem(item)
+        self.lstDesigns.blockSignals(False)
+        self.butActivate.setEnabled(self.lstDesigns.count() > 0)
+        self.butRemove.setEnabled(self.lstDesigns.count() > 0)
+
+#------------------------------------------------------------------------------
+    def _selected_slot(self):
+        """ Return the slot of the selected design or None """
+        item = self.lstDesigns.currentItem()
+        if item is None:
+            return None
+        return item.data(Qt.UserRole)
+
+    def store_design(self):
+        """ Store the active design in a new slot of the workspace """
+        try:
+            ws.store()
+        except ValueError as e:
+            logger.warning(e)
+            return
+        self.load_dict()
+
+    def activate_design(self):
+        """
+        Make the selected design the active one and update input and plot
+        widgets via `sigFilterLoaded` (-> InputTabWidgets.load_all)
+        """
+        idx = self._selected_slot()
+        if idx is None:
+            return
+        ws.activate(idx)
+        self.load_dict()
+        logger.info('Activated design "%s".', ws.active_name())
+        self.sigFilterLoaded.emit()
+
+    def remove_design(self):
+        """ Remove the selected design from the workspace """
+        idx = self._selected_slot()
+        if idx is None:
+            return
+        overlaid = idx in ws.overlay
+        ws.remove(idx)
+        self.load_dict()
+        if overlaid:
+            self.sigViewChanged.emit()
+
+    def _item_changed(self, item):
+        """
+        Triggered when a design has been renamed or (un)checked for overlaying
+        """
+        idx = item.data(Qt.UserRole)
+        changed = False
+        name = str(item.text()).strip()
+        if name and name != ws.design_name(fb.fil[idx]):
+            ws.rename(idx, name)
+            changed = idx in ws.overlay # update legend
+        overlaid = item.checkState() == Qt.Checked
+        if overlaid != (idx in ws.overlay):
+            ws.set_overlay(idx, overlaid)
+            changed = True
+        if changed:
+            self.sigViewChanged.emit()
+
+#------------------------------------------------------------------------------
+
+def main():
+    from ..compat import QApplication
+    app = QApplication(sys.argv)
+    mainw = FilterDesigns(None)
+    app.setActiveWindow(mainw)
+    mainw.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
 import pyfda.filter_factory as ff # importing filterbroker initializes all its globals
-from pyfda.pyfda_lib import lin2unit, mod_version
+from pyfda.pyfda_lib import lin2unit, mod_version, calc_Hcomplex, calc_Hminmax
 from pyfda.pyfda_rc import params
 # TODO: Passband and stopband info should show min / max values for each band
 
@@ -187,36 +187,18 @@ class FilterInfo(QWidget):
         Print filter properties in a table at frequencies of interest. When
         specs are violated, colour the table entry in red.
         """
-        
-        antiC = False
 
         def _find_min_max(self, f_start, f_stop, unit = 'dB'):
             """
             Find minimum and maximum magnitude and the corresponding frequencies
             for the filter defined in the filter dict in a given frequency band
-            [f_start, f_stop].
+            [f_start, f_stop]. The extrema found on the grid are refined by
+            zooming in with the chirp-Z transform (incl. antiCausals if we have them).
             """
-            w = np.linspace(f_start, f_stop, params['N_FFT'])*2*np.pi
-            [w, H] = sig.freqz(bb, aa, worN = w)
-
-            # add antiCausals if we have them
-            if (antiC):
-               #
-               # Evaluate transfer function of anticausal half on the same freq grid.
-               #
-               wa, ha = sig.freqz(bbA, aaA, worN = w)
-               ha = ha.conjugate()
-               #
-               # Total transfer function is the product
-               #
-               H = H*ha
-
-            f = w / (2.0 * pi) # frequency normalized to f_S
-            H_abs = abs(H)
-            H_max = max(H_abs)
-            H_min = min(H_abs)
-            F_max = f[np.argmax(H_abs)] # find the frequency where H_abs 
-            F_min = f[np.argmin(H_abs)] # becomes max resp. min
+            W_min, H_min, W_max, H_max = calc_Hminmax(fb.fil[0], 2*pi*f_start,
+                                            2*pi*f_stop, N=params['N_FFT'])
+            F_min = W_min / (2.0 * pi) # frequency normalized to f_S
+            F_max = W_max / (2.0 * pi)
             if unit == 'dB':
                 H_max = 20*log10(H_max)
                 H_min = 20*log10(H_min)
@@ -226,17 +208,6 @@ class FilterInfo(QWidget):
         self.tblFiltPerf.setVisible(self.chkFiltPerf.isChecked())
         if self.chkFiltPerf.isChecked():
 
-            bb = fb.fil[0]['ba'][0]
-            aa = fb.fil[0]['ba'][1]
-
-            #'rpk' means nonCausal filter
-            if 'rpk' in fb.fil[0]:
-                antiC = True
-                bbA = fb.fil[0]['baA'][0]
-                aaA = fb.fil[0]['baA'][1]
-                bbA = bbA.conjugate()
-                aaA = aaA.conjugate()
-
             f_S  = fb.fil[0]['f_S']
     
             f_lbls = []
@@ -307,12 +278,9 @@ class FilterInfo(QWidget):
                 logger.debug("F_test_labels = %s" %f_lbls)
                                
                 # Calculate frequency response at test frequencies
-                [w_test, a_test] = sig.freqz(bb, aa, 2.0 * pi * f_vals.astype(np.float))
-                # add antiCausals if we have them
-                if (antiC):
-                   wa, ha = sig.freqz(bbA, aaA, 2.0 * pi * f_vals.astype(np.float))
-                   ha = ha.conjugate()
-                   a_test = a_test*ha
+                # (incl. antiCausals if we have them)
+                [w_test, a_test] = calc_Hcomplex(fb.fil[0],
+                                    2.0 * pi * f_vals.astype(np.float), False)
 
 
             (F_min, H_min, F_max, H_max) = _find_min_max(self, 0, 1, unit = 'V')    
@@ -386,6 +354,8 @@ class FilterInfo(QWidget):
         Print filter dict for debugging
         """
         self.txtFiltDict.setVisible(self.chkFiltDict.isChecked())
+        if not self.chkFiltDict.isChecked():
+            return # don't calculate formats of the design that haven't been accessed yet
 
         fb_sorted = [str(key) +' : '+ str(fb.fil[0][key]) for key in sorted(fb.fil[0].keys())]
         dictstr = pprint.pformat(fb_sorted)
@@ -193,7 +193,7 @@ class FilterPZ(QWidget):
         self.norm_last = qget_cmb_box(self.ui.cmbNorm, data=False) # initial setting of cmbNorm
         self._construct_UI() # construct the rest of the UI
 
-        self.load_dict() # initialize table from filterbroker
+        self.load_dict(force=True) # initialize table from filterbroker
         self._refresh_table() # initialize table with values
 
         self.setup_signal_slot() # setup signal-slot connections and eventFilters
@@ -433,10 +433,22 @@ class FilterPZ(QWidget):
            self.ui.butEnable.setIcon(QIcon(':/circle-check.svg'))
 
 #------------------------------------------------------------------------------
-    def load_dict(self):
+    def showEvent(self, event):
+        """
+        Load the filter dict when it has been updated while the widget was hidden.
+        """
+        if self.dict_pending:
+            self.load_dict()
+        super(FilterPZ, self).showEvent(event)
+
+#------------------------------------------------------------------------------
+    def load_dict(self, force=False):
         """
         Load all entries from filter dict fb.fil[0]['zpk'] into the Zero/Pole/Gain list
         self.zpk and update the display via `self._refresh_table()`.
+        When the widget is hidden, loading is deferred until it is shown
+        (unless `force` is True) as the zeros and poles of a design are only
+        calculated when they are accessed.
         The explicit np.array( ... ) statement enforces a deep copy of fb.fil[0],
         otherwise the filter dict would be modified inadvertedly.
 
@@ -445,7 +457,10 @@ class FilterPZ(QWidget):
         for different lengths of z / p / k subarrays while adding / deleting items.?
         """
         # TODO: check the above
-        
+        self.dict_pending = not (force or self.isVisible())
+        if self.dict_pending:
+            return
+
         self.zpk = np.array(fb.fil[0]['zpk'])# this enforces a deep copy
         qstyle_widget(self.ui.butSave, 'normal')
         self._refresh_table()
@@ -19,7 +19,7 @@ logger = logging.getLogger(__name__)
 
 import numpy as np
 
-from ..compat import (QWidget, QLabel, QFrame, QPushButton, pyqtSignal,
+from ..compat import (QtCore, QWidget, QLabel, QFrame, QPushButton, pyqtSignal,
                       QVBoxLayout, QHBoxLayout)
 
 import pyfda.filterbroker as fb
@@ -140,12 +140,18 @@ class FilterSpecs(QWidget):
         self.w_specs.sigSpecsChanged.connect(self.sigSpecsChanged)
 
         # Other signal-slot connections
-        self.butDesignFilt.clicked.connect(self.start_design_filt)
+        self.butDesignFilt.clicked.connect(self.design_clicked)
         self.butQuit.clicked.connect(self.sigQuit) # pass on to main application
+
+        # timer for polling the results of designs running in the worker process
+        self.design_timer = QtCore.QTimer(self)
+        self.design_timer.setInterval(100) # ms
+        self.design_timer.timeout.connect(self._poll_design)
         #----------------------------------------------------------------------
 
         self.update_UI() # first time initialization
         self.start_design_filt() # design first filter using default values
+        ff.fil_factory.start_worker() # start worker process for following designs
 
 #------------------------------------------------------------------------------
     def update_UI(self):
@@ -245,7 +251,19 @@ class FilterSpecs(QWidget):
         qstyle_widget(self.butDesignFilt, "ok")
 
 #------------------------------------------------------------------------------
-    def start_design_filt(self):
+    def design_clicked(self):
+        """
+        <DESIGN FILTER> button has been clicked: Start the filter design in the
+        background or cancel a running design.
+        """
+        if ff.fil_factory.busy():
+            self.design_timer.stop()
+            self._finish_design(ff.fil_factory.cancel_fil_method())
+        else:
+            self.start_design_filt(background=True)
+
+#------------------------------------------------------------------------------
+    def start_design_filt(self, background=False):
         """
         Start the actual filter design process:
         - store the entries of all input widgets in the global filter dict.
@@ -254,8 +272,15 @@ class FilterSpecs(QWidget):
         - update the input widgets in case weights, corner frequencies etc.
           have been changed by the filter design method
         - the plots are updated via signal-slot connection
+
+        When `background == True`, the design is run in a worker process, the
+        <DESIGN FILTER> button can be used to cancel it in the meantime.
         """
 
+        if ff.fil_factory.busy(): # cancel running design, results would be overwritten
+            self.design_timer.stop()
+            ff.fil_factory.cancel_fil_method()
+
         try:
             logger.info("Start filter design using method '{0}.{1}{2}'"\
                 .format(str(fb.fil[0]['fc']), str(fb.fil[0]['rt']), str(fb.fil[0]['fo'])))
@@ -270,44 +295,84 @@ class FilterSpecs(QWidget):
             # The filter is designed by passing the specs in fil[0] to the method,
             # resulting in e.g. cheby1.LPman(fb.fil[0]) and writing back coefficients,
             # P/Z etc. back to fil[0].
-
-            err = ff.fil_factory.call_fil_method(fb.fil[0]['rt'] + fb.fil[0]['fo'], fb.fil[0])
+            method = fb.fil[0]['rt'] + fb.fil[0]['fo']
+            if background:
+                err = ff.fil_factory.start_fil_method(method, fb.fil[0])
+            else:
+                err = ff.fil_factory.call_fil_method(method, fb.fil[0])
             # this is the same as e.g.
             # from pyfda.filter_design import ellip
             # inst = ellip.ellip()
             # inst.LPmin(fb.fil[0])
             #-----------------------------------------------------------------------
 
+            if err is None: # design is running in the worker process
+                self.butDesignFilt.setText("CANCEL DESIGN")
+                self.color_design_button("busy")
+                self.design_timer.start()
+            else:
+                self._finish_design(err)
+
+        except Exception as e:
+            self._design_exception(e)
+
+    def _poll_design(self):
+        """
+        Check periodically whether the design in the worker process has finished
+        """
+        try:
+            err = ff.fil_factory.poll_fil_method()
+            if err is not None:
+                self.design_timer.stop()
+                self._finish_design(err)
+        except Exception as e:
+            self.design_timer.stop()
+            self.butDesignFilt.setText("DESIGN FILTER")
+            self._design_exception(e)
+
+    def _finish_design(self, err):
+        """
+        Update the UI after the filter design has finished with error code `err`
+        """
+        self.butDesignFilt.setText("DESIGN FILTER")
+        try:
             if err > 0:
                 self.color_design_button("error")
             elif err == -1: # filter design cancelled by user
+                self.color_design_button("changed")
                 return
             else:
                 # Update filter order. weights and freq display in case they
                 # have been changed by the design algorithm
                 self.sel_fil.load_filter_order()
+                if hasattr(ff.fil_inst, 'load_dict'): # dynamic filter widget
+                    ff.fil_inst.load_dict()
                 self.w_specs.load_dict()
                 self.f_specs.load_dict()
                 self.color_design_button("ok")
 
                 self.sigFilterDesigned.emit() # emit signal -> InputTabWidgets.update_all
                 logger.info ('Filter designed with order = {0}'.format(str(fb.fil[0]['N'])))
-                logger.debug("Results:\n"
-                    "F_PB = %s, F_SB = %s "
-                    "Filter order N = %s\n"
-                    "NDim fil[0]['ba'] = %s\n\n"
-                    "b,a = %s\n\n"
-                    "zpk = %s\n",
-                    str(fb.fil[0]['F_PB']), str(fb.fil[0]['F_SB']), str(fb.fil[0]['N']),
-                    str(np.ndim(fb.fil[0]['ba'])), pformat(fb.fil[0]['ba']),
-                    pformat(fb.fil[0]['zpk']))
+                if logger.isEnabledFor(logging.DEBUG): # don't calculate 'zpk' otherwise
+                    logger.debug("Results:\n"
+                        "F_PB = %s, F_SB = %s "
+                        "Filter order N = %s\n"
+                        "NDim fil[0]['ba'] = %s\n\n"
+                        "b,a = %s\n\n"
+                        "zpk = %s\n",
+                        str(fb.fil[0]['F_PB']), str(fb.fil[0]['F_SB']), str(fb.fil[0]['N']),
+                        str(np.ndim(fb.fil[0]['ba'])), pformat(fb.fil[0]['ba']),
+                        pformat(fb.fil[0]['zpk']))
 
         except Exception as e:
-            if ('__doc__' in str(e)):
-                logger.warning("Filter design:\n %s\n %s\n", e.__doc__, e)
-            else:
-                logger.warning("{0}".format(e))
-            self.color_design_button("error")
+            self._design_exception(e)
+
+    def _design_exception(self, e):
+        if ('__doc__' in str(e)):
+            logger.warning("Filter design:\n %s\n %s\n", e.__doc__, e)
+        else:
+            logger.warning("{0}".format(e))
+        self.color_design_button("error")
 
 
     def color_design_button(self, state):
@@ -22,7 +22,7 @@ from pyfda.pyfda_rc import params
 from pyfda.pyfda_lib import mod_version
 
 from pyfda.input_widgets import (filter_specs, file_io, filter_coeffs,
-                                filter_info, filter_pz)
+                                filter_info, filter_pz, filter_designs)
 
 if mod_version("myhdl"):
     from pyfda.hdl_generation import hdl_specs
@@ -58,6 +58,8 @@ class InputTabWidgets(QWidget):
         self.filter_pz.setObjectName("filter_pz")
         self.filter_info = filter_info.FilterInfo(self)
         self.filter_info.setObjectName("filter_info")
+        self.filter_designs = filter_designs.FilterDesigns(self)
+        self.filter_designs.setObjectName("filter_designs")
 
         if HAS_MYHDL:
             self.hdlSpecs = hdl_specs.HDLSpecs(self)
@@ -81,6 +83,9 @@ class InputTabWidgets(QWidget):
         tabWidget.addTab(self.filter_info, 'Info')
         tabWidget.setTabToolTip(4, "<span>Display the achieved filter specifications"
                                    " and more info about the filter design algorithm.</span>")        
+        tabWidget.addTab(self.filter_designs, 'Designs')
+        tabWidget.setTabToolTip(5, "<span>Store several filter designs, switch between"
+                                   " them and overlay them in the plots.</span>")
         if HAS_MYHDL:
             tabWidget.addTab(self.hdlSpecs, 'HDL')
 
@@ -131,6 +136,8 @@ class InputTabWidgets(QWidget):
         self.filter_pz.ui.sig_tx.connect(self.filter_coeffs.ui.sig_rx)
         self.filter_pz.sigFilterDesigned.connect(self.load_all)
         self.file_io.sigFilterLoaded.connect(self.load_all)
+        self.filter_designs.sigFilterLoaded.connect(self.load_all)
+        self.filter_designs.sigViewChanged.connect(self.update_view)
         #----------------------------------------------------------------------
 
     def update_view(self):
@@ -199,6 +206,7 @@ class InputTabWidgets(QWidget):
         self.filter_info.load_dict()
         self.filter_coeffs.load_dict()
         self.filter_pz.load_dict()
+        self.filter_designs.load_dict()
 
         logger.debug("Emit sigFilterDesigned!")
         self.sigFilterDesigned.emit() # pyFDA -> PlotTabWidgets.update_data
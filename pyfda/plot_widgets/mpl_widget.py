@@ -22,6 +22,7 @@ import numpy as np
 #from matplotlib.backend_bases import cursors as mplCursors
 from matplotlib.figure import Figure
 from matplotlib.transforms import Bbox
+from matplotlib.collections import LineCollection
 from matplotlib import rcParams
 
 try:
@@ -78,6 +79,13 @@ class MplWidget(QWidget):
         self.mplToolbar.enable_plot(state = True)
         self.mplToolbar.sig_tx.connect(self.process_signals)
 
+        self.layout_key = None # canvas size and axes labels of the last layout
+        # Animated artists that are drawn on top of the saved background by
+        # `blit()`, e.g. for toggling their visibility without a full redraw:
+        self.blit_artists = []
+        self.background = None
+        self.pltCanv.mpl_connect('draw_event', self._on_draw)
+
         #=============================================
         # Main plot widget layout
         #=============================================
@@ -108,9 +116,12 @@ class MplWidget(QWidget):
                 self.limits = ax.axis() # save old limits
 
 #------------------------------------------------------------------------------
-    def redraw(self):
+    def redraw(self, layout=False):
         """
         Redraw the figure with new properties (grid, linewidth)
+
+        The layout is only recalculated (`tight_layout()`) when the canvas size,
+        the axes, their labels or limits have changed or when `layout` is True.
         """
         # only execute when at least one axis exists -> tight_layout crashes otherwise
         if self.fig.axes:
@@ -121,13 +132,79 @@ class MplWidget(QWidget):
                     ax.axis(self.limits) # restore old limits
                 else:
                     self.limits = ax.axis() # save old limits
-            try:
-                # tight_layout() crashes with small figure sizes
-               self.fig.tight_layout(pad = 0.1)
-            except(ValueError, np.linalg.linalg.LinAlgError):
-                logger.debug("error in tight_layout")
+            layout_key = self._get_layout_key()
+            if layout or layout_key != self.layout_key:
+                try:
+                    # tight_layout() crashes with small figure sizes
+                    self.fig.tight_layout(pad = 0.1)
+                    self.layout_key = layout_key
+                except(ValueError, np.linalg.linalg.LinAlgError):
+                    logger.debug("error in tight_layout")
+                    self.layout_key = None
         self.pltCanv.draw() # now (re-)draw the figure
 
+#------------------------------------------------------------------------------
+    def _get_layout_key(self):
+        """
+        Return a tuple with the properties of the canvas and the axes that
+        determine the layout: canvas size, axes, titles, labels and limits
+        (the latter define the width of the tick labels).
+        """
+        return (self.pltCanv.get_width_height(),) + tuple(
+                (id(ax), ax.get_title(), ax.get_xlabel(), ax.get_ylabel(),
+                 ax.get_xlim(), ax.get_ylim()) for ax in self.fig.axes)
+
+#------------------------------------------------------------------------------
+    def _on_draw(self, event):
+        """
+        Save the background after a full redraw of the canvas and draw the
+        animated artists on top of it.
+        """
+        self.background = self.pltCanv.copy_from_bbox(self.fig.bbox)
+        self._draw_blit_artists()
+
+    def _draw_blit_artists(self):
+        # draw the visible animated artists that still belong to the figure
+        self.blit_artists = [a for a in self.blit_artists if a.axes is not None
+                and a.axes in self.fig.axes and a in a.axes.get_children()]
+        for artist in self.blit_artists:
+            if artist.get_visible():
+                artist.axes.draw_artist(artist)
+
+#------------------------------------------------------------------------------
+    def blit(self):
+        """
+        Update the animated artists in `blit_artists` (e.g. after changing their
+        visibility) by restoring the saved background and drawing them on top,
+        the rest of the figure is not redrawn. When no background has been saved
+        yet, the whole canvas is redrawn.
+        """
+        if self.background is None:
+            self.pltCanv.draw()
+        else:
+            self.pltCanv.restore_region(self.background)
+            self._draw_blit_artists()
+            self.pltCanv.blit(self.fig.bbox)
+
+#------------------------------------------------------------------------------
+    def get_zoom_range(self, ax, x):
+        """
+        Return the visible x-range `(x_min, x_max, N)` of `ax` and the number `N`
+        of points needed to display a function sampled at `x` there with
+        screen resolution (`pyfda_rc.params['N_zoom_pixel']` points per pixel).
+
+        Return `None` when the points of `x` in the visible range are sufficient
+        for the screen resolution, i.e. when not zoomed in far enough.
+        """
+        if len(x) < 2:
+            return None
+        x_min, x_max = sorted(ax.get_xlim())
+        x_min, x_max = max(x_min, x[0]), min(x_max, x[-1])
+        N = int(ax.bbox.width * pyfda_rc.params['N_zoom_pixel'])
+        if x_max <= x_min or np.count_nonzero((x >= x_min) & (x <= x_max)) >= N:
+            return None
+        return x_min, x_max, N
+
 #------------------------------------------------------------------------------
     def clear_disabled_figure(self, enabled):
         """
@@ -135,6 +212,7 @@ class MplWidget(QWidget):
         """
         if not enabled:
             self.fig.clf()
+            self.blit_artists = []
             self.pltCanv.draw()
         else:
             self.redraw()
@@ -167,6 +245,113 @@ class MplWidget(QWidget):
         bbox = Bbox.union([item.get_window_extent() for item in items])
         return bbox.expanded(1.0 + pad, 1.0 + pad)
 
+###############################################################################
+class Stems(object):
+    """
+    Stem plot of `y` over `x` in the axes `ax` for long sequences, drawn with one
+    `LineCollection` for the stems, one marker line and one base line instead of
+    one artist per sample as `ax.stem()`.
+
+    When more than `max_density` samples of the visible x-range fall onto one
+    pixel, the stems are replaced by a min / max envelope (one vertical line per
+    pixel column) and the markers are hidden. The decimation is recalculated
+    whenever the x-limits of `ax` change (zoom, pan), zooming in shows the
+    individual samples again.
+
+    The object has to be referenced as long as the plot exists, matplotlib
+    only keeps a weak reference to the `xlim_changed` callback.
+
+    Parameters
+    ----------
+    ax : matplotlib axes
+    x, y : array_like
+        positions and values of the stems, `x` has to be sorted
+    bottom : float
+        y-position of the base line
+    markerfmt : str
+        marker symbol
+    label : str
+        label for the legend
+    color : matplotlib color
+        color of stems and markers, default: next color of the axes color cycle
+    baseline : bool
+        draw the base line
+    max_density : float
+        max. number of samples per pixel before switching to the envelope
+
+    Further parameters `lw`, `ms`, `mfc`, `mec` and `alpha` set linewidth of
+    the stems, marker size, marker face and edge color and transparency.
+    """
+    def __init__(self, ax, x, y, bottom=0, markerfmt='o', label=None, color=None,
+                 baseline=True, max_density=1., lw=None, ms=None, mfc=None,
+                 mec=None, alpha=None):
+        self.ax = ax
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.bottom = bottom
+        self.max_density = max_density
+        self.decimated = False
+
+        mkw = dict((k, v) for k, v in (('color', color), ('ms', ms), ('mfc', mfc),
+                   ('mec', mec), ('alpha', alpha)) if v is not None)
+        self.markerline, = ax.plot(self.x, self.y, markerfmt, linestyle='None',
+                                   label=label, scalex=False, scaley=False, **mkw)
+        color = self.markerline.get_color()
+        self.stemlines = LineCollection([], colors=color, alpha=alpha,
+                                        linewidths=None if lw is None else float(lw))
+        ax.add_collection(self.stemlines, autolim=False)
+        if baseline and len(self.x) > 0:
+            self.baseline, = ax.plot(self.x[[0, -1]], [bottom, bottom], 'C3-',
+                                     scalex=False, scaley=False)
+        else:
+            self.baseline = None
+
+        # update the data limits with the extent of the stems and rescale
+        if len(self.x) > 0:
+            ax.update_datalim([(self.x[0], bottom), (self.x[-1], bottom),
+                               (self.x[0], np.nanmin(self.y)),
+                               (self.x[-1], np.nanmax(self.y))])
+            ax.autoscale_view()
+        self.update()
+        self.cid = ax.callbacks.connect('xlim_changed', self.update)
+
+    def update(self, ax=None):
+        """
+        Recalculate stems (or min / max envelope) and markers for the visible
+        x-range.
+        """
+        x0, x1 = sorted(self.ax.get_xlim())
+        i0 = max(np.searchsorted(self.x, x0, side='left') - 1, 0)
+        i1 = min(np.searchsorted(self.x, x1, side='right') + 1, len(self.x))
+        x, y = self.x[i0:i1], self.y[i0:i1]
+        n_pix = max(int(self.ax.bbox.width), 1)
+
+        self.decimated = len(x) > self.max_density * n_pix
+        if self.decimated:
+            # min / max of the samples in each pixel column:
+            edges = np.unique(np.searchsorted(x, np.linspace(x[0], x[-1], n_pix + 1)[:-1]))
+            x = x[edges]
+            y_min = np.minimum(np.minimum.reduceat(y, edges), self.bottom)
+            y_max = np.maximum(np.maximum.reduceat(y, edges), self.bottom)
+        else:
+            y_min = np.minimum(y, self.bottom)
+            y_max = np.maximum(y, self.bottom)
+            self.markerline.set_data(x, y)
+        self.markerline.set_visible(not self.decimated)
+
+        segs = np.empty((len(x), 2, 2))
+        segs[:, :, 0] = x[:, np.newaxis]
+        segs[:, 0, 1] = y_min
+        segs[:, 1, 1] = y_max
+        self.stemlines.set_segments(segs)
+
+    def remove(self):
+        """ Remove all artists and the callback from the axes """
+        self.ax.callbacks.disconnect(self.cid)
+        for artist in (self.markerline, self.stemlines, self.baseline):
+            if artist is not None:
+                artist.remove()
+
 ###############################################################################
 
 class MplToolbar(NavigationToolbar):
@@ -276,7 +461,8 @@ class MplToolbar(NavigationToolbar):
         self.a_gr.setChecked(True)
 
         # REDRAW:
-        self.a_rd = self.addAction(QIcon(':/brush.svg'), 'Redraw', self.parent.redraw)
+        self.a_rd = self.addAction(QIcon(':/brush.svg'), 'Redraw',
+                                   lambda: self.parent.redraw(layout=True))
         self.a_rd.setToolTip('Redraw Plot')
 
         # SAVE:
@@ -452,6 +638,21 @@ class MplToolbar(NavigationToolbar):
 
         self.sig_tx.emit({'enabled':self.enabled})
 
+#------------------------------------------------------------------------------
+    def save_figure(self, *args):
+        """
+        Save the figure, the animated artists of the parent widget (which are
+        skipped by `savefig()`) are temporarily turned into normal artists.
+        """
+        artists = [a for a in self.parent.blit_artists if a.get_animated()]
+        for artist in artists:
+            artist.set_animated(False)
+        try:
+            NavigationToolbar.save_figure(self, *args)
+        finally:
+            for artist in artists:
+                artist.set_animated(True)
+
 #------------------------------------------------------------------------------
     def mpl2Clip(self):
         """
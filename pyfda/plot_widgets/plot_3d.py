@@ -23,7 +23,7 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
-from pyfda.pyfda_lib import H_mag, mod_version, safe_eval
+from pyfda.pyfda_lib import H_mag, mod_version, safe_eval, calc_Hcomplex
 from pyfda.pyfda_qt_lib import qget_cmb_box
 from pyfda.plot_widgets.mpl_widget import MplWidget
 
@@ -426,7 +426,7 @@ class Plot3D(QWidget):
         #-----------------------------------------------------------------------------
 
 
-        [w, H] = sig.freqz(bb, aa, worN=N_FFT, whole=True)
+        [w, H] = calc_Hcomplex(fb.fil[0], N_FFT, True) # (cached) H(w)
         H = np.nan_to_num(H) # replace nans and inf by finite numbers
        
         H_abs = abs(H)
@@ -471,9 +471,13 @@ class Plot3D(QWidget):
                 plevel_btm = top
                 
         # calculate H(jw)| along the unity circle and |H(z)|, each clipped
-        # between bottom and top
-        H_UC = H_mag(bb, aa, self.xy_UC, top, H_min=bottom, log=self.chkLog.isChecked())
-        Hmag = H_mag(bb, aa, self.z, top, H_min=bottom, log=self.chkLog.isChecked())
+        # between bottom and top. Evaluation from zpk is robust for high orders
+        # and cached for the grid, changing display limits is cheap.
+        zpk = fb.fil[0]['zpk']
+        H_UC = H_mag(bb, aa, self.xy_UC, top, H_min=bottom, log=self.chkLog.isChecked(),
+                     zpk=zpk)
+        Hmag = H_mag(bb, aa, self.z, top, H_min=bottom, log=self.chkLog.isChecked(),
+                     zpk=zpk)
 
 
         #===============================================================
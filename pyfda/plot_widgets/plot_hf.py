@@ -19,9 +19,10 @@ from matplotlib import rcParams
 #import matplotlib.ticker
 
 import pyfda.filterbroker as fb
+import pyfda.filter_workspace as ws
 from pyfda.pyfda_rc import params
 from pyfda.plot_widgets.mpl_widget import MplWidget
-from pyfda.pyfda_lib import calc_Hcomplex
+from pyfda.pyfda_lib import calc_Hcomplex_multi, calc_Hzoom
 
 class PlotHf(QWidget):
     """
@@ -29,6 +30,11 @@ class PlotHf(QWidget):
     """
     def __init__(self, parent): 
         super(PlotHf, self).__init__(parent)
+        self.line_H = None # persistent artists: |H(f)|, ...
+        self.line_0 = None # ... horizontal line at 0 and ...
+        self.spec_artists = [] # ... spec limits (animated) with ...
+        self.spec_key = None # ... the parameters they have been drawn with
+        self.lines_ov = [] # overlaid designs of the workspace: (fil_dict, line, H_plt)
 
         modes = ['| H |', 're{H}', 'im{H}']
         self.cmbShowH = QComboBox(self)
@@ -112,14 +118,15 @@ class PlotHf(QWidget):
         #----------------------------------------------------------------------
         # SIGNALS & SLOTs
         #----------------------------------------------------------------------
-        self.cmbUnitsA.currentIndexChanged.connect(self.draw)
-        self.cmbShowH.currentIndexChanged.connect(self.draw)
+        # view-only changes don't recalculate H(f):
+        self.cmbUnitsA.currentIndexChanged.connect(self.update_view)
+        self.cmbShowH.currentIndexChanged.connect(self.update_view)
 
-        self.chkLinphase.clicked.connect(self.draw)
+        self.chkLinphase.clicked.connect(self.update_view)
         self.cmbInset.currentIndexChanged.connect(self.draw_inset)
 
-        self.chkSpecs.clicked.connect(self.draw)
-        self.chkPhase.clicked.connect(self.draw)
+        self.chkSpecs.clicked.connect(self.toggle_specs)
+        self.chkPhase.clicked.connect(self.update_view)
 
         self.mplwidget.mplToolbar.sig_tx.connect(self.process_signals)
         
@@ -148,35 +155,41 @@ class PlotHf(QWidget):
         self.ax.clear()
         self.ax.get_xaxis().tick_bottom() # remove axis ticks on top
         self.ax.get_yaxis().tick_left() # remove axis ticks right
+        # re-evaluate H(f) with screen resolution when zooming in:
+        self.ax.callbacks.connect('xlim_changed', self.update_zoom)
 
 #------------------------------------------------------------------------------
     def plot_spec_limits(self, ax):
         """
-        Plot the specifications limits (F_SB, A_SB, ...) as hatched areas with borders.
+        Plot the specifications limits (F_SB, A_SB, ...) as hatched areas with borders,
+        return a list of the created artists.
         """
         hatch = params['mpl_hatch']
         hatch_borders = params['mpl_hatch_border']
+        artists = []
 
         def dB(lin):
             return 20 * np.log10(lin)
 
         def _plot_specs():
             # upper limits:
-            ax.plot(F_lim_upl, A_lim_upl, F_lim_upc, A_lim_upc, F_lim_upr, A_lim_upr, **hatch_borders)
+            artists.extend(ax.plot(F_lim_upl, A_lim_upl, F_lim_upc, A_lim_upc,
+                                   F_lim_upr, A_lim_upr, **hatch_borders))
             if A_lim_upl:
-                ax.fill_between(F_lim_upl, max(A_lim_upl), A_lim_upl, **hatch)
+                artists.append(ax.fill_between(F_lim_upl, max(A_lim_upl), A_lim_upl, **hatch))
             if A_lim_upc:
-                ax.fill_between(F_lim_upc, max(A_lim_upc), A_lim_upc, **hatch)
+                artists.append(ax.fill_between(F_lim_upc, max(A_lim_upc), A_lim_upc, **hatch))
             if A_lim_upr:
-                ax.fill_between(F_lim_upr, max(A_lim_upr), A_lim_upr, **hatch)
+                artists.append(ax.fill_between(F_lim_upr, max(A_lim_upr), A_lim_upr, **hatch))
             # lower limits:
-            ax.plot(F_lim_lol, A_lim_lol, F_lim_loc, A_lim_loc, F_lim_lor, A_lim_lor, **hatch_borders)
+            artists.extend(ax.plot(F_lim_lol, A_lim_lol, F_lim_loc, A_lim_loc,
+                                   F_lim_lor, A_lim_lor, **hatch_borders))
             if A_lim_lol:
-                ax.fill_between(F_lim_lol, min(A_lim_lol), A_lim_lol, **hatch)
+                artists.append(ax.fill_between(F_lim_lol, min(A_lim_lol), A_lim_lol, **hatch))
             if A_lim_loc:
-                ax.fill_between(F_lim_loc, min(A_lim_loc), A_lim_loc, **hatch)
+                artists.append(ax.fill_between(F_lim_loc, min(A_lim_loc), A_lim_loc, **hatch))
             if A_lim_lor:
-                ax.fill_between(F_lim_lor, min(A_lim_lor), A_lim_lor, **hatch)
+                artists.append(ax.fill_between(F_lim_lor, min(A_lim_lor), A_lim_lor, **hatch))
 
         if self.unitA == 'V':
             exp = 1.
@@ -308,6 +321,53 @@ class PlotHf(QWidget):
 
             _plot_specs()
 
+        return artists
+
+#------------------------------------------------------------------------------
+    def update_specs(self):
+        """
+        (Re-)create the spec limits as animated artists when they are displayed
+        and the specs, the unit or the frequency range have changed since they
+        have been drawn, otherwise only set their visibility.
+        """
+        spec_key = (self.unitA, self.f_S, fb.fil[0]['rt'], fb.fil[0]['ft'],
+                    fb.fil[0]['freqSpecsRangeType'],
+                    tuple(fb.fil[0][k] for k in ('A_PB', 'A_PB2', 'A_SB', 'A_SB2',
+                                                 'F_PB', 'F_PB2', 'F_SB', 'F_SB2')))
+        # artists are invalid as well when the axes have been cleared or replaced
+        valid = spec_key == self.spec_key and all(a in self.ax.lines or
+                    a in self.ax.collections for a in self.spec_artists)
+
+        if self.specs and not valid:
+            for artist in self.spec_artists:
+                try:
+                    artist.remove()
+                except ValueError: # artist has already been removed with the axes
+                    pass
+            self.spec_artists = self.plot_spec_limits(self.ax)
+            self.spec_key = spec_key
+            for artist in self.spec_artists:
+                artist.set_animated(True)
+            self.mplwidget.blit_artists = [a for a in self.mplwidget.blit_artists
+                if a.axes is not self.ax] + self.spec_artists
+
+        for artist in self.spec_artists:
+            artist.set_visible(self.specs)
+
+#------------------------------------------------------------------------------
+    def toggle_specs(self):
+        """
+        Show / hide the spec limits: As they are animated artists that don't
+        change the axes, only the spec limits are redrawn on top of the
+        stored background (blitting).
+        """
+        self.specs = self.chkSpecs.isChecked()
+        if not hasattr(self, 'unitA'): # nothing has been plotted yet
+            self.update_view()
+        else:
+            self.update_specs()
+            self.mplwidget.blit()
+
 #------------------------------------------------------------------------------
     def draw_inset(self):
         """
@@ -377,6 +437,7 @@ class PlotHf(QWidget):
 
         if self.chkPhase.isChecked():
             self.ax_p = ax.twinx() # second axes system with same x-axis for phase
+            self.ax_p.callbacks.connect('xlim_changed', self.update_zoom)
 #
             phi_str = r'$\angle H(\mathrm{e}^{\mathrm{j} \Omega})$'
             if fb.fil[0]['plt_phiUnit'] == 'rad':
@@ -435,11 +496,12 @@ class PlotHf(QWidget):
 #------------------------------------------------------------------------------
     def calc_hf(self):
         """
-        (Re-)Calculate the complex frequency response H(f)
+        (Re-)Calculate the complex frequency response H(f), responses of the
+        overlaid designs are calculated in parallel
         """
-
+        fils = [fb.fil[0]] + [fil for _, _, fil in ws.overlay_designs()]
         # calculate H_cmplx(W) (complex) for W = 0 ... 2 pi:
-        self.W, self.H_cmplx = calc_Hcomplex(fb.fil[0], params['N_FFT'], True)
+        self.W, self.H_cmplx = calc_Hcomplex_multi(fils, params['N_FFT'], True)[0]
 
 #------------------------------------------------------------------------------
     def enable_ui(self, enabled):
@@ -516,29 +578,18 @@ class PlotHf(QWidget):
         self.F = self.W / (2 * np.pi) * self.f_S
 
         if fb.fil[0]['freqSpecsRangeType'] == 'sym':
-            # shift H and F by f_S/2
-            self.H_c = np.fft.fftshift(self.H_cmplx)
+            # shift F by f_S/2
             self.F -= self.f_S/2.
         elif fb.fil[0]['freqSpecsRangeType'] == 'half':
-            # only use the first half of H and F
-            self.H_c = self.H_cmplx[0:params['N_FFT']//2]
+            # only use the first half of F
             self.F = self.F[0:params['N_FFT']//2]
-        else: # fb.fil[0]['freqSpecsRangeType'] == 'whole'
-            # use H and F as calculated
-            self.H_c = self.H_cmplx
-            
-        # now calculate mag / real / imaginary part of H_c:
-        if self.linphase: # remove the linear phase
-            self.H_c = self.H_c * np.exp(1j * self.W[0:len(self.F)] * fb.fil[0]["N"]/2.)
+        self.H_c = self.sel_range(self.H_cmplx, fb.fil[0])
 
         if self.cmbShowH.currentIndex() == 0: # show magnitude of H
-            H = abs(self.H_c)
             H_str = r'$|H(\mathrm{e}^{\mathrm{j} \Omega})|$'
         elif self.cmbShowH.currentIndex() == 1: # show real part of H
-            H = self.H_c.real
             H_str = r'$\Re \{H(\mathrm{e}^{\mathrm{j} \Omega})\}$'
         else:  # show imag. part of H
-            H = self.H_c.imag
             H_str = r'$\Im \{H(\mathrm{e}^{\mathrm{j} \Omega})\}$'
 
         #================ Main Plotting Routine =========================
@@ -547,27 +598,29 @@ class PlotHf(QWidget):
 
             if self.unitA == 'dB':
                 A_lim = [20*np.log10(A_min) -10, 20*np.log10(1+A_max) +1]
-                self.H_plt = 20*np.log10(abs(H))
                 H_str += ' in dB ' + r'$\rightarrow$'
             elif self.unitA == 'V': #  'lin'
                 A_lim = [0, (1.05 + A_max)]
-                self.H_plt = H
                 H_str +=' in V ' + r'$\rightarrow $'
-                self.ax.axhline(linewidth=1, color='k') # horizontal line at 0
             else: # unit is W
                 A_lim = [0, (1.03 + A_max)**2.]
-                self.H_plt = H * H.conj()
                 H_str += ' in W ' + r'$\rightarrow $'
+            self.H_plt = self.calc_H_plt(self.H_c)
 
             #-----------------------------------------------------------
-            self.ax.clear()
-            self.ax.plot(self.F, self.H_plt, label = 'H(f)')
+            # update the data of the existing lines instead of clearing the axes
+            if self.line_H not in self.ax.lines:
+                self.line_H, = self.ax.plot(self.F, self.H_plt, label = 'H(f)')
+                self.line_0 = self.ax.axhline(linewidth=1, color='k') # horizontal line at 0
+            else:
+                self.line_H.set_data(self.F, self.H_plt)
+            self.line_0.set_visible(self.unitA == 'V')
+            self.draw_overlays()
             self.draw_phase(self.ax)
             #-----------------------------------------------------------
             
             #============= Set Limits and draw specs =========================
-            if self.specs: 
-                self.plot_spec_limits(self.ax)
+            self.update_specs()
 
             #     self.ax_bounds = [self.ax.get_ybound()[0], self.ax.get_ybound()[1]]#, self.ax.get]
             self.ax.set_xlim(f_lim)
@@ -579,6 +632,97 @@ class PlotHf(QWidget):
 
         self.redraw()
         
+#------------------------------------------------------------------------------
+    def sel_range(self, H_cmplx, fil_dict):
+        """
+        Select the displayed frequency range of the response `H_cmplx` (calculated
+        for W = 0 ... 2 pi) and remove the linear phase of the design `fil_dict`
+        if selected
+        """
+        if fb.fil[0]['freqSpecsRangeType'] == 'sym':
+            # shift H by f_S/2
+            H_c = np.fft.fftshift(H_cmplx)
+        elif fb.fil[0]['freqSpecsRangeType'] == 'half':
+            # only use the first half of H
+            H_c = H_cmplx[0:params['N_FFT']//2]
+        else: # fb.fil[0]['freqSpecsRangeType'] == 'whole'
+            # use H as calculated
+            H_c = H_cmplx
+
+        if self.linphase: # remove the linear phase
+            H_c = H_c * np.exp(1j * self.W[0:len(self.F)] * fil_dict["N"]/2.)
+        return H_c
+
+#------------------------------------------------------------------------------
+    def draw_overlays(self):
+        """
+        Draw the responses of the designs selected for overlaying in the
+        workspace with a legend, the lines are recreated each time as the
+        selection may have changed.
+        """
+        for _, line, _ in self.lines_ov:
+            if line in self.ax.lines:
+                line.remove()
+        self.lines_ov = []
+        designs = ws.overlay_designs()
+        if not designs:
+            self.line_H.set_label('H(f)')
+            if self.ax.get_legend():
+                self.ax.get_legend().remove()
+            return
+
+        results = calc_Hcomplex_multi([fil for _, _, fil in designs],
+                                      params['N_FFT'], True)
+        for (_, name, fil), (_, H) in zip(designs, results):
+            H_plt = self.calc_H_plt(self.sel_range(H, fil))
+            line, = self.ax.plot(self.F, H_plt, linestyle='--', linewidth=1, label=name)
+            self.lines_ov.append((fil, line, H_plt))
+        self.line_H.set_label(ws.active_name())
+        self.ax.legend(loc='best', fontsize='small')
+
+#------------------------------------------------------------------------------
+    def calc_H_plt(self, H_c):
+        """
+        Return magnitude, real or imaginary part of the complex frequency
+        response `H_c` in the selected unit
+        """
+        if self.cmbShowH.currentIndex() == 0: # show magnitude of H
+            H = abs(H_c)
+        elif self.cmbShowH.currentIndex() == 1: # show real part of H
+            H = H_c.real
+        else:  # show imag. part of H
+            H = H_c.imag
+
+        if self.unitA == 'dB':
+            return 20*np.log10(abs(H))
+        elif self.unitA == 'V':
+            return H
+        else: # unit is W
+            return H * H.conj()
+
+#------------------------------------------------------------------------------
+    def update_zoom(self, ax):
+        """
+        Triggered when the x-limits have been changed (e.g. by zooming with the
+        toolbar): When the frequency grid of the full response is too coarse for
+        the visible range, re-evaluate H(f) there with screen resolution using
+        a chirp-Z transform. Otherwise, restore the full response.
+        """
+        if self.line_H not in self.ax.lines:
+            return
+        zoom = self.mplwidget.get_zoom_range(ax, self.F)
+        lines = [(fb.fil[0], self.line_H, self.H_plt)] + self.lines_ov
+        if zoom is None:
+            for _, line, H_plt in lines:
+                line.set_data(self.F, H_plt)
+            return
+        for fil, line, _ in lines:
+            W, H_c = calc_Hzoom(fil, 2*np.pi * zoom[0] / self.f_S,
+                                2*np.pi * zoom[1] / self.f_S, zoom[2])
+            if self.linphase: # remove the linear phase
+                H_c = H_c * np.exp(1j * W * fil["N"]/2.)
+            line.set_data(W * self.f_S / (2*np.pi), self.calc_H_plt(H_c))
+
 #------------------------------------------------------------------------------
     def redraw(self):
         """
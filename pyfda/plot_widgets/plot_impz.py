@@ -20,9 +20,10 @@ import numpy as np
 import scipy.signal as sig
 
 import pyfda.filterbroker as fb
-from pyfda.pyfda_lib import expand_lim, to_html, safe_eval
+from pyfda.pyfda_lib import expand_lim, to_html, safe_eval, fil_hash, resp_cache,\
+                            lfilter_fast, impz_len, fil_sos
 from pyfda.pyfda_rc import params # FMT string for QLineEdit fields, e.g. '{:.3g}'
-from pyfda.plot_widgets.mpl_widget import MplWidget
+from pyfda.plot_widgets.mpl_widget import MplWidget, Stems
 #from mpl_toolkits.mplot3d.axes3d import Axes3D
 
 
@@ -38,6 +39,9 @@ class PlotImpz(QWidget):
         self.stim_freq = 0.02
         self.A = 1.0
         self.bottom = -80
+        self.resp_key = None # key and ...
+        self.resp = None # ... stimulus and response (x, h) of the last calculation
+        self.stems = [] # stem plots of the current figure
         self._construct_UI()
 
     def _construct_UI(self):
@@ -127,10 +131,11 @@ class PlotImpz(QWidget):
         #----------------------------------------------------------------------
         # SIGNALS & SLOTs
         #----------------------------------------------------------------------
-        self.chkLog.clicked.connect(self.draw)
+        # display options only redraw the last response:
+        self.chkLog.clicked.connect(self.redraw_impz)
         self.ledNPoints.editingFinished.connect(self.draw)
-        self.ledLogBottom.editingFinished.connect(self.draw)
-        self.chkPltStim.clicked.connect(self.draw)
+        self.ledLogBottom.editingFinished.connect(self.redraw_impz)
+        self.chkPltStim.clicked.connect(self.redraw_impz)
         self.cmbStimulus.activated.connect(self.draw)
         self.ledAmp.editingFinished.connect(self.draw)
         self.ledFreq.installEventFilter(self)
@@ -279,9 +284,18 @@ class PlotImpz(QWidget):
             self.draw_impz()
 
 #------------------------------------------------------------------------------
-    def draw_impz(self):
+    def redraw_impz(self):
         """
-        (Re-)calculate h[n] and draw the figure
+        Draw the figure after changing display options, reusing the last response
+        """
+        if self.mplwidget.mplToolbar.enabled:
+            self.draw_impz(recalc=False)
+
+#------------------------------------------------------------------------------
+    def draw_impz(self, recalc=True):
+        """
+        (Re-)calculate h[n] and draw the figure. With `recalc = False`, the
+        last response is reused when filter and stimulus are unchanged.
         """
         log = self.chkLog.isChecked()
         stim = str(self.cmbStimulus.currentText())
@@ -303,9 +317,8 @@ class PlotImpz(QWidget):
             logger.error('No proper filter coefficients: len(a), len(b) < 2 !')
             return
 
-        sos = np.asarray(fb.fil[0]['sos'])
+        sos = fil_sos(fb.fil[0]) # second-order sections or None
         antiCausal = 'zpkA' in fb.fil[0]
-        causal     = not (antiCausal)
 
         self.f_S  = fb.fil[0]['f_S']
         
@@ -322,65 +335,45 @@ class PlotImpz(QWidget):
         title_str = r'Impulse Response' # default
         H_str = r'$h[n]$' # default
 
-        # calculate h[n]
-        if stim == "Pulse":
-            x = np.zeros(N)
-            x[0] = self.A # create dirac impulse as input signal
-        elif stim == "Step":
-            x = self.A * np.ones(N) # create step function
+        if stim == "Step":
             title_str = r'Step Response'
             H_str = r'$h_{\epsilon}[n]$'
         elif stim == "StepErr":
-            x = self.A * np.ones(N) # create step function
             title_str = r'Settling Error'
             H_str = r'$h_{\epsilon, \infty} - h_{\epsilon}[n]$'
-            
-        elif stim in {"Cos"}:
-            x = self.A * np.cos(2 * np.pi * t * float(self.ledFreq.text()))
-            if stim == "Cos":
-                title_str = r'Transient Response to Cosine Signal'
-                H_str = r'$y_{\cos}[n]$'
-
-        elif stim in {"Sine", "Rect"}:
-            x = self.A * np.sin(2 * np.pi * t * float(self.ledFreq.text()))
-            if stim == "Sine":
-                title_str = r'Transient Response to Sine Signal'
-                H_str = r'$y_{\sin}[n]$'
-            else:
-                x = self.A * np.sign(x)
-                title_str = r'Transient Response to Rect. Signal'
-                H_str = r'$y_{rect}[n]$'
-
+        elif stim == "Cos":
+            title_str = r'Transient Response to Cosine Signal'
+            H_str = r'$y_{\cos}[n]$'
+        elif stim == "Sine":
+            title_str = r'Transient Response to Sine Signal'
+            H_str = r'$y_{\sin}[n]$'
+        elif stim == "Rect":
+            title_str = r'Transient Response to Rect. Signal'
+            H_str = r'$y_{rect}[n]$'
         elif stim == "Saw":
-            x = self.A * sig.sawtooth(t * (float(self.ledFreq.text())* 2*np.pi))
             title_str = r'Transient Response to Sawtooth Signal'
             H_str = r'$y_{saw}[n]$'
-
         elif stim == "RandN":
-            x = self.A * np.random.randn(N)
             title_str = r'Transient Response to Gaussian Noise'
             H_str = r'$y_{gauss}[n]$'
-
         elif stim == "RandU":
-            x = self.A * (np.random.rand(N)-0.5)
             title_str = r'Transient Response to Uniform Noise'
             H_str = r'$y_{uni}[n]$'
-
-        else:
+        elif stim != "Pulse":
             logger.error('Unknown stimulus "{0}"'.format(stim))
             return
 
-        if len(sos) > 0 and (causal): # has second order sections and is causal
-            h = sig.sosfilt(sos, x)
-        elif (antiCausal):
-            h = sig.filtfilt(self.bb, self.aa, x, -1, None)
-        else: # no second order sections or antiCausals for current filter
-            h = sig.lfilter(self.bb, self.aa, x)
-
-        dc = sig.freqz(self.bb, self.aa, [0])
-
-        if stim == "StepErr":
-            h = h - abs(dc[1]) # subtract DC value from response
+        f_stim = float(self.ledFreq.text()) if periodic_sig else 0
+        key = ('impz', fil_hash(fb.fil[0]), stim, N, self.A, f_stim, self.f_S)
+        if not recalc and key == self.resp_key:
+            x, h = self.resp
+        elif stim in {"RandN", "RandU"}:
+            # don't cache noise responses, a new realization is expected each time
+            x, h = self.calc_response(stim, N, self.A, f_stim, sos, antiCausal)
+        else:
+            x, h = resp_cache.lookup(key, self.calc_response, stim, N, self.A,
+                                     f_stim, sos, antiCausal)
+        self.resp_key, self.resp = key, (x, h)
 
         h = np.real_if_close(h, tol = 1e3)  # tol specified in multiples of machine eps
         self.cmplx = np.any(np.iscomplex(h))
@@ -403,25 +396,20 @@ class PlotImpz(QWidget):
         self.init_axes()
 
         #================ Main Plotting Routine =========================
-        [ml, sl, bl] = self.ax_r.stem(t, h, bottom=self.bottom, markerfmt='o', label = '$h[n]$')
+        # stems are drawn as line collections, keep references for zoom callbacks
+        self.stems = [Stems(self.ax_r, t, h, bottom=self.bottom, markerfmt='o',
+                            label = '$h[n]$')]
         stem_fmt = params['mpl_stimuli']
         if self.chkPltStim.isChecked():
-            [ms, ss, bs] = self.ax_r.stem(t, x, bottom=self.bottom, label = 'Stim.', **stem_fmt)
-            ms.set_mfc(stem_fmt['mfc'])
-            ms.set_mec(stem_fmt['mec'])
-            ms.set_ms(stem_fmt['ms'])
-            ms.set_alpha(stem_fmt['alpha'])
-            for stem in ss:
-                stem.set_linewidth(stem_fmt['lw'])
-                stem.set_color(stem_fmt['mec'])
-                stem.set_alpha(stem_fmt['alpha'])
-            bs.set_visible(False) # invisible bottomline
+            # stems in marker edge color, invisible bottomline
+            self.stems.append(Stems(self.ax_r, t, x, bottom=self.bottom, label = 'Stim.',
+                                    color=stem_fmt['mec'], baseline=False, **stem_fmt))
         expand_lim(self.ax_r, 0.02)
         self.ax_r.set_title(title_str)
 
         if self.cmplx:
-            [ml_i, sl_i, bl_i] = self.ax_i.stem(t, h_i, bottom=self.bottom,
-                                                markerfmt='d', label = '$h_i[n]$')
+            self.stems.append(Stems(self.ax_i, t, h_i, bottom=self.bottom,
+                                    markerfmt='d', label = '$h_i[n]$'))
             self.ax_i.set_xlabel(fb.fil[0]['plt_tLabel'])
             # self.ax_r.get_xaxis().set_ticklabels([]) # removes both xticklabels
             # plt.setp(ax_r.get_xticklabels(), visible=False) 
@@ -436,10 +424,14 @@ class PlotImpz(QWidget):
 
         if self.ACTIVE_3D: # not implemented / tested yet
 
-            # plotting the stems
-            for i in range(len(t)):
-              self.ax3d.plot([t[i], t[i]], [h[i], h[i]], [0, h_i[i]],
-                             '-', linewidth=2, alpha=.5)
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
+            # plotting the stems as one collection
+            segs = np.empty((len(t), 2, 3))
+            segs[:, :, 0] = t[:, np.newaxis]
+            segs[:, :, 1] = h[:, np.newaxis]
+            segs[:, 0, 2] = 0
+            segs[:, 1, 2] = h_i
+            self.ax3d.add_collection3d(Line3DCollection(segs, linewidths=2, alpha=.5))
 
             # plotting a circle on the top of each stem
             self.ax3d.plot(t, h, h_i, 'o', markersize=8,
@@ -451,6 +443,49 @@ class PlotImpz(QWidget):
 
         self.redraw()
         
+#------------------------------------------------------------------------------
+    def calc_response(self, stim, N, A, f_stim, sos, antiCausal):
+        """
+        Calculate the stimulus `x` with `N` points and amplitude `A` and the
+        filter response `h` to it. `f_stim` is the frequency of periodic stimuli.
+        """
+        t = np.linspace(0, N/self.f_S, N, endpoint=False)
+
+        if stim == "Pulse":
+            x = np.zeros(N)
+            x[0] = A # create dirac impulse as input signal
+        elif stim in {"Step", "StepErr"}:
+            x = A * np.ones(N) # create step function
+        elif stim == "Cos":
+            x = A * np.cos(2 * np.pi * t * f_stim)
+        elif stim == "Sine":
+            x = A * np.sin(2 * np.pi * t * f_stim)
+        elif stim == "Rect":
+            x = A * np.sign(np.sin(2 * np.pi * t * f_stim))
+        elif stim == "Saw":
+            x = A * sig.sawtooth(t * (f_stim * 2*np.pi))
+        elif stim == "RandN":
+            x = A * np.random.randn(N)
+        elif stim == "RandU":
+            x = A * (np.random.rand(N)-0.5)
+
+        if antiCausal:
+            if sos is not None:
+                h = sig.sosfiltfilt(sos, x, -1, None)
+            else:
+                h = sig.filtfilt(self.bb, self.aa, x, -1, None)
+        else: # second order sections, direct form or FFT convolution (long FIR filters)
+            h = lfilter_fast(self.bb, self.aa, x, sos=sos)
+
+        if stim == "StepErr":
+            if sos is not None:
+                dc = sig.sosfreqz(sos, [0])
+            else:
+                dc = sig.freqz(self.bb, self.aa, [0])
+            h = h - abs(dc[1]) # subtract DC value from response
+
+        return x, h
+
 #------------------------------------------------------------------------------
     def redraw(self):
         """
@@ -463,17 +498,19 @@ class PlotImpz(QWidget):
         """
         Calculate number of points to be displayed, depending on type of filter 
         (FIR, IIR) and user input. If the user selects 0 points, the number is
-        calculated automatically.
-        
-        An improvement would be to calculate the dominant pole and the corresponding
-        settling time.
+        calculated automatically from the settling time of the dominant pole
+        in `fb.fil[0]['zpk']` (IIR) or the number of coefficients (FIR), see
+        `pyfda_lib.impz_len()`. Threshold and maximum number of points are
+        set by `params['impz_tol']`, `params['impz_mode']` and `params['impz_N_max']`.
         """
 
         if N_user == 0: # set number of data points automatically
             if fb.fil[0]['ft'] == 'IIR':
-                N = 100
+                p = fb.fil[0]['zpk'][1] if 'zpk' in fb.fil[0] else None
+                N = impz_len(self.bb, self.aa, p, tol=params['impz_tol'],
+                             mode=params['impz_mode'], N_max=params['impz_N_max'])
             else:
-                N = min(len(self.bb),  100) # FIR: N = number of coefficients (max. 100)
+                N = impz_len(self.bb, N_max=params['impz_N_max']) # FIR: N = number of coefficients
         else:
             N = N_user
 
@@ -15,15 +15,18 @@ from ..compat import QCheckBox, QWidget, QComboBox, QHBoxLayout, QFrame, pyqtSlo
 import numpy as np
 
 import pyfda.filterbroker as fb
+import pyfda.filter_workspace as ws
 from pyfda.pyfda_rc import params
 from pyfda.plot_widgets.mpl_widget import MplWidget
-from pyfda.pyfda_lib import calc_Hcomplex
+from pyfda.pyfda_lib import calc_Hcomplex_multi, calc_Hzoom
 
 
 class PlotPhi(QWidget):
 
     def __init__(self, parent):
         super(PlotPhi, self).__init__(parent)
+        self.line_phi = None
+        self.lines_ov = [] # overlaid designs of the workspace: (fil_dict, line, phi)
         self._construct_UI()
 
     def _construct_UI(self):
@@ -79,8 +82,8 @@ class PlotPhi(QWidget):
 #        #=============================================
 #        # Signals & Slots
 #        #=============================================
-        self.chkWrap.clicked.connect(self.draw)
-        self.cmbUnitsPhi.currentIndexChanged.connect(self.draw)
+        self.chkWrap.clicked.connect(self.update_view)
+        self.cmbUnitsPhi.currentIndexChanged.connect(self.update_view)
         self.mplwidget.mplToolbar.sig_tx.connect(self.process_signals)
 
 #------------------------------------------------------------------------------
@@ -118,14 +121,18 @@ class PlotPhi(QWidget):
         self.ax.clear()
         self.ax.get_xaxis().tick_bottom() # remove axis ticks on top
         self.ax.get_yaxis().tick_left() # remove axis ticks right
+        # re-evaluate the phase with screen resolution when zooming in:
+        self.ax.callbacks.connect('xlim_changed', self.update_zoom)
 
 #------------------------------------------------------------------------------
     def calc_hf(self):
         """
-        (Re-)Calculate the complex frequency response H(f)
+        (Re-)Calculate the complex frequency response H(f), responses of the
+        overlaid designs are calculated in parallel
         """
+        fils = [fb.fil[0]] + [fil for _, _, fil in ws.overlay_designs()]
         # calculate H_cplx(W) (complex) for W = 0 ... 2 pi:
-        self.W, self.H_cmplx = calc_Hcomplex(fb.fil[0], params['N_FFT'], wholeF=True)
+        self.W, self.H_cmplx = calc_Hcomplex_multi(fils, params['N_FFT'], True)[0]
         # replace nan and inf by finite values, otherwise np.unwrap yields
         # an array full of nans
         self.H_cmplx = np.nan_to_num(self.H_cmplx) 
@@ -155,38 +162,39 @@ class PlotPhi(QWidget):
         F = self.W * f_S2 / np.pi
 
         if fb.fil[0]['freqSpecsRangeType'] == 'sym':
-            # shift H and F by f_S/2
-            H = np.fft.fftshift(self.H_cmplx)
+            # shift F by f_S/2
             F -= f_S2
         elif fb.fil[0]['freqSpecsRangeType'] == 'half':
-            # only use the first half of H and F
-            H = self.H_cmplx[0:params['N_FFT']//2]
+            # only use the first half of F
             F = F[0:params['N_FFT']//2]
-        else: # fb.fil[0]['freqSpecsRangeType'] == 'whole'
-            # use H and F as calculated
-            H = self.H_cmplx
+        H = self.sel_range(self.H_cmplx)
 
         y_str = r'$\angle H(\mathrm{e}^{\mathrm{j} \Omega})$ in '
         if self.unitPhi == 'rad':
             y_str += 'rad ' + r'$\rightarrow $'
-            scale = 1.
+            self.scale = 1.
         elif self.unitPhi == 'rad/pi':
             y_str += 'rad' + r'$ / \pi \;\rightarrow $'
-            scale = 1./ np.pi
+            self.scale = 1./ np.pi
         else:
             y_str += 'deg ' + r'$\rightarrow $'
-            scale = 180./np.pi
+            self.scale = 180./np.pi
         fb.fil[0]['plt_phiLabel'] = y_str
         fb.fil[0]['plt_phiUnit'] = self.unitPhi
-        
-        if self.chkWrap.isChecked():
-            phi_plt = np.angle(H) * scale
-        else:
-            phi_plt = np.unwrap(np.angle(H)) * scale
+
+        self.F = F
+        self.phi_plt = self.calc_phi(H)
 
         #---------------------------------------------------------
-        self.ax.clear() # need to clear, doesn't overwrite 
-        line_phi, = self.ax.plot(F, phi_plt)
+        # update the data of the existing line instead of clearing the axes
+        if self.line_phi not in self.ax.lines:
+            self.line_phi, = self.ax.plot(self.F, self.phi_plt)
+        else:
+            self.line_phi.set_data(self.F, self.phi_plt)
+        self.draw_overlays()
+        self.ax.relim()
+        self.ax.set_autoscaley_on(True) # autoscaling is turned off by zooming
+        self.ax.autoscale_view(scalex=False)
         #---------------------------------------------------------
 
         self.ax.set_title(r'Phase Frequency Response')
@@ -196,6 +204,87 @@ class PlotPhi(QWidget):
 
         self.redraw()
         
+#------------------------------------------------------------------------------
+    def sel_range(self, H_cmplx):
+        """
+        Select the displayed frequency range of the response `H_cmplx`,
+        calculated for W = 0 ... 2 pi
+        """
+        if fb.fil[0]['freqSpecsRangeType'] == 'sym':
+            # shift H by f_S/2
+            return np.fft.fftshift(H_cmplx)
+        elif fb.fil[0]['freqSpecsRangeType'] == 'half':
+            # only use the first half of H
+            return H_cmplx[0:params['N_FFT']//2]
+        else: # fb.fil[0]['freqSpecsRangeType'] == 'whole'
+            # use H as calculated
+            return H_cmplx
+
+#------------------------------------------------------------------------------
+    def draw_overlays(self):
+        """
+        Draw the phases of the designs selected for overlaying in the workspace
+        with a legend, the lines are recreated each time as the selection may
+        have changed.
+        """
+        for _, line, _ in self.lines_ov:
+            if line in self.ax.lines:
+                line.remove()
+        self.lines_ov = []
+        designs = ws.overlay_designs()
+        if not designs:
+            self.line_phi.set_label('_nolegend_')
+            if self.ax.get_legend():
+                self.ax.get_legend().remove()
+            return
+
+        results = calc_Hcomplex_multi([fil for _, _, fil in designs],
+                                      params['N_FFT'], True)
+        for (_, name, fil), (_, H) in zip(designs, results):
+            phi = self.calc_phi(self.sel_range(np.nan_to_num(H)))
+            line, = self.ax.plot(self.F, phi, linestyle='--', linewidth=1, label=name)
+            self.lines_ov.append((fil, line, phi))
+        self.line_phi.set_label(ws.active_name())
+        self.ax.legend(loc='best', fontsize='small')
+
+#------------------------------------------------------------------------------
+    def calc_phi(self, H):
+        """
+        Return the (wrapped or unwrapped) phase of H in the selected unit
+        """
+        if self.chkWrap.isChecked():
+            return np.angle(H) * self.scale
+        else:
+            return np.unwrap(np.angle(H)) * self.scale
+
+#------------------------------------------------------------------------------
+    def update_zoom(self, ax):
+        """
+        Triggered when the x-limits have been changed (e.g. by zooming with the
+        toolbar): When the frequency grid of the full response is too coarse for
+        the visible range, re-evaluate the phase there with screen resolution
+        using a chirp-Z transform. Otherwise, restore the full response.
+        """
+        if self.line_phi not in self.ax.lines:
+            return
+        zoom = self.mplwidget.get_zoom_range(ax, self.F)
+        lines = [(fb.fil[0], self.line_phi, self.phi_plt)] + self.lines_ov
+        if zoom is None:
+            for _, line, phi_plt in lines:
+                line.set_data(self.F, phi_plt)
+            return
+        f_S = fb.fil[0]['f_S']
+        for fil, line, phi_plt in lines:
+            W, H = calc_Hzoom(fil, 2*np.pi * zoom[0] / f_S, 2*np.pi * zoom[1] / f_S,
+                              zoom[2])
+            phi = self.calc_phi(np.nan_to_num(H))
+            if not self.chkWrap.isChecked():
+                # align the unwrapped phase with the one of the full response
+                period = 2 * np.pi * self.scale
+                phi += period * np.round((np.interp(zoom[0], self.F, phi_plt)
+                                          - phi[0]) / period)
+            line.set_data(W * f_S / (2*np.pi), phi)
+
 #------------------------------------------------------------------------------
     def redraw(self):
         """
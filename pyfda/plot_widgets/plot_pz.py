@@ -21,7 +21,7 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
-from pyfda.pyfda_lib import unique_roots
+from pyfda.pyfda_lib import unique_roots, calc_Hcomplex
 
 from pyfda.plot_widgets.mpl_widget import MplWidget
 
@@ -399,8 +399,7 @@ class PlotPZ(QWidget):
         self.lblRad_Hf.setVisible(self.chkHf.isChecked())
         if not self.chkHf.isChecked():
             return
-        ba = fb.fil[0]['ba']
-        w, H = sig.freqz(ba[0], ba[1], worN=params['N_FFT'], whole=True)
+        w, H = calc_Hcomplex(fb.fil[0], params['N_FFT'], True) # (cached) H(w)
         H = np.abs(H)
         if self.chkHfLog.isChecked():
             H = np.clip(np.log10(H), -6, None) # clip to -120 dB
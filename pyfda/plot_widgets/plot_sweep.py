@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Widget for sweeping one or two filter specs and plotting the achieved
+stopband attenuation, passband ripple, group delay variation or order
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import os
+import io
+import logging
+logger = logging.getLogger(__name__)
+
+from ..compat import (QWidget, QComboBox, QLineEdit, QLabel, QPushButton, QFrame,
+                      QHBoxLayout, QVBoxLayout, QFD, QtCore, pyqtSlot)
+
+import numpy as np
+
+import pyfda.filterbroker as fb
+import pyfda.pyfda_dirs as dirs
+from pyfda.pyfda_lib import safe_eval, unit2lin
+from pyfda.pyfda_rc import params
+from pyfda.filter_sweep import ParameterSweep
+from pyfda.plot_widgets.mpl_widget import MplWidget
+
+# spec keys that can be swept with their default ranges (start, stop, num) in
+# display units: frequencies in the unit of f_S, amplitudes in dB
+SWEEP_KEYS = [('N', (2, 20, 10)), ('F_C', (0.05, 0.2, 7)), ('F_PB', (0.05, 0.2, 7)),
+              ('F_SB', (0.15, 0.3, 7)), ('A_PB', (0.1, 3, 7)), ('A_SB', (20, 80, 7)),
+              ('W_PB', (1, 10, 7)), ('W_SB', (1, 10, 7))]
+# metrics of the sweep results with their axis labels
+METRICS = [('A_SB', r'$A_{SB}$ in dB'), ('A_PB', r'$A_{PB}$ (ripple) in dB'),
+           ('tau_spread', r'$\Delta \tau_g$ in passband / $T_S$'), ('N_design', r'Order $N$')]
+
+class PlotSweep(QWidget):
+    """
+    Widget for sweeping one or two specs of the current filter design over a
+    grid and plotting the achieved performance as curves or as a heatmap.
+    Sweeps are only started with the "Sweep" button, the results are kept when
+    the filter is redesigned.
+    """
+    def __init__(self, parent):
+        super(PlotSweep, self).__init__(parent)
+
+        self.sweep = None # running sweep
+        self.result = None # results of the last sweep ...
+        self.disp_grids = [] # ... and the swept values in display units
+        self._construct_UI()
+
+    def _construct_UI(self):
+        self.cmbKey1, self.ledRange1 = self._key_widgets(0)
+        self.cmbKey2, self.ledRange2 = self._key_widgets(5)
+        self.cmbKey2.insertItem(0, "none")
+        self.cmbKey2.setCurrentIndex(0)
+
+        self.cmbMetric = QComboBox(self)
+        self.cmbMetric.addItems([m for m, _ in METRICS])
+        self.cmbMetric.setToolTip("<span>Performance metric to be plotted.</span>")
+
+        self.cmbMode = QComboBox(self)
+        self.cmbMode.addItems(["Curves", "Heatmap"])
+        self.cmbMode.setToolTip("<span>Display of a 2D sweep as one curve per value of "
+                                "the second parameter or as a heatmap.</span>")
+
+        self.butRun = QPushButton("Sweep", self)
+        self.butRun.setToolTip("<span>Design the filter for all points of the grid "
+                               "(in a pool of worker processes).</span>")
+        self.butSave = QPushButton("Save CSV", self)
+        self.butSave.setToolTip("<span>Save the results of the last sweep as a CSV table.</span>")
+        self.butSave.setEnabled(False)
+        self.lblInfo = QLabel(self)
+
+        layHKeys = QHBoxLayout()
+        for lbl, cmb, led in (("Sweep", self.cmbKey1, self.ledRange1),
+                              ("and", self.cmbKey2, self.ledRange2)):
+            layHKeys.addWidget(QLabel(lbl, self))
+            layHKeys.addWidget(cmb)
+            layHKeys.addWidget(led)
+            layHKeys.addStretch(1)
+        layHKeys.addStretch(10)
+
+        layHDisp = QHBoxLayout()
+        layHDisp.addWidget(self.butRun)
+        layHDisp.addWidget(self.butSave)
+        layHDisp.addStretch(1)
+        layHDisp.addWidget(QLabel("Plot", self))
+        layHDisp.addWidget(self.cmbMetric)
+        layHDisp.addWidget(self.cmbMode)
+        layHDisp.addStretch(1)
+        layHDisp.addWidget(self.lblInfo)
+        layHDisp.addStretch(10)
+
+        layVControls = QVBoxLayout()
+        layVControls.addLayout(layHKeys)
+        layVControls.addLayout(layHDisp)
+
+        # This widget encompasses all control subwidgets:
+        self.frmControls = QFrame(self)
+        self.frmControls.setObjectName("frmControls")
+        self.frmControls.setLayout(layVControls)
+
+        #----------------------------------------------------------------------
+        # mplwidget
+        #----------------------------------------------------------------------
+        self.mplwidget = MplWidget(self)
+        self.mplwidget.layVMainMpl.addWidget(self.frmControls)
+        self.mplwidget.layVMainMpl.setContentsMargins(*params['wdg_margins'])
+        self.setLayout(self.mplwidget.layVMainMpl)
+
+        # poll the results of a running sweep:
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(100)
+
+        #----------------------------------------------------------------------
+        # SIGNALS & SLOTs
+        #----------------------------------------------------------------------
+        self.cmbKey1.activated.connect(self._set_default_range)
+        self.cmbKey2.activated.connect(self._set_default_range)
+        self.cmbMetric.activated.connect(self.update_view)
+        self.cmbMode.activated.connect(self.update_view)
+        self.butRun.clicked.connect(self.start_stop)
+        self.butSave.clicked.connect(self.save_csv)
+        self.timer.timeout.connect(self.poll)
+
+        self.mplwidget.mplToolbar.sig_tx.connect(self.process_signals)
+
+        self.update_view() # initial drawing
+
+    def _key_widgets(self, idx):
+        """
+        Return a combo box for selecting a spec key (initialized with `SWEEP_KEYS[idx]`)
+        and a line edit for its range
+        """
+        cmb = QComboBox(self)
+        cmb.addItems([k for k, _ in SWEEP_KEYS])
+        cmb.setCurrentIndex(idx)
+        cmb.setToolTip("<span>Spec to be swept.</span>")
+        led = QLineEdit(self)
+        led.setText("{0}, {1}, {2}".format(*SWEEP_KEYS[idx][1]))
+        led.setToolTip("<span>Range of the swept spec as 'start, stop, number of points'. "
+                       "Frequencies are entered in the unit of f_S, amplitudes in dB.</span>")
+        return cmb, led
+
+#------------------------------------------------------------------------------
+    @pyqtSlot(object)
+    def process_signals(self, sig_dict):
+        """
+        Process signals coming from the navigation toolbar
+        """
+        if 'update_view' in sig_dict:
+            self.update_view()
+        elif 'enabled' in sig_dict:
+            self.enable_ui(sig_dict['enabled'])
+        elif 'home' in sig_dict:
+            self.update_view()
+        else:
+            pass
+
+#------------------------------------------------------------------------------
+    def enable_ui(self, enabled):
+        """
+        Triggered when the toolbar is enabled or disabled
+        """
+        self.frmControls.setEnabled(enabled)
+        if enabled:
+            self.update_view()
+
+#------------------------------------------------------------------------------
+    def _set_default_range(self):
+        """ Reset the range of the spec that has been selected """
+        defaults = dict(SWEEP_KEYS)
+        for cmb, led in ((self.cmbKey1, self.ledRange1), (self.cmbKey2, self.ledRange2)):
+            if cmb is self.sender() and cmb.currentText() in defaults:
+                led.setText("{0}, {1}, {2}".format(*defaults[cmb.currentText()]))
+
+    def _get_values(self, key, led):
+        """
+        Return the values of the swept spec `key` in display units and in the
+        units of the filter dict for the range entered in `led`.
+        """
+        rng = [safe_eval(s.strip(), 0, return_type='float')
+               for s in str(led.text()).split(',')]
+        if len(rng) != 3 or rng[2] < 1:
+            raise ValueError("Enter the range of {0} as 'start, stop, number of points'."\
+                             .format(key))
+        disp = np.linspace(rng[0], rng[1], int(rng[2]))
+        if key == 'N':
+            disp = np.unique(np.round(disp).astype(int))
+            values = disp
+        elif key.startswith('F_'):
+            values = disp / fb.fil[0]['f_S']
+        elif key.startswith('A_'):
+            values = [unit2lin(v, fb.fil[0]['ft'], key, 'dB') for v in disp]
+        else:
+            values = disp
+        return disp, values
+
+#------------------------------------------------------------------------------
+    def start_stop(self):
+        """ Start a new sweep or cancel the running sweep """
+        if self.sweep is not None:
+            self.sweep.cancel()
+            self._finished("Sweep cancelled.")
+            return
+
+        keys = [(self.cmbKey1, self.ledRange1)]
+        if self.cmbKey2.currentText() != "none":
+            keys.append((self.cmbKey2, self.ledRange2))
+        method = str(fb.fil[0]['rt']) + str(fb.fil[0]['fo'])
+        try:
+            grids = [self._get_values(str(cmb.currentText()), led) for cmb, led in keys]
+            sweep_params = [(str(cmb.currentText()), values)
+                            for (cmb, _), (_, values) in zip(keys, grids)]
+            self.sweep = ParameterSweep(fb.fil[0], method, sweep_params)
+        except ValueError as e:
+            logger.error("Cannot start sweep: %s", e)
+            return
+
+        self.disp_grids = [disp for disp, _ in grids]
+        self.butRun.setText("Cancel")
+        self.butSave.setEnabled(False)
+        self.sweep.start()
+        self.timer.start()
+        self.poll()
+
+    def poll(self):
+        """ Collect results of the running sweep and display the progress """
+        if self.sweep.poll():
+            if self.sweep.error:
+                self._finished("Sweep failed: {0}".format(self.sweep.error))
+            else:
+                self._finished("Swept {0} designs.".format(self.sweep.n_points))
+        else:
+            self.lblInfo.setText("Designing {0} / {1} ..."\
+                                 .format(self.sweep.n_done, self.sweep.n_points))
+
+    def _finished(self, msg):
+        self.timer.stop()
+        self.result, self.sweep = self.sweep.result, None
+        self.butRun.setText("Sweep")
+        self.butSave.setEnabled(True)
+        self.lblInfo.setText(msg)
+        self.update_view()
+
+#------------------------------------------------------------------------------
+    def save_csv(self):
+        """
+        Save the results of the last sweep as a CSV table with one row per
+        design, swept specs are saved in display units.
+        """
+        dlg = QFD(self)
+        file_name, _ = dlg.getSaveFileName_(caption="Save sweep results as",
+                            directory=dirs.save_dir, filter="CSV table (*.csv)")
+        file_name = str(file_name)
+        if file_name == "": # cancelled file operation returns empty string
+            return
+        file_name = os.path.splitext(file_name)[0] + '.csv'
+
+        table = self.result.table()
+        mesh = np.meshgrid(*self.disp_grids, indexing='ij')
+        for i, m in enumerate(mesh):
+            table[:, i] = m.ravel()
+        try:
+            with io.open(file_name, 'wb') as f:
+                np.savetxt(f, table, delimiter=',', fmt='%.6g',
+                           header=','.join(self.result.columns()), comments='')
+            logger.info('Sweep results saved as "%s"', file_name)
+            dirs.save_dir = os.path.dirname(file_name)
+        except IOError as e:
+            logger.error('Failed saving "%s"!\n%s\n', file_name, e)
+
+#------------------------------------------------------------------------------
+    def draw(self):
+        """
+        Called when the filter has been redesigned: The sweep is not repeated
+        automatically as it can take a long time.
+        """
+        if self.result is not None and self.sweep is None:
+            self.lblInfo.setText("Filter has changed, sweep again for new results.")
+
+    def update_view(self):
+        """
+        Plot the selected metric of the last sweep results
+        """
+        self.mplwidget.fig.clf()
+        self.ax = self.mplwidget.fig.add_subplot(111)
+        self.ax.get_xaxis().tick_bottom() # remove axis ticks on top
+        self.ax.get_yaxis().tick_left() # remove axis ticks right
+
+        if self.result is None:
+            self.ax.set_title("Parameter Sweep")
+            self.ax.text(0.5, 0.5, "Select specs and ranges and press 'Sweep'.",
+                         ha='center', va='center', transform=self.ax.transAxes)
+            self.redraw()
+            return
+
+        metric, label = METRICS[self.cmbMetric.currentIndex()]
+        data = self.result[metric]
+        keys = self.result.keys
+        self.ax.set_title("{0}: {1}".format(" / ".join(keys), metric))
+        if len(keys) == 1:
+            self.ax.plot(self.disp_grids[0], data, 'o-')
+            self.ax.set_xlabel(keys[0])
+            self.ax.set_ylabel(label)
+        elif self.cmbMode.currentText() == "Heatmap":
+            x, y = self.disp_grids
+            img = self.ax.pcolormesh(self._edges(y), self._edges(x),
+                                     np.ma.masked_invalid(data))
+            self.mplwidget.fig.colorbar(img, ax=self.ax, label=label)
+            self.ax.set_xlabel(keys[1])
+            self.ax.set_ylabel(keys[0])
+        else:
+            for i, v in enumerate(self.disp_grids[1]):
+                self.ax.plot(self.disp_grids[0], data[:, i], 'o-',
+                             label="{0} = {1:.4g}".format(keys[1], v))
+            self.ax.legend(loc='best', fontsize='small')
+            self.ax.set_xlabel(keys[0])
+            self.ax.set_ylabel(label)
+
+        self.redraw()
+
+    @staticmethod
+    def _edges(x):
+        """ Return the cell edges of a heatmap for the (sorted) grid values `x` """
+        x = np.asarray(x, dtype=float)
+        if len(x) < 2:
+            return np.array([x[0] - 0.5, x[0] + 0.5])
+        mid = (x[1:] + x[:-1]) / 2
+        return np.concatenate(([2 * x[0] - mid[0]], mid, [2 * x[-1] - mid[-1]]))
+
+#------------------------------------------------------------------------------
+    def redraw(self):
+        """
+        Redraw the canvas when e.g. the canvas size has changed
+        """
+        self.mplwidget.redraw()
+
+#------------------------------------------------------------------------------
+
+def main():
+    import sys
+    from ..compat import QApplication
+    app = QApplication(sys.argv)
+    mainw = PlotSweep(None)
+    app.setActiveWindow(mainw)
+    mainw.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    main()
@@ -11,30 +11,90 @@ Tabbed container with all plot widgets
 """
 from __future__ import print_function, division, unicode_literals, absolute_import
 
+import time
+import importlib
 import logging
 logger = logging.getLogger(__name__)
 
-from ..compat import QTabWidget, QVBoxLayout, QEvent, QtCore
+from ..compat import QTabWidget, QWidget, QVBoxLayout, QEvent, QtCore
 
 from pyfda.pyfda_rc import params
 
-from pyfda.plot_widgets import (plot_hf, plot_phi, plot_pz, plot_tau_g, plot_impz,
-                          plot_3d)
+#------------------------------------------------------------------------------
+class LazyPlotTab(QWidget):
+    """
+    Placeholder for a plot widget in the tab widget. The module `mod_name` in
+    ``pyfda.plot_widgets`` is only imported and the plot widget `cls_name` is
+    only constructed (including its figure, grids and initial plot) when
+    ``construct()`` is called, i.e. when the tab is selected for the first time.
+
+    The dirty flags `needs_draw` (recalculate and draw with new filter data)
+    and `needs_update_view` (redraw with new specs / view) are set for hidden
+    tabs and evaluated when the tab is selected.
+    """
+    def __init__(self, parent, mod_name, cls_name):
+        super(LazyPlotTab, self).__init__(parent)
+        self.mod_name = mod_name
+        self.cls_name = cls_name
+        self.wdg = None # plot widget, constructed on demand
+        self.needs_draw = False
+        self.needs_update_view = False
+
+        self.layVMain = QVBoxLayout()
+        self.layVMain.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layVMain)
+
+    def construct(self):
+        """
+        Import module and construct plot widget if this hasn't happened yet,
+        return the plot widget. The widget is drawn with the current filter
+        data and specs during construction, resetting the dirty flags.
+        """
+        if self.wdg is None:
+            t_start = time.time()
+            mod = importlib.import_module('pyfda.plot_widgets.' + self.mod_name)
+            self.wdg = getattr(mod, self.cls_name)(self)
+            self.layVMain.addWidget(self.wdg)
+            self.needs_draw = self.needs_update_view = False
+            logger.debug("Constructed plot widget '%s' in %.3g s",
+                         self.cls_name, time.time() - t_start)
+        return self.wdg
+
+    def draw(self):
+        self.construct().draw()
+
+    def update_view(self):
+        self.construct().update_view()
+
+    def redraw(self):
+        self.construct().redraw()
 
 #------------------------------------------------------------------------------
 class PlotTabWidgets(QTabWidget):
     def __init__(self, parent):
         super(PlotTabWidgets, self).__init__(parent)
 
-        self.pltHf = plot_hf.PlotHf(self)
-        self.pltPhi = plot_phi.PlotPhi(self)
-        self.pltPZ = plot_pz.PlotPZ(self)
-        self.pltTauG = plot_tau_g.PlotTauG(self)
-        self.pltImpz = plot_impz.PlotImpz(self)
-        self.plt3D = plot_3d.Plot3D(self)
+        # Plot widgets are only constructed when their tab is selected for the
+        # first time, heavy widgets like Plot3D (mplot3d, 3D grid) are not
+        # created at startup. Plot widgets that are not visible aren't drawn
+        # when the filter or the specs change but only flagged as dirty. They
+        # are updated when they are selected.
+        self.pltHf = LazyPlotTab(self, 'plot_hf', 'PlotHf')
+        self.pltPhi = LazyPlotTab(self, 'plot_phi', 'PlotPhi')
+        self.pltPZ = LazyPlotTab(self, 'plot_pz', 'PlotPZ')
+        self.pltTauG = LazyPlotTab(self, 'plot_tau_g', 'PlotTauG')
+        self.pltImpz = LazyPlotTab(self, 'plot_impz', 'PlotImpz')
+        self.plt3D = LazyPlotTab(self, 'plot_3d', 'Plot3D')
+        self.pltSweep = LazyPlotTab(self, 'plot_sweep', 'PlotSweep')
 
         self._construct_UI()
 
+#------------------------------------------------------------------------------
+    def _plot_widgets(self):
+        """ Return a list with all (lazy) plot widgets """
+        return [self.pltHf, self.pltPhi, self.pltPZ, self.pltTauG, self.pltImpz,
+                self.plt3D, self.pltSweep]
+
 #------------------------------------------------------------------------------
     def _construct_UI(self):
         """ Initialize UI with tabbed subplots """
@@ -46,6 +106,8 @@ class PlotTabWidgets(QTabWidget):
         self.tabWidget.addTab(self.pltTauG, 'tau_g')
         self.tabWidget.addTab(self.pltImpz, 'h[n]')
         self.tabWidget.addTab(self.plt3D, '3D')
+        self.tabWidget.addTab(self.pltSweep, 'Sweep')
+        self.tabWidget.currentWidget().construct() # only the initial tab
 
         layVMain = QVBoxLayout()
         layVMain.addWidget(self.tabWidget)
@@ -99,7 +161,31 @@ class PlotTabWidgets(QTabWidget):
 #    @QtCore.pyqtSlot(int)
 #    def tab_changed(self,argTabIndex):
     def current_tab_redraw(self):
-        self.tabWidget.currentWidget().redraw()
+        """
+        Redraw the current tab after a tab change or a resize event. When the
+        filter or the specs have been changed while the tab was hidden,
+        recalculate resp. update the plot.
+        """
+        wdg = self.tabWidget.currentWidget()
+        if wdg.wdg is None:
+            wdg.construct() # first selection, widget is drawn during construction
+        elif wdg.needs_draw:
+            self._draw(wdg)
+        elif wdg.needs_update_view:
+            self._update_view(wdg)
+        else:
+            wdg.redraw()
+
+#------------------------------------------------------------------------------
+    def _draw(self, wdg):
+        """ Recalculate and draw plot widget `wdg`, reset its dirty flags """
+        wdg.needs_draw = wdg.needs_update_view = False
+        wdg.draw()
+
+    def _update_view(self, wdg):
+        """ Update view of plot widget `wdg`, reset its dirty flag """
+        wdg.needs_update_view = False
+        wdg.update_view()
             
 #------------------------------------------------------------------------------
     def eventFilter(self, source, event):
@@ -124,15 +210,16 @@ class PlotTabWidgets(QTabWidget):
     def update_data(self):
         """
         Calculate subplots with new filter DATA and redraw them,
-        triggered by self.inputTabWidgets.sigFilterDesigned.
+        triggered by self.inputTabWidgets.sigFilterDesigned. Only the current
+        tab is drawn, the other tabs are flagged as dirty.
         """
         logger.debug("update_data (filter designed)")
-        self.pltHf.draw()
-        self.pltPhi.draw()
-        self.pltPZ.draw()
-        self.pltTauG.draw()
-        self.pltImpz.draw()
-        self.plt3D.draw()
+        current = self.tabWidget.currentWidget()
+        for wdg in self._plot_widgets():
+            if wdg is current:
+                self._draw(wdg)
+            else:
+                wdg.needs_draw = True
 
 #------------------------------------------------------------------------------
     def update_view(self):
@@ -141,10 +228,12 @@ class PlotTabWidgets(QTabWidget):
         triggered by self.inputTabWidgets.sigSpecsChanged.
         """
         logger.debug("update_view (specs changed)")
-        self.pltHf.update_view()
-        self.pltPhi.update_view()
-        self.pltTauG.update_view()
-        self.pltImpz.update_view()
+        current = self.tabWidget.currentWidget()
+        for wdg in [self.pltHf, self.pltPhi, self.pltTauG, self.pltImpz]:
+            if wdg is current:
+                self._update_view(wdg)
+            else:
+                wdg.needs_update_view = True
 #        self.pltPZ.draw()
 #        self.plt3D.draw()
         
@@ -18,7 +18,7 @@ import numpy as np
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
-from pyfda.pyfda_lib import grpdelay
+from pyfda.pyfda_lib import grpdelay, hash_args, resp_cache, fil_sos
 from pyfda.plot_widgets.mpl_widget import MplWidget
 
 # TODO: Anticausal filter have no group delay. But is a filter with
@@ -32,6 +32,7 @@ class PlotTauG(QWidget):
     def __init__(self, parent):
         super(PlotTauG, self).__init__(parent)
         self.verbose = False # suppress warnings
+        self.line_tau_g = None
 
 # =============================================================================
 # #### not needed at the moment ###
@@ -105,8 +106,14 @@ class PlotTauG(QWidget):
         bb = fb.fil[0]['ba'][0]
         aa = fb.fil[0]['ba'][1]
 
-        # calculate H_cmplx(W) (complex) for W = 0 ... 2 pi:
-        self.W, self.tau_g = grpdelay(bb, aa, params['N_FFT'], whole = True,
+        # use second-order sections when available, they are more accurate
+        # for high filter orders
+        sos = fil_sos(fb.fil[0])
+
+        # calculate tau_g(W) for W = 0 ... 2 pi or fetch it from the cache:
+        key = ('tau_g', hash_args(bb, aa, sos, params['N_FFT']))
+        self.W, self.tau_g = resp_cache.lookup(key, grpdelay, bb, aa,
+            params['N_FFT'], whole = True, sos = sos,
             verbose = self.verbose) # self.chkWarnings.isChecked())
 
         # Zero phase filters have no group delay (Causal+AntiCausal)
@@ -153,8 +160,11 @@ class PlotTauG(QWidget):
             tau_g = tau_g / fb.fil[0]['f_S']
 
         #---------------------------------------------------------
-        self.ax.clear() # need to clear, doesn't overwrite
-        line_tau_g, = self.ax.plot(F, tau_g, label = "Group Delay")
+        # update the data of the existing line instead of clearing the axes
+        if self.line_tau_g not in self.ax.lines:
+            self.line_tau_g, = self.ax.plot(F, tau_g, label = "Group Delay")
+        else:
+            self.line_tau_g.set_data(F, tau_g)
         #---------------------------------------------------------
 
         self.ax.set_title(r'Group Delay $ \tau_g$')
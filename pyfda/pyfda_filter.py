@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Command line tool for filtering (large) signal files with a filter saved by
+pyfda in zipped binary numpy format (`.npz`, "Save Filter" in the Files tab).
+
+The input file is memory-mapped and filtered in chunks of fixed size, the
+filter state `zi` is carried across chunk boundaries. The result is identical
+to filtering the whole signal at once, memory use doesn't depend on the
+length of the file. The output file is memory-mapped as well and written
+chunk by chunk. Channels are filtered in parallel by a pool of threads.
+
+Supported file formats:
+
+- `.npy`: numpy arrays with shape (N,) or (N, channels)
+- `.wav`: integer PCM (8, 16, 32 bit) or IEEE float (32, 64 bit) WAV files
+
+The output file has the data type of the input file, integer data is rounded
+and saturated. 8 bit WAV data is unsigned with an offset of 128, the offset
+is removed before filtering and added again afterwards.
+
+Example
+-------
+
+    pyfda-filter lowpass.npz recording.wav filtered.wav --chunk 65536
+"""
+from __future__ import division, print_function, unicode_literals
+
+import sys, os, io
+import struct
+import time
+import argparse
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+import scipy.signal as sig
+from scipy.io import wavfile
+
+__version__ = 0.1
+
+CHUNK_SIZE = 65536 # default number of samples per chunk and channel
+
+#------------------------------------------------------------------------------
+def load_filter(file_name, use_ba=False):
+    """
+    Load the coefficients of a filter saved as `.npz` file by pyfda.
+
+    Parameters
+    ----------
+    file_name : str
+        name of the `.npz` file
+    use_ba : bool
+        use the transfer function ('ba') even when second-order sections
+        ('sos') are available
+
+    Returns
+    -------
+    tuple (fmt, coeffs)
+        `('sos', sos)` with the sos array of shape (n_sections, 6) or
+        `('ba', (b, a))` with the numerator and denominator coefficients
+    """
+    with np.load(file_name, allow_pickle=True) as fil:
+        if 'sos' in fil and not use_ba:
+            sos = np.asarray(fil['sos'])
+            if sos.ndim == 2 and sos.shape[1] == 6 and len(sos) > 0:
+                return 'sos', sos
+        if 'ba' not in fil:
+            raise ValueError('"{0}" contains no filter coefficients!'.format(file_name))
+        ba = fil['ba']
+        b = np.atleast_1d(np.asarray(ba[0]).squeeze())
+        a = np.atleast_1d(np.asarray(ba[1]).squeeze())
+        return 'ba', (b, a)
+
+#------------------------------------------------------------------------------
+def open_input(file_name):
+    """
+    Memory-map the signal file `file_name` (`.npy` or `.wav`) for reading.
+
+    Returns
+    -------
+    tuple (x, f_S)
+        array with shape (N, channels) and sampling rate (None for `.npy` files)
+    """
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext == '.npy':
+        x, f_S = np.load(file_name, mmap_mode='r'), None
+    elif ext == '.wav':
+        f_S, x = wavfile.read(file_name, mmap=True)
+    else:
+        raise ValueError('Unknown file type "{0}"'.format(ext))
+
+    if x.ndim == 1:
+        x = x.reshape(-1, 1)
+    elif x.ndim != 2:
+        raise ValueError('"{0}": Expected an array with shape (N,) or (N, channels), '
+                         'got {1}'.format(file_name, x.shape))
+    return x, f_S
+
+#------------------------------------------------------------------------------
+def open_output(file_name, shape, dtype, f_S=None):
+    """
+    Create the signal file `file_name` (`.npy` or `.wav`) for an array with
+    `shape` = (N, channels) and `dtype` and memory-map the data for writing.
+    `f_S` is the sampling rate written to WAV files (default: 1).
+    """
+    ext = os.path.splitext(file_name)[1].lower()
+    dtype = np.dtype(dtype)
+    if ext == '.npy':
+        return np.lib.format.open_memmap(file_name, mode='w+', dtype=dtype,
+                                         shape=shape)
+    elif ext == '.wav':
+        if dtype.kind == 'f':
+            fmt_tag = 3 # IEEE float
+        elif dtype.kind in {'i', 'u'} and dtype.itemsize in {1, 2, 4}:
+            fmt_tag = 1 # PCM
+            dtype = np.dtype('u1' if dtype.itemsize == 1 else 'i{0}'.format(dtype.itemsize))
+        else:
+            raise ValueError('Data type "{0}" is not supported for WAV files'.format(dtype))
+        N, channels = shape
+        block_align = channels * dtype.itemsize
+        data_size = N * block_align
+        f_S = int(f_S) if f_S else 1
+        with io.open(file_name, 'wb') as f:
+            f.write(b'RIFF' + struct.pack('<I', 36 + data_size) + b'WAVE')
+            f.write(b'fmt ' + struct.pack('<IHHIIHH', 16, fmt_tag, channels, f_S,
+                                          f_S * block_align, block_align,
+                                          dtype.itemsize * 8))
+            f.write(b'data' + struct.pack('<I', data_size))
+            f.truncate(44 + data_size)
+        return np.memmap(file_name, dtype=dtype.newbyteorder('<'), mode='r+',
+                         offset=44, shape=shape)
+    else:
+        raise ValueError('Unknown file type "{0}"'.format(ext))
+
+#------------------------------------------------------------------------------
+class ChunkFilter(object):
+    """
+    Filter the channels of a signal in consecutive chunks, the filter state of
+    each channel is kept between calls of `process()`.
+
+    Parameters
+    ----------
+    fmt : str
+        'sos' or 'ba'
+    coeffs : array_like or tuple
+        second-order sections or tuple (b, a)
+    channels : int
+        number of channels
+    """
+    def __init__(self, fmt, coeffs, channels=1):
+        self.fmt = fmt
+        if fmt == 'sos':
+            self.sos = np.asarray(coeffs)
+            zi_shape = (len(self.sos), 2)
+        elif fmt == 'ba':
+            self.b, self.a = [np.atleast_1d(c) for c in coeffs]
+            zi_shape = (max(len(self.a), len(self.b)) - 1,)
+        else:
+            raise ValueError('Unknown filter format "{0}"'.format(fmt))
+        self.zi = [np.zeros(zi_shape) for _ in range(channels)]
+
+    def process(self, x, ch=0):
+        """
+        Filter the chunk `x` of channel `ch` and update its filter state.
+        """
+        if self.fmt == 'sos':
+            y, self.zi[ch] = sig.sosfilt(self.sos, x, zi=self.zi[ch])
+        else:
+            y, self.zi[ch] = sig.lfilter(self.b, self.a, x, zi=self.zi[ch])
+        return y
+
+#------------------------------------------------------------------------------
+def _to_dtype(y, dtype):
+    """
+    Convert the float array `y` to `dtype`, rounding and saturating integers.
+    """
+    if dtype.kind in {'i', 'u'}:
+        info = np.iinfo(dtype)
+        y = np.clip(np.round(y), info.min, info.max)
+    return y.astype(dtype)
+
+#------------------------------------------------------------------------------
+def filter_file(fil_file, in_file, out_file, chunk_size=CHUNK_SIZE, threads=None,
+                use_ba=False):
+    """
+    Filter the signal file `in_file` with the filter saved in `fil_file` and
+    write the result to `out_file`, processing chunks of `chunk_size` samples.
+    The channels are filtered by a pool of `threads` threads (default: one
+    thread per channel and CPU).
+
+    Returns a dict with the number of samples per channel 'N', the number of
+    'channels', the filter format 'fmt', the processing time 't' and the
+    throughput 'samples_per_s' (summed over all channels).
+    """
+    fmt, coeffs = load_filter(fil_file, use_ba=use_ba)
+    x, f_S = open_input(in_file)
+    N, channels = x.shape
+    if N == 0:
+        raise ValueError('"{0}" contains no data'.format(in_file))
+    y = open_output(out_file, x.shape, x.dtype, f_S)
+    flt = ChunkFilter(fmt, coeffs, channels)
+    # 8 bit WAV data is unsigned, filter the samples around the midpoint
+    offset = 128. if x.dtype == np.uint8 else 0.
+
+    if threads is None:
+        threads = min(channels, multiprocessing.cpu_count())
+    pool = ThreadPool(threads) if threads > 1 and channels > 1 else None
+
+    def _process(args):
+        ch, start, stop = args
+        y[start:stop, ch] = _to_dtype(
+            flt.process(np.asarray(x[start:stop, ch], dtype=float) - offset, ch)
+            + offset, y.dtype)
+
+    t_start = time.time()
+    try:
+        for start in range(0, N, chunk_size):
+            stop = min(start + chunk_size, N)
+            args = [(ch, start, stop) for ch in range(channels)]
+            if pool:
+                pool.map(_process, args)
+            else:
+                for arg in args:
+                    _process(arg)
+            y.flush() # write chunk to disk, releasing the dirty pages
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    t = time.time() - t_start
+    del y # close memory map
+
+    logger.info('Filtered "%s" (%d samples x %d channels) in %.3g s', in_file,
+                N, channels, t)
+    return {'N': N, 'channels': channels, 'fmt': fmt, 't': t,
+            'samples_per_s': N * channels / t if t > 0 else float('inf')}
+
+#------------------------------------------------------------------------------
+def main(argv=None):
+    """
+    entry point for the `pyfda-filter` command line tool
+    """
+    parser = argparse.ArgumentParser(prog='pyfda-filter',
+        description="Filter a signal file (.npy, .wav) in chunks with a filter "
+                    "saved by pyfda (.npz).")
+    parser.add_argument('filter', help="filter file (.npz)")
+    parser.add_argument('input', help="input signal file (.npy, .wav)")
+    parser.add_argument('output', help="output signal file (.npy, .wav)")
+    parser.add_argument('-c', '--chunk', type=int, default=CHUNK_SIZE,
+                        help="number of samples per chunk (default: %(default)s)")
+    parser.add_argument('-t', '--threads', type=int, default=None,
+                        help="number of threads (default: one per channel and CPU)")
+    parser.add_argument('--ba', action='store_true',
+                        help="use the transfer function instead of second-order sections")
+    args = parser.parse_args(argv)
+
+    if args.chunk < 1:
+        parser.error("chunk size must be a positive integer")
+    try:
+        res = filter_file(args.filter, args.input, args.output, chunk_size=args.chunk,
+                          threads=args.threads, use_ba=args.ba)
+    except (IOError, OSError, ValueError) as e:
+        print("pyfda-filter: error: {0}".format(e), file=sys.stderr)
+        return 1
+
+    print("Filtered {0} samples x {1} channel(s) ({2}) in {3:.3f} s: "
+          "{4:.3g} samples/s".format(res['N'], res['channels'], res['fmt'],
+                                     res['t'], res['samples_per_s']))
+    return 0
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(main())
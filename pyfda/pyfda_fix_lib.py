@@ -21,7 +21,6 @@ import numpy as np
 from pyfda.pyfda_qt_lib import qstr
 
 # TODO: Absolute value for WI is taken, no negative WI specifications possible
-# TODO: Vecorization for hex / csd functions (frmt2float)
 
 __version__ = 0.5
 
@@ -123,87 +122,136 @@ def dec2csd(dec_val, WF=0):
 
     Returns:
     --------
-    A string with the CSD value
-
-    Original author: Harnesser
-    https://sourceforge.net/projects/pycsd/
-    License: GPL2
+    A string with the CSD value, see ``dec2csd_vec()``
 
     """
-    # figure out binary range, special case for 0
-    if dec_val == 0 :
-        return '0'
-    if np.abs(dec_val) < 1.0 :
-        k = 0
-    else:
-        k = int(np.ceil(np.log2(np.abs(dec_val) * 1.5)))
-
-    logger.debug("CSD: Converting {0:f} to {1:d}.{2:d} format".format(dec_val, k, WF))
-
-    # Initialize CSD calculation
-    csd_digits = []
-    remainder = dec_val
-    prev_non_zero = False
-    k -= 1 # current exponent in the CSD string under construction
-
-    while( k >= -WF): # has the last fractional digit been reached
-
-
-        limit = pow(2.0, k+1) / 3.0
-
-        # logger.debug("\t{0} - {1}".format(remainder, limit))
-
-        # decimal point?
-        if k == -1 :
-            if csd_digits == []:
-                if dec_val > limit:
-                    remainder -= 1
-                    csd_digits.extend(['+.'])
-                    prev_non_zero = True
-                elif dec_val < -limit:
-                    remainder += 1
-                    csd_digits.extend(['-.'])
-                    prev_non_zero = True
-                else:
-                    csd_digits.extend( ['0.'] )
-            else:
-                csd_digits.extend( ['.'] )
+    return dec2csd_vec(dec_val, WF).item()
 
-        # convert the number
-        if prev_non_zero:
-            csd_digits.extend( ['0'] )
-            prev_non_zero = False
-
-        elif remainder > limit :
-            csd_digits.extend( ['+'] )
-            remainder -= pow(2.0, k )
-            prev_non_zero = True
-
-        elif remainder < -limit :
-            csd_digits.extend( ['-'] )
-            remainder += pow(2.0, k )
-            prev_non_zero = True
-
-        else :
-            csd_digits.extend( ['0'] )
-            prev_non_zero = False
-
-        k -= 1
+#------------------------------------------------------------------------------
+# UCS4 codes of the characters used for building string arrays
+CHR_CODES = dict((c, ord(c)) for c in '0123456789ABCDEF+-.')
+HEX_CODES = np.array([ord(c) for c in '0123456789ABCDEF'], dtype=np.uint32)
 
-    # Always have something before the point
-#    if np.abs(dec_val) < 1.0:
-#        csd_digits.insert(0, '0')
+def codes2str(codes):
+    """
+    Convert an integer array `codes` of unicode code points with shape
+    (..., L) to an array of strings with length <= L and shape (...).
+    Code points 0 at the end of a row are stripped.
+    """
+    codes = np.ascontiguousarray(codes, dtype=np.uint32)
+    L = max(codes.shape[-1], 1)
+    if codes.shape[-1] == 0:
+        codes = np.zeros(codes.shape[:-1] + (1,), dtype=np.uint32)
+    return codes.view(np.dtype(('U', L))).reshape(codes.shape[:-1])
+
+def _bit_length(x):
+    """ Number of bits required for the non-negative integer array `x` """
+    x_max = int(np.max(x)) if np.size(x) > 0 else 0
+    return x_max.bit_length()
+
+def _twos_complement(y_int, W):
+    """
+    Return the `W` bit two's complement representation of the integer (array)
+    `y_int` as non-negative int64, values outside the range of `W` bits are
+    wrapped around.
+    """
+    return np.bitwise_and(np.asarray(y_int, dtype=np.int64), (1 << W) - 1)
 
-    csd_str = "".join(csd_digits)
-    
-    logger.debug("CSD result = {0}".format(csd_str))
+def int2bin_vec(y_int, W, WI=None):
+    """
+    Return the (array of) fixpoint integers `y_int` as two's complement binary
+    strings with `W` bits. When `WI` is given and there are fractional bits,
+    a radix point is inserted after the sign bit and `WI` integer bits.
 
-#    if WF > 0:
-#        csd_str = csd_str[:-WF] + "." + csd_str[-WF:]
+    The string array is assembled from the bit planes of the int64
+    representation in a single vectorized step.
+    """
+    u = _twos_complement(y_int, W)
+    bits = np.right_shift(u[..., np.newaxis], np.arange(W - 1, -1, -1)) & 1
+    codes = bits + CHR_CODES['0']
+    if WI is not None and W - WI - 1 > 0:
+        codes = np.insert(codes, WI + 1, CHR_CODES['.'], axis=-1)
+    return codes2str(codes)
+
+def int2hex_vec(y_int, W, WI):
+    """
+    Return the (array of) fixpoint integers `y_int` with `W` bits and `WI`
+    integer bits as hex strings, equivalent to converting the binary strings
+    with ``bin2hex()``: Sign bit and integer bits are zero-extended to the
+    left, the fractional bits to the right to a multiple of 4 bits each,
+    a radix point is inserted before the fractional digits.
+    The strings are assembled from a nibble lookup table.
+    """
+    u = _twos_complement(y_int, W)
+    WF = W - WI - 1
+    nI = (WI + 4) // 4  # number of hex digits for sign and integer bits
+    nF = (WF + 3) // 4  # number of hex digits for fractional bits
+    nibbles = np.right_shift(np.right_shift(u, WF)[..., np.newaxis],
+                             4 * np.arange(nI - 1, -1, -1)) & 15
+    codes = HEX_CODES[nibbles]
+    if WF > 0:
+        frac = np.left_shift(u & ((1 << WF) - 1), 4 * nF - WF)
+        nibbles_f = np.right_shift(frac[..., np.newaxis],
+                                   4 * np.arange(nF - 1, -1, -1)) & 15
+        point = np.full(nibbles.shape[:-1] + (1,), CHR_CODES['.'], dtype=np.uint32)
+        codes = np.concatenate((codes, point, HEX_CODES[nibbles_f]), axis=-1)
+    return codes2str(codes)
+
+def dec2csd_vec(dec_val, WF=0):
+    """
+    Convert the (array of) decimal values `dec_val` to strings in CSD format
+    with `WF` fractional places, values are rounded to multiples of 2**-WF.
 
-    return csd_str
+    The CSD digits are calculated as the non-adjacent form (NAF) of the
+    integer `x = |dec_val| * 2**WF`: With `xh = x >> 1` and `x3 = x + xh`,
+    the bits of `x3 & (xh ^ x3)` are the '+' digits and the bits of
+    `xh & (xh ^ x3)` are the '-' digits (swapped for negative values).
 
-dec2csd_vec = np.frompyfunc(dec2csd, 2, 1)
+    Returns:
+    --------
+    An (array of) strings with the CSD values. All digits down to 2**0 are
+    returned, followed by a radix point and `WF` fractional digits for WF > 0,
+    e.g. '+0-' (3), '0.+0' (0.5 with WF=2), '+0.-0' (1.5 with WF=2).
+    Zero is returned as '0'.
+    """
+    shape = np.shape(dec_val)
+    x = np.rint(np.multiply(np.ravel(dec_val), 2. ** WF)).astype(np.int64)
+    neg_val = x < 0
+    x = np.abs(x)
+    xh = np.right_shift(x, 1)
+    x3 = x + xh
+    c = np.bitwise_xor(xh, x3)
+    d_pos = np.bitwise_and(x3, c)
+    d_neg = np.bitwise_and(xh, c)
+    d_pos, d_neg = np.where(neg_val, d_neg, d_pos), np.where(neg_val, d_pos, d_neg)
+    d_all = d_pos | d_neg
+
+    nb = max(_bit_length(d_all), WF + 1) # number of digit positions
+    shifts = np.arange(nb)
+    # digit codes for bit positions 0 ... nb-1 (= 2**-WF ... 2**(nb-WF-1))
+    digits = np.full((len(x), nb), CHR_CODES['0'], dtype=np.uint32)
+    digits[(np.right_shift(d_pos[:, np.newaxis], shifts) & 1) > 0] = CHR_CODES['+']
+    digits[(np.right_shift(d_neg[:, np.newaxis], shifts) & 1) > 0] = CHR_CODES['-']
+
+    # bit position of the most significant digit, at least the one for 2**0
+    top = np.zeros(len(x), dtype=np.int64)
+    for b in range(1, nb):
+        top[np.right_shift(d_all, b) > 0] = b
+    top = np.maximum(top, WF)[:, np.newaxis]
+    # output column j contains the digit for bit position `top - j`, for
+    # WF > 0 the radix point is inserted after bit position WF (= 2**0)
+    j = np.arange(nb + (WF > 0))
+    if WF > 0:
+        bit = top - j + (j > top - WF)
+    else:
+        bit = top - j
+    codes = digits[np.arange(len(x))[:, np.newaxis], np.clip(bit, 0, nb - 1)]
+    if WF > 0:
+        codes[j == top - WF + 1] = CHR_CODES['.']
+    codes[bit < 0] = 0 # columns beyond the end of the string
+    codes[x == 0] = 0
+    codes[x == 0, 0] = CHR_CODES['0']
+    return codes2str(codes).reshape(shape)
 
 def csd2dec(csd_str):
     """
@@ -259,6 +307,44 @@ def csd2dec(csd_str):
 #csd2dec_vec = np.frompyfunc(csd2dec, 1, 1)
 csd2dec_vec = np.vectorize(csd2dec) # safer than np.frompyfunc()
 
+# value of the digits 0 ... 9, A ... F, a ... f, indexed by unicode code point;
+# all other code points < 128 are marked as invalid by -1
+DIGIT_VALUES = np.full(128, -1, dtype=np.int64)
+DIGIT_VALUES[[ord(c) for c in '0123456789ABCDEF']] = np.arange(16)
+DIGIT_VALUES[[ord(c) for c in 'abcdef']] = np.arange(10, 16)
+
+# valid decimal strings after removing illegal characters
+DEC_REGEX = re.compile(r'-?(\d+\.?\d*|\.\d+)$')
+
+def _clean_frmt_str(y_str, regex):
+    """
+    Remove illegal characters (matched by the compiled `regex`) and leading zeros
+    from the string `y_str`, replace ',' by '.' and prepend a '0' when the string
+    starts with the radix point.
+
+    Return the cleaned string, the string without radix point and the number
+    of fractional places (zero when there is no or more than one radix point).
+    """
+    val_str = regex.sub('', y_str).lstrip('0').replace(',', '.')
+    if val_str[:1] == '.':
+        val_str = '0' + val_str
+    if val_str.count('.') == 1:
+        frc_places = len(val_str) - val_str.index('.') - 1
+    else:
+        frc_places = 0
+    return val_str, val_str.replace('.', ''), frc_places
+
+def str2codes(y_str):
+    """
+    Convert a 1D array of strings `y_str` with length N to an integer array
+    with shape (N, L) of unicode code points, L being the length of the longest
+    string. Shorter strings are padded with code point 0, this is the inverse
+    of `codes2str()`.
+    """
+    y_str = np.ascontiguousarray(y_str, dtype='U')
+    L = y_str.dtype.itemsize // 4
+    return y_str.view(np.uint32).reshape(len(y_str), L)
+
 #------------------------------------------------------------------------
 class Fixed(object):
     """
@@ -348,7 +434,9 @@ class Fixed(object):
 
                         -1: negative overflow
 
-        has occured during last fixpoint conversion
+        has occured during last fixpoint conversion. For real numeric arrays,
+        no flags are created (`ovr_flag` = 0), only the counters below are
+        updated.
 
     N_over : integer
         total number of overflows
@@ -389,10 +477,10 @@ class Fixed(object):
         # arguments for regex replacement with illegal characters
         # ^ means "not", | means "or" and \ escapes
         self.FRMT_REGEX = {
-                'bin' : r'[^0|1|.|,|\-]',
-                'csd' : r'[^0|\+|\-|.|,]',
-                'dec' : r'[^0-9|.|,|\-]',
-                'hex' : r'[^0-9A-Fa-f|.|,|\-]'
+                'bin' : re.compile(r'[^0|1|.|,|\-]'),
+                'csd' : re.compile(r'[^0|\+|\-|.|,]'),
+                'dec' : re.compile(r'[^0-9|.|,|\-]'),
+                'hex' : re.compile(r'[^0-9A-Fa-f|.|,|\-]')
                         }
 
     def setQobj(self, q_obj):
@@ -464,7 +552,7 @@ class Fixed(object):
         self.ovr_flag = 0
 
 #------------------------------------------------------------------------------
-    def fixp(self, y, scaling='mult'):
+    def fixp(self, y, scaling='mult', out=None, int_out=False):
         """
         Return fixed-point integer or fractional representation for `y`
         (scalar or array-like) with the same shape as `y`.
@@ -472,6 +560,10 @@ class Fixed(object):
         Saturation / two's complement wrapping happens outside the range +/- MSB,
         requantization (round, floor, fix, ...) is applied on the ratio `y / LSB`.
 
+        Real numeric arrays are quantized by ``_fixp_array()`` in the integer
+        domain without temporary copies of the data, only the overflow counters
+        are updated (no array of overflow flags is created).
+
         Parameters
         ----------
         y: scalar or array-like object
@@ -489,6 +581,17 @@ class Fixed(object):
              
             For all other settings, `y` is transformed unscaled.
 
+        out: ndarray or None
+            Optional output array with the same shape as `y` for real numeric
+            arrays `y`. It needs to be of type float64 (or int64 for
+            ``int_out=True``); passing `y` itself quantizes `y` in place.
+
+        int_out: bool
+            When True, return the fixpoint integers (in multiples of LSB) as
+            int64 instead of floats. The result is not divided by `self.scale`.
+            This requires a quantization method other than 'none' and finite
+            values of `y`.
+
         Returns
         -------
         float scalar or ndarray
@@ -526,6 +629,8 @@ class Fixed(object):
             # for speedup, test for invalid types
             SCALAR = False
             y = np.asarray(y) # convert lists / tuples / ... to numpy arrays
+            if y.dtype.kind in {'b', 'i', 'u', 'f'}: # real numeric array
+                return self._fixp_array(y, scaling.lower(), out, int_out)
             yq = np.zeros(y.shape)
             over_pos = over_neg = np.zeros(y.shape, dtype = bool)
             self.ovr_flag = np.zeros(y.shape, dtype = int)
@@ -605,7 +710,8 @@ class Fixed(object):
             raise Exception('Unknown Requantization type "%s"!'%(self.quant))
 
         yq = yq * self.LSB
-        logger.debug("y_in={0} | y={1} | yq={2}".format(y_in, y, yq))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("y_in={0} | y={1} | yq={2}".format(y_in, y, yq))
 
         #======================================================================
         # (4) : Handle Overflow / saturation in relation to MSB
@@ -629,9 +735,11 @@ class Fixed(object):
                 yq = np.where(over_pos, self.MAX, yq) # (cond, true, false)
                 yq = np.where(over_neg, self.MIN, yq)
             # Replace overflows by two's complement wraparound (wrap)
+            # (modulo 2**W like in `_fixp_array()`, MAX - MIN + LSB = 2**W * LSB)
             elif self.ovfl == 'wrap':
-                yq = np.where(over_pos | over_neg,
-                    yq - 4. * self.MSB*np.fix((np.sign(yq) * 2 * self.MSB+yq)/(4*self.MSB)), yq)
+                with np.errstate(invalid='ignore'):
+                    yq = np.where(over_pos | over_neg, self.MIN +
+                        np.mod(yq - self.MIN, self.MAX - self.MIN + self.LSB), yq)
             else:
                 raise Exception('Unknown overflow type "%s"!'%(self.ovfl))
                 return None
@@ -642,12 +750,90 @@ class Fixed(object):
         #       float2frmt passes on the scaling argument
         #======================================================================
 
-        if scaling in {'div', 'multdiv'}:
+        if int_out:
+            yq = np.asarray(np.round(np.divide(yq, self.LSB))).astype(np.int64)
+        elif scaling in {'div', 'multdiv'}:
             yq = yq / self.scale
 
         if SCALAR and isinstance(yq, np.ndarray):
             yq = yq.item() # convert singleton array to scalar
+        elif out is not None:
+            out[...] = yq
+            yq = out
+
+        return yq
+
+#------------------------------------------------------------------------------
+    def _fixp_array(self, y, scaling, out=None, int_out=False):
+        """
+        Quantize and saturate / wrap the real numeric array `y` in the integer
+        domain, called by ``fixp()`` with the same arguments. All operations
+        work in place on the result array, i.e. apart from the result (and
+        the int64 conversion for ``int_out=True``) no full-size temporary
+        arrays are created. Instead of an array with overflow flags, only the
+        number of overflows is counted.
+        """
+        if out is not None and out.dtype == np.float64:
+            yq = out
+        else:
+            yq = None # allocate new float array
+        # (2) scale to multiples of LSB (exact for powers of two) and by `scale`
+        yq = np.multiply(y, 1. / self.LSB, out=yq, dtype=np.float64)
+        if scaling in {'mult', 'multdiv'} and self.scale != 1:
+            np.multiply(yq, self.scale, out=yq)
+
+        # (3) quantize to fixpoint integers (float64)
+        if   self.quant == 'floor': np.floor(yq, out=yq)
+        elif self.quant == 'round': np.round(yq, out=yq)
+        elif self.quant == 'fix':   np.trunc(yq, out=yq) # = np.fix, safe in place
+        elif self.quant == 'ceil':  np.ceil(yq, out=yq)
+        elif self.quant == 'rint':  np.rint(yq, out=yq)
+        elif self.quant == 'none':  pass
+        else:
+            raise Exception('Unknown Requantization type "%s"!'%(self.quant))
+
+        # (4) overflow handling with integer limits
+        self.ovr_flag = 0 # flags are only provided for scalar arguments
+        if self.ovfl != 'none' and yq.size > 0:
+            MIN = self.MIN / self.LSB
+            MAX = self.MAX / self.LSB
+            # Count overflows only when the extreme values (ignoring nan)
+            # exceed the limits, the reductions don't need temporary arrays
+            N_neg = N_pos = 0
+            with np.errstate(invalid='ignore'):
+                if np.fmin.reduce(yq, axis=None) < MIN:
+                    N_neg = np.count_nonzero(yq < MIN)
+                if np.fmax.reduce(yq, axis=None) > MAX:
+                    N_pos = np.count_nonzero(yq > MAX)
+            self.N_over_neg += N_neg
+            self.N_over_pos += N_pos
+            self.N_over = self.N_over_neg + self.N_over_pos
+
+            if N_neg + N_pos > 0:
+                if self.ovfl == 'sat':
+                    np.clip(yq, MIN, MAX, out=yq)
+                elif self.ovfl == 'wrap':
+                    # two's complement wrap-around modulo 2**W
+                    with np.errstate(invalid='ignore'):
+                        np.subtract(yq, MIN, out=yq)
+                        np.mod(yq, MAX - MIN + 1, out=yq)
+                        np.add(yq, MIN, out=yq)
+                else:
+                    raise Exception('Unknown overflow type "%s"!'%(self.ovfl))
+
+        # (5) return fixpoint integers or rescale to float
+        if int_out:
+            if out is None:
+                return yq.astype(np.int64)
+            np.copyto(out, yq, casting='unsafe')
+            return out
 
+        np.multiply(yq, self.LSB, out=yq)
+        if scaling in {'div', 'multdiv'}:
+            np.divide(yq, self.scale, out=yq)
+        if out is not None and out is not yq:
+            np.copyto(out, yq, casting='unsafe')
+            return out
         return yq
 
 #------------------------------------------------------------------------------
@@ -661,8 +847,8 @@ class Fixed(object):
 #------------------------------------------------------------------------------
     def frmt2float(self, y, frmt=None):
         """
-        Return floating point representation for fixpoint scalar `y` given in
-        format `frmt`.
+        Return floating point representation for fixpoint scalar or array-like
+        `y` given in format `frmt`.
 
         * When input format is float, return unchanged
         * else:
@@ -674,9 +860,13 @@ class Fixed(object):
             - Calculate fixpoint float representation `y_float = fixp(y_dec, scaling='div')`,
               dividing the result by `scale`.
 
+        Arrays of strings are converted element-wise using numpy string and
+        integer operations and a single call to `fixp()`. Strings that cannot
+        be converted are replaced by zero.
+
         Parameters
         ----------
-        y: scalar or string
+        y: scalar, string or array-like of scalars / strings
             to be quantized with the numeric base specified by `frmt`.
 
         frmt: string (optional)
@@ -685,9 +875,10 @@ class Fixed(object):
 
         Returns
         -------
-        quantized floating point (`dtype=np.float64`) representation of input string
+        quantized floating point (`dtype=np.float64`) representation of input
+        string, an array with the shape of `y` for array-like input
         """
-        if y == "":
+        if np.ndim(y) == 0 and y == "":
             return 0
 
         if frmt is None:
@@ -705,6 +896,9 @@ class Fixed(object):
             try:
                 y_float = np.float64(y)
             except ValueError:
+                if np.ndim(y) > 0: # convert element-wise
+                    return np.array([self.frmt2float(v, frmt) for v in np.ravel(y)]
+                                    ).reshape(np.shape(y))
                 try:
                     y_float = np.complex(y).real
                 except Exception as e:
@@ -712,113 +906,101 @@ class Fixed(object):
                     logger.warning("Can't convert {0}: {1}".format(y,e))
             return y_float
 
-        else: # {'dec', 'bin', 'hex', 'csd'}
-         # Find the number of places before the first radix point (if there is one)
-         # and join integer and fractional parts
-         # when returned string is empty, skip general conversions and rely on error handling
-         # of individual routines
-         # remove illegal characters and trailing zeros
-            val_str = re.sub(self.FRMT_REGEX[frmt],r'', qstr(y)).lstrip('0')
-            if len(val_str) > 0:
-                val_str = val_str.replace(',','.') # ',' -> '.' for German-style numbers
-                if val_str[0] == '.': # prepend '0' when the number starts with '.'
-                    val_str = '0' + val_str
-
-                # count number of fractional places in string
-                try:
-                    _, frc_str = val_str.split('.') # split into integer and fractional places
-                    frc_places = len(frc_str)
-                except ValueError: # no fractional part
-                    frc_places = 0
-
-                raw_str = val_str.replace('.','') # join integer and fractional part
-
-                logger.debug("y={0}, val_str={1}, raw_str={2} ".format(y, val_str, raw_str))
-            else:
-                return 0.0
+        elif frmt not in {'dec', 'bin', 'hex', 'csd'}:
+            logger.error('Unknown output format "{0}"!'.format(frmt))
+            return 0.0
 
-        # (1) calculate the decimal value of the input string using np.float64()
-        #     which takes the number of decimal places into account.
+        shape = np.shape(y)
+        if len(shape) == 0:
+            y_str = np.array([qstr(y)])
+        else:
+            y_str = np.asarray(y)
+            if y_str.dtype.kind == 'S':
+                y_str = np.char.decode(y_str, 'utf-8')
+            y_str = y_str.astype('U').ravel()
+
+        # Remove illegal characters and leading zeros, find the number of places
+        # after the radix point (if there is one) and join integer and fractional parts
+        val_str, raw_str, frc_places = np.frompyfunc(_clean_frmt_str, 2, 3)(
+                                                y_str, self.FRMT_REGEX[frmt])
+        raw_str = raw_str.astype('U')
+        frc_places = frc_places.astype(np.int64)
+        valid = val_str.astype(bool) # empty strings are converted to zero
+        empty = ~valid
+
+        # (1) calculate the decimal value of the input string
         # (2) quantize and saturate
         # (3) divide by scale
         if frmt == 'dec':
-            # try to convert string -> float directly with decimal point position
-            try:
-                y_dec = y_float = self.fixp(val_str, scaling='div')
-            except Exception as e:
-                logger.warning(e)
+            # convert string -> float directly with decimal point position
+            valid &= np.frompyfunc(DEC_REGEX.match, 1, 1)(val_str).astype(bool)
+            y_dec = np.where(valid, val_str, '0').astype('U').astype(np.float64)
 
         elif frmt in {'hex', 'bin'}:
             # - Glue integer and fractional part to a string without radix point
             # - Check for a negative sign, use this information only in the end
+            # - Calculate the integer value of the M = WI + 1 + <fractional bits>
+            #   LSBs, discarding the MSBs outside the fixpoint range
             # - Divide by <base> ** <number of fractional places> for correct scaling
-            # - Strip MSBs outside fixpoint range
             # - Transform numbers in negative 2's complement to negative floats.
             # - Calculate the fixpoint representation for correct saturation / quantization
-            neg_sign = False
-            try:
-                if raw_str[0] == '-':
-                    neg_sign = True
-                    raw_str = raw_str.lstrip('-')
-
-                y_dec = abs(int(raw_str, self.base) / self.base**frc_places)
-
-                if y_dec == 0:  # avoid log2(0)
-                    return 0
-
-                int_bits = max(int(np.floor(np.log2(y_dec))) + 1, 0)
-                # When number is outside fixpoint range, discard MSBs:
-                if int_bits > self.WI + 1:
-                    if frmt == 'hex':
-                        raw_str = np.binary_repr(int(raw_str, 16))
-                    # discard the upper bits outside the valid range
-                    raw_str = raw_str[int_bits - self.WI - 1:] 
-
-                    # recalculate y_dec for truncated string
-                    y_dec = int(raw_str, 2) / self.base**frc_places 
-
-                    if y_dec == 0: # avoid log2(0) error in code below
-                        return 0
-
-                    int_bits = max(int(np.floor(np.log2(y_dec))) + 1, 0) # ... and int_bits
-                # now, y_dec is in the correct range:
-                if int_bits <= self.WI: # positive number
-                    pass
-                elif int_bits == self.WI + 1: # negative, calculate 2's complemente
-                    y_dec = y_dec - (1 << int_bits)
-                # quantize / saturate / wrap & scale the integer value:
-                if neg_sign:
-                    y_dec = -y_dec
-                y_float = self.fixp(y_dec, scaling='div')
-            except Exception as e:
-                logger.warning(e)
-                y_dec = y_float = None
-
-            logger.debug("MSB={0} | LSB={1} | scale={2}".format(self.MSB, self.LSB, self.scale))
-            logger.debug("y_in={0} | y_dec={1}".format(y, y_dec))
+            bits = 1 if frmt == 'bin' else 4 # number of bits per digit
+            frc_bits = bits * frc_places
+            M = self.WI + 1 + frc_bits
+
+            codes = str2codes(raw_str)
+            # power of <base> for each digit, negative for padding after the string
+            exp = np.count_nonzero(codes, axis=1)[:, None] - 1 - np.arange(codes.shape[1])
+            # leading '-' characters (there may be more than one) are the sign
+            sign = np.cumprod(codes == ord('-'), axis=1).astype(bool)
+            neg_sign = sign[:, 0]
+            digits = np.where(sign, 0, DIGIT_VALUES[np.minimum(codes, 127)])
+            valid &= ~np.any((exp >= 0) & ((digits < 0) | (digits >= 1 << bits)
+                                                        | (codes > 127)), axis=1)
+            # int64 arithmetics for up to 60 bits (<= 63 bits before masking)
+            fast = M <= 60
+            keep = (valid & fast)[:, None] & (exp >= 0) & (exp * bits < M[:, None])
+            y_int = np.sum(np.where(keep, digits << np.where(keep, exp * bits, 0), 0),
+                           axis=1)
+            y_int &= (np.int64(1) << np.where(fast, M, 0)) - 1
+            # negative two's complement numbers with MSB = 1
+            y_int -= np.where(y_int >= np.int64(1) << np.where(fast, M - 1, 0),
+                              np.int64(1) << np.where(fast, M, 0), 0)
+            y_dec = y_int / 2.**frc_bits
+
+            for i in np.flatnonzero(valid & ~fast): # longer strings: python ints
+                v = int(raw_str[i].lstrip('-'), 1 << bits) & ((1 << int(M[i])) - 1)
+                if v >= 1 << int(M[i] - 1):
+                    v -= 1 << int(M[i])
+                y_dec[i] = v / 2.**frc_bits[i]
+
+            y_dec = np.where(neg_sign, -y_dec, y_dec)
         # ----
         elif frmt == 'csd':
             # - Glue integer and fractional part to a string without radix point
+            # - Sum up +/- 2 ** <position>, all other characters are ignored
             # - Divide by 2 ** <number of fractional places> for correct scaling
-            # - Calculate fixpoint representation for saturation / overflow effects
-
-            y_dec = csd2dec_vec(raw_str) # csd -> integer
-            if y_dec is not None:
-                y_float = self.fixp(y_dec / 2**frc_places, scaling='div')
-        # ----
-        else:
-            logger.error('Unknown output format "%s"!'.format(frmt))
-
-        if frmt != "float": 
+            codes = str2codes(raw_str)
+            exp = np.count_nonzero(codes, axis=1)[:, None] - 1 - np.arange(codes.shape[1])
+            sign = np.where(codes == ord('+'), 1., np.where(codes == ord('-'), -1., 0.))
+            y_dec = np.sum(sign * 2.**(exp - frc_places[:, None]), axis=1)
+
+        if np.any(~valid & ~empty):
+            invalid = y_str[~valid & ~empty]
+            logger.warning("Can't convert {0} value(s) in format '{1}', e.g. '{2}', "
+                           "replacing by 0.".format(len(invalid), frmt, invalid[0]))
+        y_dec = np.where(valid, y_dec, 0.)
+        # quantize / saturate / wrap & scale the decimal value:
+        y_float = self.fixp(y_dec, scaling='div')
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("MSB={0:g} |  scale={1:g} | raw_str={2} | val_str={3}"\
                          .format(self.MSB, self.scale, raw_str, val_str))
             logger.debug("y={0} | y_dec = {1} | y_float={2}".format(y, y_dec, y_float))
 
-
-        if y_float is not None:
-            return y_float
-        else:
-            return 0.0
+        if len(shape) == 0:
+            return y_float.item()
+        return y_float.reshape(shape)
 
 #------------------------------------------------------------------------------
     def float2frmt(self, y):
@@ -846,22 +1028,6 @@ class Fixed(object):
         digits is returned.
         """
 
-        """
-        Define vectorized functions using numpys automatic type casting:
-        Vectorized functions for inserting binary point in string `bin_str`
-        after position `pos`.
-
-        Usage:  insert_binary_point(bin_str, pos)
-
-        Parameters: bin_str : string
-                    pos     : integer
-        """
-        insert_binary_point = np.vectorize(lambda bin_str, pos:(
-                                    bin_str[:pos+1] + "." + bin_str[pos+1:]))
-
-        binary_repr_vec = np.frompyfunc(np.binary_repr, 2, 1)
-        #======================================================================
-
         if self.frmt == 'float': # return float input value unchanged (no string)
             return y
         elif self.frmt == 'float32':
@@ -888,18 +1054,11 @@ class Fixed(object):
             else: # bin or hex
                 # represent fixpoint number as integer in the range -2**(W-1) ... 2**(W-1)
                 y_fix_int = np.int64(np.round(y_fix / self.LSB))
-                # convert to (array of) string with 2's complement binary
-                y_bin_str = binary_repr_vec(y_fix_int, self.W)
-
+                # convert to (array of) string with 2's complement binary / hex
                 if self.frmt == 'hex':
-                    y_str = bin2hex_vec(y_bin_str, self.WI)
-
-                else: # self.frmt == 'bin':
-                    # insert radix point if required
-                    if self.WF > 0:
-                        y_str = insert_binary_point(y_bin_str, self.WI)
-                    else:
-                        y_str = y_bin_str
+                    y_str = int2hex_vec(y_fix_int, self.W, self.WI)
+                else: # self.frmt == 'bin', insert radix point if required
+                    y_str = int2bin_vec(y_fix_int, self.W, self.WI)
 
             if isinstance(y_str, np.ndarray) and np.ndim(y_str) < 1:
                 y_str = y_str.item() # convert singleton array to scalar
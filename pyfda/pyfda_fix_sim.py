@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the pyFDA project hosted at https://github.com/chipmuenk/pyfda
+#
+# Copyright © pyFDA Project Contributors
+# Licensed under the terms of the MIT License
+# (see file LICENSE in root directory for details)
+
+"""
+Bit-true simulation of fixpoint filters (FIR, direct form I / transposed direct
+form II IIR, cascaded second-order sections) in the integer domain.
+
+All signals are represented by integers in multiples of their LSB, the
+fractional word length of each node is tracked separately. Quantization and
+overflow behaviour is defined by dicts in the format used by
+`pyfda.pyfda_fix_lib.Fixed` for
+
+- `q_input`: input signal
+- `q_coeff`: coefficients
+- `q_mult`: products (optional, default: full precision)
+- `q_accu`: accumulator (optional, default: full precision)
+- `q_out`: output signal and feedback path of recursive filters
+
+Non-recursive parts of a filter are calculated for whole blocks of samples
+with numpy (int64 or python integers for very long words), only the
+recursive part is calculated sample by sample.
+
+Example
+-------
+
+>>> fx = FixFilter(fb.fil[0], q_input={'WI':0, 'WF':15, 'quant':'round', 'ovfl':'sat'},
+...                q_out={'WI':0, 'WF':15, 'quant':'floor', 'ovfl':'wrap'})
+>>> y = fx.process(x) # quantized output
+>>> fx.N_over # number of overflows per node
+"""
+from __future__ import division, print_function, unicode_literals
+
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from pyfda.pyfda_fix_lib import Fixed
+
+__version__ = 0.1
+
+QUANT_MODES = {'floor', 'round', 'fix', 'ceil', 'rint', 'none'}
+OVFL_MODES = {'wrap', 'sat', 'none'}
+
+# maximum number of bits for vectorized calculations with int64
+INT64_BITS = 62
+
+#------------------------------------------------------------------------------
+class IntQuant(object):
+    """
+    Requantize and saturate / wrap integer signals in the integer domain.
+
+    The input values are integers in multiples of 2 ** -WF_in, the result
+    is given in multiples of the LSB 2 ** -WF of the quantizer. Rounding
+    modes and overflow behaviour are the same as for `Fixed.fixp()`, i.e.
+    'round' and 'rint' both round half to even (like `np.round()`).
+
+    With `quant = 'none'` the values are passed with the fractional word length
+    of the input, with `ovfl = 'none'` no overflow handling is performed. When
+    `q_obj` is None, the quantizer is transparent.
+
+    Parameters
+    ----------
+    q_obj : dict or None
+        quantization dict in the format used by `Fixed`, the keys 'frmt' and
+        'scale' are ignored
+
+    Instance Attributes
+    -------------------
+    N_over : integer
+        number of overflows since the last reset
+    """
+    def __init__(self, q_obj=None):
+        if q_obj is None:
+            q_obj = {'WI':0, 'WF':0, 'quant':'none', 'ovfl':'none'}
+        q = Fixed(dict(q_obj)) # complete and check the dict
+        self.q_obj = q.q_obj
+        self.WI, self.WF, self.quant, self.ovfl = q.WI, q.WF, q.quant, q.ovfl
+        if self.quant not in QUANT_MODES:
+            raise ValueError('Unknown quantization type "{0}"!'.format(self.quant))
+        if self.ovfl not in OVFL_MODES:
+            raise ValueError('Unknown overflow type "{0}"!'.format(self.ovfl))
+        self.transparent = self.quant == 'none' and self.ovfl == 'none'
+        self.N_over = 0
+
+    def wf(self, WF_in):
+        """
+        Return the fractional word length of the result for an input with
+        fractional word length `WF_in`.
+        """
+        return WF_in if self.quant == 'none' else self.WF
+
+    def requant(self, y, WF_in):
+        """
+        Requantize and saturate / wrap the integer array `y` (dtype int64 or
+        object) with fractional word length `WF_in`, return an array with
+        fractional word length `self.wf(WF_in)`.
+        """
+        if self.transparent:
+            return y
+        WF = self.wf(WF_in)
+        s = WF_in - WF
+        if s < 0:
+            y = y << -s
+        elif s > 0:
+            q = y >> s # floor
+            if self.quant == 'ceil':
+                q = -((-y) >> s)
+            elif self.quant == 'fix':
+                q = np.where(y < 0, -((-y) >> s), q)
+            elif self.quant in {'round', 'rint'}: # round half to even
+                r = y - (q << s)
+                half = 1 << (s - 1)
+                q = q + ((r > half) | ((r == half) & ((q & 1) == 1)))
+            y = q
+
+        if self.ovfl != 'none' and np.size(y) > 0:
+            MIN = -(1 << (self.WI + WF))
+            MAX = (1 << (self.WI + WF)) - 1
+            if np.min(y) < MIN or np.max(y) > MAX:
+                self.N_over += int(np.count_nonzero((y < MIN) | (y > MAX)))
+                if self.ovfl == 'sat':
+                    y = np.clip(y, MIN, MAX)
+                else: # two's complement wrap-around
+                    y = ((y - MIN) & ((1 << (self.WI + WF + 1)) - 1)) + MIN
+        return y
+
+    def requant_int(self, y, WF_in):
+        """
+        Same as `requant()` for a single python integer `y`.
+        """
+        if self.transparent:
+            return y
+        WF = self.wf(WF_in)
+        s = WF_in - WF
+        if s < 0:
+            y <<= -s
+        elif s > 0:
+            if self.quant == 'floor':
+                y >>= s
+            elif self.quant == 'ceil':
+                y = -((-y) >> s)
+            elif self.quant == 'fix':
+                y = -((-y) >> s) if y < 0 else y >> s
+            else: # round half to even
+                q = y >> s
+                r = y - (q << s)
+                half = 1 << (s - 1)
+                y = q + 1 if r > half or (r == half and q & 1) else q
+
+        if self.ovfl != 'none':
+            lim = 1 << (self.WI + WF)
+            if y < -lim or y >= lim:
+                self.N_over += 1
+                if self.ovfl == 'sat':
+                    y = -lim if y < 0 else lim - 1
+                else:
+                    y = ((y + lim) & (2 * lim - 1)) - lim
+        return y
+
+    def bits(self, WF_in, bits_in):
+        """
+        Return an upper bound for the number of bits (incl. sign) of the result
+        and of intermediate values for an input with `bits_in` bits and
+        fractional word length `WF_in`.
+        """
+        bits = bits_in + max(self.wf(WF_in) - WF_in, 0) + 1
+        if self.ovfl != 'none':
+            return max(bits, self.WI + self.wf(WF_in) + 1)
+        return bits
+
+#------------------------------------------------------------------------------
+class FixFilter(object):
+    """
+    Bit-true fixpoint simulation of the filter defined by the filter dict
+    `fil_dict` (e.g. `fb.fil[0]`).
+
+    The coefficients are taken from `fil_dict['ba']` resp. from
+    `fil_dict['sos']` for a cascade of second-order sections, they are
+    normalized to `a[0] = 1` before quantization.
+
+    For each section and each output sample,
+
+    - the products of coefficients and input resp. output samples are
+      calculated with full precision and requantized with `q_mult`,
+    - the products are summed up with full precision, the sum is requantized
+      and saturated / wrapped with `q_accu`,
+    - the accumulator is requantized with `q_out`, giving the output of the
+      section and the value in the feedback path.
+
+    For the transposed direct form II ('df2t'), the state registers are
+    requantized with `q_accu` after each addition. Sections are cascaded
+    without additional requantization, i.e. the output format `q_out` is
+    the input format of the next section.
+
+    The state of the filter is kept between calls of `process()`, i.e. long
+    signals can be processed in blocks.
+
+    Parameters
+    ----------
+    fil_dict : dict
+        filter dict with the keys 'ba', 'sos' and 'ft' and the
+        coefficient quantization 'q_coeff' (when `q_coeff` is None)
+
+    q_input, q_coeff, q_mult, q_accu, q_out : dict or None
+        quantization dicts (see `Fixed`) for input, coefficients, products,
+        accumulator and output. When `q_input` is None, the format 'Q0.15' with
+        rounding and saturation is used, `q_out` defaults to `q_input`.
+        `q_mult` and `q_accu` default to full precision without overflows.
+
+    structure : str
+        'df1' (direct form I, default) or 'df2t' (transposed direct form II)
+
+    sos : bool or None
+        Simulate a cascade of second-order sections. When None (default),
+        second-order sections are used for IIR filters when `fil_dict['sos']`
+        is available.
+    """
+    def __init__(self, fil_dict, q_input=None, q_coeff=None, q_mult=None,
+                 q_accu=None, q_out=None, structure='df1', sos=None):
+
+        if q_input is None:
+            q_input = {'WI':0, 'WF':15, 'quant':'round', 'ovfl':'sat'}
+        if q_out is None:
+            q_out = q_input
+        if q_coeff is None:
+            q_coeff = fil_dict['q_coeff']
+
+        self.structure = structure.lower()
+        if self.structure not in {'df1', 'df2t'}:
+            raise ValueError('Unknown filter structure "{0}"!'.format(structure))
+
+        # the float -> integer conversion of input and coefficients uses `Fixed`
+        self.Q_input = Fixed(dict(q_input, scale=1))
+        self.Q_coeff = Fixed(dict(q_coeff, scale=1))
+        for Q, name in ((self.Q_input, 'input'), (self.Q_coeff, 'coefficient')):
+            if Q.quant == 'none':
+                raise ValueError("The {0} quantization must not be 'none'.".format(name))
+        self.Q_mult = IntQuant(q_mult)
+        self.Q_accu = IntQuant(q_accu)
+        self.Q_out = IntQuant(q_out)
+
+        if sos is None:
+            sos = fil_dict.get('ft', 'FIR') == 'IIR' and np.ndim(fil_dict.get('sos', [])) == 2
+        if sos:
+            sections = [(s[:3], s[3:]) for s in np.asarray(fil_dict['sos'], dtype=float)]
+        else:
+            sections = [(fil_dict['ba'][0], fil_dict['ba'][1])]
+
+        # integer coefficients, the normalized a[0] = 1 is not stored
+        self.coeffs = []
+        for b, a in sections:
+            b = np.atleast_1d(np.asarray(b, dtype=float))
+            a = np.atleast_1d(np.asarray(a, dtype=float))
+            b, a = b / a[0], np.trim_zeros(a / a[0], 'b')
+            B = self.Q_coeff.fixp(b, int_out=True)
+            A = self.Q_coeff.fixp(a[1:], int_out=True)
+            if len(A) > 0 and self.Q_out.quant == 'none':
+                raise ValueError("The output quantization of recursive filters "
+                                 "must not be 'none'.")
+            self.coeffs.append((B, A))
+
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """
+        Reset the filter states and the overflow counters.
+        """
+        self.zi = [None] * len(self.coeffs)
+        for Q in (self.Q_input, self.Q_mult, self.Q_accu, self.Q_out):
+            Q.N_over = 0
+
+    @property
+    def N_over(self):
+        """
+        Dict with the number of overflows for each node since the last reset.
+        Coefficient overflows are only counted once during initialization.
+        """
+        return {'input': int(self.Q_input.N_over), 'coeff': int(self.Q_coeff.N_over),
+                'mult': self.Q_mult.N_over, 'accu': self.Q_accu.N_over,
+                'out': self.Q_out.N_over}
+
+#------------------------------------------------------------------------------
+    def process(self, x, int_in=False, int_out=False):
+        """
+        Filter the signal block `x`, continuing with the filter state of the
+        previous block.
+
+        Parameters
+        ----------
+        x : array_like
+            input signal, float values or integers in multiples of the input
+            LSB (when `int_in` is True)
+
+        int_in : bool
+            input signal consists of fixpoint integers in the `q_input` format,
+            only overflows are handled
+
+        int_out : bool
+            return fixpoint integers in the `q_out` format instead of floats
+
+        Returns
+        -------
+        y : ndarray
+            output signal, dtype float64 or int64 (object for more than 63 bits)
+        """
+        WF = self.Q_input.WF
+        if int_in:
+            Q = IntQuant(dict(self.Q_input.q_obj, quant='none'))
+            X = Q.requant(np.asarray(x, dtype=np.int64), WF)
+            self.Q_input.N_over += Q.N_over
+        else:
+            X = self.Q_input.fixp(np.asarray(x, dtype=float), int_out=True)
+        bits = self._bits(X)
+
+        for i, (B, A) in enumerate(self.coeffs):
+            if self.structure == 'df2t':
+                X, WF, bits = self._df2t(i, X, WF, bits, B, A)
+            else:
+                X, WF, bits = self._df1(i, X, WF, bits, B, A)
+
+        if int_out:
+            return X
+        return X.astype(np.float64) / 2.**WF if X.dtype == object else X / 2.**WF
+
+#------------------------------------------------------------------------------
+    def _formats(self, WF, bits, B, A):
+        """
+        Return the fractional word lengths of feed-forward products, feedback
+        products, sum, accumulator and output of a section and an upper bound
+        for the number of bits needed for the vectorized calculations.
+        """
+        WF_c, bits_c = self.Q_coeff.WF, max(self._bits(B), self._bits(A))
+        WF_pb = self.Q_mult.wf(WF_c + WF)
+        if len(A) > 0:
+            WF_pa = self.Q_mult.wf(WF_c + self.Q_out.WF)
+        else:
+            WF_pa = WF_pb
+        WF_s = max(WF_pb, WF_pa) # products are aligned to WF_s for summation
+        WF_acc = self.Q_accu.wf(WF_s)
+        WF_y = self.Q_out.wf(WF_acc)
+        bits_pb = self.Q_mult.bits(WF_c + WF, bits + bits_c) + WF_s - WF_pb
+        bits_sum = bits_pb + int(np.ceil(np.log2(len(B) + 1))) + 1
+        bits_sum = self.Q_accu.bits(WF_s, bits_sum) + max(WF_acc - WF_s, 0)
+        return WF_pb, WF_pa, WF_s, WF_acc, WF_y, bits_sum
+
+    def _product(self, X, c, WF, WF_s):
+        """
+        Return the product of the integer array `X` (fractional word length `WF`)
+        and the integer coefficient `c`, requantized with `q_mult` and aligned
+        to the fractional word length `WF_s`.
+        """
+        WF_p = self.Q_coeff.WF + WF
+        return self.Q_mult.requant(X * int(c), WF_p) << (WF_s - self.Q_mult.wf(WF_p))
+
+    @staticmethod
+    def _dtype(bits):
+        return np.int64 if bits <= INT64_BITS else object
+
+    @staticmethod
+    def _bits(Y):
+        """
+        Return the number of bits (incl. sign) needed for the integers in `Y`
+        """
+        if len(Y) == 0:
+            return 1
+        return max(int(np.max(Y)).bit_length(), (-int(np.min(Y)) - 1).bit_length()) + 1
+
+    @staticmethod
+    def _int_array(Y):
+        """
+        Convert the list of python integers `Y` to an int64 array (object array
+        for more than 64 bits).
+        """
+        try:
+            return np.array(Y, dtype=np.int64)
+        except OverflowError:
+            return np.array(Y, dtype=object)
+
+#------------------------------------------------------------------------------
+    def _df1(self, i, X, WF, bits, B, A):
+        """
+        Filter the integer signal `X` with fractional word length `WF` and
+        `bits` bits with section `i` in direct form I.
+        """
+        WF_pb, WF_pa, WF_s, WF_acc, WF_y, bits_sum = self._formats(WF, bits, B, A)
+        dtype = self._dtype(bits_sum)
+        L = len(X)
+        nb, na = len(B), len(A)
+        if self.zi[i] is None:
+            self.zi[i] = (np.zeros(nb - 1, dtype=X.dtype), [0] * na)
+        x_hist, y_hist = self.zi[i]
+
+        X_ext = np.concatenate((x_hist, X)).astype(dtype)
+        acc = np.zeros(L, dtype=dtype)
+        for k in range(nb): # feed-forward products B[k] * X[n-k]
+            if B[k] != 0:
+                acc += self._product(X_ext[nb - 1 - k: nb - 1 - k + L], B[k], WF, WF_s)
+        x_hist = X_ext[len(X_ext) - (nb - 1):]
+
+        if na == 0: # non-recursive: vectorized
+            Y = self.Q_out.requant(self.Q_accu.requant(acc, WF_s), WF_acc)
+            if Y.dtype == object and self._bits(Y) <= 63:
+                Y = Y.astype(np.int64)
+        else: # recursive part sample by sample with python integers
+            A = [int(a) for a in A]
+            WF_p = self.Q_coeff.WF + WF_y
+            sh = WF_s - WF_pa
+            mult, accu, out = self.Q_mult, self.Q_accu, self.Q_out
+            Y = []
+            for v in acc.tolist():
+                for k in range(na):
+                    if A[k]:
+                        v -= mult.requant_int(A[k] * y_hist[k], WF_p) << sh
+                y = out.requant_int(accu.requant_int(v, WF_s), WF_acc)
+                y_hist = [y] + y_hist[:-1]
+                Y.append(y)
+            Y = self._int_array(Y)
+
+        self.zi[i] = (x_hist, y_hist)
+        return Y, WF_y, self._bits(Y)
+
+#------------------------------------------------------------------------------
+    def _df2t(self, i, X, WF, bits, B, A):
+        """
+        Filter the integer signal `X` with fractional word length `WF` and
+        `bits` bits with section `i` in transposed direct form II.
+        """
+        WF_pb, WF_pa, WF_s, WF_acc, WF_y, bits_sum = self._formats(WF, bits, B, A)
+        WF_t = max(WF_s, WF_acc)
+        dtype = self._dtype(bits_sum + WF_t - WF_s)
+        nb, na = len(B), len(A)
+        M = max(nb - 1, na) # number of state registers
+        B = np.concatenate((B, np.zeros(M + 1 - nb, dtype=B.dtype)))
+        A = [int(a) for a in A] + [0] * (M - na)
+        if self.zi[i] is None:
+            self.zi[i] = [0] * M
+        s = self.zi[i]
+
+        # feed-forward products for all samples, states are accumulated with
+        # WF_acc and aligned to the common fractional word length WF_t
+        X = X.astype(dtype)
+        P = [(self._product(X, c, WF, WF_s) << (WF_t - WF_s)).tolist() if c != 0
+             else [0] * len(X) for c in B]
+        WF_p = self.Q_coeff.WF + WF_y
+        sh_a = WF_t - WF_pa
+        sh_s = WF_t - WF_acc
+        mult, accu, out = self.Q_mult, self.Q_accu, self.Q_out
+        Y = []
+        for n in range(len(X)):
+            v = P[0][n] + (s[0] << sh_s if M > 0 else 0)
+            y = out.requant_int(accu.requant_int(v, WF_t), WF_acc)
+            for k in range(M):
+                v = P[k + 1][n] + (s[k + 1] << sh_s if k + 1 < M else 0)
+                if A[k]:
+                    v -= mult.requant_int(A[k] * y, WF_p) << sh_a
+                s[k] = accu.requant_int(v, WF_t)
+            Y.append(y)
+
+        self.zi[i] = s
+        Y = self._int_array(Y)
+        return Y, WF_y, self._bits(Y)
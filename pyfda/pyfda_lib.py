@@ -14,6 +14,8 @@ from __future__ import division, print_function
 import os, re
 import sys, time
 import struct
+import hashlib
+from collections import OrderedDict
 import logging
 logger = logging.getLogger(__name__)
 import numpy as np
@@ -24,6 +26,7 @@ import scipy.signal as sig
 from distutils.version import LooseVersion
 
 import pyfda.simpleeval as se
+from pyfda.filter_dict import FilterDesign
 
 ####### VERSIONS and related stuff ############################################
 # ================ Required Modules ============================
@@ -31,8 +34,8 @@ import pyfda.simpleeval as se
 # == When one of the following imports fails, terminate the program
 from numpy import __version__ as VERSION_NP
 from scipy import __version__ as VERSION_SCI
-from matplotlib import __version__ as VERSION_MPL
-from .compat import QT_VERSION_STR # imports pyQt
+# matplotlib and PyQt are only needed by the GUI, their versions are read
+# in _gui_versions() to allow for designing filters without importing them.
 
 PY32_64 = struct.calcsize("P") * 8 # yields 32 or 64, depending on 32 or 64 bit Python
 
@@ -40,8 +43,6 @@ VERSION = {}
 # VERSION.update({'python_long': sys.version})
 VERSION.update({'python': ".".join(map(str, sys.version_info[:3])) 
                             + " (" + str(PY32_64) + " Bit)"})
-VERSION.update({'matplotlib': VERSION_MPL})
-VERSION.update({'pyqt': QT_VERSION_STR})
 VERSION.update({'numpy': VERSION_NP})
 VERSION.update({'scipy': VERSION_SCI})
 
@@ -84,12 +85,27 @@ except ImportError:
 PY3 = sys.version_info > (3,) # True for Python 3
 CRLF = os.linesep # Windows: "\r\n", Mac OS: "\r", *nix: "\n" 
 
+GUI_MODULES = ('matplotlib', 'pyqt')
+
+def _gui_versions():
+    """
+    Add the versions of matplotlib and PyQt to VERSION when they are requested
+    for the first time, importing the modules if needed.
+    """
+    if 'pyqt' not in VERSION:
+        from matplotlib import __version__ as VERSION_MPL
+        from .compat import QT_VERSION_STR # imports pyQt
+        VERSION.update({'matplotlib': VERSION_MPL})
+        VERSION.update({'pyqt': QT_VERSION_STR})
+
 def cmp_version(mod, version):
     """
     Compare version number of installed module `mod` against string `version` and
     return 1, 0 or -1 if the installed version is greater, equal or less than
     the number in `version`. If `mod` is not installed, return -2.
     """
+    if mod in GUI_MODULES:
+        _gui_versions()
     if mod not in VERSION:
         return -2
     elif LooseVersion(VERSION[mod]) > LooseVersion(version):
@@ -105,6 +121,8 @@ def mod_version(mod = None):
     None. When no module is specified, return a string with all modules and
     their versions sorted alphabetically.
     """
+    if mod in GUI_MODULES or not mod:
+        _gui_versions()
     if mod:
         if mod in VERSION:
             return LooseVersion(VERSION[mod])
@@ -120,8 +138,6 @@ def mod_version(mod = None):
 
 #------------------------------------------------------------------------------
 
-logger.info("Found the following modules:" + "\n" + mod_version())
-
 SOS_AVAIL = cmp_version("scipy", "0.16") >= 0 # True when installed version = 0.16 or higher
 
 # Amplitude max, min values to prevent scipy aborts
@@ -370,12 +386,19 @@ def cround(x, n_dig = 0):
             x = np.around(x, n_dig)
     return x
 
-def H_mag(num, den, z, H_max, H_min = None, log = False, div_by_0 = 'ignore'):
+def H_mag(num, den, z, H_max, H_min = None, log = False, div_by_0 = 'ignore',
+          zpk = None):
     """
     Calculate `|H(z)|` at the complex frequency(ies) `z` (scalar or
     array-like).  The function `H(z)` is given in polynomial form with numerator and
     denominator. When log = True, `20 log_10 (|H(z)|)` is returned.
 
+    When the zeros, poles and gain `zpk` are passed as well, `|H(z)|` is
+    calculated from them in the log domain using `log_H_zpk()` which is faster
+    and numerically robust for high filter orders. The result is taken from
+    the response cache when the same filter has been evaluated on the same
+    grid `z` before.
+
     The result is clipped at H_min, H_max; clipping can be disabled by passing
     None as the argument.
 
@@ -399,12 +422,27 @@ def H_mag(num, den, z, H_max, H_min = None, log = False, div_by_0 = 'ignore'):
         'ignore'). As the denomintor of H(z) becomes 0 at each pole, warnings
         are suppressed by default. This parameter is passed to numpy.seterr(),
         hence other valid options are 'warn', 'raise' and 'print'.
+    zpk : list or None, optional
+        Zeros, poles and gain of H(z). When not None, `num` and `den` are
+        ignored.
 
     Returns
     -------
     H_mag : float or ndarray
         The magnitude |`H(z)`| for each value of `z`.
     """
+    if zpk is not None:
+        key = ('log_H_zpk', hash_args(zpk, z))
+        log_H = resp_cache.lookup(key, log_H_zpk, zpk, z)
+        # same treatment of inf and nan as for the polynomial form below:
+        # |H| = inf -> max. float, zero / zero = nan -> 0
+        log_H = np.where(np.isnan(log_H), -np.inf, log_H)
+        log_H = np.minimum(log_H, np.log10(np.finfo(float).max))
+        if log:
+            H_val = 20 * log_H
+        else:
+            H_val = 10**log_H
+        return np.clip(H_val, H_min, H_max)
 
     try: len(num)
     except TypeError:
@@ -431,6 +469,55 @@ def H_mag(num, den, z, H_max, H_min = None, log = False, div_by_0 = 'ignore'):
     # clip result to H_min / H_max
     return np.clip(H_val, H_min, H_max)
 
+LOG_H_MAX_BYTES = 2**24 # max. size of intermediate arrays in log_H_zpk()
+
+def log_H_zpk(zpk, z, max_bytes=LOG_H_MAX_BYTES):
+    """
+    Calculate `log10(|H(z)|)` at the complex frequency(ies) `z` (scalar or
+    array-like) from the zeros `z_i`, poles `p_i` and the gain `k` of H(z):
+
+    .. math::
+
+        \\log_{10}|H(z)| = \\log_{10}|k| + \\sum_i \\log_{10}|z - z_i|
+                            - \\sum_i \\log_{10}|z - p_i|
+
+    This gives the same result as the polynomial form `polyval(b, z) / polyval(a, z)`
+    in `H_mag()` but neither overflows nor loses precision for high orders.
+    The distances to the zeros and poles are calculated with broadcasting in
+    chunks of roots, limiting the size of intermediate arrays to `max_bytes`.
+
+    Parameters
+    ----------
+    zpk : list
+        Zeros, poles and gain of H(z)
+    z : complex or array-like
+        The complex frequency(ies) where `H(z)` is to be evaluated
+    max_bytes : integer, optional
+        Maximum size of the intermediate arrays
+
+    Returns
+    -------
+    log_H : float or ndarray
+        `log10(|H(z)|)` with the shape of `z`, `-inf` at the zeros and `inf`
+        at the poles of `H(z)`.
+    """
+    z = np.asarray(z)
+    zf = z.ravel().astype(complex)
+    chunk = max(1, max_bytes // (16 * max(zf.size, 1)))
+
+    def _sum_log(roots):
+        """ sum of log10|z - roots_i| """
+        roots = np.atleast_1d(np.asarray(roots, dtype=complex)).ravel()
+        roots = roots[np.isfinite(roots)]
+        acc = np.zeros(zf.shape)
+        for i in range(0, len(roots), chunk):
+            acc += np.log10(np.abs(zf[:, np.newaxis] - roots[np.newaxis, i:i+chunk])).sum(axis=1)
+        return acc
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_H = np.log10(np.abs(zpk[2])) + _sum_log(zpk[0]) - _sum_log(zpk[1])
+    return log_H.reshape(z.shape)
+
 #----------------------------------------------
 # from scipy.sig.signaltools.py:
 def cmplx_sort(p):
@@ -443,9 +530,8 @@ def cmplx_sort(p):
     return np.take(p, indx, 0), indx
 
 # adapted from scipy.signal.signaltools.py:
-# TODO:  comparison of real values has several problems (5 * tol ???)
-# TODO: speed improvements
-def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
+def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian',
+                 method='auto'):
     """
     Determine unique roots and their multiplicities from a list of roots.
 
@@ -471,6 +557,16 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
         How to measure the distance between roots: 'euclid' is the euclidian
         distance. 'manhattan' is less common, giving the
         sum of the differences of real and imaginary parts.
+    method : {'auto', 'grid', 'loop'}, optional
+        Clustering algorithm for complex roots (without `magsort`):
+        - 'auto' (default): use 'grid' for 256 roots and more, else 'loop'
+        - 'grid': sort the roots into buckets of a grid with spacing
+          `tol`, only roots in neighbouring buckets are compared (O(n log n)).
+        - 'loop': compare the first remaining root against all other roots
+          in each pass (O(n^2), reference implementation).
+        Both methods yield the same result: Taking the roots in the order
+        of `p`, each root that hasn't been assigned yet collects all
+        unassigned roots within `tol`.
 
     Returns
     -------
@@ -531,6 +627,9 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
     else:
         raise TypeError(rdist)
 
+    if method not in {'auto', 'grid', 'loop'}:
+        raise ValueError("Unknown method '{0}' for clustering roots!".format(method))
+
     mult = [] # initialize list for multiplicities
     pout = [] # initialize list for reduced output list of roots
 
@@ -553,37 +652,147 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
             pass
 
         elif (np.iscomplexobj(p) and not magsort):
-            while len(p):
-                # calculate distance of first root against all others and itself
-                # -> multiplicity is at least 1, first root is always deleted
-                tolarr = np.less(dist_roots(p[0], p), tol)                               # assure multiplicity is at least one
-                mult.append(np.sum(tolarr)) # multiplicity = number of "hits"
-                pout.append(comproot(p[tolarr])) # pick the roots within the tolerance
-
-                p = p[~tolarr]  # and delete them
+            if method == 'auto':
+                method = 'grid' if len(p) >= 256 else 'loop'
+            if method == 'grid':
+                clusters = _cluster_roots_grid(p, tol, dist_roots)
+            else:
+                clusters = _cluster_roots_loop(p, tol, dist_roots)
+            if comproot is np.mean:
+                # average all clusters at once
+                labels = np.empty(len(p), dtype=np.int64)
+                for k, c in enumerate(clusters):
+                    labels[c] = k
+                m = np.bincount(labels)
+                pout += ((np.bincount(labels, p.real) + 1j * np.bincount(labels, p.imag))
+                         / m).tolist()
+                mult += m.tolist()
+            else:
+                for c in clusters:
+                    mult.append(len(c))
+                    if len(c) == 1:
+                        pout.append(p[c[0]])
+                    else:
+                        pout.append(comproot(p[c])) # pick the roots within the tolerance
 
         else:
-            sameroots = [] # temporary list for roots within the tolerance
+            # sort-and-sweep: sorted roots within `tol` of the first root of
+            # the current cluster are assigned to it
             p,indx = cmplx_sort(p)
-            indx = len(mult)-1
-            curp = p[0] + 5 * tol # needed to avoid "self-detection" ?
-            for k in range(len(p)):
-                tr = p[k]
-                if abs(tr - curp) < tol:
-                    sameroots.append(tr)
-                    curp = comproot(sameroots)  # not correct for 'avg'
-                                                # of multiple (N > 2) root !
-                    pout[indx] = curp
-                    mult[indx] += 1
-                else:
-                    pout.append(tr)
-                    curp = tr
-                    sameroots = [tr]
-                    indx += 1
-                    mult.append(1)
+            d = dist_roots(p[1:], p[:-1]) < tol # gaps >= tol always split
+            starts = [0]
+            for k in np.nonzero(d == False)[0] + 1:
+                starts.append(k)
+            # within a run of close roots, split where roots are too far
+            # from the first root of the current cluster
+            bounds = []
+            for start, stop in zip(starts, starts[1:] + [len(p)]):
+                seed = start
+                for k in range(start + 1, stop):
+                    if not dist_roots(p[k], p[seed]) < tol:
+                        bounds.append(seed)
+                        seed = k
+                bounds.append(seed)
+            bounds = np.array(bounds)
+            m = np.diff(np.append(bounds, len(p)))
+            mult += m.tolist()
+            if comproot is np.mean:
+                pout += (np.add.reduceat(p, bounds) / m).tolist()
+            else:
+                for b, mb in zip(bounds.tolist(), m.tolist()):
+                    pout.append(p[b] if mb == 1 else comproot(p[b:b+mb]))
 
         return np.array(pout), np.array(mult)
 
+def _cluster_roots_loop(p, tol, dist_roots):
+    """
+    Cluster the roots `p`: In each pass, calculate the distance of the first
+    remaining root to all other roots and remove the ones within `tol`.
+    Returns a list with an index array for each cluster.
+    """
+    idx = np.arange(len(p))
+    clusters = []
+    while len(idx):
+        # calculate distance of first root against all others and itself
+        # -> multiplicity is at least 1, first root is always deleted
+        tolarr = np.less(dist_roots(p[idx[0]], p[idx]), tol)
+        tolarr[0] = True
+        clusters.append(idx[tolarr])
+        idx = idx[~tolarr]  # and delete them
+    return clusters
+
+def _cluster_roots_grid(p, tol, dist_roots):
+    """
+    Cluster the roots `p` with the same result as `_cluster_roots_loop()`:
+    The roots are sorted into grid cells with spacing `tol`, candidate pairs
+    are only formed with the roots in the same and the eight neighbouring
+    cells (both for euclidian and manhattan distance). The pairs within `tol`
+    are determined in a vectorized way, only the final assignment of the
+    roots to the clusters is done in a (cheap) python loop.
+    Returns a list with an index array for each cluster.
+    """
+    n = len(p)
+    cell = tol if tol > 0 else 1.
+    # grid coordinates, compressed to the ranks of the occupied rows / columns
+    # to keep the cell index small for widely spread roots
+    ux, rx = np.unique(np.floor(p.real / cell), return_inverse=True)
+    uy, ry = np.unique(np.floor(p.imag / cell), return_inverse=True)
+    ny = len(uy)
+    key = rx * ny + ry
+
+    def _rank(u, r, d):
+        """ rank of the neighbouring row / column r + d, -1 if unoccupied """
+        if d == 0:
+            return r
+        r_d = r + d
+        valid = (r_d >= 0) & (r_d < len(u))
+        # beyond 2**53, neighbouring cells can't be resolved any more:
+        step = np.maximum(1, 2 * np.spacing(np.abs(u[r])))
+        r_d[valid & (np.abs(u[np.clip(r_d, 0, len(u)-1)] - u[r]) > step)] = -1
+        r_d[~valid] = -1
+        return r_d
+
+    order = np.argsort(key, kind='mergesort')
+    skey = key[order]
+
+    # find all pairs (ii, jj) of roots in neighbouring cells:
+    ii = []
+    jj = []
+    for dx in (-1, 0, 1):
+        nrx = _rank(ux, rx, dx)
+        for dy in (-1, 0, 1):
+            nry = _rank(uy, ry, dy)
+            nkey = np.where((nrx < 0) | (nry < 0), -1, nrx * ny + nry)
+            lo = np.searchsorted(skey, nkey, side='left')
+            hi = np.searchsorted(skey, nkey, side='right')
+            cnt = hi - lo
+            tot = cnt.sum()
+            if tot == 0:
+                continue
+            offs = np.arange(tot) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            ii.append(np.repeat(np.arange(n), cnt))
+            jj.append(order[np.repeat(lo, cnt) + offs])
+    ii = np.concatenate(ii)
+    jj = np.concatenate(jj)
+    close = np.less(dist_roots(p[ii], p[jj]), tol) | (ii == jj)
+    ii = ii[close]
+    jj = jj[close]
+    srt = np.lexsort((jj, ii))
+    jj = jj[srt].tolist()
+    ptr = np.searchsorted(ii[srt], np.arange(n + 1)).tolist()
+
+    # greedy assignment in the order of p
+    done = bytearray(n)
+    clusters = []
+    for i in range(n):
+        if done[i]:
+            continue
+        c = [j for j in jj[ptr[i]:ptr[i+1]] if not done[j]]
+        for j in c:
+            done[j] = 1
+        clusters.append(c)
+    return clusters
+
 ##### original code ####
 #    p = asarray(p) * 1.0
 #    tol = abs(tol)
@@ -611,6 +820,82 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
 
 
 
+#==================================================================
+# Automatic length of impulse responses, see `impz_len()`:
+IMPZ_TOL = 1e-4     # settling threshold, relative to the initial envelope
+IMPZ_N_MAX = 10000  # hard cap for the number of points
+
+def impz_len(b, a=1, p=None, tol=IMPZ_TOL, mode='settle', N_max=IMPZ_N_MAX):
+    """
+Estimate the number of points required to display the impulse response of
+a discrete time filter, specified by numerator coefficients `b`, denominator
+coefficients `a` and (optionally) the poles `p`.
+
+The length of recursive filters is determined by the dominant pole with the
+radius `r = max(abs(p))`, the envelope of its contribution to the impulse
+response decays with `r**n`. The length of non-recursive filters is the
+number of coefficients.
+
+Parameters
+----------
+b :  array_like
+     Numerator coefficients (transversal part of filter)
+
+a :  array_like (optional, default = 1 for FIR-filter)
+     Denominator coefficients (recursive part of filter)
+
+p :  array_like (optional, default: None)
+     Poles of the filter, e.g. `fil_dict['zpk'][1]`. When `p` is None, the
+     poles are calculated as the roots of `a`.
+
+tol : float (optional, default: IMPZ_TOL = 1e-4)
+     Threshold for the envelope (mode 'settle') or the remaining energy
+     (mode 'energy') of the impulse response, relative to its initial value.
+
+mode : string (optional, default: 'settle')
+     'settle' : length after which the envelope `r**n` has decayed to `tol`
+
+     'energy' : length after which the remaining energy of the impulse response
+     (approx. `r**(2n)`) is less than `tol`
+
+N_max : int (optional, default: IMPZ_N_MAX = 10000)
+     Maximum number of points, also used for unstable or marginally stable
+     filters (`r >= 1`).
+
+Returns
+-------
+N : int
+    Number of points
+
+Examples
+--------
+>>> b, a = sig.ellip(4, 0.5, 60, 0.02)
+>>> N = impz_len(b, a)
+"""
+    b = np.trim_zeros(np.atleast_1d(b), 'b')
+    a = np.trim_zeros(np.atleast_1d(a), 'b')
+    L = max(len(b), len(a), 1) # length of the "FIR part" of the response
+
+    if p is None:
+        p = np.roots(a) if len(a) > 1 else []
+    p = np.atleast_1d(p)
+    r = np.max(np.abs(p)) if len(p) > 0 else 0.
+
+    if r < 1e-10: # FIR filter or poles in the origin
+        N = L
+    elif r >= 1: # unstable or marginally stable filter
+        N = N_max
+    else:
+        if mode == 'settle':
+            n_settle = np.log(tol) / np.log(r)
+        elif mode == 'energy':
+            n_settle = np.log(tol) / (2. * np.log(r))
+        else:
+            raise ValueError("Unknown mode '{0}' for impulse response length!".format(mode))
+        N = L + int(np.ceil(n_settle))
+
+    return int(min(N, N_max))
+
 #==================================================================
 def impz(b, a=1, FS=1, N=0, step = False):
     """
@@ -634,7 +919,7 @@ FS : float (optional, default: FS = 1)
 
 N :  float (optional)
      Number of calculated points.
-     Default: N = len(b) for FIR filters, N = 100 for IIR filters
+     Default: N = 0, the number of points is determined by `impz_len()`
 
 Returns
 -------
@@ -667,10 +952,7 @@ Examples
             IIR = True
 
     if N == 0: # set number of data points automatically
-        if IIR:
-            N = 100 # TODO: IIR: more intelligent algorithm needed
-        else:
-            N = min(len(b),  100) # FIR: N = number of coefficients (max. 100)
+        N = impz_len(b, a) if IIR else impz_len(b)
 
     impulse = np.zeros(N)
     impulse[0] =1.0 # create dirac impulse as input signal
@@ -683,7 +965,186 @@ Examples
     return hn, td
 
 #==================================================================
-def grpdelay(b, a=1, nfft=512, whole=False, analog=False, verbose=True, fs=2.*pi, use_scipy = True):
+# Cost model for `lfilter_fast()`, relative time per multiply-accumulate
+# of the direct form, per `nfft log2(nfft)` for a forward / inverse (r)FFT
+# pair and per frequency point of the spectral product (~ ns on a 2018 PC):
+LFILTER_COST_MAC = 0.27
+LFILTER_COST_FFT = 3.
+LFILTER_COST_MUL = 4.
+LFILTER_COST_SETUP = 2.e4 # overhead of the FFT method
+
+def fft_len(n):
+    """
+    Return the smallest FFT length >= `n` that factors into powers of 2, 3 and 5
+    ("5-smooth" numbers), the fast lengths of numpy / scipy FFT routines.
+    """
+    n = int(n)
+    if n <= 6:
+        return max(n, 1)
+    best = 2 ** int(np.ceil(np.log2(n)))
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # smallest power of 2 with p35 * 2**k >= n:
+            p2 = 1 << int((-(-n // p35)) - 1).bit_length()
+            best = min(best, p2 * p35)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+def lfilter_cost(L, N):
+    """
+Estimate the cost of filtering `N` samples with an FIR filter of length `L`
+in direct form and with overlap-save FFT convolution for all fast FFT lengths
+between `2 L` and `N + L - 1` (one block).
+
+Returns
+-------
+method : str
+    'direct' or 'ols', whichever is cheaper
+
+nfft : int
+    the cheapest FFT length for overlap-save / overlap-add convolution
+    """
+    cost_direct = LFILTER_COST_MAC * L * N
+    nfft_max = fft_len(N + L - 1)
+    nfft = min(fft_len(2 * L), nfft_max)
+    best_cost, best_nfft = None, nfft
+    while True:
+        step = nfft - L + 1
+        cost = LFILTER_COST_SETUP + (-(-N // step)) * nfft\
+            * (LFILTER_COST_FFT * np.log2(nfft) + LFILTER_COST_MUL)
+        if best_cost is None or cost < best_cost:
+            best_cost, best_nfft = cost, nfft
+        if nfft >= nfft_max:
+            break
+        nfft = fft_len(nfft + 1)
+
+    method = 'ols' if best_cost < cost_direct else 'direct'
+    return method, best_nfft
+
+def lfilter_fast(b, a, x, sos=None, method='auto', nfft=None):
+    """
+Filter the one-dimensional signal `x` with the filter specified by the
+numerator coefficients `b` and the denominator coefficients `a` (or the
+second-order sections `sos`), the result is the same as `sig.lfilter(b, a, x)`.
+
+FIR filters are calculated in direct form or with FFT convolution, depending
+on the estimated cost for the filter length and the length of `x`. This is
+much faster for long filters and signals (e.g. 4000 taps, 200 000 samples).
+
+Parameters
+----------
+b :  array_like
+     Numerator coefficients (transversal part of filter)
+
+a :  array_like
+     Denominator coefficients (recursive part of filter), trailing zeros
+     are ignored.
+
+x :  array_like
+     Input signal (one-dimensional)
+
+sos : array_like (optional, default: None)
+     Second-order sections with shape (n_sections, 6), used for recursive
+     filters with method 'auto'.
+
+method : string (optional, default: 'auto')
+     'direct' : `sig.lfilter(b, a, x)`
+
+     'sos' : `sig.sosfilt(sos, x)`
+
+     'ols' : FFT convolution with overlap-save (FIR filters only)
+
+     'ola' : FFT convolution with overlap-add (FIR filters only)
+
+     'auto' : 'sos' for recursive filters when `sos` is given, otherwise
+     'direct'; FIR filters use 'direct' or 'ols', see `lfilter_cost()`.
+
+nfft : int (optional, default: None)
+     FFT length for 'ols' and 'ola', default: determined by `lfilter_cost()`
+
+Returns
+-------
+y : ndarray with the same length as `x`
+
+Examples
+--------
+>>> b = sig.firwin(4001, 0.1)
+>>> y = lfilter_fast(b, 1, np.random.randn(200000))
+"""
+    x = np.asarray(x)
+    b = np.atleast_1d(b)
+    a = np.atleast_1d(a)
+    a = a[:max(len(np.trim_zeros(a, 'b')), 1)] # remove trailing zeros
+    recursive = len(a) > 1
+
+    if method == 'auto':
+        if recursive:
+            method = 'sos' if sos is not None and len(sos) > 0 else 'direct'
+        else:
+            method, nfft_opt = lfilter_cost(len(b), len(x))
+            nfft = nfft or nfft_opt
+        logger.debug("lfilter_fast: method '{0}', nfft = {1}".format(method, nfft))
+
+    if method == 'direct':
+        return sig.lfilter(b, a, x)
+    elif method == 'sos':
+        return sig.sosfilt(sos, x)
+    elif method in {'ols', 'ola'}:
+        if recursive:
+            raise ValueError("FFT convolution ('{0}') requires an FIR filter!".format(method))
+        if nfft is None:
+            nfft = lfilter_cost(len(b), len(x))[1]
+        return _fft_filter(b / a[0], x, nfft, method)
+    else:
+        raise ValueError("Unknown method '{0}' for filtering!".format(method))
+
+def _fft_filter(b, x, nfft, method):
+    """
+    FIR filter `x` with `b` by FFT convolution (overlap-save 'ols' or
+    overlap-add 'ola') with blocks of length `nfft`, see `lfilter_fast()`.
+    All blocks are transformed with one FFT call.
+    """
+    L, N = len(b), len(x)
+    step = nfft - L + 1 # number of new output samples per block
+    if step < 1 or (method == 'ola' and step < L - 1 and step < N):
+        raise ValueError("FFT length nfft = {0} is too short for filter length {1}!"\
+                         .format(nfft, L))
+    if np.iscomplexobj(b) or np.iscomplexobj(x):
+        fft, ifft = np.fft.fft, np.fft.ifft
+    else:
+        fft, ifft = np.fft.rfft, np.fft.irfft
+    dtype = np.result_type(b, x, float)
+    H = fft(b, nfft)
+    blocks = max(-(-N // step), 1)
+
+    if method == 'ols':
+        # overlapping frames of length nfft with a hop size of `step`, the
+        # first L-1 samples of each output frame are corrupted by circular
+        # convolution and discarded:
+        xp = np.zeros(blocks * step + L - 1, dtype=dtype)
+        xp[L-1:L-1+N] = x
+        frames = np.lib.stride_tricks.as_strided(xp, shape=(blocks, nfft),
+                                    strides=(step * xp.strides[0], xp.strides[0]))
+        y = ifft(fft(frames, nfft, axis=1) * H, nfft, axis=1)[:, L-1:]
+        return y.ravel()[:N]
+    else:
+        # non-overlapping input blocks of length `step`, zero-padded to nfft,
+        # the tails of the output blocks are added to the following block:
+        xp = np.zeros(blocks * step, dtype=dtype)
+        xp[:N] = x
+        yb = ifft(fft(xp.reshape(blocks, step), nfft, axis=1) * H, nfft, axis=1)
+        y = np.zeros((blocks + 1, step), dtype=yb.dtype)
+        y[:blocks] = yb[:, :step]
+        n_tail = min(L - 1, step)
+        y[1:, :n_tail] += yb[:, step:step + n_tail]
+        return y.ravel()[:N]
+
+#==================================================================
+def grpdelay(b, a=1, nfft=512, whole=False, analog=False, verbose=True, fs=2.*pi,
+             use_scipy = True, sos=None, method='auto'):
 #==================================================================
     """
 Calculate group delay of a discrete time filter, specified by
@@ -714,6 +1175,21 @@ nfft :  integer (optional, default: 512)
 fs : float (optional, default: fs = 2*pi)
      Sampling frequency.
 
+sos : array_like (optional, default: None)
+     Second-order sections with shape (n_sections, 6). When given, `b` and `a`
+     are ignored and the group delay is calculated as the sum of the group
+     delays of the individual sections which is numerically more robust for
+     high filter orders.
+
+method : string (optional, default: 'auto')
+     'fft' : Evaluate the plain and the ramped polynomial with one (r)FFT each,
+     requires a uniform grid around the unit circle (`fs = 2 pi`).
+
+     'polyval' : Evaluate the polynomials with `np.polyval` at each frequency
+     point (slow for long filters, reference implementation).
+
+     'auto' : Use 'fft' when possible, otherwise 'polyval'.
+
 
 Returns
 -------
@@ -935,22 +1411,143 @@ Examples
             w = np.linspace(0, pi, w, endpoint=False)
 
     w = np.atleast_1d(w)
-    b, a = map(np.atleast_1d, (b, a))
-    c = np.convolve(b, a[::-1])
-    cr = c * np.arange(c.size)
-    z = np.exp(-1j * w)
-    num = np.polyval(cr[::-1], z)
-    den = np.polyval(c[::-1], z)
-    singular = np.absolute(den) < 10 * minmag
+
+    # The grid w = 2 pi k / nfft corresponds to the bins of an nfft-point DFT:
+    if method == 'auto':
+        method = 'fft' if np.isclose(fs, 2. * pi) else 'polyval'
+    elif method not in {'fft', 'polyval'}:
+        raise ValueError("Unknown method '{0}' for group delay calculation!".format(method))
+    if method == 'fft' and not np.isclose(fs, 2. * pi):
+        logger.warning("FFT based group delay requires fs = 2 pi, using polyval.")
+        method = 'polyval'
+
+    if sos is not None:
+        sos = np.atleast_2d(sos)
+        gd = np.zeros_like(w)
+        singular = np.zeros(w.shape, dtype=bool)
+        for section in sos:
+            gd_s, sing_s = _grpdelay_ba(section[:3], section[3:], w, nfft, method)
+            gd += gd_s
+            singular |= sing_s
+    else:
+        gd, singular = _grpdelay_ba(b, a, w, nfft, method)
+
     if np.any(singular) and verbose:
         singularity_list = ", ".join("{0:.3f}".format(ws/(2*pi)) for ws in w[singular])
         logger.warning("pyfda_lib.py:grpdelay:\n"
             "The group delay is singular at F = [{0:s}], setting to 0".format(singularity_list)
         )
 
+    gd[singular] = 0
+    return w, gd
+
+def _grpdelay_ba(b, a, w, nfft, method):
+    """
+    Calculate the group delay of the filter `(b, a)` at the frequencies `w`,
+    see `grpdelay()`. With method 'fft', `w` has to be the uniform grid
+    2 pi k / nfft.
+
+    Returns the group delay and a boolean array marking the frequencies where
+    the group delay is singular (and set to 0).
+    """
+    minmag = 10. * np.spacing(1) # equivalent to matlab "eps"
+    b, a = map(np.atleast_1d, (b, a))
+    c = np.convolve(b, a[::-1])
+    cr = c * np.arange(c.size)
+    if method == 'fft':
+        num = _dft_poly(cr, nfft)
+        den = _dft_poly(c, nfft)
+    else:
+        z = np.exp(-1j * w)
+        num = np.polyval(cr[::-1], z)
+        den = np.polyval(c[::-1], z)
+    singular = np.absolute(den) < 10 * minmag
+
     gd = np.zeros_like(w)
     gd[~singular] = np.real(num[~singular] / den[~singular]) - a.size + 1
-    return w, gd
+    return gd, singular
+
+def _dft_poly(c, nfft):
+    """
+    Evaluate the polynomial sum_k c[k] z^(-k) at the nfft points z = exp(j 2 pi n / nfft)
+    using an FFT. Coefficient vectors longer than nfft are folded (time-domain
+    aliasing) which gives the exact result on the DFT grid. For real-valued
+    coefficients, only half the spectrum is calculated with an rfft.
+    """
+    if c.size > nfft:
+        c = np.concatenate((c, np.zeros(-c.size % nfft, dtype=c.dtype)))
+        c = c.reshape(-1, nfft).sum(axis=0)
+    if np.iscomplexobj(c):
+        return np.fft.fft(c, nfft)
+    C = np.fft.rfft(c, nfft)
+    # restore the full spectrum from the conjugate symmetric half:
+    return np.concatenate((C, np.conj(C[(nfft - 1) // 2:0:-1])))
+
+#==================================================================
+def czt(x, M, W, A=1.):
+    """
+    Chirp-Z transform of the sequence `x` (length N), i.e. the z-transform
+    evaluated at the M points z_k = A W^(-k), k = 0 ... M-1 on a spiral
+    contour:
+
+        X_k = sum_n x[n] z_k^(-n)
+
+    The transform is calculated with Bluestein's algorithm as a convolution
+    with a chirp using FFTs of length >= N + M - 1, i.e. in O((N+M) log(N+M))
+    operations instead of O(N M) for a direct evaluation.
+
+    Parameters
+    ----------
+    x : array_like
+        input sequence (coefficients of a polynomial in z^(-1))
+    M : int
+        number of output points
+    W : complex
+        ratio between consecutive points on the contour
+    A : complex
+        starting point of the contour
+
+    Returns
+    -------
+    ndarray (complex)
+        M values of the chirp-Z transform
+    """
+    x = np.atleast_1d(np.asarray(x))
+    N = len(x)
+    L = fft_len(N + M - 1)
+    # chirp W^(k^2 / 2) for k = -(N-1) ... max(M, N)-1 (any branch of log(W)
+    # works as nk = (n^2 + k^2 - (k-n)^2) / 2):
+    k2 = np.arange(-(N-1), max(M, N), dtype=float)**2 / 2.
+    chirp = np.exp(np.log(complex(W)) * k2)
+    n = np.arange(N)
+    y = x * np.exp(-np.log(complex(A)) * n) * chirp[N-1:2*N-1]
+    g = np.fft.ifft(np.fft.fft(y, L) * np.fft.fft(1. / chirp[:N-1+M], L))
+    return g[N-1:N-1+M] * chirp[N-1:N-1+M]
+
+def freqz_zoom(b, a=1, w_start=0., w_stop=pi, N=512):
+    """
+    Calculate the frequency response H(e^(j w)) = B(e^(j w)) / A(e^(j w)) at
+    `N` equidistant frequencies w = w_start ... w_stop (including both end
+    points, normalized to 2 pi f_S) with a chirp-Z transform ("zoom FFT").
+    In contrast to `scipy.signal.freqz`, the density of the frequency points
+    can be chosen independently of the frequency range and the filter order.
+
+    Returns
+    -------
+    w, H : ndarrays
+        frequency points and complex frequency response
+    """
+    N = int(N)
+    dw = (w_stop - w_start) / (N - 1) if N > 1 else 0.
+    w = w_start + np.arange(N) * dw
+    W = np.exp(-1j * dw)
+    A = np.exp(1j * w_start)
+    H = czt(b, N, W, A)
+    if np.size(a) > 1:
+        H = H / czt(a, N, W, A)
+    else:
+        H = H / np.ravel(a)[0]
+    return w, H
 
 #==================================================================
 def expand_lim(ax, eps_x, eps_y = None):
@@ -1030,6 +1627,23 @@ def format_ticks(ax, xy, scale=1., format="%.1f"):
 
 #==============================================================================
 
+def fil_order_warning(N, fil_class):
+    """
+    Warn the user about the rather high filter order `N` for the design method
+    `fil_class`. When the GUI is running, a dialog box asks whether the design
+    should be continued, otherwise the warning is only logged.
+
+    Returns True when the design shall be continued.
+    """
+    qt_lib = sys.modules.get('pyfda.pyfda_qt_lib') # only imported by the GUI
+    if qt_lib is not None:
+        return qt_lib.qfilter_warning(None, N, fil_class)
+    logger.warning("N = {0} is a rather high order for an {1} filter and may "
+                   "cause large numerical errors and compute times.".format(N, fil_class))
+    return True
+
+#==============================================================================
+
 def fil_save(fil_dict, arg, format_in, sender, convert = True):
     """
     Save filter design ``arg`` given in the format specified as ``format_in`` in
@@ -1065,6 +1679,8 @@ def fil_save(fil_dict, arg, format_in, sender, convert = True):
     convert : boolean
         When convert = True, convert arg to the other formats.
     """
+    if isinstance(fil_dict, FilterDesign):
+        fil_dict.new_design() # drop lazy formats of the previous design
 
     if format_in == 'sos':
             fil_dict['sos'] = arg
@@ -1156,6 +1772,9 @@ def fil_convert(fil_dict, format_in):
     and second-order sections and store all formats not generated by the filter
     design routine in the passed dictionary 'fil_dict'.
 
+    When `fil_dict` is a `FilterDesign` object, the other formats are only
+    marked as lazy and calculated by `convert_format()` when they are accessed.
+
     Parameters
     ----------
     fil_dict :  dictionary
@@ -1171,9 +1790,7 @@ def fil_convert(fil_dict, format_in):
          'ba' : [b, a] where b and a are the polynomial coefficients - finding
                    the roots of the a and b polynomes may fail for higher orders
     """
-
     if 'sos' in format_in:
-
         # check for bad coeffs before converting IIR filt
         # this is the same defn used by scipy (tolerance of 1e-14)
         if (fil_dict['ft'] == 'IIR'):
@@ -1186,65 +1803,159 @@ def fil_convert(fil_dict, format_in):
                 if ((np.amin(b1)) < 1e-14 and np.amin(b1) > 0):
                     raise ValueError('Bad coefficients, Order N is too high')
 
-        if 'zpk' not in format_in:
+    elif 'zpk' not in format_in and 'ba' not in format_in:
+        raise ValueError("Unknown input format {0:s}".format(format_in))
+
+    if 'ba' in format_in:
+        # eliminate complex coefficients created by numerical inaccuracies
+        fil_dict['ba'] = np.real_if_close(fil_dict['ba'], tol=100) # tol specified in multiples of machine eps
+
+    if isinstance(fil_dict, FilterDesign):
+        fil_dict.set_lazy(format_in)
+    else:
+        for format_out in ('zpk', 'ba', 'sos'):
+            if format_out not in format_in:
+                fil_dict[format_out] = convert_format(fil_dict, format_in, format_out)
+
+def convert_format(fil_dict, format_in, format_out, ft=None):
+    """
+    Calculate and return the filter format `format_out` ('ba', 'zpk' or 'sos')
+    from the format(s) `format_in` generated by the filter design routine
+    (see `fil_convert()`). 'sos' has precedence over 'zpk' over 'ba' as the
+    source of the conversion. Only 'sos' from 'ba' is derived via 'zpk'.
+    The filter type `ft` of the design ('FIR' or 'IIR') defaults to
+    `fil_dict['ft']`.
+    """
+    if 'sos' in format_in:
+        if format_out == 'zpk':
             try:
-                fil_dict['zpk'] = list(sig.sos2zpk(fil_dict['sos']))
+                zpk = list(sig.sos2zpk(fil_dict['sos']))
             except Exception as e:
                 raise ValueError(e)
             # check whether sos conversion has created a additional (superfluous)
             # pole and zero at the origin and delete them:
-            z_0 = np.where(fil_dict['zpk'][0] == 0)[0]
-            p_0 = np.where(fil_dict['zpk'][1] == 0)[0]
+            z_0 = np.where(zpk[0] == 0)[0]
+            p_0 = np.where(zpk[1] == 0)[0]
             if p_0 and z_0: # eliminate z = 0 and p = 0 from list:
-                fil_dict['zpk'][0] = np.delete(fil_dict['zpk'][0],z_0)
-                fil_dict['zpk'][1] = np.delete(fil_dict['zpk'][1],p_0)
+                zpk[0] = np.delete(zpk[0],z_0)
+                zpk[1] = np.delete(zpk[1],p_0)
+            return zpk
 
-        if 'ba' not in format_in:
+        elif format_out == 'ba':
             try:
-                fil_dict['ba'] = list(sig.sos2tf(fil_dict['sos']))
+                ba = list(sig.sos2tf(fil_dict['sos']))
             except Exception as e:
                 raise ValueError(e)
             # check whether sos conversion has created additional (superfluous)
             # highest order polynomial with coefficient 0 and delete them
-            if fil_dict['ba'][0][-1] == 0 and fil_dict['ba'][1][-1] == 0:
-                fil_dict['ba'][0] = np.delete(fil_dict['ba'][0],-1)
-                fil_dict['ba'][1] = np.delete(fil_dict['ba'][1],-1)
+            if ba[0][-1] == 0 and ba[1][-1] == 0:
+                ba[0] = np.delete(ba[0],-1)
+                ba[1] = np.delete(ba[1],-1)
+            return np.real_if_close(ba, tol=100)
 
     elif 'zpk' in format_in: # z, p, k have been generated,convert to other formats
-        zpk = fil_dict['zpk']
-        if 'ba' not in format_in:
+        if format_out == 'ba':
+            zpk = fil_dict['zpk']
             try:
-                fil_dict['ba'] = sig.zpk2tf(zpk[0], zpk[1], zpk[2])
+                ba = sig.zpk2tf(zpk[0], zpk[1], zpk[2])
             except Exception as e:
                 raise ValueError(e)
-        if 'sos' not in format_in:
-            fil_dict['sos'] = [] # don't convert zpk -> SOS due to numerical inaccuracies
-#            try:
-#                fil_dict['sos'] = sig.zpk2sos(zpk[0], zpk[1], zpk[2])
-#            except ValueError:
-#                fil_dict['sos'] = []
-#                logger.warning("Complex-valued coefficients, could not convert to SOS.")
+            return np.real_if_close(ba, tol=100)
+
+        elif format_out == 'sos':
+            return _fil_zpk2sos(fil_dict, ft)
 
     elif 'ba' in format_in: # arg = [b,a]
-        b, a = fil_dict['ba'][0], fil_dict['ba'][1]
-        try:
-            zpk = sig.tf2zpk(b,a)
-            fil_dict['zpk'] = [zpk[0].astype(np.complex), zpk[1].astype(np.complex), zpk[2]]
-        except Exception as e:
-            raise ValueError(e)
-        fil_dict['sos'] = [] # don't convert ba -> SOS due to numerical inaccuracies
-#        if SOS_AVAIL:
-#            try:
-#                fil_dict['sos'] = sig.tf2sos(b,a)
-#            except ValueError:
-#                fil_dict['sos'] = []
-#                logger.warning("Complex-valued coefficients, could not convert to SOS.")
+        if format_out == 'zpk':
+            b, a = fil_dict['ba'][0], fil_dict['ba'][1]
+            try:
+                zpk = sig.tf2zpk(b,a)
+            except Exception as e:
+                raise ValueError(e)
+            return [zpk[0].astype(np.complex), zpk[1].astype(np.complex), zpk[2]]
 
-    else:
-        raise ValueError("Unknown input format {0:s}".format(format_in))
-        
-    # eliminate complex coefficients created by numerical inaccuracies
-    fil_dict['ba'] = np.real_if_close(fil_dict['ba'], tol=100) # tol specified in multiples of machine eps
+        elif format_out == 'sos':
+            return _fil_zpk2sos(fil_dict, ft)
+
+    raise ValueError("Cannot convert format {0} to '{1}'".format(format_in, format_out))
+
+def _fil_zpk2sos(fil_dict, ft=None):
+    """
+    Return second-order sections for IIR filters, paired from the zeros and
+    poles in `fil_dict`, or an empty list for FIR filters (they are evaluated
+    more efficiently from their coefficients) and when the conversion fails.
+    The filter type `ft` defaults to `fil_dict['ft']`.
+    """
+    if ft is None:
+        ft = fil_dict['ft']
+    if ft != 'IIR' or not SOS_AVAIL:
+        return []
+    zpk = fil_dict['zpk']
+    sos = zpk2sos(zpk[0], zpk[1], zpk[2])
+    if sos is None:
+        logger.warning("Complex-valued zeros / poles, could not convert to SOS.")
+        return []
+    return sos
+
+SOS_CONJ_TOL = 1e-6 # relative tolerance for real polynomials / roots
+
+def _conj_roots(r, tol=SOS_CONJ_TOL):
+    """
+    Clean up the roots `r` of a polynomial with real coefficients: roots with
+    a (relative) imaginary part below `tol` are made real, all other roots
+    are paired with their nearest complex conjugate partner and replaced by
+    an exactly conjugated pair. Multiple roots (e.g. found by `np.roots()`)
+    can have large errors, hence the polynomial is tested instead of the roots.
+
+    Return the cleaned roots or None when the polynomial has complex
+    coefficients.
+    """
+    r = np.atleast_1d(np.asarray(r, dtype=complex))
+    c = np.poly(r)
+    if np.max(np.abs(c.imag)) > tol * np.max(np.abs(c)):
+        return None
+    is_real = np.abs(r.imag) <= tol * np.maximum(np.abs(r), 1.)
+    upper = sorted(r[~is_real & (r.imag > 0)], key=lambda z: abs(z.imag))
+    lower = sorted(np.conj(r[~is_real & (r.imag < 0)]), key=lambda z: abs(z.imag))
+    real = list(r[is_real].real)
+    while len(upper) != len(lower): # roots with smallest imag. part become real
+        real.append((upper if len(upper) > len(lower) else lower).pop(0).real)
+    pairs = []
+    for z in upper: # pair with nearest root mirrored from the lower half-plane
+        i = np.argmin(np.abs(np.asarray(lower) - z))
+        pairs.append((z + lower.pop(i)) / 2.)
+    pairs = np.asarray(pairs, dtype=complex)
+    return np.concatenate((real, pairs, np.conj(pairs)))
+
+def zpk2sos(z, p, k, tol=SOS_CONJ_TOL):
+    """
+    Convert zeros, poles and gain to second-order sections. In contrast to
+    `scipy.signal.zpk2sos()`, roots with numerical errors are tolerated
+    (see `_conj_roots()`), then the poles are paired with their nearest
+    zeros by `scipy.signal.zpk2sos()`.
+
+    Returns
+    -------
+    sos : ndarray or None
+        Array of second-order sections with shape (n_sections, 6) or None
+        when zeros, poles or gain are complex-valued.
+    """
+    z, p = _conj_roots(z, tol), _conj_roots(p, tol)
+    if z is None or p is None or abs(np.imag(k)) > tol * max(abs(k), 1.):
+        return None
+    if len(z) == 0 and len(p) == 0: # gain only
+        return np.array([[np.real(k), 0., 0., 1., 0., 0.]])
+    return sig.zpk2sos(z, p, np.real(k))
+
+def fil_sos(fil_dict):
+    """
+    Return the second-order sections in `fil_dict` as an ndarray with shape
+    (n_sections, 6) or None when the filter has no (valid) SOS representation.
+    """
+    sos = np.asarray(fil_dict.get('sos', []))
+    if sos.ndim != 2 or sos.shape[1] != 6 or len(sos) == 0:
+        return None
+    return sos
 
 def sos2zpk(sos):
     """
@@ -1504,6 +2215,150 @@ def remlplen_ichige(fp,fs,dp,ds):
 
     return int(N4)
 
+#------------------------------------------------------------------------------
+def spec_bands(fil_dict):
+    """
+    Return the pass- and stopbands of the target specs in `fil_dict` as a list
+    of tuples `(F_start, F_stop, gain, A)` with the band edges normalized to f_S,
+    the target gain (1 for passbands, 0 for stopbands) and the linear amplitude
+    spec (maximum deviation from the target gain). Response types without
+    pass- and stopbands return an empty list.
+    """
+    rt = fil_dict['rt']
+    F_PB, F_SB = fil_dict['F_PB'], fil_dict['F_SB']
+    F_PB2, F_SB2 = fil_dict['F_PB2'], fil_dict['F_SB2']
+    A_PB, A_SB = fil_dict['A_PB'], fil_dict['A_SB']
+    A_PB2, A_SB2 = fil_dict['A_PB2'], fil_dict['A_SB2']
+    if rt == 'LP':
+        return [(0, F_PB, 1, A_PB), (F_SB, 0.5, 0, A_SB)]
+    elif rt == 'HP':
+        return [(0, F_SB, 0, A_SB), (F_PB, 0.5, 1, A_PB)]
+    elif rt == 'BP':
+        return [(0, F_SB, 0, A_SB), (F_PB, F_PB2, 1, A_PB), (F_SB2, 0.5, 0, A_SB2)]
+    elif rt == 'BS':
+        return [(0, F_PB, 1, A_PB), (F_SB, F_SB2, 0, A_SB), (F_PB2, 0.5, 1, A_PB2)]
+    else:
+        return []
+
+def fir_check_specs(coeffs, bands, N_FFT=None):
+    """
+    Check which of the FIR filters with the coefficients in the list `coeffs`
+    meet the specs `bands` (see `spec_bands()`). The magnitude responses of all
+    filters are calculated at once by an FFT of the zero-padded coefficient
+    matrix, the deviation from the target gain is compared to the amplitude
+    spec in each band.
+
+    Returns a boolean array with one entry per filter.
+    """
+    L = max(len(b) for b in coeffs)
+    if N_FFT is None: # the frequency grid needs to resolve the ripples
+        N_FFT = 1 << int(np.ceil(np.log2(max(16 * L, 4096))))
+    B = np.zeros((len(coeffs), L))
+    for i, b in enumerate(coeffs):
+        B[i, :len(b)] = b
+    H = np.abs(np.fft.rfft(B, N_FFT, axis=1))
+    F = np.arange(H.shape[1]) / N_FFT
+    ok = np.ones(len(coeffs), dtype=bool)
+    for F_start, F_stop, gain, A in bands:
+        band = (F >= F_start) & (F <= F_stop)
+        ok &= np.max(np.abs(H[:, band] - gain), axis=1) <= A
+    return ok
+
+def fir_min_order(design, bands, N_est, step=1, N_min=3, N_max=2000):
+    """
+    Find the minimum length (number of taps) for which the FIR filter returned
+    by `design(N)` meets the specs `bands` (see `spec_bands()`), starting from
+    the estimate `N_est`, e.g. calculated by `remezord()`. Only the lengths
+    `N_est + k * step` are tried to keep the required symmetry (e.g. `step = 2`
+    for odd lengths).
+
+    Candidate lengths are designed in batches by the pool of worker threads
+    and checked at once with `fir_check_specs()`: The first batch brackets the
+    estimate, the following batches widen the search upwards with growing
+    distance until a compliant length has been found and then bisect the
+    interval between the longest failing and the shortest compliant length.
+    Designs that raise an exception count as failing.
+
+    Returns
+    -------
+    N : int
+        minimum compliant filter length or None when no length up to `N_max`
+        meets the specs
+
+    b : ndarray
+        coefficients of the filter with length `N` (None when no compliant
+        length has been found)
+    """
+    import multiprocessing
+    n_batch = max(multiprocessing.cpu_count(), 4) # candidates per batch
+
+    def _design(N):
+        try:
+            return np.asarray(design(N))
+        except Exception as e:
+            logger.debug("Design with {0} taps failed:\n{1}".format(N, e))
+            return None
+
+    # search on the index k of the lengths N_est + k * step:
+    k_min = -((N_est - N_min) // step)
+    k_max = (N_max - N_est) // step
+    lo = k_min - 1 # longest failing ...
+    hi = None # ... and shortest compliant length found so far
+    designs = {}
+    cands = range(-(n_batch // 2), n_batch - n_batch // 2)
+    while True:
+        cands = sorted(set(int(k) for k in cands
+                           if lo < k <= k_max and (hi is None or k < hi)))
+        if not cands:
+            break
+        results = _thread_pool().map(_design, [N_est + k * step for k in cands])
+        valid = [(k, b) for k, b in zip(cands, results) if b is not None]
+        ok = fir_check_specs([b for _, b in valid], bands) if valid else []
+        for (k, b), k_ok in zip(valid, ok):
+            if k_ok and (hi is None or k < hi):
+                hi = k
+                designs[k] = b
+        lo = max([lo] + [k for k in cands if k not in designs and (hi is None or k < hi)])
+
+        if hi is None: # widen the search upwards
+            cands = [cands[-1] + (1 << i) for i in range(n_batch)]
+        elif hi - lo <= 1:
+            break
+        else: # bisect the interval between failing and compliant length
+            cands = np.round(np.linspace(lo, hi, n_batch + 2)[1:-1])
+
+    if hi is None:
+        return None, None
+    return N_est + hi * step, designs[hi]
+
+def fir_verify_order(design, fil_dict, N_est, verify=True, step=1, N_max=2000):
+    """
+    Return the length and the coefficients of a minimum order FIR filter
+    designed by `design(N)`: When `verify` is False, the estimated length
+    `N_est` is used. Otherwise, the shortest length that meets the specs of
+    `fil_dict` is searched with `fir_min_order()`, trying only the lengths
+    `N_est + k * step` up to `N_max`. When no length meets the specs, the
+    estimate is used and a warning is logged.
+
+    Returns
+    -------
+    N : int
+        filter length
+
+    b : ndarray
+        coefficients of the filter with length `N`
+    """
+    if verify:
+        N, b = fir_min_order(design, spec_bands(fil_dict), N_est, step=step,
+                             N_max=N_max)
+        if N is not None:
+            logger.info("Verified minimum filter length N = %d (estimated: %d).",
+                        N, N_est)
+            return N, b
+        logger.warning("No filter length up to %d meets the specs, "
+                       "using the estimated length %d.", N_max, N_est)
+    return N_est, design(N_est)
+
 
 #------------------------------------------------------------------------------
 def to_html(text, frmt=None):
@@ -1569,6 +2424,152 @@ def to_html(text, frmt=None):
 
     return html
 
+#------------------------------------------------------------------------------
+#### Response cache ###########################################################
+
+RESP_CACHE_MAX_BYTES = 64 * 2**20 # max. memory used by the response cache
+
+def _nbytes(obj):
+    """
+    Return the number of bytes occupied by the numpy arrays contained in `obj`
+    (an array or a (nested) tuple / list / dict of arrays).
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, (tuple, list)):
+        return sum(_nbytes(o) for o in obj)
+    elif isinstance(obj, dict):
+        return sum(_nbytes(o) for o in obj.values())
+    else:
+        return sys.getsizeof(obj)
+
+def _freeze(obj):
+    """
+    Set all numpy arrays contained in `obj` to read-only, preventing that a
+    widget modifies a cached result that is shared with other widgets.
+    """
+    if isinstance(obj, np.ndarray):
+        obj.setflags(write=False)
+    elif isinstance(obj, (tuple, list)):
+        for o in obj:
+            _freeze(o)
+    elif isinstance(obj, dict):
+        for o in obj.values():
+            _freeze(o)
+    return obj
+
+def hash_args(*args):
+    """
+    Return a hex digest that identifies the content of `args`. Arguments can
+    be scalars, strings, numpy arrays or (nested) lists / tuples of them,
+    arrays are hashed with their dtype and shape.
+    """
+    h = hashlib.sha1()
+
+    def _update(arg):
+        if isinstance(arg, (tuple, list)):
+            h.update("({0}:".format(len(arg)).encode())
+            for a in arg:
+                _update(a)
+            h.update(b")")
+        elif isinstance(arg, np.ndarray) and arg.dtype != object:
+            h.update("{0}{1}".format(arg.dtype.str, arg.shape).encode())
+            h.update(np.ascontiguousarray(arg).tobytes())
+        elif isinstance(arg, np.ndarray): # object array, e.g. ragged ba
+            _update(arg.tolist())
+        else:
+            h.update(repr(arg).encode())
+
+    for arg in args:
+        _update(arg)
+    return h.hexdigest()
+
+class ResponseCache(object):
+    """
+    Least recently used (LRU) cache for calculated responses (frequency
+    response, group delay, transient responses, ...), bounded by the total
+    number of bytes of the stored numpy arrays.
+
+    Results are stored read-only, callers that need to modify a result have
+    to copy it first.
+
+    Parameters
+    ----------
+    max_bytes : integer
+        Maximum memory occupied by the cached results. When a new result is
+        stored, least recently used entries are evicted until the limit is
+        met. Results larger than `max_bytes` are not cached at all.
+    """
+    def __init__(self, max_bytes=RESP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        """ Remove all entries and reset the statistics """
+        self._data = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Return the result stored under `key` and mark it as most recently used,
+        return `default` when `key` is not in the cache.
+        """
+        try:
+            value, nbytes = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = (value, nbytes) # re-insert as most recent entry
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store `value` (read-only) under `key`, evicting least recently used
+        entries when the memory limit is exceeded. Return `value`.
+        """
+        nbytes = _nbytes(value)
+        if key in self._data:
+            self.nbytes -= self._data.pop(key)[1]
+        if nbytes > self.max_bytes:
+            logger.debug("Result with {0} bytes is too large for cache.".format(nbytes))
+            return value
+        while self._data and self.nbytes + nbytes > self.max_bytes:
+            _, (_, nb) = self._data.popitem(last=False) # oldest entry
+            self.nbytes -= nb
+        self._data[key] = (_freeze(value), nbytes)
+        self.nbytes += nbytes
+        return value
+
+    def lookup(self, key, func, *args, **kwargs):
+        """
+        Return the result stored under `key`. When it doesn't exist, calculate it
+        with `func(*args, **kwargs)` and store it in the cache.
+        """
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, func(*args, **kwargs))
+        return value
+
+# Instance of the response cache shared by all widgets:
+resp_cache = ResponseCache()
+
+def fil_hash(fil_dict):
+    """
+    Return a hash of the filter design in `fil_dict`, consisting of the causal
+    and the anticausal coefficients `ba` and `baA` and the second-order sections.
+    """
+    return hash_args(fil_dict['ba'], fil_dict.get('baA', None),
+                     fil_dict.get('sos', None))
+
 #------------------------------------------------------------------------------
 
 def calc_Hcomplex(fil_dict, param, wholeF):
@@ -1576,14 +2577,71 @@ def calc_Hcomplex(fil_dict, param, wholeF):
     Calculate the complex frequency response H(f), consider antiCausal poles/zeros
     return the H function and also the W function
     Use fil_dict to gather poles/zeros, frequency ranges
+
+    The causal part is evaluated from the second-order sections when they are
+    available, this is more accurate for high filter orders.
+
+    Results are taken from the response cache `resp_cache` when the same
+    filter has already been evaluated with the same parameters; the returned
+    arrays are read-only.
     """
+    key = ('H', fil_hash(fil_dict), hash_args(param, wholeF))
+    return resp_cache.lookup(key, _calc_Hcomplex, fil_dict, param, wholeF)
 
-    # causal poles/zeros
-    bc  = fil_dict['ba'][0]
-    ac  = fil_dict['ba'][1]
+def calc_Hcomplex_multi(fil_dicts, param, wholeF):
+    """
+    Calculate the complex frequency responses of several filter designs, e.g.
+    for overlaying them, see `calc_Hcomplex()`. Responses that are not in the
+    response cache yet are calculated in parallel by a pool of worker threads.
 
-    # standard call to signal freqz
-    W, H = sig.freqz(bc, ac, worN = param, whole = wholeF) 
+    Returns
+    -------
+    list of tuples (W, H), one for each filter dict in `fil_dicts`
+    """
+    # hash (and calculate lazy formats) in the main thread, the cache is
+    # only accessed from here as well
+    keys = [('H', fil_hash(f), hash_args(param, wholeF)) for f in fil_dicts]
+    results = dict((k, resp_cache.get(k)) for k in keys)
+    missing = dict((k, f) for k, f in zip(keys, fil_dicts) if results[k] is None)
+    if missing:
+        def _calc(item):
+            return item[0], _calc_Hcomplex(item[1], param, wholeF)
+        if len(missing) > 1:
+            calculated = _thread_pool().map(_calc, missing.items())
+        else:
+            calculated = map(_calc, missing.items())
+        for k, value in calculated:
+            results[k] = resp_cache.put(k, value)
+    return [results[k] for k in keys]
+
+_pool = None
+
+def _thread_pool():
+    """
+    Return the pool of worker threads for calculating responses, it is
+    created on first use with one thread per CPU.
+    """
+    global _pool
+    if _pool is None:
+        import multiprocessing
+        from multiprocessing.pool import ThreadPool
+        _pool = ThreadPool(max(multiprocessing.cpu_count(), 2))
+    return _pool
+
+def _calc_Hcomplex(fil_dict, param, wholeF):
+    """
+    Calculate the complex frequency response, see `calc_Hcomplex()`
+    """
+    sos = fil_sos(fil_dict)
+    if sos is not None:
+        W, H = sig.sosfreqz(sos, worN = param, whole = wholeF)
+    else:
+        # causal poles/zeros
+        bc  = fil_dict['ba'][0]
+        ac  = fil_dict['ba'][1]
+
+        # standard call to signal freqz
+        W, H = sig.freqz(bc, ac, worN = param, whole = wholeF)
 
     # test for NonCausal filter
     if ('rpk' in fil_dict):
@@ -1607,7 +2665,80 @@ def calc_Hcomplex(fil_dict, param, wholeF):
        H = H*ha
 
     return (W, H)
-    
+
+def calc_Hzoom(fil_dict, w_start, w_stop, N):
+    """
+    Calculate the complex frequency response H(f) at `N` equidistant frequencies
+    in the band w = w_start ... w_stop (normalized to 2 pi f_S) with a chirp-Z
+    transform, consider antiCausal poles/zeros. This allows evaluating a
+    zoomed-in frequency band with any resolution.
+
+    Results are cached like those of `calc_Hcomplex()`.
+
+    Returns
+    -------
+    W, H : ndarrays
+        frequency points and complex frequency response
+    """
+    key = ('Hzoom', fil_hash(fil_dict),
+           hash_args(float(w_start), float(w_stop), int(N)))
+    return resp_cache.lookup(key, _calc_Hzoom, fil_dict, w_start, w_stop, N)
+
+def _calc_Hzoom(fil_dict, w_start, w_stop, N):
+    """
+    Calculate the complex frequency response in a band, see `calc_Hzoom()`
+    """
+    sos = fil_sos(fil_dict)
+    if sos is not None: # product of the responses of the sections
+        W = np.linspace(w_start, w_stop, int(N))
+        zi = np.exp(-1j * W) # z^(-1)
+        H = np.ones(len(W), dtype=complex)
+        for b0, b1, b2, a0, a1, a2 in sos:
+            H *= (b0 + (b1 + b2 * zi) * zi) / (a0 + (a1 + a2 * zi) * zi)
+    else:
+        W, H = freqz_zoom(fil_dict['ba'][0], fil_dict['ba'][1], w_start, w_stop, N)
+
+    if 'rpk' in fil_dict: # anticausal part, see `_calc_Hcomplex()`
+        _, ha = freqz_zoom(np.conj(fil_dict['baA'][0]), np.conj(fil_dict['baA'][1]),
+                           w_start, w_stop, N)
+        H = H * ha.conjugate()
+
+    return W, H
+
+HMINMAX_N_ZOOM = 32 # number of points per refinement step in `calc_Hminmax()`
+
+def calc_Hminmax(fil_dict, w_start, w_stop, N=2048, tol=1e-10, max_iter=20):
+    """
+    Find the minimum and the maximum of |H(f)| and the corresponding frequencies
+    in the band w = w_start ... w_stop (normalized to 2 pi f_S).
+
+    The extrema are first located on a grid of `N` points, then the interval
+    around each extremum is zoomed into with the chirp-Z transform until it is
+    smaller than `tol`. This yields the extrema with (almost) machine precision
+    instead of the resolution of the grid.
+
+    Returns
+    -------
+    tuple (W_min, H_min, W_max, H_max)
+        frequencies and magnitudes of the minimum and the maximum
+    """
+    W, H = calc_Hzoom(fil_dict, w_start, w_stop, max(int(N), 3))
+    H_abs = np.abs(H)
+
+    result = []
+    for find in (np.argmin, np.argmax):
+        W_z, H_z = W, H_abs
+        for _ in range(max_iter):
+            i = find(H_z)
+            w_lo, w_hi = W_z[max(i-1, 0)], W_z[min(i+1, len(W_z)-1)]
+            if w_hi - w_lo < tol:
+                break
+            W_z, H_z = _calc_Hzoom(fil_dict, w_lo, w_hi, HMINMAX_N_ZOOM)
+            H_z = np.abs(H_z)
+        i = find(H_z)
+        result += [W_z[i], H_z[i]]
+    return tuple(result)
+
 #------------------------------------------------------------------------------
 
 if __name__=='__main__':
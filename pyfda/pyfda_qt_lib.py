@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 from .pyfda_lib import PY3
 
-from .compat import QFrame, QMessageBox
+from .compat import QFrame, QMessageBox, QApplication
 
 #------------------------------------------------------------------------------
 def qstr(text):
@@ -218,8 +218,14 @@ def qget_selected(table, select_all=False, reverse=True):
 #------------------------------------------------------------------------------
 def qfilter_warning(self, N, fil_class):
     """
-    Pop-up a warning box for very large filter orders
+    Pop-up a warning box for very large filter orders. Without a running
+    Qt application (e.g. in the design worker process), only a warning is logged
+    and the design is continued.
     """
+    if QApplication.instance() is None:
+        logger.warning("N = {0} is a rather high order for an {1} filter and may "
+                       "cause large numerical errors and compute times.".format(N, fil_class))
+        return True
     reply = QMessageBox.warning(self, 'Warning',
         ("<span><i><b>N = {0}</b></i> &nbsp; is a rather high order for<br />"
          "an {1} filter and may cause large <br />"
@@ -42,6 +42,13 @@ THEME = 'light' # select 'dark' or 'light' theme or 'none' or use one of the
 mpl_ms = 8 # base size for matplotlib markers
 # Various parameters for calculation and plotting
 params = {'N_FFT':  2048,   # number of FFT points for plot commands (freqz etc.)
+          'design_timeout': 60, # max. time for a filter design in s
+          # automatic number of points for transient responses (pyfda_lib.impz_len):
+          'impz_tol': 1e-4, # threshold for envelope / remaining energy
+          'impz_mode': 'settle', # 'settle' (envelope) or 'energy'
+          'impz_N_max': 10000, # hard cap for the number of points
+          # frequency points per screen pixel for zoomed-in frequency responses:
+          'N_zoom_pixel': 2,
           'FMT': '{:.3g}',  # format string for QLineEdit fields
           'CSV':    # format options and parameters for CSV-files and clipboard
                   {
@@ -425,6 +432,9 @@ qss_common = """
                         stop: 0 #cccccc, stop: 0.1 red, stop: 1.0 #444444);
                                 color: white;}
                 QPushButton[state="failed"]{background-color:orange; color:white}
+                QPushButton[state="busy"]{background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                        stop: 0 #cccccc, stop: 0.1 #3399ff, stop: 1.0 #444444);
+                                color: white;}
                 QPushButton[state="ok"]{background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
                         stop: 0 #cccccc, stop: 0.1 green, stop: 1.0 #444444);
                                 color: white;}
@@ -11,6 +11,7 @@ Mainwindow for the pyFDA app
 """
 from __future__ import print_function, division, unicode_literals, absolute_import
 import sys, os
+import multiprocessing
 
 #from sip import setdestroyonexit
 import logging
@@ -32,7 +33,7 @@ except ImportError:
 from .compat import (QtCore, QMainWindow, QApplication, QSplitter, QIcon, 
                      QMessageBox, QPlainTextEdit)
 
-from pyfda.pyfda_lib import to_html
+from pyfda.pyfda_lib import to_html, mod_version
 
 #========================= Setup the loggers ==================================
 class DynFileHandler(logging.FileHandler):
@@ -94,6 +95,7 @@ class QEditHandler(logging.Handler):
 logging.DynFileHandler = DynFileHandler
 logging.QEditHandler = QEditHandler
 logging.config.fileConfig(dirs.USER_LOG_CONF_FILE)#, disable_existing_loggers=True)
+logger.info("Found the following modules:" + "\n" + mod_version())
 #==============================================================================
 
 from pyfda import pyfda_rc as rc
@@ -251,6 +253,8 @@ def main():
     Since the QApplication object does so much initialization, it must be created 
     *before* any other objects related to the user interface are created."     
     """
+    # required for the design worker process in frozen executables (Windows)
+    multiprocessing.freeze_support()
      # instantiate QApplication object, passing command line arguments
 
     if len(rc.qss_rc) > 20:
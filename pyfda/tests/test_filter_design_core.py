@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the Qt-free design cores in pyfda.filter_design.core
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import subprocess
+import sys
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+import pyfda.filterbroker as fb
+from pyfda.filter_design.core.equiripple import EquirippleCore
+from pyfda.filter_design.core.firwin import FirwinCore
+from pyfda.filter_design.core.ma import MACore
+from pyfda.filter_design.core.ellip_zero import EllipZeroPhzCore
+from pyfda.pyfda_lib import (fir_min_order, fir_verify_order, fir_check_specs,
+                             spec_bands)
+
+def default_dict(**kwargs):
+    """ return a copy of the default filter dict, updated with `kwargs` """
+    fil_dict = dict(fb.fil[0])
+    fil_dict.pop('wdg_fil', None)
+    fil_dict.update(kwargs)
+    return fil_dict
+
+
+class TestDesignCore(unittest.TestCase):
+
+    def test_no_qt(self):
+        """ importing the design modules doesn't import PyQt or matplotlib """
+        code = ("import sys\n"
+                "import pyfda.filter_design.core.equiripple, pyfda.filter_design.core.firwin\n"
+                "import pyfda.filter_design.core.ma, pyfda.filter_design.core.ellip_zero\n"
+                "import pyfda.filter_design.butter, pyfda.filter_design.ellip\n"
+                "print(sorted(m for m in sys.modules if m.startswith(('PyQt', 'matplotlib'))))")
+        out = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(out.decode().strip(), '[]')
+
+    def test_equiripple(self):
+        fil_dict = default_dict(N=20, rt='LP', fo='man',
+                                wdg_fil={'equiripple':{'grid_density': 32}})
+        EquirippleCore().LPman(fil_dict)
+        b = sig.remez(21, [0, fil_dict['F_PB'], fil_dict['F_SB'], 0.5], [1, 0],
+                      weight=[fil_dict['W_PB'], fil_dict['W_SB']], Hz=1, grid_density=32)
+        np.testing.assert_allclose(fil_dict['ba'][0], b)
+
+    def test_firwin(self):
+        fil_dict = default_dict(N=30, rt='LP', fo='man',
+                                wdg_fil={'firwin':{'win':('kaiser', 5.), 'alg':'ichige'}})
+        FirwinCore().LPman(fil_dict)
+        b = sig.firwin(30, fil_dict['F_C'] * 2, window=('kaiser', 5.))
+        np.testing.assert_allclose(fil_dict['ba'][0], b)
+        # minimum order with kaiser window stores the calculated beta
+        fil_dict['fo'] = 'min'
+        FirwinCore().LPmin(fil_dict)
+        win = fil_dict['wdg_fil']['firwin']['win']
+        self.assertEqual(win[0], 'kaiser')
+        self.assertEqual(len(fil_dict['ba'][0]), fil_dict['N'])
+
+    def test_fir_min_order(self):
+        """ search finds the minimum compliant length from any estimate """
+        # a single tap 1/N meets a stopband spec of 1/37 for N >= 37
+        design = lambda N: [1. / N]
+        bands = [(0, 0.5, 0, 1. / 37)]
+        for N_est in (5, 36, 37, 38, 500):
+            self.assertEqual(fir_min_order(design, bands, N_est)[0], 37)
+        self.assertEqual(fir_min_order(design, bands, 4, step=2)[0], 38)
+        self.assertEqual(fir_min_order(design, bands, 5, N_max=30), (None, None))
+
+    def test_fir_verify_order(self):
+        """ verification is optional, failed searches fall back to the estimate """
+        fil_dict = default_dict(rt='LP', F_PB=0.1, F_SB=0.15, A_PB=0.02, A_SB=0.001)
+        design = lambda N: np.ones(N) / N
+        self.assertEqual(fir_verify_order(design, fil_dict, 5, verify=False)[0], 5)
+        N, b = fir_verify_order(design, fil_dict, 5, N_max=30)
+        self.assertEqual((N, len(b)), (5, 5))
+
+    def test_verify_min_order(self):
+        """ verified minimum order designs meet the specs with one tap less failing """
+        for cls, wdg_fil in ((EquirippleCore, {'equiripple':{'verify_N': True}}),
+                             (FirwinCore, {'firwin':{'win':'hamming', 'verify_N': True}})):
+            fil_dict = default_dict(rt='LP', fo='min', F_PB=0.1, F_SB=0.15, A_PB=0.02,
+                                    A_SB=0.001, wdg_fil=wdg_fil)
+            cls().LPmin(fil_dict)
+            b = fil_dict['ba'][0]
+            bands = spec_bands(fil_dict)
+            self.assertTrue(fir_check_specs([b], bands)[0])
+            fil_dict['fo'] = 'man'
+            fil_dict['N'] -= 1
+            fil_dict['wdg_fil'] = wdg_fil
+            cls().LPman(fil_dict)
+            self.assertEqual(len(fil_dict['ba'][0]), len(b) - 1)
+            self.assertFalse(fir_check_specs([fil_dict['ba'][0]], bands)[0])
+
+    def test_ma(self):
+        fil_dict = default_dict(rt='LP', fo='man',
+                                wdg_fil={'ma':{'delays': 7, 'stages': 2, 'normalize': True}})
+        MACore().LPman(fil_dict)
+        np.testing.assert_allclose(fil_dict['ba'][0], np.convolve(np.ones(8), np.ones(8)) / 64)
+        self.assertEqual(fil_dict['N'], 14)
+
+    def test_ellip_zero(self):
+        fil_dict = default_dict(N=4, rt='LP', fo='man')
+        EllipZeroPhzCore().LPman(fil_dict)
+        self.assertEqual(len(fil_dict['zpk'][1]), 4)
+        self.assertIn('rpk', fil_dict)
+        self.assertIn('baA', fil_dict)
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_design_core
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the filter dictionary with lazily calculated formats
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import pickle
+import numpy as np
+import scipy.signal as sig
+from pyfda.filter_dict import FilterDesign
+from pyfda.pyfda_lib import fil_save
+
+class TestFilterDesign(unittest.TestCase):
+
+    def setUp(self):
+        self.fil = FilterDesign(0.123, {'ft': 'IIR', 'N': 0})
+        self.b, self.a = sig.butter(5, 0.25)
+
+    def test_lazy(self):
+        """ formats are calculated on first access only and memoized """
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        self.assertTrue(self.fil.is_lazy('zpk'))
+        self.assertTrue(self.fil.is_lazy('sos'))
+        self.assertEqual(self.fil['creator'], ('ba', 'test'))
+        zpk = self.fil['zpk']
+        self.assertFalse(self.fil.is_lazy('zpk'))
+        self.assertIs(self.fil.zpk, zpk)
+        self.assertTrue(self.fil.is_lazy('sos'))
+        # same results as the eager conversion of a plain dict
+        fil_ref = {'ft': 'IIR'}
+        fil_save(fil_ref, [self.b, self.a], 'ba', 'test')
+        np.testing.assert_allclose(self.fil.sos, fil_ref['sos'])
+        np.testing.assert_allclose(np.sort_complex(zpk[1]),
+                                   np.sort_complex(fil_ref['zpk'][1]))
+
+    def test_invalidate(self):
+        """ a new design replaces all formats, also the calculated ones """
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        self.assertEqual(len(self.fil.zpk[1]), 5)
+        t = self.fil['timestamp']
+        fil_save(self.fil, sig.cheby1(3, 1, 0.3, output='zpk'), 'zpk', 'test2')
+        self.assertTrue(self.fil.is_lazy('ba'))
+        self.assertEqual(self.fil['creator'], ('zpk', 'test2'))
+        self.assertGreaterEqual(self.fil['timestamp'], t)
+        self.assertEqual(len(self.fil.ba[1]), 4)
+        self.assertEqual(self.fil.sos.shape, (2, 6))
+        # assigning the source format invalidates the formats derived from it
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        self.assertEqual(len(self.fil['zpk'][1]), 5)
+        self.fil['ba'] = [[1, 0.5], [1, -0.5]]
+        self.assertTrue(self.fil.is_lazy('zpk'))
+        self.assertTrue(self.fil.is_lazy('sos'))
+        self.assertEqual(self.fil.format_in, 'ba')
+        np.testing.assert_allclose(self.fil['zpk'][1], [0.5])
+
+    def test_filter_type(self):
+        """ lazy formats are calculated for the filter type of the design """
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        self.fil['ft'] = 'FIR' # changed by the user before a redesign
+        self.assertEqual(np.shape(self.fil.sos), (3, 6))
+
+        fil_save(self.fil, sig.firwin(41, 0.2), 'ba', 'test')
+        self.fil['ft'] = 'IIR'
+        self.assertEqual(self.fil.sos, [])
+        # copies keep the filter type of the design
+        fil = FilterDesign()
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        fil.update(self.fil)
+        fil['ft'] = 'FIR'
+        self.assertEqual(np.shape(fil.sos), (3, 6))
+
+    def test_rpk(self):
+        """ residues are calculated from 'ba', stored ones are returned as is """
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        r, p, k = self.fil.rpk
+        np.testing.assert_allclose(sig.invresz(r, p, k)[0], self.b, atol=1e-12)
+        self.assertNotIn('rpk', self.fil) # 'rpk' marks zero-phase designs
+        self.fil['rpk'] = [1, 2, 3]
+        self.assertEqual(self.fil.rpk, [1, 2, 3])
+
+    def test_dict_compatibility(self):
+        """ dict(), copy() and pickling behave like for a plain dict """
+        fil_save(self.fil, [self.b, self.a], 'ba', 'test')
+        self.assertEqual(self.fil['undefined'], 0.123) # default value
+
+        fil_copy = self.fil.copy()
+        self.assertTrue(fil_copy.is_lazy('zpk'))
+        fil_pkl = pickle.loads(pickle.dumps([self.fil], protocol=2))[0]
+        self.assertIsInstance(fil_pkl, FilterDesign)
+        self.assertTrue(fil_pkl.is_lazy('zpk'))
+        self.assertEqual(fil_pkl['creator'], ('ba', 'test'))
+
+        fil_dict = dict(self.fil)
+        self.assertEqual(set(fil_dict), set(self.fil.keys()))
+        self.assertEqual(len(fil_dict['zpk'][1]), 5)
+        self.assertEqual(np.shape(dict(**fil_pkl)['sos']), (3, 6))
+        self.assertEqual(len(dict(fil_copy.items())['zpk'][0]), 5)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_dict
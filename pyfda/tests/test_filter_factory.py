@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for running filter designs in the worker process of filter_factory
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import time
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+import pyfda.filterbroker as fb
+import pyfda.filter_factory as ff
+from pyfda.pyfda_rc import params
+
+def butter_dict():
+    """ return a filter dict for a 4th order Butterworth LP """
+    fil_dict = dict(fb.fil[0])
+    fil_dict.update({'N': 4, 'F_C': 0.1, 'rt': 'LP', 'fo': 'man', 'fc': 'Butter',
+                     'ba': [1, 1]})
+    return fil_dict
+
+def wait(fact, t_max=60):
+    """ poll the design until it has finished or `t_max` s have passed """
+    t_start = time.time()
+    err = fact.poll_fil_method()
+    while err is None and time.time() - t_start < t_max:
+        time.sleep(0.05)
+        err = fact.poll_fil_method()
+    return err
+
+
+@unittest.skipIf(ff.MP_CTX is None, "multiprocessing with 'spawn' is not available")
+class TestWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.fact = ff.FilterFactory()
+        self.timeout = params['design_timeout']
+        self.fil_inst = ff.fil_inst
+
+    def tearDown(self):
+        self.fact.stop_worker()
+        ff.fil_inst = self.fil_inst
+        params['design_timeout'] = self.timeout
+
+    def test_design(self):
+        fil_dict = butter_dict()
+        err = self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        self.assertIsNone(err) # design runs in the background
+        self.assertTrue(self.fact.busy())
+        self.assertEqual(wait(self.fact), 0)
+        self.assertFalse(self.fact.busy())
+        b, a = sig.butter(4, 0.2)
+        np.testing.assert_allclose(fil_dict['ba'][0], b)
+        np.testing.assert_allclose(fil_dict['ba'][1], a)
+        # the results are identical to those of the design in this process
+        fil_dict_l = butter_dict()
+        self.assertEqual(self.fact.call_fil_method('LPman', fil_dict_l), 0)
+        np.testing.assert_allclose(fil_dict['ba'][1], fil_dict_l['ba'][1])
+
+    def test_errors(self):
+        self.assertEqual(self.fact.start_fil_method('XXman', butter_dict(), fc='Butter'), 17)
+        # exception in the worker, the filter dict is not modified
+        fil_dict = butter_dict()
+        fil_dict['F_C'] = 'foo'
+        self.assertIsNone(self.fact.start_fil_method('LPman', fil_dict, fc='Butter'))
+        self.assertEqual(wait(self.fact), 99)
+        self.assertEqual(fil_dict['ba'], [1, 1])
+
+    def test_cancel_timeout(self):
+        fil_dict = butter_dict()
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        self.assertEqual(self.fact.cancel_fil_method(), -1)
+        self.assertFalse(self.fact.busy())
+        self.assertEqual(fil_dict['ba'], [1, 1])
+        params['design_timeout'] = 0 # worker needs some time to start up
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        time.sleep(0.01)
+        self.assertEqual(wait(self.fact), 20)
+        self.assertEqual(fil_dict['ba'], [1, 1])
+        # the worker is restarted for the next design
+        params['design_timeout'] = self.timeout
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        self.assertEqual(wait(self.fact), 0)
+
+    def test_edit_while_running(self):
+        """ specs edited during the design are kept, a new selection discards it """
+        fil_dict = butter_dict()
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        fil_dict['F_SB'] = 0.321 # not used by the design
+        fil_dict['N'] = 7 # used, but not changed by a manual order design
+        self.assertEqual(wait(self.fact), 0)
+        self.assertEqual(len(fil_dict['ba'][1]), 5)
+        self.assertEqual((fil_dict['F_SB'], fil_dict['N']), (0.321, 7))
+
+        fil_dict = butter_dict()
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        fil_dict['rt'] = 'HP'
+        self.assertEqual(wait(self.fact), -1)
+        self.assertEqual(fil_dict['ba'], [1, 1])
+
+        self.fact.start_fil_method('LPman', fil_dict, fc='Butter')
+        self.fact.create_fil_inst('Cheby1') # filter class changed by the user
+        self.assertEqual(wait(self.fact), -1)
+        self.assertEqual(fil_dict['ba'], [1, 1])
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_factory
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for parameter sweeps over filter specs
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+import pyfda.filterbroker as fb
+import pyfda.filter_factory as ff
+from pyfda.filter_sweep import ParameterSweep, sweep_metrics
+from pyfda.pyfda_lib import fil_save
+
+def butter_dict():
+    """ return a filter dict for a Butterworth LP """
+    fil_dict = fb.fil[0].copy()
+    fil_dict.update({'N': 4, 'F_C': 0.1, 'F_PB': 0.05, 'F_SB': 0.2,
+                     'rt': 'LP', 'fo': 'man', 'fc': 'Butter', 'ft': 'IIR'})
+    return fil_dict
+
+class TestFilterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.fil_inst = ff.fil_inst
+        ff.fil_factory.create_fil_inst('Butter')
+
+    def tearDown(self):
+        ff.fil_inst = self.fil_inst
+
+    def test_metrics(self):
+        """ metrics of a Butterworth LP match its frequency response """
+        fil_dict = butter_dict()
+        fil_save(fil_dict, sig.butter(4, 0.2), 'ba', 'test')
+        m = sweep_metrics(fil_dict)
+        self.assertEqual(m['N_design'], 4)
+        _, H = sig.freqz(*sig.butter(4, 0.2), worN=[0.4 * np.pi])
+        self.assertAlmostEqual(m['A_SB'], -20 * np.log10(abs(H[0])),
+                               delta=0.1) # frequency grid
+        self.assertTrue(0 < m['A_PB'] < 0.1)
+        self.assertTrue(0 < m['tau_spread'] < 2)
+
+        fil_dict['rt'] = 'HIL' # no pass- and stopbands
+        self.assertTrue(np.isnan(sweep_metrics(fil_dict)['A_SB']))
+
+    def test_sweep(self):
+        """ 2D sweep in the worker processes and in the current process """
+        fil_dict = butter_dict()
+        params = [('N', [2, 4, 6]), ('F_SB', [0.2, 0.3])]
+        res = ParameterSweep(fil_dict, 'LPman', params).run(processes=2)
+        self.assertEqual(res.shape, (3, 2))
+        np.testing.assert_array_equal(res['err'], 0)
+        np.testing.assert_array_equal(res['N_design'][:, 0], [2, 4, 6])
+        # stopband attenuation increases with order and stopband edge
+        self.assertTrue(np.all(np.diff(res['A_SB'], axis=0) > 0))
+        self.assertTrue(np.all(np.diff(res['A_SB'], axis=1) > 0))
+        self.assertEqual(fil_dict['N'], 4) # filter dict is not modified
+
+        mp_ctx, ff.MP_CTX = ff.MP_CTX, None
+        try:
+            res_s = ParameterSweep(fil_dict, 'LPman', params).run()
+        finally:
+            ff.MP_CTX = mp_ctx
+        np.testing.assert_allclose(res_s['A_SB'], res['A_SB'])
+
+        table = res.table()
+        self.assertEqual(table.shape, (6, len(res.columns())))
+        self.assertEqual(res.columns()[:3], ['N', 'F_SB', 'N_design'])
+        np.testing.assert_allclose(table[:, 1], [0.2, 0.3] * 3)
+
+        with self.assertRaises(ValueError):
+            ParameterSweep(fil_dict, 'LPman', [('foo', [1, 2])])
+
+    def test_worker_error(self):
+        """ an exception raised by the pool cancels the sweep """
+        class FailingResults(object):
+            def next(self, timeout=None):
+                raise RuntimeError("worker died")
+        sw = ParameterSweep(butter_dict(), 'LPman', [('N', [2, 4])])
+        sw._it = FailingResults()
+        self.assertTrue(sw.poll())
+        self.assertEqual(sw.error, "RuntimeError: worker died")
+        self.assertTrue(sw.poll()) # nothing is raised again
+        self.assertTrue(np.all(np.isnan(sw.result['A_SB'])))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_sweep
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for caching the filter tree in filter_tree_builder
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import os, sys
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from pyfda.compat import QApplication
+import pyfda.filterbroker as fb
+import pyfda.filter_factory as ff
+from pyfda.filter_tree_builder import FilterTreeBuilder, file_stamp
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def thaw(tree):
+    """ convert a (frozen) filter tree to nested dicts for comparison """
+    if isinstance(tree, frozenset): # FrozenDict with key-value items
+        return dict((k, thaw(v)) for k, v in frozenset.__iter__(tree))
+    return tree
+
+class TestFilterTreeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'fil_tree.pickle')
+        self.globals = (fb.fil_tree, fb.fil_classes, ff.fil_inst)
+
+    def tearDown(self):
+        fb.fil_tree, fb.fil_classes, ff.fil_inst = self.globals
+        shutil.rmtree(self.tmp_dir)
+
+    def build(self):
+        return FilterTreeBuilder('filter_design', 'filter_list.txt',
+                                 comment_char='#', cache_file=self.cache_file)
+
+    def test_file_stamp(self):
+        path = os.path.join(self.tmp_dir, 'a.txt')
+        with open(path, 'w') as f:
+            f.write('abc')
+        stamp = file_stamp(path)
+        self.assertEqual(stamp[1], 3)
+        self.assertEqual(file_stamp(path, stamp), stamp)
+        # same mtime and size: file is not hashed again
+        self.assertIs(file_stamp(path, stamp[:2] + ('x',))[2], 'x')
+
+    def test_cache(self):
+        ftb = self.build()
+        if ftb.import_errors > 0:
+            self.skipTest("not all filter modules can be imported")
+        self.assertTrue(os.path.isfile(self.cache_file))
+        fil_tree = fb.fil_tree
+        fil_classes = dict(fb.fil_classes)
+
+        ff.fil_inst = None
+        fb.fil_tree = fb.fil_classes = None
+        ftb = self.build()
+        self.assertFalse(hasattr(ftb, 'import_errors')) # nothing has been imported
+        self.assertIsNone(ff.fil_inst)
+        self.assertEqual(thaw(fb.fil_tree), thaw(fil_tree))
+        self.assertEqual(fb.fil_classes, fil_classes)
+
+        # stamp a copy of the filter files, the installed ones are not touched
+        filt_dir_path = os.path.join(self.tmp_dir, 'filter_design')
+        shutil.copytree(ftb.filt_dir_path, filt_dir_path,
+                        ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+        ftb.filt_dir_file = os.path.join(filt_dir_path,
+                                         os.path.basename(ftb.filt_dir_file))
+        ftb.filt_dir_path = filt_dir_path
+        ftb.save_cache(thaw(fb.fil_tree))
+        self.assertTrue(ftb.load_cache())
+
+        # a changed file invalidates the cache
+        path = ftb._cache_files()[-1]
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data + b'\n')
+        self.assertFalse(ftb.load_cache())
+        # a touched but unchanged file is rehashed, the cache stays valid ...
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (0, 12345)) # distinct mtime on coarse filesystems
+        self.assertTrue(ftb.load_cache())
+        # ... and its new stamp is stored, it isn't hashed again at next start
+        with open(self.cache_file, 'rb') as f:
+            stamp = pickle.load(f)['files'][path]
+        self.assertEqual(tuple(stamp), file_stamp(path))
+        self.assertEqual(stamp[0], 12345)
+
+    def test_invalid_cache(self):
+        with open(self.cache_file, 'wb') as f:
+            f.write(b'no pickle')
+        ftb = self.build() # cache is ignored and rebuilt
+        self.assertTrue(len(fb.fil_classes) > 0)
+        if ftb.import_errors == 0:
+            self.assertTrue(ftb.load_cache())
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_tree_builder
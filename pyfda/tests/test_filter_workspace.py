@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the workspace with several filter designs and the parallel
+calculation of their frequency responses
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+import pyfda.filterbroker as fb
+import pyfda.filter_workspace as ws
+from pyfda.pyfda_lib import (fil_save, calc_Hcomplex, calc_Hcomplex_multi,
+                             resp_cache)
+
+class TestFilterWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.fil_0 = fb.fil[0].copy()
+        fb.fil[1:] = [None] * (len(fb.fil) - 1)
+        ws.overlay.clear()
+        ws.active = None
+        resp_cache.clear()
+
+    def tearDown(self):
+        fb.fil[0] = self.fil_0
+        fb.fil[1:] = [None] * (len(fb.fil) - 1)
+        ws.overlay.clear()
+        ws.active = None
+
+    def test_store_activate(self):
+        """ activating a stored design restores it, lazy formats stay lazy """
+        fil_save(fb.fil[0], sig.butter(4, 0.2), 'ba', 'test')
+        fb.fil[0]['N'] = 4
+        idx = ws.store("butter")
+        self.assertEqual((idx, ws.active, ws.slots()), (1, 1, [1]))
+        self.assertTrue(fb.fil[1].is_lazy('zpk'))
+
+        fil_save(fb.fil[0], sig.firwin(21, 0.2), 'ba', 'test')
+        fb.fil[0]['N'] = 20
+        self.assertEqual(ws.store(), 2)
+        self.assertNotEqual(ws.design_name(fb.fil[2]), "butter")
+
+        ws.activate(1)
+        self.assertEqual((fb.fil[0]['N'], fb.fil[0]['ft']), (4, 'IIR'))
+        self.assertEqual(ws.active_name(), "butter")
+        self.assertNotIn(ws.NAME_KEY, fb.fil[0])
+        self.assertTrue(fb.fil[0].is_lazy('zpk'))
+        self.assertIsNot(fb.fil[0], fb.fil[1])
+
+        ws.set_overlay(2)
+        ws.rename(2, "fir")
+        self.assertEqual([(i, name) for i, name, _ in ws.overlay_designs()], [(2, "fir")])
+        ws.remove(2)
+        self.assertEqual((ws.overlay_designs(), ws.slots()), ([], [1]))
+
+        for i in range(len(fb.fil) - 2):
+            ws.store()
+        with self.assertRaises(ValueError):
+            ws.store()
+
+    def test_nested_values(self):
+        """ nested values modified in place are not shared with stored designs """
+        fb.fil[0]['wdg_fil'] = {'equiripple': {'grid_density': 16}}
+        ws.store("remez")
+        fb.fil[0]['wdg_fil']['equiripple'].update({'grid_density': 64})
+        self.assertEqual(fb.fil[1]['wdg_fil']['equiripple']['grid_density'], 16)
+
+        ws.activate(1)
+        fb.fil[0]['wdg_fil']['equiripple']['grid_density'] = 32
+        self.assertEqual(fb.fil[1]['wdg_fil']['equiripple']['grid_density'], 16)
+
+    def test_calc_Hcomplex_multi(self):
+        """ responses of several designs are calculated in parallel and cached """
+        fils = []
+        for N in (3, 5, 7):
+            fil = {'ft': 'IIR'}
+            fil_save(fil, sig.cheby1(N, 1, 0.3, output='zpk'), 'zpk', 'test')
+            fils.append(fil)
+        results = calc_Hcomplex_multi(fils + fils[:1], 256, True)
+        self.assertEqual(len(results), 4)
+        self.assertIs(results[0], results[3])
+        self.assertEqual(len(resp_cache), 3)
+        for fil, (W, H) in zip(fils, results):
+            np.testing.assert_allclose(H, sig.freqz(fil['ba'][0], fil['ba'][1], W)[1],
+                                       atol=1e-10)
+            self.assertIs(calc_Hcomplex(fil, 256, True)[1], H)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_filter_workspace
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the chirp-Z transform and the zoomed frequency response
+evaluation in pyfda_lib
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import czt, freqz_zoom, calc_Hzoom, calc_Hminmax, resp_cache
+
+class TestFreqzZoom(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(1)
+        resp_cache.clear()
+
+    def test_czt(self):
+        """ chirp-Z transform equals the direct evaluation on a spiral contour """
+        W, A = 0.999 * np.exp(-0.1j), 1.01 * np.exp(0.3j)
+        for N, M in [(1, 5), (5, 1), (37, 50), (101, 32)]:
+            x = self.rng.randn(N) + 1j * self.rng.randn(N)
+            z = A * W**(-np.arange(M))
+            X_ref = np.array([np.sum(x * zk**(-np.arange(N))) for zk in z])
+            np.testing.assert_allclose(czt(x, M, W, A), X_ref, rtol=1e-12,
+                                       atol=1e-12 * np.max(abs(X_ref)))
+        # DFT as special case
+        x = self.rng.randn(64)
+        np.testing.assert_allclose(czt(x, 64, np.exp(-2j*np.pi/64)), np.fft.fft(x),
+                                   atol=1e-12)
+
+    def test_freqz_zoom(self):
+        """ zoomed frequency response equals freqz at the same frequencies """
+        for b, a in [(sig.firwin(101, 0.3), [1]), sig.ellip(6, 0.5, 60, 0.2)]:
+            w, H = freqz_zoom(b, a, 0.1, 0.7, 777)
+            self.assertEqual((w[0], len(w)), (0.1, 777))
+            self.assertAlmostEqual(w[-1], 0.7)
+            _, H_ref = sig.freqz(b, a, worN=w)
+            np.testing.assert_allclose(H, H_ref, rtol=1e-8, atol=1e-10)
+
+    def test_calc_Hzoom(self):
+        """ results with anticausal part match calc_Hcomplex and are cached """
+        b, a = sig.butter(3, 0.3)
+        fil = {'ba': [b, a], 'baA': [b[::-1], np.array([1.])], 'rpk': True}
+        W, H = calc_Hzoom(fil, 0.2, 1.2, 50)
+        H_ref = sig.freqz(b, a, worN=W)[1] * np.conj(sig.freqz(b[::-1], 1, worN=W)[1])
+        np.testing.assert_allclose(H, H_ref, rtol=1e-10)
+        self.assertIs(calc_Hzoom(fil, 0.2, 1.2, 50)[1], H)
+
+    def test_calc_Hminmax(self):
+        """ extrema in the passband are found with high precision """
+        h = sig.firwin(101, 0.5, window=('kaiser', 4))
+        W_min, H_min, W_max, H_max = calc_Hminmax({'ba': [h, [1]]}, 0, 0.4*np.pi, N=256)
+        w, H = sig.freqz(h, 1, worN=np.linspace(0, 0.4*np.pi, 2**18))
+        self.assertAlmostEqual(H_max, np.max(abs(H)), places=9)
+        self.assertAlmostEqual(H_min, np.min(abs(H)), places=9)
+        self.assertAlmostEqual(W_max, w[np.argmax(abs(H))], places=4)
+        self.assertAlmostEqual(W_min, w[np.argmin(abs(H))], places=4)
+        # much more accurate than the grid itself:
+        _, H_grid = sig.freqz(h, 1, worN=np.linspace(0, 0.4*np.pi, 256))
+        self.assertTrue(np.min(abs(H_grid)) - H_min > 1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_freqz_zoom
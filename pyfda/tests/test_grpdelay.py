@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for grpdelay in pyfda_lib: compare FFT, polyval and SOS implementations
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import grpdelay
+
+class TestGrpdelay(unittest.TestCase):
+
+    def _compare(self, b, a, nfft, whole):
+        """ compare FFT and polyval results where |H| is not too small """
+        w1, gd1 = grpdelay(b, a, nfft, whole=whole, method='polyval', verbose=False)
+        w2, gd2 = grpdelay(b, a, nfft, whole=whole, method='fft', verbose=False)
+        np.testing.assert_allclose(w1, w2)
+        _, H = sig.freqz(b, a, worN=w1)
+        mask = abs(H) > 1e-3 * max(abs(H))
+        np.testing.assert_allclose(gd1[mask], gd2[mask], rtol=1e-6, atol=1e-6)
+
+    def test_fir(self):
+        b = sig.firwin(101, 0.2)
+        for nfft in [64, 511, 512, 2048]: # also test folding for nfft < len(b)
+            self._compare(b, 1, nfft, True)
+        w, gd = grpdelay(b, 1, 512, whole=True)
+        np.testing.assert_allclose(gd, 50, atol=1e-6) # linear phase
+
+    def test_iir(self):
+        b, a = sig.ellip(6, 0.5, 60, 0.3)
+        for nfft in [511, 512, 2048]:
+            for whole in [True, False]:
+                self._compare(b, a, nfft, whole)
+
+    def test_complex(self):
+        b = sig.firwin(31, 0.2) * np.exp(1j * 0.3 * np.arange(31))
+        self._compare(b, 1, 512, True)
+
+    def test_sos(self):
+        sos = sig.butter(6, 0.3, output='sos')
+        b, a = sig.sos2tf(sos)
+        w1, gd1 = grpdelay(b, a, 1024, whole=True, verbose=False)
+        w2, gd2 = grpdelay(None, None, 1024, whole=True, sos=sos, verbose=False)
+        # the group delay is ill-conditioned near the sixfold zero at z = -1
+        _, H = sig.sosfreqz(sos, worN=w1)
+        mask = abs(H) > 1e-3
+        np.testing.assert_allclose(gd1[mask], gd2[mask], rtol=1e-6, atol=1e-6)
+
+    def test_singular(self):
+        # zero on the unit circle at F = 0.25
+        b = np.array([1, 0, 1])
+        w, gd = grpdelay(b, 1, 8, whole=True, verbose=False)
+        self.assertEqual(gd[2], 0)
+        self.assertEqual(gd[6], 0)
+        np.testing.assert_allclose(gd[[0, 1, 3]], 1)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            grpdelay([1, 1], 1, method='foo')
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_grpdelay
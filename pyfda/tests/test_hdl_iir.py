@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the floating-point IIR sections and the frame-wise RTL
+simulation in hdl_generation
+"""
+from __future__ import division, print_function, unicode_literals
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+from numpy.fft import fft
+
+from pyfda.hdl_generation.iir_sections import IIRTypeOneSection, IIRTypeTwoSection
+
+try:
+    import myhdl
+    from pyfda.hdl_generation.filter_iir import FilterIIR
+except ImportError:
+    myhdl = None
+
+
+class TestIIRSections(unittest.TestCase):
+
+    def test_sections(self):
+        """ direct form I and II biquads give the same result as lfilter """
+        x = np.random.RandomState(1).uniform(-1, 1, 200)
+        for b, a in (sig.butter(2, 0.2), sig.cheby1(2, 1, 0.3, 'high')):
+            y_ref = sig.lfilter(b, a, x)
+            for cls in (IIRTypeOneSection, IIRTypeTwoSection):
+                sec = cls(b, a)
+                np.testing.assert_allclose([sec.process(v) for v in x], y_ref,
+                                           atol=1e-12, err_msg=cls.__name__)
+
+
+@unittest.skipIf(myhdl is None, "MyHDL is not available")
+class TestFilterIIRSim(unittest.TestCase):
+
+    def setUp(self):
+        self.b, self.a = sig.butter(2, 0.2)
+        self.flt = FilterIIR(b=self.b, a=self.a, word_format=(24, 0))
+
+    def test_simulate_freqz(self):
+        """ frames are simulated from reset and their spectra are averaged """
+        np.random.seed(0)
+        self.flt.simulate_freqz(num_loops=3, Nfft=64, processes=1)
+        np.random.seed(0)
+        xf = np.random.uniform(-1, 1, (3, 64))
+        frames = [self.flt.simulate_frame(x) for x in xf]
+        ysave = np.array([y for _, y, _ in frames])
+        np.testing.assert_array_equal(np.array([x for _, _, x in frames]), xf)
+        np.testing.assert_allclose(self.flt.yfavg,
+                                   np.sum(np.abs(fft(ysave, axis=1)), axis=0) / 64)
+        # fixpoint RTL and floating-point model of the same frames agree
+        np.testing.assert_allclose(self.flt.yfavg, self.flt.pfavg, rtol=1e-3)
+
+        yfavg = self.flt.yfavg
+        np.random.seed(0)
+        self.flt.simulate_freqz(num_loops=3, Nfft=64, processes=2)
+        np.testing.assert_allclose(self.flt.yfavg, yfavg)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_hdl_iir
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the automatic impulse response length impz_len in pyfda_lib
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import impz_len, impz
+
+class TestImpzLen(unittest.TestCase):
+
+    def test_fir(self):
+        b = sig.firwin(151, 0.2)
+        self.assertEqual(impz_len(b), 151)
+        self.assertEqual(impz_len(b, np.r_[1, np.zeros(150)]), 151) # padded a
+        self.assertEqual(impz_len(b, N_max=100), 100)
+
+    def test_iir(self):
+        """ the response has settled after N points, narrowband filters need more """
+        for f_c in [0.4, 0.1, 0.01]:
+            b, a = sig.ellip(4, 0.5, 60, f_c)
+            z, p, k = sig.tf2zpk(b, a)
+            for mode, tol in [('settle', 1e-4), ('energy', 1e-6)]:
+                N = impz_len(b, a, p, tol=tol, mode=mode)
+                self.assertEqual(N, impz_len(b, a, tol=tol, mode=mode)) # poles from a
+                h = sig.lfilter(b, a, np.r_[1, np.zeros(4 * N - 1)])
+                if mode == 'settle':
+                    self.assertTrue(np.max(np.abs(h[N:])) < 10 * tol * np.max(np.abs(h)))
+                else:
+                    self.assertTrue(np.sum(h[N:]**2) < 10 * tol * np.sum(h**2))
+        self.assertTrue(impz_len(*sig.ellip(4, 0.5, 60, 0.01)) >
+                        10 * impz_len(*sig.ellip(4, 0.5, 60, 0.4)))
+
+    def test_unstable(self):
+        self.assertEqual(impz_len([1], [1, -1], N_max=500), 500)
+        self.assertEqual(impz_len([1], [1, -1.1]), impz_len([1], [1, -2]))
+
+    def test_impz(self):
+        b, a = sig.butter(3, 0.1)
+        h, t = impz(b, a)
+        self.assertEqual(len(h), impz_len(b, a))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            impz_len([1], [1, 0.5], mode='foo')
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_impz_len
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for lfilter_fast in pyfda_lib: compare direct form, overlap-save and
+overlap-add FFT convolution and second-order sections with scipy.signal.lfilter
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import lfilter_fast, lfilter_cost, fft_len
+
+class TestLfilterFast(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(1)
+
+    def test_fft_len(self):
+        self.assertEqual([fft_len(n) for n in [1, 7, 11, 17, 101, 1025, 8001]],
+                         [1, 8, 12, 18, 108, 1080, 8100])
+
+    def test_fir(self):
+        """ all methods give the same result for different lengths """
+        for L, N in [(1, 10), (5, 3), (31, 1000), (300, 5000), (1001, 700)]:
+            b = self.rng.randn(L)
+            x = self.rng.randn(N)
+            y_ref = sig.lfilter(b, 1, x)
+            for method in ['auto', 'direct', 'ols', 'ola']:
+                # pyfda pads the denominator of FIR filters with zeros
+                y = lfilter_fast(b, np.r_[1, np.zeros(L-1)], x, method=method)
+                self.assertEqual(y.shape, y_ref.shape)
+                np.testing.assert_allclose(y, y_ref, atol=1e-10)
+        # short FFT length, many blocks
+        np.testing.assert_allclose(lfilter_fast(b, 1, x, method='ola', nfft=2048),
+                                   y_ref, atol=1e-10)
+
+    def test_complex(self):
+        b = sig.firwin(41, 0.2) * np.exp(1j * 0.3 * np.arange(41))
+        x = self.rng.randn(1000)
+        for method in ['ols', 'ola']:
+            np.testing.assert_allclose(lfilter_fast(b, 1, x, method=method, nfft=128),
+                                       sig.lfilter(b, 1, x), atol=1e-12)
+
+    def test_iir(self):
+        sos = sig.ellip(8, 0.5, 60, 0.2, output='sos')
+        b, a = sig.sos2tf(sos)
+        x = self.rng.randn(2000)
+        np.testing.assert_allclose(lfilter_fast(b, a, x, sos=sos),
+                                   sig.sosfilt(sos, x))
+        np.testing.assert_allclose(lfilter_fast(b, a, x), sig.lfilter(b, a, x))
+        with self.assertRaises(ValueError):
+            lfilter_fast(b, a, x, method='ols')
+
+    def test_cost(self):
+        self.assertEqual(lfilter_cost(10, 100000)[0], 'direct')
+        method, nfft = lfilter_cost(4001, 200000)
+        self.assertEqual(method, 'ols')
+        self.assertEqual(nfft, fft_len(nfft))
+        self.assertTrue(nfft >= 2 * 4001)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            lfilter_fast([1, 1], 1, [1, 2, 3], method='foo')
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_lfilter_fast
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the chunked streaming filter in pyfda_filter
+"""
+from __future__ import division, print_function, unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import scipy.signal as sig
+from scipy.io import wavfile
+
+from pyfda.pyfda_filter import load_filter, filter_file, main
+
+
+class TestStreamingFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.b, self.a = sig.ellip(6, 0.5, 60, 0.2)
+        self.sos = sig.tf2sos(self.b, self.a)
+        np.savez(self.path('iir.npz'), ba=np.array([self.b, self.a]), sos=self.sos,
+                 ft='IIR')
+        np.savez(self.path('iir_ba.npz'), ba=np.array([self.b, self.a]), sos=[],
+                 ft='IIR')
+        self.x = np.random.RandomState(1).randn(10007, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def path(self, file_name):
+        return os.path.join(self.dir, file_name)
+
+    def test_load_filter(self):
+        fmt, sos = load_filter(self.path('iir.npz'))
+        self.assertEqual(fmt, 'sos')
+        np.testing.assert_array_equal(sos, self.sos)
+        fmt, (b, a) = load_filter(self.path('iir.npz'), use_ba=True)
+        self.assertEqual(fmt, 'ba')
+        np.testing.assert_array_equal(a, self.a)
+        self.assertEqual(load_filter(self.path('iir_ba.npz'))[0], 'ba')
+
+    def test_npy(self):
+        """ filtering in chunks gives the same result as filtering at once """
+        np.save(self.path('x.npy'), self.x)
+        for threads in [1, 3]:
+            res = filter_file(self.path('iir.npz'), self.path('x.npy'),
+                              self.path('y.npy'), chunk_size=1000, threads=threads)
+            self.assertEqual((res['N'], res['channels'], res['fmt']), (10007, 3, 'sos'))
+            np.testing.assert_allclose(np.load(self.path('y.npy')),
+                                       sig.sosfilt(self.sos, self.x, axis=0), atol=1e-12)
+        np.save(self.path('x.npy'), self.x[:, 0])
+        filter_file(self.path('iir_ba.npz'), self.path('x.npy'), self.path('y.npy'),
+                    chunk_size=333)
+        np.testing.assert_allclose(np.load(self.path('y.npy'))[:, 0],
+                                   sig.lfilter(self.b, self.a, self.x[:, 0]), atol=1e-12)
+
+    def test_wav(self):
+        """ integer WAV files are rounded and saturated, float WAVs keep their type """
+        xi = (self.x * 8000).astype(np.int16)
+        wavfile.write(self.path('x.wav'), 44100, xi)
+        self.assertEqual(main([self.path('iir.npz'), self.path('x.wav'),
+                               self.path('y.wav'), '-c', '4096']), 0)
+        f_S, y = wavfile.read(self.path('y.wav'))
+        self.assertEqual((f_S, y.dtype, y.shape), (44100, np.int16, xi.shape))
+        y_ref = np.clip(np.round(sig.sosfilt(self.sos, xi, axis=0)), -2**15, 2**15-1)
+        self.assertTrue(np.max(np.abs(y - y_ref)) <= 1)
+
+        wavfile.write(self.path('x.wav'), 8000, self.x.astype(np.float32))
+        filter_file(self.path('iir.npz'), self.path('x.wav'), self.path('y.npy'))
+        y = np.load(self.path('y.npy'))
+        self.assertEqual(y.dtype, np.float32)
+        np.testing.assert_allclose(y, sig.sosfilt(self.sos, self.x.astype(np.float32),
+                                                  axis=0), atol=1e-5)
+
+    def test_wav_8bit(self):
+        """ unsigned 8 bit WAV data is filtered around its midpoint of 128 """
+        b, a = sig.butter(2, 0.05, 'high')
+        np.savez(self.path('hp.npz'), ba=np.array([b, a]), sos=sig.tf2sos(b, a),
+                 ft='IIR')
+        n = np.arange(8000)
+        xu = np.round(128 + 60 * np.sin(2 * np.pi * 0.1 * n)).astype(np.uint8)
+        wavfile.write(self.path('x.wav'), 8000, xu)
+        filter_file(self.path('hp.npz'), self.path('x.wav'), self.path('y.wav'))
+        y = wavfile.read(self.path('y.wav'))[1]
+        self.assertEqual(y.dtype, np.uint8)
+        y_ref = np.clip(np.round(sig.sosfilt(sig.tf2sos(b, a), xu - 128.) + 128), 0, 255)
+        self.assertTrue(np.max(np.abs(y - y_ref)) <= 1)
+        self.assertAlmostEqual(np.mean(y[1000:]), 128, delta=1)
+
+    def test_invalid(self):
+        self.assertEqual(main([self.path('iir.npz'), self.path('x.txt'),
+                               self.path('y.npy')]), 1)
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_pyfda_filter
@@ -6,10 +6,12 @@ Created on Wed Jun 14 11:57:19 2017
 """
 
 
+import re
 import unittest
 import numpy as np
 from pyfda import pyfda_fix_lib as fix_lib
-from pyfda.pyfda_fix_lib import bin2hex, dec2csd, csd2dec
+from pyfda.pyfda_fix_lib import (bin2hex, dec2csd, csd2dec, dec2csd_vec,
+                                 int2bin_vec, int2hex_vec)
 # TODO: Add test case for complex numbers
 
 class TestSequenceFunctions(unittest.TestCase):
@@ -197,6 +199,56 @@ class TestSequenceFunctions(unittest.TestCase):
         yq_list_goal = [7.0, -8.0, -4, 0, 4, 7, 7.5, -8, -7.5]
         self.assertEqual(yq_list, yq_list_goal)
 
+        # values that are a multiple of the full range away are wrapped to MIN
+        q_obj = {'WI':0, 'WF':3, 'ovfl':'wrap', 'quant':'ceil', 'scale': 1}
+        self.myQ.setQobj(q_obj)
+        yq_list = list(self.myQ.fixp([-3.0, -1.0, 1.0, 3.0]))
+        self.assertEqual(yq_list, [-1.0, -1.0, -1.0, -1.0])
+
+    def test_fix_scalar_array(self):
+        """
+        Test that scalars and arrays are quantized and saturated / wrapped
+        identically, including multiples of the full range
+        """
+        y = np.concatenate((np.random.RandomState(0).uniform(-5, 5, 200),
+                            np.arange(-6, 6.5, 0.5), [-3.0, -2.0, 2.0, 3.0]))
+        for ovfl in ['wrap', 'sat']:
+            for quant in ['floor', 'round', 'fix', 'ceil', 'rint', 'none']:
+                q_obj = {'WI':0, 'WF':3, 'ovfl':ovfl, 'quant':quant, 'scale': 1}
+                self.myQ.setQobj(q_obj)
+                yq = self.myQ.fixp(y)
+                yq_scalar = [self.myQ.fixp(float(v)) for v in y]
+                np.testing.assert_allclose(yq_scalar, yq, rtol=0, atol=1e-12,
+                                           err_msg="{0}, {1}".format(ovfl, quant))
+                self.assertTrue(np.all((yq >= -1) & (yq <= 1)))
+
+    def test_fix_array_fast_path(self):
+        """
+        Test in-place quantization, integer output and overflow counters for
+        numeric arrays
+        """
+        q_obj = {'WI':0, 'WF':3, 'ovfl':'sat', 'quant':'round', 'scale': 1}
+        self.myQ.setQobj(q_obj)
+        self.myQ.resetN()
+        y = np.array(self.y_list)
+        yq_goal = [-1, -1, -0.5, 0, 0.5, 0.875, 0.875, 0.875, 0.875]
+        yq = self.myQ.fixp(y, out=y) # in place
+        self.assertIs(yq, y)
+        self.assertEqual(list(y), yq_goal)
+        self.assertEqual((self.myQ.N_over_neg, self.myQ.N_over_pos), (1, 3))
+        self.assertEqual(self.myQ.N_over, 4)
+
+        yq_int = self.myQ.fixp(self.y_list, int_out=True)
+        self.assertEqual(yq_int.dtype, np.int64)
+        self.assertEqual(list(yq_int), [-8, -8, -4, 0, 4, 7, 7, 7, 7])
+        out = np.zeros(len(self.y_list), dtype=np.int64)
+        self.myQ.fixp(self.y_list, out=out, int_out=True)
+        self.assertEqual(list(out), list(yq_int))
+        self.assertEqual(self.myQ.N_over, 12)
+        # scalars
+        self.assertEqual(self.myQ.fixp(1.1, int_out=True), 7)
+        self.assertEqual(self.myQ.ovr_flag, 1)
+
 
     def test_float2frmt_bin(self):
         """
@@ -284,6 +336,26 @@ class TestSequenceFunctions(unittest.TestCase):
         yq_arr = list(self.myQ.float2frmt(self.y_list))
         self.assertEqual(yq_arr, yq_list_goal)
         
+    def test_vec_formats(self):
+        """
+        Vectorized conversion of fixpoint integers to bin, hex and CSD
+        """
+        y_int = np.array([[-64, -63, -31, -1], [0, 1, 31, 63]])
+        for WI in range(7):
+            y_bin = int2bin_vec(y_int, 7, WI)
+            self.assertEqual(y_bin.shape, (2, 4))
+            y_hex_goal = [bin2hex(b.replace('.', ''), WI) for b in y_bin.ravel()]
+            self.assertEqual(list(int2hex_vec(y_int, 7, WI).ravel()), y_hex_goal)
+        self.assertEqual(list(int2bin_vec(y_int[0], 7, 2)), ['100.0000', '100.0001',
+                                                             '110.0001', '111.1111'])
+        # CSD: value, no adjacent non-zero digits
+        y_csd = dec2csd_vec(y_int / 16., 4)
+        self.assertEqual(y_csd.shape, (2, 4))
+        self.assertEqual(list(y_csd[1]), ['0', '0.000+', '+0.000-', '+00.000-'])
+        for y, csd in zip(y_int.ravel(), y_csd.ravel()):
+            self.assertEqual(csd2dec(csd.replace('.', '')), y)
+            self.assertIsNone(re.search(r'[+-][+-]', csd))
+
     def test_float2frmt_csd(self):
         """
         Conversion from float and dec to CSD format
@@ -318,8 +390,10 @@ class TestSequenceFunctions(unittest.TestCase):
         # Fractional case: Q0.6, scalar, test float2frmt       
         self.myQ.setQobj({'Q':'0.6', 'scale':1./64})
         yq_list = list(map(self.myQ.float2frmt, y_list))
-        yq_list_goal = ['-.000000',  '-.00000+', '-.0+0+0+', '0.00000-', '0', '0.00000+', '+.0-0-0-', '+.0-0-0-', '+.00000-']
-# TODO: 3rd argument should be: '-.0000+', 7th argument should be '+.0000-', 8th argument should be '+.00000'
+        yq_list_goal = ['-.000000',  '-.00000+', '0.-0000+', '0.00000-', '0', '0.00000+', '0.+0000-', '0.+00000', '+.00000-']
+        self.assertEqual(yq_list, yq_list_goal)
+        # same, vectorized
+        yq_list = list(self.myQ.float2frmt(y_list))
         self.assertEqual(yq_list, yq_list_goal)
 
         # Integer case: Q3.0, scale = 8, scalar parameter, test float2frmt
@@ -372,8 +446,8 @@ class TestSequenceFunctions(unittest.TestCase):
         yq_list_goal = [0, -1, 0, -1, -0.875, -0.5,-0.125,  0, 0.5, 0.875, -1, 0, 0.25]
         self.assertEqual(yq_list, yq_list_goal)
         # same but vectorized
-        #yq_list = self.myQ.frmt2float(y_list)
-        #self.assertEqual(yq_list, yq_list_goal)
+        yq_list = list(self.myQ.frmt2float(y_list))
+        self.assertEqual(yq_list, yq_list_goal)
         
         # same for integer case
         y_list = ['11000', '1000', '-0111', '1001', '1100', '1111', '0000', '0100', '0111', '01000']
@@ -389,9 +463,9 @@ class TestSequenceFunctions(unittest.TestCase):
         yq_list = list(map(self.myQ.frmt2float, y_list))
         yq_list_goal = [-8, -8, -7, -7, -4, -1,  0, 4, 7, -8]  
         self.assertEqual(yq_list, yq_list_goal)
-        # same but vectorized     
-        #yq_list = list(self.myQ.frmt2float(y_list)) 
-        #self.assertEqual(yq_list, yq_list_goal)
+        # same but vectorized
+        yq_list = list(self.myQ.frmt2float(y_list))
+        self.assertEqual(yq_list, yq_list_goal)
 
     def test_frmt2float_hex(self):
         """
@@ -422,8 +496,8 @@ class TestSequenceFunctions(unittest.TestCase):
         self.assertEqual(yq_list, yq_list_goal)
         
         # same but vectorized
-        # yq_list = self.myQ.frmt2float(y_list)
-        # self.assertEqual(yq_list, yq_list_goal)
+        yq_list = list(self.myQ.frmt2float(y_list))
+        self.assertEqual(yq_list, yq_list_goal)
 
         # same for integer case
         y_list = ['100000', '1,000', '1,1', '1.5', '1.E', '1.F', '0.000', '1', '2', '8','', '2.0', '07.00', '070.01']
@@ -468,8 +542,30 @@ class TestSequenceFunctions(unittest.TestCase):
         self.assertEqual(yq_list, yq_list_goal)
 
         # same but vectorized
-        # yq_list = self.myQ.frmt2float(y_list)
-        # self.assertEqual(yq_list, yq_list_goal)
+        yq_list = list(self.myQ.frmt2float(y_list))
+        self.assertEqual(yq_list, yq_list_goal)
+
+    def test_frmt2float_vec(self):
+        """
+        Test vectorized conversion of string arrays to float
+        """
+        q_obj = {'WI':3, 'WF':4, 'ovfl':'wrap', 'quant':'round', 'scale': 1}
+        self.myQ.setQobj(q_obj)
+        y = np.linspace(-8, 7.9375, 256)
+        for frmt in ['dec', 'bin', 'hex', 'csd']:
+            self.myQ.setQobj({'frmt': frmt})
+            y_str = self.myQ.float2frmt(y.reshape(16, 16))
+            yq = self.myQ.frmt2float(y_str)
+            self.assertEqual(yq.shape, (16, 16))
+            np.testing.assert_array_equal(yq.ravel(), y)
+            # scalar conversion gives the same result
+            self.assertEqual(self.myQ.frmt2float(y_str[0, 1]), y[1])
+
+        # illegal characters are removed, invalid strings are replaced by zero,
+        # MSBs outside the fixpoint range are discarded (also for > 64 bits)
+        y_list = ['1x', '--1', '1-1', 'F' * 30 + '.8', '-' + '1' * 20 + '.1']
+        yq_list = list(self.myQ.frmt2float(y_list, frmt='hex'))
+        self.assertEqual(yq_list, [1, -1, 0, -0.5, -1.0625])
 
 
 # TODO: test csd2dec, csd2dec_vec
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the bit-true fixpoint filter simulation in pyfda_fix_sim
+"""
+from __future__ import division, print_function, unicode_literals
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.pyfda_fix_lib import Fixed
+from pyfda.pyfda_fix_sim import IntQuant, FixFilter
+
+
+def rtl_iir(b, a, x, W):
+    """
+    Python transcription of the RTL description `filter_iir_hdl` in
+    `hdl_generation.filter_iir_hdl` (full precision accumulator, output and
+    feedback registers are the slice yacc[2W:W-1] of the accumulator)
+    """
+    ql, qu = W - 1, 2 * W
+
+    def acc_slice(v): # yacc[qu:ql].signed()
+        v = (v >> ql) & ((1 << (qu - ql)) - 1)
+        return v - (1 << (qu - ql)) if v >> (qu - ql - 1) else v
+
+    ffd, fbd, y = [0, 0], [0, 0], []
+    for xi in x:
+        yacc = b[0]*xi + b[1]*ffd[0] + b[2]*ffd[1] - a[1]*fbd[0] - a[2]*fbd[1]
+        ffd = [xi, ffd[0]]
+        fbd = [acc_slice(yacc), fbd[0]]
+        y.append(fbd[0])
+    return np.array(y)
+
+
+class TestFixSim(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(1)
+
+    def test_int_quant(self):
+        """ integer requantization gives the same results as Fixed.fixp() """
+        y = self.rng.randint(-2**20, 2**20, 2000)
+        for quant in ['floor', 'round', 'fix', 'ceil', 'rint']:
+            for ovfl in ['sat', 'wrap']:
+                for WF_in, WF in [(12, 5), (5, 5), (5, 9)]:
+                    q_obj = {'WI':3, 'WF':WF, 'quant':quant, 'ovfl':ovfl}
+                    Q = IntQuant(q_obj)
+                    yq = Q.requant(y, WF_in)
+                    yf = Fixed(q_obj).fixp(y / 2.**WF_in, int_out=True)
+                    np.testing.assert_array_equal(yq, yf)
+                    self.assertEqual([Q.requant_int(v, WF_in) for v in y.tolist()],
+                                     yf.tolist())
+                    # python integers with more than 64 bits
+                    yo = Q.requant(y.astype(object) << 60, WF_in + 60)
+                    self.assertEqual(yo.tolist(), yf.tolist())
+        Q = IntQuant({'WI':0, 'WF':3, 'ovfl':'wrap', 'quant':'floor'})
+        self.assertEqual(Q.requant(np.array([-9, -8, 7, 8, 15]), 3).tolist(),
+                         [7, -8, 7, -8, -1])
+        self.assertEqual(Q.N_over, 3)
+        self.assertIs(IntQuant().requant(y, 20), y) # transparent
+
+    def test_rtl_iir(self):
+        """ direct form I matches the RTL description of filter_iir_hdl """
+        W = 16
+        b, a = sig.butter(2, 0.1)
+        B = np.round(b * 2**(W-1)).astype(int)
+        A = np.floor(a * 2**(W-1)).astype(int)
+        x = self.rng.randint(-2**(W-1), 2**(W-1), 3000)
+        y_rtl = rtl_iir(B.tolist(), A.tolist(), x.tolist(), W)
+
+        fil_dict = {'ba': (B / 2.**(W-1), A / 2.**(W-1)), 'ft':'IIR', 'sos':[]}
+        fx = FixFilter(fil_dict, q_input={'WI':0, 'WF':W-1, 'ovfl':'none'},
+                       q_coeff={'WI':2, 'WF':W-1, 'quant':'round', 'ovfl':'none'},
+                       q_out={'WI':1, 'WF':W-1, 'quant':'floor', 'ovfl':'wrap'})
+        y = fx.process(x, int_in=True, int_out=True)
+        np.testing.assert_array_equal(y, y_rtl)
+        # processing in blocks gives the same result
+        fx.reset()
+        y = [fx.process(x[i:i+700], int_in=True, int_out=True) for i in range(0, 3000, 700)]
+        np.testing.assert_array_equal(np.concatenate(y), y_rtl)
+        self.assertEqual(fx.N_over, {'input':0, 'coeff':0, 'mult':0, 'accu':0, 'out':0})
+
+    def test_fir(self):
+        """ FIR filter with quantized products and accumulator """
+        h = sig.firwin(31, 0.2)
+        q = {'q_input': {'WI':0, 'WF':15, 'quant':'round', 'ovfl':'sat'},
+             'q_coeff': {'WI':0, 'WF':17, 'quant':'round', 'ovfl':'sat'},
+             'q_mult': {'WI':0, 'WF':20, 'quant':'floor', 'ovfl':'wrap'},
+             'q_accu': {'WI':0, 'WF':20, 'quant':'none', 'ovfl':'wrap'},
+             'q_out': {'WI':0, 'WF':12, 'quant':'rint', 'ovfl':'sat'}}
+        x = self.rng.uniform(-1.2, 1.2, 2000)
+        fx = FixFilter({'ba':(h, [1]), 'ft':'FIR', 'sos':[]}, **q)
+        y = fx.process(x)
+        # reference with floats quantized by Fixed
+        Q = dict((k, Fixed(v)) for k, v in q.items())
+        xq, hq = Q['q_input'].fixp(x), Q['q_coeff'].fixp(h)
+        acc = np.zeros(len(x))
+        for k in range(len(h)):
+            acc += Q['q_mult'].fixp(hq[k] * np.concatenate((np.zeros(k), xq[:len(x)-k])))
+        np.testing.assert_array_equal(y, Q['q_out'].fixp(Q['q_accu'].fixp(acc)))
+        self.assertEqual(fx.N_over['input'], Q['q_input'].N_over)
+        self.assertTrue(fx.N_over['input'] > 0)
+        # transposed direct form II gives the same result for FIR filters
+        fx2 = FixFilter({'ba':(h, [1]), 'ft':'FIR', 'sos':[]}, structure='df2t', **q)
+        np.testing.assert_array_equal(fx2.process(x), y)
+
+    def test_iir_high_precision(self):
+        """ DF1 / DF2T and SOS cascades approach the float filter for long words """
+        b, a = sig.ellip(6, 1, 60, 0.2)
+        sos = sig.tf2sos(b, a)
+        x = self.rng.uniform(-0.5, 0.5, 2000)
+        q = {'WI':6, 'WF':40, 'quant':'round', 'ovfl':'sat'}
+        for structure in ['df1', 'df2t']:
+            for use_sos in [False, True]:
+                fx = FixFilter({'ba':(b, a), 'sos':sos, 'ft':'IIR'},
+                               q_input={'WI':0, 'WF':40}, q_coeff=q, q_out=q,
+                               structure=structure, sos=use_sos)
+                y = fx.process(x)
+                np.testing.assert_allclose(y, sig.lfilter(b, a, x), atol=1e-8)
+
+    def test_invalid(self):
+        fil_dict = {'ba':([1, 1], [1, 0.5]), 'ft':'IIR', 'sos':[]}
+        with self.assertRaises(ValueError):
+            FixFilter(fil_dict, q_coeff={'WI':1, 'WF':5}, structure='df3')
+        with self.assertRaises(ValueError):
+            FixFilter(fil_dict, q_coeff={'WI':1, 'WF':5},
+                      q_out={'WI':1, 'WF':5, 'quant':'none'})
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_pyfda_fix_sim
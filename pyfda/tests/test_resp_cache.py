@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the response cache in pyfda_lib
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import (ResponseCache, hash_args, calc_Hcomplex,
+                             resp_cache, H_mag, log_H_zpk)
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.b, self.a = sig.butter(4, 0.3)
+        self.fil_dict = {'ba': [self.b, self.a]}
+        resp_cache.clear()
+
+    def test_hash_args(self):
+        self.assertEqual(hash_args(self.b, 512, True), hash_args(self.b.copy(), 512, True))
+        self.assertNotEqual(hash_args(self.b, 512, True), hash_args(self.b, 512, False))
+        # same values, different dtype / shape
+        self.assertNotEqual(hash_args(np.arange(4)), hash_args(np.arange(4.)))
+        self.assertNotEqual(hash_args(np.zeros((2,2))), hash_args(np.zeros(4)))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_bytes=3 * 800)
+        for i in range(3):
+            cache.put(i, np.zeros(100)) # 800 bytes each
+        cache.get(0) # 0 becomes the most recently used entry
+        cache.put(3, np.zeros(100))
+        self.assertNotIn(1, cache)
+        self.assertIn(0, cache)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.nbytes, 3 * 800)
+        # too large entries are not stored
+        cache.put(4, np.zeros(1000))
+        self.assertNotIn(4, cache)
+
+    def test_readonly(self):
+        cache = ResponseCache()
+        x = cache.put('x', (np.ones(10), np.zeros(10)))
+        with self.assertRaises(ValueError):
+            x[0][0] = 2
+
+    def test_calc_Hcomplex(self):
+        W, H = calc_Hcomplex(self.fil_dict, 1024, True)
+        w_ref, H_ref = sig.freqz(self.b, self.a, worN=1024, whole=True)
+        np.testing.assert_allclose(H, H_ref)
+        W2, H2 = calc_Hcomplex({'ba': [self.b.copy(), self.a.copy()]}, 1024, True)
+        self.assertIs(H, H2) # same result object from cache
+        self.assertEqual(resp_cache.hits, 1)
+        W3, H3 = calc_Hcomplex(self.fil_dict, 512, True)
+        self.assertEqual(len(H3), 512)
+
+
+class TestHmagZpk(unittest.TestCase):
+
+    def setUp(self):
+        x, y = np.meshgrid(np.linspace(-1.5, 1.5, 31), np.linspace(-1.5, 1.5, 31))
+        self.z = x + 1j * y
+        resp_cache.clear()
+
+    def test_poly_zpk(self):
+        """ polynomial and zpk form yield the same result for low orders """
+        b, a = sig.cheby1(6, 1, 0.3)
+        zpk = sig.tf2zpk(b, a)
+        for log, H_max, H_min in [(False, 100, 0), (True, 40, -80)]:
+            H_poly = H_mag(b, a, self.z, H_max, H_min=H_min, log=log)
+            H_zpk = H_mag(b, a, self.z, H_max, H_min=H_min, log=log, zpk=zpk)
+            np.testing.assert_allclose(H_zpk, H_poly, rtol=1e-8, atol=1e-9)
+        self.assertEqual(resp_cache.hits, 1) # log. grid has been reused
+
+    def test_high_order(self):
+        """ product of 400 zeros at distance 2 overflows the polynomial form """
+        zpk = [2 * np.exp(2j * np.pi * np.arange(400) / 400), [], 1]
+        log_H = log_H_zpk(zpk, np.array([0, 1e-3]))
+        np.testing.assert_allclose(log_H, 400 * np.log10(2), rtol=1e-6)
+        # chunked calculation gives the same result
+        np.testing.assert_allclose(log_H_zpk(zpk, self.z, max_bytes=1000),
+                                   log_H_zpk(zpk, self.z))
+
+    def test_singular(self):
+        H = H_mag(1, 1, np.array([0, 1, 2]), 100, log=True, zpk=[[0], [1], 1])
+        self.assertEqual(H[0], -np.inf)
+        self.assertEqual(H[1], 100) # clipped pole
+        np.testing.assert_allclose(H[2], 20 * np.log10(2))
+
+
+if __name__=='__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_resp_cache
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+unittest for the conversion to second-order sections in fil_save / fil_convert
+and the evaluation of the frequency response from them
+"""
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+import unittest
+import numpy as np
+import scipy.signal as sig
+from pyfda.pyfda_lib import (zpk2sos, fil_save, fil_sos, calc_Hcomplex,
+                             calc_Hzoom, resp_cache)
+
+class TestSOSPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(1)
+        resp_cache.clear()
+
+    def test_zpk2sos(self):
+        """ roots with numerical errors are paired, complex filters are rejected """
+        z, p, k = sig.ellip(8, 0.5, 60, 0.3, output='zpk')
+        sos_ref = sig.zpk2sos(z, p, k)
+        # perturb the conjugate symmetry and shuffle the roots
+        z_n = self.rng.permutation(z + 1e-10j * self.rng.randn(len(z)))
+        p_n = self.rng.permutation(p + 1e-10 * self.rng.randn(len(p)))
+        sos = zpk2sos(z_n, p_n, k)
+        self.assertEqual(sos.shape, sos_ref.shape)
+        w, H = sig.sosfreqz(sos, 256)
+        np.testing.assert_allclose(H, sig.sosfreqz(sos_ref, 256)[1], atol=1e-8)
+
+        self.assertIsNone(zpk2sos([0.5j], [0.3], 1)) # no conjugate zero
+        self.assertIsNone(zpk2sos([0.5], [0.3], 1j)) # complex gain
+        np.testing.assert_allclose(zpk2sos([], [], 2.), [[2, 0, 0, 1, 0, 0]])
+
+    def test_fil_save_zpk(self):
+        """ IIR designs in zpk format are converted to SOS """
+        zpk = sig.ellip(24, 0.1, 100, 0.1, output='zpk')
+        fil_dict = {}
+        fil_save(fil_dict, zpk, 'zpk', 'test')
+        self.assertEqual(fil_dict['ft'], 'IIR')
+        sos = fil_sos(fil_dict)
+        self.assertEqual(sos.shape, (12, 6))
+        # the response is calculated from the SOS, polynomials are useless here:
+        w, H = calc_Hcomplex(fil_dict, 1024, False)
+        H_ref = sig.sosfreqz(sig.zpk2sos(*zpk), 1024)[1]
+        np.testing.assert_allclose(H, H_ref, atol=1e-10)
+        W, H_z = calc_Hzoom(fil_dict, 0, 0.1 * np.pi, 100)
+        np.testing.assert_allclose(H_z, sig.sosfreqz(sig.zpk2sos(*zpk), W)[1],
+                                   atol=1e-10)
+
+    def test_fil_save_ba(self):
+        """ IIR filters in ba format get SOS, FIR filters don't """
+        fil_dict = {}
+        b, a = sig.butter(4, 0.2)
+        fil_save(fil_dict, [b, a], 'ba', 'test')
+        sos = fil_sos(fil_dict)
+        self.assertEqual(sos.shape, (2, 6))
+        np.testing.assert_allclose(sig.sosfreqz(sos, 64)[1], sig.freqz(b, a, 64)[1],
+                                   atol=1e-12)
+        fil_save(fil_dict, sig.firwin(31, 0.2), 'ba', 'test')
+        self.assertEqual(fil_dict['ft'], 'FIR')
+        self.assertIsNone(fil_sos(fil_dict))
+
+    def test_fil_save_sos(self):
+        """ SOS designs are converted to ba and zpk """
+        sos = sig.butter(6, 0.3, output='sos')
+        fil_dict = {}
+        fil_save(fil_dict, sos, 'sos', 'test')
+        b, a = sig.sos2tf(sos)
+        np.testing.assert_allclose(np.real(fil_dict['ba'][0]), b, atol=1e-14)
+        np.testing.assert_allclose(np.real(fil_dict['ba'][1]), a, atol=1e-14)
+        self.assertEqual(len(fil_dict['zpk'][1]), 6)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# run tests with python -m pyfda.tests.test_sos_pipeline
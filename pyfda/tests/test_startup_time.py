@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+# Import time of the plot widgets and startup time of the plot tab widget,
+# checking that heavy plot widgets (3D plot, impulse response) are only
+# constructed when their tab is selected.
+#
+# Run the benchmark with
+#   python -m pyfda.tests.test_startup_time
+#===========================================================================
+from __future__ import division, print_function, unicode_literals
+
+import sys
+import subprocess
+import unittest
+
+# Python code executed in a fresh interpreter, prints a dict with the results
+IMPORT_SCRIPT = """
+import sys, time
+t_start = time.time()
+import pyfda.plot_widgets.plot_tab_widgets
+print({'t_import': time.time() - t_start,
+       'mplot3d': 'mpl_toolkits.mplot3d' in sys.modules,
+       'plot_3d': 'pyfda.plot_widgets.plot_3d' in sys.modules})
+"""
+
+STARTUP_SCRIPT = """
+import sys, time
+t_start = time.time()
+from pyfda.compat import QApplication
+app = QApplication(sys.argv)
+from pyfda.plot_widgets.plot_tab_widgets import PlotTabWidgets
+t_import = time.time() - t_start
+t_start = time.time()
+tabs = PlotTabWidgets(None)
+t_startup = time.time() - t_start
+res = {'t_import': t_import, 't_startup': t_startup,
+       'mplot3d': 'mpl_toolkits.mplot3d' in sys.modules,
+       'plt3D': tabs.plt3D.wdg is not None}
+t_start = time.time()
+tabs.tabWidget.setCurrentWidget(tabs.plt3D)
+res.update({'t_3d': time.time() - t_start,
+            'mplot3d_selected': 'mpl_toolkits.mplot3d' in sys.modules,
+            'plt3D_selected': tabs.plt3D.wdg is not None})
+print(res)
+"""
+
+def run(script):
+    """
+    Run `script` in a new Python interpreter and return the dict it prints
+    """
+    out = subprocess.check_output([sys.executable, '-c', script])
+    return eval(out.decode('utf-8').strip().splitlines()[-1])
+
+def main(Navg=3):
+    for name, script in [('import', IMPORT_SCRIPT), ('startup', STARTUP_SCRIPT)]:
+        res = [run(script) for i in range(Navg)]
+        print("{0:>8s}:".format(name), ", ".join(
+            "{0} = {1:.3g} s".format(k, min(r[k] for r in res))
+                for k in sorted(res[0]) if k.startswith('t_')))
+        print("{0:>8s}  {1}".format("", dict((k, v) for k, v in res[-1].items()
+                                              if not k.startswith('t_'))))
+
+
+class TestStartupTime(unittest.TestCase):
+
+    def test_import(self):
+        """ importing the plot tab widget doesn't import the 3D plot """
+        res = run(IMPORT_SCRIPT)
+        self.assertFalse(res['mplot3d'])
+        self.assertFalse(res['plot_3d'])
+        self.assertTrue(res['t_import'] > 0)
+
+#===========================================================================
+if __name__ == "__main__":
+    main()
@@ -261,6 +261,40 @@ class TestSequenceFunctions(unittest.TestCase):
         roots_goal = ([r0], [2*N])
         self.assertEqual(toSoT(roots_out),toSoT(roots_goal))         
 
+    def test_avg_chain(self):
+        """
+        real roots are assigned to a cluster when they are within `tol` of the
+        first root of the cluster, not of the running average
+        """
+        roots_in = [1.0, 1.0009, 1.0012]
+        roots_out = FuT(roots_in)
+        roots_goal = ([1.00045, 1.0012], [2, 1])
+        self.assertEqual(toSoT(roots_out),toSoT(roots_goal))
+
+        roots_in = [1.0, 1.0002, 1.0004, 1.0006]
+        roots_out = FuT(roots_in)
+        roots_goal = ([1.0003], [4])
+        self.assertEqual(toSoT(roots_out),toSoT(roots_goal))
+
+    def test_grid_loop(self):
+        """
+        grid and loop implementation yield the same result for clustered roots
+        """
+        rng = np.random.RandomState(0)
+        base = rng.randn(50) + 1j * rng.randn(50)
+        roots_in = base[rng.randint(0, 50, 200)] \
+                    + 2e-4 * (rng.randn(200) + 1j * rng.randn(200))
+        for rt in ['min', 'max', 'avg', 'median']:
+            for rd in ['euclid', 'manhattan']:
+                r_grid = unique_roots(roots_in, rtype=rt, rdist=rd, method='grid')
+                r_loop = unique_roots(roots_in, rtype=rt, rdist=rd, method='loop')
+                np.testing.assert_array_equal(r_grid[1], r_loop[1])
+                np.testing.assert_allclose(r_grid[0], r_loop[0])
+        with self.assertRaises(ValueError):
+            unique_roots(roots_in, method='foo')
+        with self.assertRaises(ValueError): # also checked for real roots
+            unique_roots([1., 2.], method='foo')
+
 #=====================================00
 
 if __name__ == '__main__':
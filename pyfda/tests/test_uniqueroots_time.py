@@ -1,74 +1,86 @@
 #!/usr/bin/env python
 # -*- coding: iso-8859-15 -*-
 #===========================================================================
-# Speed comparison for unique_roots from scipy.signal against
-# new implementation 
+# Speed comparison for unique_roots in pyfda_lib ('grid' and 'loop' method)
+# against scipy.signal.unique_roots
 #
+# Run the benchmark with
+#   python -m pyfda.tests.test_uniqueroots_time
 # (c) 2015 Christian Muenker
 #===========================================================================
 from __future__ import division, print_function, unicode_literals # v3line15
 
+import timeit
+import unittest
+
 import numpy as np
 import numpy.random as rnd
 
 import scipy.signal as sig
 
-import time
 if __name__ == "__main__":
     import sys, os
     __cwd__ = os.path.dirname(os.path.abspath(__file__))
     sys.path.append(os.path.join('..',os.path.dirname(__cwd__)))
 
 import pyfda.pyfda_lib as dsp
-#import my_dsp_lib_v6a as dsp
 
-## scalar inputs - IndexError with scipy implementation
-#vals = 1 # real root
-#vals = 1j # imag. root
-#vals = 1j + 1  # complex root
+rtype = 'avg'
+rdist = 'euclid'
+SIZES = (100, 500, 1000, 2000) # approx. number of roots of the test vectors
 
-## multiple & single real roots 
-#vals = np.convolve(ones(13),ones(13)) # 12 double, one single real root
-#vals = np.convolve(ones(1000),ones(1000))
-#vals = [1,2,-1] # different unique real roots
+def make_vectors(N):
+    """
+    Return a dict with test vectors of (approx.) `N` roots each
+    """
+    rnd.seed(0)
+    return {
+        # 500 double complex roots on the UC (like a long moving average filter)
+        'UC double': np.roots(np.convolve(np.ones(N//2 + 1), np.ones(N//2 + 1))),
+        # mostly single complex roots of a long FIR filter
+        'FIR': np.roots(sig.firwin(N + 1, 0.2)),
+        # random complex roots
+        'random': rnd.randn(N) + 1j * rnd.randn(N),
+        # random real roots
+        'real': rnd.randn(N)
+        }
 
-## multiple & single imag. roots on the unit circle
-vals =[1j, 1j]
-vals = rnd.randn(1000)
-vals = rnd.randn(100) + 1j * rnd.randn(100)
-#vals = ones(5) * 1j # root at j with multiplicity 5
-#vals = np.append(vals, ones(5))
-#vals = ones(5)
-#np.sort_complex()
-#vals = np.roots(np.convolve(ones(5),ones(5))) # 4 double complex roots
-#vals = np.roots(np.convolve(ones(500),ones(100))) # 100 double and 400 single complex roots,
-#vals = np.roots(np.convolve(ones(500),ones(500))) # 500 double complex roots
+def bench(vals, Navg):
+    """
+    Return the average execution times of unique_roots with method 'grid',
+    'loop' and of scipy.signal.unique_roots for the roots `vals`
+    """
+    T = {}
+    for m in ['grid', 'loop']:
+        T[m] = timeit.timeit(lambda: dsp.unique_roots(vals, rtype=rtype,
+                                rdist=rdist, method=m), number=Navg) / Navg
+    T['scipy'] = timeit.timeit(lambda: sig.unique_roots(vals, rtype=rtype),
+                               number=Navg) / Navg
+    return T
 
-#vals = np.roots(np.convolve(ones(5),ones(7))) # 4 double complex roots
+def main(sizes=SIZES, Navg=10):
+    print("{0:>10s} {1:>6s} {2:>10s} {3:>10s} {4:>10s} {5:>10s}".format(
+          "roots", "N", "T_grid", "T_loop", "T_scipy", "loop/grid"))
+    for N in sizes:
+        for name, vals in make_vectors(N).items():
+            T = bench(vals, Navg)
+            print("{0:>10s} {1:6d} {2:10.2e} {3:10.2e} {4:10.2e} {5:10.1f}".format(
+                name, N, T['grid'], T['loop'], T['scipy'], T['loop'] / T['grid']))
 
-## tests with nans 
-#vals = list(ones(5) * 1j); vals.append(np.nan); vals.append(np.nan)
-#vals = []
-#print(vals)
 
-Navg = 1000
-rtype = 'min'
-print('============ dsp.unique_roots() ================================')
-t1 = time.clock()
-for i in range(Navg):
-    roots, mult = dsp.unique_roots(vals, rtype = rtype, rdist='manhattan')
-t2 = time.clock()
-T_dsp = (t2 - t1)/Navg
-print (mult)
+class TestUniqueRootsTime(unittest.TestCase):
 
-print('============ signal.unique_roots() =============================')
-t1 = time.clock()
-for i in range(Navg):
-    roots, mult = sig.unique_roots(vals, rtype = rtype)
-t2 = time.clock()
-T_sig = (t2 - t1)/Navg
-print (mult)
+    def test_grid_loop(self):
+        """ both methods return the same clusters for the benchmark inputs """
+        for N in SIZES[:2]: # roots of the larger test polynomials take too long
+            for name, vals in make_vectors(N).items():
+                r_grid = dsp.unique_roots(vals, rtype=rtype, rdist=rdist, method='grid')
+                r_loop = dsp.unique_roots(vals, rtype=rtype, rdist=rdist, method='loop')
+                np.testing.assert_array_equal(r_grid[1], r_loop[1],
+                                              err_msg="{0}, N = {1}".format(name, N))
+                np.testing.assert_allclose(r_grid[0], r_loop[0],
+                                           err_msg="{0}, N = {1}".format(name, N))
 
-print("T_dsp = ",T_dsp, " s")
-print("T_sig = ",T_sig, " s")
-print("T_dsp / T_sig = ", T_dsp / T_sig)
+#===========================================================================
+if __name__ == "__main__":
+    main()
@@ -82,6 +82,7 @@ setup(
     entry_points = {
         'console_scripts': [
             'pyfdax = pyfda.pyfdax:main',
+            'pyfda-filter = pyfda.pyfda_filter:main',
         ],
         'gui_scripts': [
             'pyfdax_no_term = pyfda.pyfdax:main',
@@ -99,6 +100,9 @@ to stderr could be provided (not implemented yet).
 
 pyfdax_no_term does essentially the same but it starts no terminal.
 
+pyfda-filter runs main() in pyfda_filter.py, a command line tool for filtering
+signal files with a saved filter (see "pyfda-filter -h").
+
 On Windows, a set of pyfdax.exe and pyfdax_no_term.exe launchers are created,
 alongside a set of pyfdax.py and pyfdax_no_term.pyw files. The .exe wrappers find
 and execute the right version of Python to run the .py or .pyw file.